@@ -1,36 +1,35 @@
 # =============================PEAK!===============================
 
-class HeaderFactory:
-    """Central factory for the ASCII branding."""
-    ASCII_ART = """
-███████╗ ██╗ ██╗      ██╗ ███████╗
-██╔════╝ ██║ ██║      ██║ ██╔════╝
-███████╗ ██║ ██║      ██║ ███████╗
-╚════██║ ██║ ██║      ██║ ╚════██║
-███████║ ██║ ███████╗ ██║ ███████║
-╚══════╝ ╚═╝ ╚══════╝ ╚═╝ ╚══════╝
-    """
-    TAGLINE = "Silis — Silicon Scaffold"
-    COPYRIGHT = "TO BE COPYRIGHTED"
-    LICENSE = "TO BE LICENCED UNDER OPEN-SOURCE"
-
-    @staticmethod
-    def get_raw_header():
-        return f"{HeaderFactory.ASCII_ART}\n{HeaderFactory.TAGLINE}\n{HeaderFactory.COPYRIGHT}\n{HeaderFactory.LICENSE}\n"
-
 import sys
 import os
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
 import subprocess
 import threading
-import queue
 import glob
 import re
 import shutil
 import json
 import random
+import concurrent.futures
+import collections
+import itertools
+import bisect
+import mmap
+import signal
+import sqlite3
 import xml.etree.ElementTree as ET
 from contextlib import suppress
+# Qt-free flow core: tools, scheduler, telemetry, flow DAG, report parsing
+from silis_flow import (HeaderFactory, PDKManager, silis_cache_dir, file_fingerprint, cache_key, TELEMETRY_LOG, begin_flow_run,
+                        cgroup_usage, load_telemetry, telemetry_runs, ToolRun, JOB_FLOW, JOB_INTERACTIVE, JOB_BACKGROUND, JOB_ACTIVE,
+                        current_job, bind_job, kill_group, JobCancelled, job_scheduler, DUMP_PROFILE, save_dump_profile,
+                        load_project_settings, save_project_settings, SIM_BACKENDS, project_sources, sim_flow, VCDParser, WaveSearch,
+                        WaveDiff, latest_vcd, saif_command, synth_liberty, netlist_liberty, DEFAULT_RECIPE, ABC_PRESETS,
+                        synth_sources, yosys_script, sta_script, sdc_with_period, sdc_period, synth_outputs, synth_flow, ReportEngine,
+                        FmaxSearch, StaService, ensure_sdc, openroad_init_tcl, prepare_backend_dirs, openroad_step_cmd, magic_merge,
+                        magic_drc, FlowGraph, discover_testbenches, parse_seeds, regression_matrix, RegressionRunner,
+                        schematic_sources, render_schematic, project_root, prep_workspace, CLI_COMMANDS)
+if __name__ == "__main__" and sys.argv[1:2] and sys.argv[1] in CLI_COMMANDS: sys.exit(CLI_COMMANDS[sys.argv[1]](sys.argv[2:]))   # headless, before any Qt import
 from PyQt6.QtOpenGLWidgets import QOpenGLWidget
 from PyQt6.QtGui import QPalette
 from PyQt6.QtCore import Qt, QRectF, QPointF
@@ -49,16 +48,17 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QGraphicsRectItem, QTableWidget, QTableWidgetItem,
                              QHeaderView, QAbstractItemView, QCheckBox, QGroupBox,
                              QToolButton, QStackedWidget, QButtonGroup, 
-                             QGraphicsPolygonItem, QGraphicsPathItem, QScrollArea, QListWidget, QFrame, QTabWidget, QGridLayout, QListWidgetItem)
+                             QGraphicsPolygonItem, QGraphicsPathItem, QScrollArea, QListWidget, QFrame, QTabWidget, QGridLayout, QListWidgetItem, QTableView, QAbstractScrollArea, QProgressBar)
 from PyQt6.QtCore import (Qt, QTimer, QSize, pyqtSignal, QThread, QDir, 
-                          QEvent, QProcess, QRectF, QPointF)
+                          QEvent, QProcess, QRectF, QPointF, QAbstractTableModel, QModelIndex, QUrl, QObject)
 from PyQt6.QtGui import (QAction, QFont, QColor, QSyntaxHighlighter, 
                          QTextCharFormat, QTextFormat, QPixmap, QPainter, QImage, QBrush, QPen,
                          QFileSystemModel, QKeySequence, QShortcut, QImageReader, 
-                         QTransform, QPolygonF, QIcon, QPainterPath, QFontMetrics)
+                         QTransform, QPolygonF, QIcon, QPainterPath, QFontMetrics, QTextCursor, QDesktopServices)
 from PyQt6.QtSvgWidgets import QGraphicsSvgItem
 from PyQt6.QtSvg import QSvgRenderer
 import gdstk
+import numpy as np
 
 from PyQt6.QtGui import QPen, QBrush, QColor, QPolygonF, QPainter # Ensure these are imported
 
@@ -182,157 +182,450 @@ class GDSViewerWidget(QGraphicsView):
         new_pos = self.mapToScene(event.position().toPoint())
         self.translate(new_pos.x() - old_pos.x(), new_pos.y() - old_pos.y())
 
-# ================= PDK MANAGEMENT SYSTEM =================
-
-class SSAForge:
+# === LOG PIPELINE (per-source rings, coalesced appends, spill to disk) ===
+
+LOG_TAIL_LINES = 5000      # lines a live log widget keeps
+LOG_RING_LINES = 20000     # lines waiting per source for the GUI; older ones are skipped in the live view
+LOG_FRAME_LINES = 1000     # lines appended per source per GUI tick; the rest wait for the next one
+LOG_CHANNELS = {"TERM_OUT": "terminal", "[BACKEND]": "backend", "[YOSYS]": "synth", "[STA]": "synth", "SYNTH_LOG": "synth",
+                "STA_LOG": "synth", "[STA_Q]": "sta_console", "[SIM]": "sim", "[FLOW]": "flow",
+                "[SYS]": "terminal", "SYS": "terminal"}
+
+
+class LogChannel:
+    """One log source: a bounded ring of lines for the live view plus a spill file holding all of them."""
+    def __init__(self, name, spill_dir):
+        self.name = name; self.lock = threading.Lock()
+        self.ring = collections.deque(maxlen=LOG_RING_LINES); self.skipped = 0
+        self.path = None; self.spill = None
+        self.restart(spill_dir)
+
+    def restart(self, spill_dir):
+        """Starts a fresh full log in spill_dir and forgets lines not yet shown."""
+        with self.lock:
+            if self.spill: self.spill.close()
+            self.path = os.path.join(spill_dir, f"{self.name}.log")
+            try: self.spill = open(self.path, "w", encoding="utf-8", errors="replace")
+            except OSError: self.spill = None
+            self.ring.clear(); self.skipped = 0
+
+    def put(self, text, color=None):
+        with self.lock:
+            if len(self.ring) == LOG_RING_LINES: self.skipped += 1
+            self.ring.append((text, color))
+            if self.spill: self.spill.write(text + "\n")
+
+    def record(self, text):
+        """Full-log only: for lines the GUI already shows directly."""
+        with self.lock:
+            if self.spill: self.spill.write(text + "\n")
+
+    def take(self, n):
+        """Up to n pending (text, color) lines and how many were skipped since the last take."""
+        with self.lock:
+            lines = [self.ring.popleft() for _ in range(min(n, len(self.ring)))]
+            skipped, self.skipped = self.skipped, 0
+            if self.spill and not self.ring: self.spill.flush()
+        return lines, skipped
+
+    def flush(self):
+        with self.lock, suppress(OSError):
+            if self.spill: self.spill.flush()
+
+
+class LogPipeline:
     """
-    Silis Standard Aliases (SSA) - The Forge
-    Decouples the IDE from specific PDK naming conventions.
+    Log storage behind the event bus. put((tag, text)) from any thread: each
+    tag goes to its channel's ring and spill file; the GUI takes one frame of
+    lines per channel with drain().
     """
-    # 1. HARDCODED DEFAULTS (Failsafe)
-    DEFAULT_PDK = "sky130_fd_sc_hd"
-    ALIASES = {
-        "sky130_fd_sc_hd": {
-            "desc": "SkyWater 130nm High Density",
-            "tap_cell": "sky130_fd_sc_hd__tapvpwrvgnd_1",
-            "tap_dist": 14,
-            "cts_root": "sky130_fd_sc_hd__clkbuf_16",
-            "cts_leaf": "sky130_fd_sc_hd__clkbuf_4",
-            "fill": "sky130_fd_sc_hd__fill_*",
-            "tie_hi": "sky130_fd_sc_hd__conb_1",
-            "tie_lo": "sky130_fd_sc_hd__conb_1",
-            "min_layer": "met1",
-            "max_layer": "met5",
-            "driver": "sky130_fd_sc_hd__buf_1"
-        }
-    }
+    def __init__(self, spill_dir):
+        self.spill_dir = spill_dir; self.channels = {}; self.lock = threading.Lock()
 
-    @staticmethod
-    def load_aliases(json_filename="pdk_aliases.json"):
-        """
-        Loads aliases from disk. 
-        Checks CWD first, then the script's own directory.
-        """
-        # 1. Check Current Working Directory
-        paths_to_check = [os.path.abspath(json_filename)]
-        
-        # 2. Check Script Directory (Crucial for execution from other folders)
-        if hasattr(sys, 'argv') and sys.argv:
-            script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-            paths_to_check.append(os.path.join(script_dir, json_filename))
-
-        loaded = False
-        for path in paths_to_check:
-            if os.path.exists(path):
-                try:
-                    with open(path, 'r') as f:
-                        data = json.load(f)
-                        # Update existing, don't overwrite blindly
-                        SSAForge.ALIASES.update(data) 
-                        print(f"[SSA] Loaded aliases from: {path}")
-                        loaded = True
-                        break
-                except Exception as e:
-                    print(f"[SSA] Error parsing {path}: {e}")
-        
-        if not loaded:
-            print(f"[SSA] No external JSON found. Using built-in defaults.")
+    def channel(self, name):
+        with self.lock:
+            if name not in self.channels: self.channels[name] = LogChannel(name, self.spill_dir)
+            return self.channels[name]
 
-    @staticmethod
-    def resolve_pdk_key(pdk_name, lib_path=None):
-        """Matches a name or file path to a known PDK key."""
-        # 1. Clean inputs
-        pdk_name = str(pdk_name).lower() if pdk_name else ""
-        lib_path = str(lib_path).lower() if lib_path else ""
-
-        # 2. Search Keys
-        for key in SSAForge.ALIASES:
-            key_lower = key.lower()
-            # Strict check first
-            if key_lower == pdk_name: return key
-            
-            # Fuzzy name check
-            if key_lower in pdk_name: return key
-            
-            # File path check (e.g. "sky130_fd_sc_hd__tt.lib")
-            if lib_path and key_lower in os.path.basename(lib_path):
-                return key
+    def restart(self, name, spill_dir=None):
+        self.channel(name).restart(spill_dir or self.spill_dir)
 
-        # 3. Fallback: If "sky130" is anywhere, assume HD
-        if "sky130" in pdk_name or "sky130" in lib_path:
-            return "sky130_fd_sc_hd"
+    def put(self, item):
+        tag, content = item if isinstance(item, tuple) else ("SYS", str(item))
+        if tag not in LOG_CHANNELS: tag, content = "SYS", str(item)
+        if tag in ("[SYS]", "SYS"): self.channel(LOG_CHANNELS[tag]).put(f"[SYS] {content}", "#4a8fc0"); return
+        ch = self.channel(LOG_CHANNELS[tag])
+        for line in str(content).splitlines() or [""]: ch.put(line)
 
-        return SSAForge.DEFAULT_PDK
+    def drain(self, limit=LOG_FRAME_LINES):
+        """(channel name, lines, skipped) for every channel with something to show."""
+        with self.lock: chans = list(self.channels.values())
+        for ch in chans:
+            lines, skipped = ch.take(limit)
+            if lines or skipped: yield ch.name, lines, skipped
 
-    @staticmethod
-    def get(pdk_name, key, lib_path=None):
-        family = SSAForge.resolve_pdk_key(pdk_name, lib_path)
-        val = SSAForge.ALIASES.get(family, {}).get(key, "")
-        
-        # If specific key missing in found family, try default family
-        if not val and family != SSAForge.DEFAULT_PDK:
-             val = SSAForge.ALIASES.get(SSAForge.DEFAULT_PDK, {}).get(key, "")
-             
-        return val
+    def backlog(self):
+        """True while some channel holds more lines than one frame took."""
+        with self.lock: chans = list(self.channels.values())
+        return any(ch.ring for ch in chans)
 
-    @staticmethod
-    def get_tap_cmd(pdk_name, lib_path=None):
-        cell = SSAForge.get(pdk_name, "tap_cell", lib_path)
-        dist = SSAForge.get(pdk_name, "tap_dist", lib_path)
-        if not cell: return "# [SSA ERROR] No TAP cell defined in aliases"
-        return f"tapcell -distance {dist} -tapcell_master {cell}; make_tracks"
+    def full_log(self, name):
+        ch = self.channel(name); ch.flush(); return ch.path
+
+
+def append_log(widget, lines, skipped=0, path=None):
+    """
+    Appends a batch of (text, color) lines to a capped QTextEdit/QPlainTextEdit
+    with one cursor edit per colour run, and scrolls once, only if the view was
+    already at the bottom.
+    """
+    sb = widget.verticalScrollBar(); follow = sb.value() >= sb.maximum() - 4
+    if skipped: lines = [(f"… {skipped} lines not shown live (full log: {path})", "#d4b44a")] + list(lines)
+    doc = widget.document(); cur = QTextCursor(doc); cur.movePosition(QTextCursor.MoveOperation.End)
+    cur.beginEditBlock()
+    first = doc.isEmpty()
+    for color, run in itertools.groupby(lines, key=lambda l: l[1]):
+        fmt = QTextCharFormat()
+        if color: fmt.setForeground(QColor(color))
+        text = "\n".join(t for t, _ in run)
+        cur.insertText(text if first else "\n" + text, fmt); first = False
+    cur.endEditBlock()
+    if follow: sb.setValue(sb.maximum())
+
+def open_full_log(path):
+    if path and os.path.exists(path): QDesktopServices.openUrl(QUrl.fromLocalFile(path))
 
-    @staticmethod
-    def get_cts_cmd(pdk_name, lib_path=None):
-        root = SSAForge.get(pdk_name, "cts_root", lib_path)
-        leaf = SSAForge.get(pdk_name, "cts_leaf", lib_path)
-        if not root: return "clock_tree_synthesis; detailed_placement"
-        return f"clock_tree_synthesis -root_buf {root} -buf_list {leaf}; detailed_placement"
 
+# === EVENT BUS (typed events, queued-signal wakeups, per-frame delivery) ===
 
+BUS_FRAME_MS = 16          # gap between deliveries while a log backlog remains, so input and paint run in between
+BusEvent = collections.namedtuple("BusEvent", "kind source data live", defaults=(False,))
+
+
+class EventBus(QObject):
+    """
+    Worker threads -> GUI. log(tag, text), progress(), metrics() and job() are
+    safe from any thread: log lines go to the LogPipeline rings, the rest to a
+    pending list where a live event replaces the previous one of the same kind
+    and source. The first post after a delivery emits one queued `wake`; the
+    GUI thread then runs deliver(), which emits `lines` once per channel (at
+    most LOG_FRAME_LINES) and `posted` per BusEvent. Nothing runs while idle;
+    while a backlog remains the next frame comes from a BUS_FRAME_MS timer
+    and final events wait until the lines before them are out.
+    """
+    wake = pyqtSignal()
+    lines = pyqtSignal(str, list, int)   # channel, [(text, color)], lines skipped in the live view
+    posted = pyqtSignal(object)          # BusEvent
+
+    def __init__(self, spill_dir):
+        super().__init__()
+        self.logs = LogPipeline(spill_dir)
+        self.lock = threading.Lock(); self.pending = []; self.armed = False
+        self.wake.connect(self.deliver, Qt.ConnectionType.QueuedConnection)
+        self.frame = QTimer(self); self.frame.setSingleShot(True); self.frame.timeout.connect(self.deliver)
+
+    def log(self, tag, text):
+        self.logs.put((tag, text)); self._arm()
+
+    def progress(self, source, done, total, text=""):
+        self.post(BusEvent("progress", source, (done, total, text), True))
+
+    def metrics(self, source, data, live=False):
+        """live: a partial update superseded by the next one; otherwise the run's final metrics."""
+        self.post(BusEvent("metrics", source, data, live))
+
+    def job(self, source, state, detail=None):
+        self.post(BusEvent("job", source, (state, detail)))
+
+    def post(self, ev):
+        with self.lock:
+            if ev.live: self.pending = [e for e in self.pending if not (e.live and e[:2] == ev[:2])]
+            self.pending.append(ev)
+        self._arm()
+
+    def _arm(self):
+        with self.lock:
+            if self.armed: return
+            self.armed = True
+        self.wake.emit()
+
+    def deliver(self):
+        """One frame (GUI thread). Also callable directly to flush synchronously."""
+        with self.lock: self.armed = False; events, self.pending = self.pending, []
+        for name, lines, skipped in self.logs.drain(): self.lines.emit(name, lines, skipped)
+        if self.logs.backlog():
+            held = [e for e in events if not e.live]; events = [e for e in events if e.live]
+            with self.lock: self.pending[:0] = held; self.armed = True
+            self.frame.start(BUS_FRAME_MS)
+        for ev in events: self.posted.emit(ev)
+
+
+class JobWorker(QObject):
+    """
+    Drop-in for the QThread workers: subclasses keep run() and their signals,
+    start() submits run() to the JobScheduler as NAME / GROUP at PRIORITY
+    (job_args() adds cpus, root, cancel hooks). Signals emitted from the job
+    thread reach the GUI queued, as they did from the QThread.
+    """
+    NAME = "job"; GROUP = None; PRIORITY = JOB_FLOW
 
-class PDKManager:
     def __init__(self):
-        self.cache_file = os.path.expanduser("~/.silis_pdk_cache.json")
-        self.configs = []
-        self.load_cache()
+        super().__init__(); self.job = None
+
+    def job_args(self): return {}
+
+    def start(self):
+        self.job = job_scheduler().submit(self.NAME, lambda job: self.run(), group=self.GROUP, priority=self.PRIORITY, **self.job_args())
+
+    def isRunning(self):
+        return self.job is not None and self.job.state in JOB_ACTIVE
+
+    def cancel(self):
+        if self.job: job_scheduler().cancel(self.job)
+        if self.job and self.job.t_start is None: self.dropped()
+
+    def dropped(self):
+        """Cancelled while still queued: run() never ran, so its completion signal never fired."""
+
+
+# === LOG VIEWER (memory-mapped, virtualized) ===
+
+class LogIndex:
+    """
+    Line starts and ERROR / Warning line numbers of a log file, built from an
+    mmap one chunk at a time (numpy finds the newlines). update() indexes
+    whatever was appended since the last call; a file that shrank (a new
+    run truncated it) is indexed from scratch. The mmap is only touched
+    under `lock`, and close() stops a running update() before unmapping.
+    """
+    CHUNK = 2 << 20                                   # per lock hold: a redraw waits for at most one chunk
+    LINE_CAP = 8192                                   # bytes of a line that are drawn
+    SEV_RE = re.compile(rb"\b(?:ERROR|Error|error|FATAL|Fatal)\b|\b(?:WARNING|Warning|warning)\b")
+    NEEDLES = ((b"rror", True), (b"RROR", True), (b"FATAL", True), (b"Fatal", True), (b"arning", False), (b"ARNING", False))
+
+    def _severity(self, mm, pos, end):
+        """(offset, is_error) of each severity word in [pos, end): bytes.find on literals, the regex only around hits."""
+        hits = []
+        for needle, err in self.NEEDLES:
+            o = mm.find(needle, pos, end)
+            while o >= 0:
+                if self.SEV_RE.search(mm[max(0, o - 2):o + len(needle) + 1]): hits.append((o, err))
+                o = mm.find(needle, o + len(needle), end)
+        return hits
+
+    def __init__(self, path):
+        self.path = path; self.lock = threading.RLock(); self.busy = threading.Lock(); self.stop = threading.Event()
+        self.mm = None; self.reset()
+
+    def reset(self):
+        if self.mm: self.mm.close()
+        self.mm = None; self.size = 0; self.done = 0
+        self.pieces = [np.zeros(1, dtype=np.int64)]; self.counts = [1]; self.firsts = [0]   # line starts, cumulative counts
+        self.errors, self.warnings = [], []
+
+    @property
+    def lines(self):
+        with self.lock:
+            if not self.size: return 0
+            return self.counts[-1] - (1 if self.pieces[-1][-1] >= self.size else 0)
+
+    def update(self, progress=None):
+        """Indexes new data; True when anything changed."""
+        with self.busy:
+            try: size = os.path.getsize(self.path)
+            except OSError: size = 0
+            with self.lock:
+                if size < self.size: self.reset()
+                if size == self.size: return False
+                with open(self.path, "rb") as f: mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+                old, self.mm, self.size = self.mm, mm, size
+                if old: old.close()
+            pos = self.done
+            while pos < size and not self.stop.is_set():
+                with self.lock:   # no numpy view of the mmap outlives the lock, so close() can unmap
+                    end = min(size, pos + self.CHUNK)
+                    if end < size:
+                        nl = mm.rfind(b"\n", pos, end)
+                        if nl >= 0: end = nl + 1
+                    buf = np.frombuffer(mm, dtype=np.uint8, count=end - pos, offset=pos)
+                    nls = np.flatnonzero(buf == 10).astype(np.int64) + pos; del buf
+                    hits = self._severity(mm, pos, end)
+                    base = self.counts[-1] - 1                        # line holding `pos`
+                    lines_of = lambda offs: (base + np.searchsorted(nls, np.array(offs, dtype=np.int64))).tolist()
+                    errs = sorted(set(lines_of([o for o, e in hits if e])))
+                    warns = sorted(set(lines_of([o for o, e in hits if not e])) - set(errs))
+                    self.errors += [l for l in errs if not self.errors or l > self.errors[-1]]          # a line continued across
+                    self.warnings += [l for l in warns if not self.warnings or l > self.warnings[-1]]  # updates is marked once
+                    if len(nls):
+                        self.pieces.append(nls + 1); self.firsts.append(int(nls[0]) + 1); self.counts.append(self.counts[-1] + len(nls))
+                    if len(self.pieces) > 256:
+                        self.pieces = [np.concatenate(self.pieces)]; self.counts = [len(self.pieces[0])]; self.firsts = [0]
+                    self.done = pos = end
+                if progress: progress(end / size)
+            return True
+
+    def _start(self, i):
+        k = bisect.bisect_right(self.counts, i)
+        return int(self.pieces[k][i - (self.counts[k - 1] if k else 0)])
+
+    def line(self, i):
+        with self.lock:
+            if not self.mm or i >= self.counts[-1]: return ""
+            a = self._start(i); b = self._start(i + 1) if i + 1 < self.counts[-1] else self.size
+            return self.mm[a:min(b, a + self.LINE_CAP)].decode(errors="replace").rstrip("\r\n").expandtabs(8)
+
+    def line_at(self, offset):
+        with self.lock:
+            k = bisect.bisect_right(self.firsts, offset) - 1
+            return (self.counts[k - 1] if k else 0) + int(np.searchsorted(self.pieces[k], offset, side="right")) - 1
+
+    def find(self, needle, line, backward=False):
+        """Line of the next (previous) occurrence of needle after (before) `line`, or None."""
+        with self.lock:
+            if not self.mm or not needle: return None
+            n = self.counts[-1]
+            if backward: pos = self.mm.rfind(needle, 0, self._start(max(0, min(line, n - 1))))
+            else: pos = self.mm.find(needle, self._start(line + 1)) if line + 1 < n else -1
+            return None if pos < 0 else self.line_at(pos)
+
+    def next_marked(self, kind, line, backward=False):
+        """Next (previous) ERROR or Warning line after (before) `line`, wrapping around."""
+        with self.lock:
+            marks = self.errors if kind == "error" else self.warnings
+            if not marks: return None
+            k = bisect.bisect_left(marks, line) - 1 if backward else bisect.bisect_right(marks, line)
+            return marks[k % len(marks)]
+
+    def close(self):
+        """Stops a running update() after its current chunk, then unmaps."""
+        self.stop.set()
+        with self.busy, self.lock: self.reset()
+        self.stop.clear()
+
+
+class LogView(QAbstractScrollArea):
+    """Draws only the visible lines of a LogIndex; ERROR / Warning lines in colour."""
+    ERR_RE = re.compile(r"\b(?:ERROR|Error|error|FATAL|Fatal)\b")
+    WARN_RE = re.compile(r"\b(?:WARNING|Warning|warning)\b")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = None; self.current = -1; self.text_w = 0
+        font = QFont(); font.setFamilies(["JetBrains Mono", "Consolas", "monospace"]); font.setStyleHint(QFont.StyleHint.Monospace); font.setPointSize(10)
+        self.setFont(font)
+        self.lh = QFontMetrics(self.font()).height()
+        self.verticalScrollBar().setSingleStep(1)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+
+    def page(self): return max(1, self.viewport().height() // self.lh)
+
+    def sync(self, follow=False):
+        """Scroll range from the index; follow keeps the bottom in view if it already was."""
+        sb = self.verticalScrollBar(); at_end = sb.value() >= sb.maximum()
+        n = self.index.lines if self.index else 0
+        sb.setRange(0, max(0, n - self.page())); sb.setPageStep(self.page())
+        if follow and at_end: sb.setValue(sb.maximum())
+        self.viewport().update()
+
+    def scroll_to(self, line):
+        self.current = line
+        sb = self.verticalScrollBar()
+        if not sb.value() <= line < sb.value() + self.page(): sb.setValue(max(0, line - self.page() // 3))
+        self.viewport().update()
+
+    def paintEvent(self, e):
+        p = QPainter(self.viewport()); p.setFont(self.font())
+        pal = self.palette(); fg = pal.color(QPalette.ColorRole.Text)
+        p.fillRect(self.viewport().rect(), pal.color(QPalette.ColorRole.Base))
+        if not self.index: return
+        first, n, fm = self.verticalScrollBar().value(), self.index.lines, QFontMetrics(self.font())
+        x = 6 - self.horizontalScrollBar().value()
+        for row in range(self.page() + 1):
+            i = first + row
+            if i >= n: break
+            text, y = self.index.line(i), row * self.lh
+            if i == self.current: p.fillRect(0, y, self.viewport().width(), self.lh, QColor(0, 188, 212, 40))
+            p.setPen(QColor("#f44336") if self.ERR_RE.search(text) else QColor("#d4b44a") if self.WARN_RE.search(text) else fg)
+            p.drawText(x, y + fm.ascent(), text)
+            self.text_w = max(self.text_w, fm.horizontalAdvance(text[:400]) + 12)
+        hb = self.horizontalScrollBar(); hb.setRange(0, max(0, self.text_w - self.viewport().width())); hb.setPageStep(self.viewport().width())
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e); self.sync()
+
+    def mousePressEvent(self, e):
+        self.current = self.verticalScrollBar().value() + int(e.position().y()) // self.lh; self.viewport().update()
+
+    def keyPressEvent(self, e):
+        if e.matches(QKeySequence.StandardKey.Copy) and self.index and self.current >= 0:
+            QApplication.clipboard().setText(self.index.line(self.current)); return
+        super().keyPressEvent(e)
+
+
+class LogViewer(QWidget):
+    """
+    Read-only log file viewer: opens instantly whatever the size (the line
+    index is built in the background), follows a growing file, finds text
+    and jumps between ERROR / Warning lines.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = None; self.worker = None; self.path = None; self.follow = False
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0); lay.setSpacing(0)
+        bar = QHBoxLayout(); bar.setContentsMargins(4, 2, 4, 2)
+        self.e_find = QLineEdit(); self.e_find.setPlaceholderText("find (Enter / Shift+Enter)"); self.e_find.setFixedWidth(220)
+        self.e_find.returnPressed.connect(lambda: self.find(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier))
+        self.btn_err = QPushButton("Errors ▶"); self.btn_warn = QPushButton("Warnings ▶")
+        self.btn_err.clicked.connect(lambda: self.jump("error")); self.btn_warn.clicked.connect(lambda: self.jump("warning"))
+        self.lbl = QLabel(""); self.lbl.setStyleSheet("color:#6a7090; font-size:10px;")
+        for w in (self.btn_err, self.btn_warn): w.setFlat(True); w.setStyleSheet("font-size:9px; padding:2px 8px;")
+        bar.addWidget(self.e_find); bar.addWidget(self.btn_err); bar.addWidget(self.btn_warn); bar.addStretch(); bar.addWidget(self.lbl)
+        lay.addLayout(bar)
+        self.view = LogView(); lay.addWidget(self.view)
+        self.timer = QTimer(self); self.timer.timeout.connect(self.poll)
+
+    def setStyleSheet(self, ss):
+        self.view.setStyleSheet(ss)
+
+    def open(self, path, follow=False):
+        """Shows `path`; with follow the view keeps to the bottom as refresh() picks up appended lines."""
+        if self.index and self.path == path: self.refresh(); return
+        self.clear(); self.path = path; self.follow = follow
+        self.index = self.view.index = LogIndex(path); self.view.current = -1; self.view.text_w = 0
+        self.refresh()
+
+    def clear(self):
+        if self.index: self.index.close()
+        self.index = self.view.index = None; self.path = None; self.view.sync(); self.lbl.setText("")
+
+    def refresh(self):
+        """Indexes newly appended data in the background and redraws."""
+        if not self.index or (self.worker and self.worker.is_alive()): return
+        self.worker = threading.Thread(target=self.index.update, daemon=True); self.worker.start()
+        self.timer.start(100)
+
+    def poll(self):
+        busy = self.worker and self.worker.is_alive()
+        if not busy:
+            self.timer.stop()
+            with suppress(OSError):   # lines appended while the last pass ran
+                if self.index and os.path.getsize(self.index.path) != self.index.size: self.refresh()
+        if not self.index: return
+        self.view.sync(follow=self.follow)
+        idx = self.index; done = f" · indexing {idx.done / idx.size:.0%}" if busy and idx.size else ""
+        self.lbl.setText(f"{idx.lines:,} lines · {len(idx.errors):,} errors · {len(idx.warnings):,} warnings{done}")
+
+    def find(self, backward=False):
+        if not self.index: return
+        line = self.index.find(self.e_find.text().encode(), max(self.view.current, self.view.verticalScrollBar().value() - 1), bool(backward))
+        if line is None: self.lbl.setText(f"'{self.e_find.text()}' not found"); return
+        self.view.scroll_to(line)
+
+    def jump(self, kind):
+        line = self.index.next_marked(kind, self.view.current) if self.index else None
+        if line is not None: self.view.scroll_to(line)
+
 
-    def load_cache(self):
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f: 
-                    self.configs = json.load(f)
-            except: 
-                self.configs = []
-
-    def save_cache(self):
-        with open(self.cache_file, 'w') as f: 
-            json.dump(self.configs, f, indent=2)
-    
-    def update_config(self, config_data):
-        # Remove existing if name matches (Edit Mode)
-        self.configs = [c for c in self.configs if c['name'] != config_data['name']]
-        # Insert new at top
-        self.configs.insert(0, config_data)
-        self.save_cache()
-    
-    def delete_config(self, name):
-        self.configs = [c for c in self.configs if c['name'] != name]
-        self.save_cache()
-    def add_manual_config(self, name, tlef, lef, lib, gds):
-        # Insert at top
-        entry = {
-            "name": name, 
-            "tlef": tlef, 
-            "lef": lef, 
-            "lib": lib, 
-            "gds": gds, # The missing link for GDS generation
-            "corner": "Manual"
-        }
-        # Remove duplicates based on name to avoid clutter
-        self.configs = [c for c in self.configs if c['name'] != name]
-        self.configs.insert(0, entry)
-        self.save_cache()
 
 class ManualPDKDialog(QDialog):
     def __init__(self, parent=None, config=None):
@@ -721,6 +1014,8 @@ class DEFParser:
 # ================= 2. SILICON PEEKER (Visualizer Full) =================
 
 class SiliconPeeker(QGraphicsView):
+    inst_picked = pyqtSignal(str)   # double-clicked component name
+
     def __init__(self, parent=None):
         super().__init__(parent)
         # [FIX] REMOVED OpenGL to stop MESA/libEGL errors and Black Screen
@@ -863,6 +1158,13 @@ class SiliconPeeker(QGraphicsView):
         super().resizeEvent(event)
         self.viewport().update()
 
+    def mouseDoubleClickEvent(self, event):
+        super().mouseDoubleClickEvent(event)
+        if not self.def_data: return
+        pt = self.mapToScene(event.position().toPoint())
+        hits = [(r.width() * r.height(), n) for n, r in self.def_data.comps_map.items() if r.contains(pt)]
+        if hits: self.inst_picked.emit(min(hits)[1])
+
     def fit_with_slack(self):
         rect = self.scene.itemsBoundingRect()
         if rect.isNull(): return
@@ -1685,6 +1987,7 @@ class VSCodeTerminalWidget(QWidget):
             "}"
         )
         self.term_log.setPlainText(HeaderFactory.get_raw_header())
+        self.term_log.document().setMaximumBlockCount(LOG_TAIL_LINES)
         lay.addWidget(self.term_log)
 
         # ── autocomplete popup list ──────────────────────────────────────────
@@ -1742,6 +2045,13 @@ class VSCodeTerminalWidget(QWidget):
         self.term_input.installEventFilter(self)
         inp_lay.addWidget(self.term_input)
 
+        btn_full = QPushButton("⤢")
+        btn_full.setToolTip("Open full log")
+        btn_full.setFixedWidth(28)
+        btn_full.setStyleSheet("QPushButton { background: transparent; color: #858585; border: none; font-size: 12px; } QPushButton:hover { color: #cccccc; }")
+        btn_full.clicked.connect(lambda: open_full_log(self.ide.bus.logs.full_log("terminal")))
+        inp_lay.addWidget(btn_full)
+
         lay.addWidget(inp_widget)
         self._update_prompt()
 
@@ -2842,7 +3152,11 @@ class CompileTab(QWidget):
         self.term_input = self.terminal.term_input  # kept for backward compat
         self.term_log   = self.terminal.term_log    # kept for backward compat
         self.mode_btn.clicked.connect(self.ide.toggle_term_mode)
-        self.right_split.addWidget(self.terminal)
+        self.sim_log = LogViewer()   # simulation output, follows the sim channel's full log
+        self.sim_log.setStyleSheet("background:#1e1e1e; color:#cccccc; border:none;")
+        self.bottom_tabs = QTabWidget(); self.bottom_tabs.setDocumentMode(True)
+        self.bottom_tabs.addTab(self.terminal, "Terminal"); self.bottom_tabs.addTab(self.sim_log, "Simulation")
+        self.right_split.addWidget(self.bottom_tabs)
         
         self.split.setStretchFactor(0, 1); self.split.setStretchFactor(1, 4)
         self.right_split.setStretchFactor(0, 3); self.right_split.setStretchFactor(1, 1)
@@ -2851,6 +3165,8 @@ class CompileTab(QWidget):
 # === TAB 2: WAVEFORM ENGINE (Refined) ===
 
 class SignalPeeker(QWidget):
+    HIT_LIST_CAP = 5000   # list widget rows; N / P navigation still covers every hit
+
     def __init__(self, ide):
         super().__init__()
         self.ide = ide; lay = QVBoxLayout(self)
@@ -2865,13 +3181,78 @@ class SignalPeeker(QWidget):
         self.btn_fit = QPushButton("↔ Fit (F)"); self.btn_fit.setStyleSheet(btn_style); self.btn_fit.clicked.connect(self.fit_view)
         self.lbl_info = QLabel("no waveform loaded"); self.lbl_info.setStyleSheet("color:#3a3e52; font-family:JetBrains Mono,Consolas,monospace; font-size:10px; margin-left:10px;")
         tb.addWidget(self.btn_load); tb.addWidget(self.btn_gtk); tb.addWidget(self.btn_fit); tb.addWidget(self.lbl_info); tb.addStretch()
+
+        # --- Condition search: "state == 3'h5 && valid" ---
+        self.e_query = QLineEdit(); self.e_query.setPlaceholderText("find: state == 3'h5 && valid")
+        self.e_query.setFixedWidth(320); self.e_query.returnPressed.connect(self.run_search)
+        self.btn_prev = QPushButton("◀"); self.btn_prev.setStyleSheet(btn_style); self.btn_prev.setToolTip("Previous hit (P)")
+        self.btn_prev.clicked.connect(lambda: self.step_hit(forward=False))
+        self.btn_next = QPushButton("▶"); self.btn_next.setStyleSheet(btn_style); self.btn_next.setToolTip("Next hit (N)")
+        self.btn_next.clicked.connect(lambda: self.step_hit(forward=True))
+        self.lbl_hits = QLabel(""); self.lbl_hits.setStyleSheet("color:#3a3e52; font-family:JetBrains Mono,Consolas,monospace; font-size:10px; margin-left:6px;")
+        tb.addWidget(self.e_query); tb.addWidget(self.btn_prev); tb.addWidget(self.btn_next); tb.addWidget(self.lbl_hits)
+        self.btn_derived = QPushButton("ƒ+ Derived"); self.btn_derived.setStyleSheet(btn_style)
+        self.btn_derived.setToolTip("Add a virtual signal: a & b, bus[7:4], {hi, lo}, count - prev(count)  (Del removes)")
+        self.btn_derived.clicked.connect(self.ask_derived)
+        self.btn_decode = QPushButton("⇄ Decode"); self.btn_decode.setStyleSheet(btn_style)
+        self.btn_decode.setToolTip("Decode UART / SPI / APB / AXI-Lite traffic into a transactions lane")
+        self.btn_decode.clicked.connect(self.ask_decode)
+        self.btn_compare = QPushButton("⇆ Compare"); self.btn_compare.setStyleSheet(btn_style)
+        self.btn_compare.setToolTip("Diff this dump against a golden VCD (signals matched by hierarchical name)")
+        self.btn_compare.clicked.connect(self.ask_compare)
+        self.btn_profile = QPushButton("⛶ Dump Profile"); self.btn_profile.setStyleSheet(btn_style)
+        self.btn_profile.setToolTip("Limit the next simulation's VCD to chosen scopes, signals and time windows")
+        self.btn_profile.clicked.connect(self.ask_dump_profile)
+        tb.addWidget(self.btn_derived); tb.addWidget(self.btn_decode); tb.addWidget(self.btn_compare); tb.addWidget(self.btn_profile)
         lay.addWidget(tb_widget)
         
         self.cvs = WaveformCanvas(self)
         self.scroll = QScrollArea(); self.scroll.setWidget(self.cvs); self.scroll.setWidgetResizable(True)
         self.scroll.setStyleSheet("QScrollArea { border: none; }"); self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        lay.addWidget(self.scroll)
+
+        self.hit_list = QListWidget()
+        self.hit_list.setStyleSheet("background:#0a0b0f; color:#c8cad8; font-family:JetBrains Mono,Consolas,monospace; font-size:10px; border:none;")
+        self.hit_list.currentRowChanged.connect(self.on_hit_selected)
+
+        # --- Decoded transactions: filter + table ---
+        self.tx_widget = QWidget(); tx_lay = QVBoxLayout(self.tx_widget); tx_lay.setContentsMargins(0,0,0,0); tx_lay.setSpacing(0)
+        self.e_tx_filter = QLineEdit(); self.e_tx_filter.setPlaceholderText("filter: W 1000 …")
+        self.e_tx_filter.textChanged.connect(self.fill_tx_table)
+        self.tx_table = QTableWidget(); self.tx_table.setColumnCount(6)
+        self.tx_table.setHorizontalHeaderLabels(["Start", "End", "Dir", "Addr", "Data", "Info"])
+        self.tx_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.tx_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tx_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tx_table.verticalHeader().setVisible(False)
+        self.tx_table.cellClicked.connect(lambda r, _c: self.on_tx_selected(r))
+        tx_lay.addWidget(self.e_tx_filter); tx_lay.addWidget(self.tx_table)
+        self.tx_rows = []
+
+        # --- Regression diff: golden vs this run ---
+        self.diff_widget = QWidget(); diff_lay = QVBoxLayout(self.diff_widget); diff_lay.setContentsMargins(0,0,0,0); diff_lay.setSpacing(0)
+        self.lbl_diff = QLabel(""); self.lbl_diff.setStyleSheet("color:#c8cad8; font-family:JetBrains Mono,Consolas,monospace; font-size:10px; padding:4px;")
+        self.lbl_diff.setWordWrap(True)
+        self.diff_table = QTableWidget(); self.diff_table.setColumnCount(4)
+        self.diff_table.setHorizontalHeaderLabels(["Signal", "First", "Intervals", "Mismatch"])
+        self.diff_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.diff_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.diff_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.diff_table.verticalHeader().setVisible(False)
+        self.diff_table.cellClicked.connect(lambda r, _c: self.on_diff_selected(r))
+        btn_off = QPushButton("✕ Stop comparing"); btn_off.setStyleSheet(btn_style); btn_off.clicked.connect(self.clear_compare)
+        diff_lay.addWidget(self.lbl_diff); diff_lay.addWidget(self.diff_table); diff_lay.addWidget(btn_off)
+        self.golden_path = None
+
+        self.side_tabs = QTabWidget(); self.side_tabs.setVisible(False)
+        self.side_tabs.addTab(self.hit_list, "Hits"); self.side_tabs.addTab(self.tx_widget, "Transactions")
+        self.side_tabs.addTab(self.diff_widget, "Diff")
+
+        self.split = QSplitter(Qt.Orientation.Horizontal)
+        self.split.addWidget(self.scroll); self.split.addWidget(self.side_tabs)
+        self.split.setStretchFactor(0, 5); self.split.setStretchFactor(1, 1)
+        lay.addWidget(self.split)
         self.current_vcd_path = None
+        self.derived_exprs = []   # re-applied whenever a dump is (re)loaded
 
     # --- NEW: PAINT EVENT OVERRIDE FOR FLOATING WATERMARK ---
     def paintEvent(self, event):
@@ -2899,6 +3280,10 @@ class SignalPeeker(QWidget):
         self.current_vcd_path = path; self.ide.log_system(f"Loading Waves: {os.path.basename(path)}")
         self.lbl_info.setText(f"Active: {os.path.basename(path)}")
         parser = VCDParser(path); self.cvs.set_data(parser); self.fit_view(); self.cvs.setFocus()
+        self.tx_rows = []; self.fill_tx_table()
+        for text in list(self.derived_exprs): self.add_derived(text, quiet=True)
+        if self.e_query.text().strip(): self.run_search()
+        if self.golden_path: self.start_compare(self.golden_path)   # re-diff every new run against the same golden
 
     def fit_view(self):
         if self.cvs.data and self.cvs.data.end_time > 0:
@@ -2910,6 +3295,205 @@ class SignalPeeker(QWidget):
         if self.current_vcd_path: subprocess.Popen(["gtkwave", self.current_vcd_path])
         else: QMessageBox.information(self, "Info", "Load a VCD file first.")
 
+    def ask_derived(self):
+        if not self.cvs.data: QMessageBox.information(self, "Info", "Load a VCD file first."); return
+        text, ok = QInputDialog.getText(self, "Derived Signal", "Expression (a & b, bus[7:4], {hi, lo}, count - prev(count)):")
+        if ok and text.strip(): self.add_derived(text)
+
+    def add_derived(self, text, quiet=False):
+        try:
+            sid = self.cvs.data.add_derived(text)
+        except (ValueError, KeyError) as e:
+            if not quiet: QMessageBox.warning(self, "Derived Signal", str(e.args[0] if e.args else e))
+            return
+        if text.strip() not in self.derived_exprs: self.derived_exprs.append(text.strip())
+        ids = [i for i in self.cvs.visible_ids if i != sid]
+        row = min(self.cvs.selected_row + 1, len(ids))
+        ids.insert(row, sid)
+        self.cvs.selected_row = row
+        self.cvs.set_rows(ids)
+
+    def remove_derived(self, sid):
+        data = self.cvs.data
+        if not data or not (sid in data.derived or sid in data.lanes or sid in data.refs): return
+        text = data.names[sid]
+        data.remove_derived(sid)
+        if text in self.derived_exprs: self.derived_exprs.remove(text)
+        self.cvs.set_rows([i for i in self.cvs.visible_ids if i != sid])
+
+    def ask_dump_profile(self):
+        data = self.cvs.data
+        if not data or not self.current_vcd_path: QMessageBox.information(self, "Info", "Load a VCD file first."); return
+        _, base = self.ide.get_context()
+        root = self.ide.get_proj_root(base) if base else os.path.dirname(os.path.abspath(self.current_vcd_path))
+        path_of = {sid: p for p, sid in reversed(list(data.paths.items()))}
+        visible = [path_of[sid] for sid in self.cvs.visible_ids if sid in path_of]
+        t0 = int(self.cvs.offset_x / self.cvs.zoom)
+        window = [t0, int((self.cvs.offset_x + self.cvs.width() - self.cvs.sidebar_width) / self.cvs.zoom)]
+        try:
+            with open(os.path.join(root, DUMP_PROFILE)) as f: current = json.load(f)
+        except (OSError, ValueError): current = None
+        dlg = DumpProfileDialog(data, current, visible, window, self)
+        if dlg.exec() != QDialog.DialogCode.Accepted: return
+        prof = dlg.get_data()
+        os.makedirs(root, exist_ok=True); save_dump_profile(root, prof)
+        state = "on" if prof["enabled"] else "off"
+        self.ide.log_system(f"Dump profile {state}: {len(prof['scopes'])} scopes, {len(prof['signals'])} signals, {len(prof['windows'])} windows -> {os.path.join(root, DUMP_PROFILE)}")
+
+    def ask_compare(self):
+        if not self.cvs.data or not self.current_vcd_path: QMessageBox.information(self, "Info", "Load a VCD file first."); return
+        t, _ = QFileDialog.getOpenFileName(self, "Golden VCD", os.path.dirname(self.current_vcd_path), "*.vcd")
+        if t: self.start_compare(t)
+
+    def start_compare(self, golden_path):
+        if not os.path.exists(golden_path):
+            self.ide.log_system(f"Golden dump missing: {golden_path}"); self.clear_compare(); return
+        self.golden_path = golden_path
+        self.btn_compare.setEnabled(False); self.btn_compare.setText("⇆ Comparing...")
+        self.differ = DiffWorker(golden_path, self.cvs.data)
+        self.differ.finished.connect(self.on_compared)
+        self.differ.failed.connect(self.on_compare_failed)
+        self.differ.start()
+
+    def on_compare_failed(self, msg):
+        self.btn_compare.setEnabled(True); self.btn_compare.setText("⇆ Compare")
+        QMessageBox.warning(self, "Compare", msg)
+
+    def on_compared(self, diff):
+        self.btn_compare.setEnabled(True); self.btn_compare.setText("⇆ Compare")
+        if diff.run is not self.cvs.data: return   # dump was reloaded meanwhile
+        self.cvs.diff = diff
+        rows = diff.summary()
+        first = diff.first_divergence
+        info = f"golden: {os.path.basename(self.golden_path)}\n{diff.compared} compared, {len(rows)} differ"
+        if first is not None: info += f", first @ {self.cvs.format_time(first)}"
+        if diff.only_golden: info += f"\nonly in golden: {len(diff.only_golden)}"
+        if diff.only_run: info += f"\nonly in run: {len(diff.only_run)}"
+        if diff.width_changed: info += f"\nwidth changed: {', '.join(diff.width_changed[:5])}"
+        self.lbl_diff.setText(info)
+        self.diff_table.setRowCount(min(len(rows), self.HIT_LIST_CAP))
+        for r, (path, f, n, m) in enumerate(rows[:self.HIT_LIST_CAP]):
+            for c, v in enumerate((path, self.cvs.format_time(f), n, m)):
+                self.diff_table.setItem(r, c, QTableWidgetItem(str(v)))
+        self.ide.log_system(f"Wave diff: {len(rows)} of {diff.compared} signals differ" + (f", first @ {self.cvs.format_time(first)}" if first is not None else ""))
+        self.side_tabs.setVisible(True); self.side_tabs.setCurrentWidget(self.diff_widget)
+        if first is not None: self.cvs.goto_time(first)
+        self.cvs.update()
+
+    def on_diff_selected(self, row):
+        """Shows the golden trace under the run's row and jumps to the first mismatch."""
+        diff = self.cvs.diff; item = self.diff_table.item(row, 0)
+        if diff is None or item is None: return
+        path = item.text(); data = self.cvs.data
+        sid = data.paths.get(path)
+        ref = data.add_reference(path, diff.golden)
+        ids = [i for i in self.cvs.visible_ids if i != ref]
+        pos = ids.index(sid) + 1 if sid in ids else 0
+        ids.insert(pos, ref)
+        self.cvs.selected_row = max(0, pos - 1)
+        self.cvs.set_rows(ids); self.cvs.ensure_row_visible()
+        self.cvs.goto_time(int(diff.mismatches[path][0][0]))
+        self.cvs.setFocus()
+
+    def clear_compare(self):
+        self.golden_path = None; self.cvs.diff = None
+        data = self.cvs.data
+        if data:
+            for sid in list(data.refs): data.remove_derived(sid)
+            self.cvs.set_rows([i for i in self.cvs.visible_ids if i in data.signals])
+        self.diff_table.setRowCount(0); self.lbl_diff.setText("")
+        self.cvs.update()
+
+    def ask_decode(self):
+        if not self.cvs.data or not self.current_vcd_path: QMessageBox.information(self, "Info", "Load a VCD file first."); return
+        dlg = DecoderDialog(self.cvs.data, self)
+        if dlg.exec() != QDialog.DialogCode.Accepted: return
+        proto, mapping, params = dlg.get_data()
+        self.btn_decode.setEnabled(False); self.btn_decode.setText("⇄ Decoding...")
+        self.decoder = DecoderWorker(self.cvs.data, self.current_vcd_path, proto, mapping, params)
+        self.decoder.finished.connect(self.on_decoded)
+        self.decoder.failed.connect(self.on_decode_failed)
+        self.decoder.start()
+
+    def on_decode_failed(self, msg):
+        self.btn_decode.setEnabled(True); self.btn_decode.setText("⇄ Decode")
+        QMessageBox.warning(self, "Decoder", msg)
+
+    def on_decoded(self, proto, rows):
+        self.btn_decode.setEnabled(True); self.btn_decode.setText("⇄ Decode")
+        if self.decoder.data is not self.cvs.data: return   # dump was reloaded meanwhile
+        self.ide.log_system(f"{proto}: {len(rows)} transactions decoded")
+        sid = self.cvs.data.add_lane(proto, rows)
+        ids = [i for i in self.cvs.visible_ids if i != sid]
+        ids.insert(0, sid); self.cvs.set_rows(ids)
+        self.tx_rows = rows
+        self.fill_tx_table()
+        self.side_tabs.setVisible(True); self.side_tabs.setCurrentWidget(self.tx_widget)
+
+    def fill_tx_table(self):
+        needle = self.e_tx_filter.text().strip().lower().split()
+        shown = []
+        for idx, r in enumerate(self.tx_rows):
+            if needle:
+                hay = " ".join(str(x) for x in r).lower()
+                if not all(n in hay for n in needle): continue
+            shown.append(idx)
+            if len(shown) >= self.HIT_LIST_CAP: break
+        self.tx_table.setRowCount(len(shown))
+        for row, idx in enumerate(shown):
+            r = self.tx_rows[idx]
+            for c, v in enumerate((self.cvs.format_time(r[0]), self.cvs.format_time(r[1])) + tuple(r[2:6])):
+                item = QTableWidgetItem(str(v))
+                if c == 0: item.setData(Qt.ItemDataRole.UserRole, idx)
+                self.tx_table.setItem(row, c, item)
+
+    def on_tx_selected(self, row):
+        item = self.tx_table.item(row, 0)
+        if item is None: return
+        self.cvs.goto_time(int(self.tx_rows[item.data(Qt.ItemDataRole.UserRole)][0]))
+        self.cvs.setFocus()
+
+    def run_search(self):
+        text = self.e_query.text().strip()
+        search = self.cvs.search
+        self.hit_list.blockSignals(True); self.hit_list.clear(); self.hit_list.blockSignals(False)
+        if not text or not self.cvs.data:
+            search.clear(); self.lbl_hits.setText(""); self.cvs.update(); return
+        try:
+            n = search.run(self.cvs.data, text)
+        except (ValueError, KeyError) as e:
+            search.clear(); self.lbl_hits.setText(f"⚠ {e.args[0] if e.args else e}"); self.cvs.update(); return
+        self.lbl_hits.setText(f"{n} hit{'s' if n != 1 else ''}")
+        self.hit_list.blockSignals(True)
+        for i in range(min(n, self.HIT_LIST_CAP)):
+            t0, t1 = int(search.starts[i]), int(search.ends[i])
+            self.hit_list.addItem(f"{i+1:>5}  {self.cvs.format_time(t0)} → {self.cvs.format_time(t1)}  ({t1 - t0})")
+        if n > self.HIT_LIST_CAP: self.hit_list.addItem(f"… {n - self.HIT_LIST_CAP} more (use N / P)")
+        self.hit_list.blockSignals(False)
+        if n: self.side_tabs.setVisible(True); self.side_tabs.setCurrentWidget(self.hit_list)
+        self.cvs.active_hit = -1
+        if n: self.step_hit(forward=True)
+        else: self.cvs.update()
+
+    def step_hit(self, forward=True):
+        search = self.cvs.search
+        if not len(search): return
+        if forward: i = search.next_hit(self.cvs.cursor_time)
+        else: i = search.prev_hit(self.cvs.cursor_time)
+        if i is None: i = 0 if forward else len(search) - 1   # wrap around
+        self.goto_hit(i)
+
+    def goto_hit(self, i):
+        self.cvs.active_hit = i
+        self.cvs.goto_time(int(self.cvs.search.starts[i]))
+        self.lbl_hits.setText(f"{i+1}/{len(self.cvs.search)} hits")
+        if i < self.hit_list.count():
+            self.hit_list.blockSignals(True); self.hit_list.setCurrentRow(i); self.hit_list.blockSignals(False)
+
+    def on_hit_selected(self, row):
+        if 0 <= row < min(len(self.cvs.search), self.HIT_LIST_CAP):
+            self.goto_hit(row); self.cvs.setFocus()
+
 
 
 # === TAB 2: WAVEFORM ENGINE (Refined) ===
@@ -2921,91 +3505,257 @@ class SignalPeeker(QWidget):
 
 # === TAB 2: WAVEFORM ENGINE (Crash-Proof & Fixed Nav) ===
 
-class VCDParser:
-    def __init__(self, path):
-        self.signals = {}     
-        self.names = {}       
-        self.widths = {}      
-        self.id_map = {}      
-        self.end_time = 0
-        self.timescale = "1ns"
-        if os.path.exists(path): self.parse(path)
-
-    def parse(self, path):
-        curr_t = 0
+# === WAVEFORM REGRESSION DIFF (the background worker) ===
+
+class DiffWorker(QThread):
+    """Parses the golden dump and diffs it against the loaded run off the GUI thread."""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, golden_path, run):
+        super().__init__()
+        self.golden_path = golden_path; self.run_data = run
+
+    def run(self):
         try:
-            with open(path, 'r') as f:
-                # 1. READ HEADER
-                for line in f:
-                    line = line.strip()
-                    if not line: continue
-                    
-                    if line.startswith("$var"):
-                        parts = line.split()
-                        # Strict check: Needs type, width, id, name (at least 5 parts)
-                        if len(parts) >= 5:
-                            width = int(parts[2])
-                            sid = parts[3]
-                            name = parts[4]
-                            
-                            self.names[sid] = name
-                            self.widths[sid] = width
-                            self.signals[sid] = []
-                            self.id_map[name] = sid
-                            
-                    elif line.startswith("$timescale"):
-                        if len(line.split()) > 1: self.timescale = line.split()[1]
-                    
-                    elif line.startswith("$enddefinitions"):
-                        break
+            self.finished.emit(WaveDiff(VCDParser(self.golden_path), self.run_data).compare())
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+# === PROTOCOL DECODERS (Clock-Sampled, Columnar) ===
+
+class ProtocolDecoder:
+    """
+    Base for bus decoders. Subclasses list their ROLES (signal slots, optional
+    ones prefixed with '?') and PARAMS, and turn the mapped signals into rows of
+    (start, end, dir, addr, data, info).
+    """
+    NAME = "base"
+    ROLES = []
+    PARAMS = {}
+
+    def __init__(self, data, mapping, params=None):
+        self.data = data
+        self.sids = {r.lstrip("?"): data.resolve(n) for r, n in mapping.items() if n}
+        self.params = dict(self.PARAMS); self.params.update(params or {})
+        missing = [r for r in self.ROLES if not r.startswith("?") and not self.sids.get(r)]
+        if missing: raise ValueError(f"{self.NAME}: map {', '.join(missing)}")
+
+    def has(self, role): return bool(self.sids.get(role))
+
+    def edges(self, role, rising=True):
+        """Times of clean 0->1 (or 1->0) transitions of a 1-bit signal."""
+        times, vals, known = self.data.column(self.sids[role])
+        if len(times) < 2: return np.zeros(0, dtype=np.int64)
+        want_now, want_before = (1, 0) if rising else (0, 1)
+        hit = (vals[1:] == want_now) & (vals[:-1] == want_before) & known[1:] & known[:-1]
+        return times[1:][hit]
+
+    def sample(self, role, at, default=0):
+        """Value of a signal just *before* each time in `at` (what a flop captures)."""
+        if not self.has(role): return np.full(len(at), default, dtype=np.int64), np.ones(len(at), dtype=bool)
+        times, vals, known = self.data.column(self.sids[role])
+        if not len(times): return np.zeros(len(at), dtype=np.int64), np.zeros(len(at), dtype=bool)
+        idx = np.searchsorted(times, at, side="left") - 1
+        ok = idx >= 0; idx = np.maximum(idx, 0)
+        return vals[idx], known[idx] & ok
+
+    def handshakes(self, clk, valid, ready):
+        """Clock edges where valid && ready were both high."""
+        edges = self.edges(clk)
+        v, vk = self.sample(valid, edges); r, rk = self.sample(ready, edges, default=1)
+        return edges[(v == 1) & (r == 1) & vk & rk]
+
+    @staticmethod
+    def hexs(v, k=True): return f"{int(v):X}" if k else "X"
+
+    def decode(self): raise NotImplementedError
+
+
+class APBDecoder(ProtocolDecoder):
+    NAME = "APB"
+    ROLES = ["pclk", "psel", "penable", "pwrite", "paddr", "?pwdata", "?prdata", "?pready", "?pslverr"]
+
+    def decode(self):
+        edges = self.edges("pclk")
+        sel, sk = self.sample("psel", edges); en, ek = self.sample("penable", edges)
+        rdy, rk = self.sample("pready", edges, default=1)
+        done = edges[(sel == 1) & (en == 1) & (rdy == 1) & sk & ek & rk]
+        setup = edges[(sel == 1) & (en == 0) & sk & ek]
+        si = np.searchsorted(setup, done, side="left") - 1
+        start = np.where(si >= 0, setup[np.maximum(si, 0)] if len(setup) else done, done)
+        wr, _ = self.sample("pwrite", done); addr, ak = self.sample("paddr", done)
+        wd, wk = self.sample("pwdata", done); rd, rdk = self.sample("prdata", done)
+        err, _ = self.sample("pslverr", done, default=0)
+        rows = []
+        for i in range(len(done)):
+            w = wr[i] == 1
+            rows.append((int(start[i]), int(done[i]), "W" if w else "R", self.hexs(addr[i], ak[i]),
+                         self.hexs(wd[i], wk[i]) if w else self.hexs(rd[i], rdk[i]), "SLVERR" if err[i] == 1 else ""))
+        return rows
+
+
+class AXILiteDecoder(ProtocolDecoder):
+    NAME = "AXI-Lite"
+    ROLES = ["aclk", "awvalid", "?awready", "awaddr", "wvalid", "?wready", "wdata", "?bvalid", "?bready", "?bresp",
+             "arvalid", "?arready", "araddr", "rvalid", "?rready", "rdata", "?rresp"]
+    RESP = {0: "OKAY", 1: "EXOKAY", 2: "SLVERR", 3: "DECERR"}
+
+    def decode(self):
+        rows = []
+        # writes: k-th AW pairs with k-th W and k-th B (AXI-Lite has no IDs / reordering)
+        aw = self.handshakes("aclk", "awvalid", "awready"); w = self.handshakes("aclk", "wvalid", "wready")
+        b = self.handshakes("aclk", "bvalid", "bready") if self.has("bvalid") else np.zeros(0, dtype=np.int64)
+        n = min(len(aw), len(w))
+        addr, ak = self.sample("awaddr", aw[:n]); wd, wk = self.sample("wdata", w[:n])
+        resp, rk = self.sample("bresp", b[:n]) if self.has("bresp") else (np.zeros(len(b[:n]), dtype=np.int64), np.ones(len(b[:n]), dtype=bool))
+        for i in range(n):
+            end = int(b[i]) if i < len(b) else int(max(aw[i], w[i]))
+            info = self.RESP.get(int(resp[i]), "") if i < len(b) and rk[i] else ""
+            rows.append((int(min(aw[i], w[i])), end, "W", self.hexs(addr[i], ak[i]), self.hexs(wd[i], wk[i]), info))
+        # reads: k-th AR pairs with k-th R
+        ar = self.handshakes("aclk", "arvalid", "arready"); r = self.handshakes("aclk", "rvalid", "rready")
+        n = min(len(ar), len(r))
+        addr, ak = self.sample("araddr", ar[:n]); rd, rdk = self.sample("rdata", r[:n])
+        resp, rk = self.sample("rresp", r[:n]) if self.has("rresp") else (np.zeros(n, dtype=np.int64), np.zeros(n, dtype=bool))
+        for i in range(n):
+            rows.append((int(ar[i]), int(r[i]), "R", self.hexs(addr[i], ak[i]), self.hexs(rd[i], rdk[i]), self.RESP.get(int(resp[i]), "") if rk[i] else ""))
+        rows.sort()
+        return rows
+
+
+class SPIDecoder(ProtocolDecoder):
+    NAME = "SPI"
+    ROLES = ["sclk", "cs_n", "mosi", "?miso"]
+    PARAMS = {"mode": 0}
+
+    def decode(self):
+        mode = int(self.params["mode"])
+        edges = self.edges("sclk", rising=mode in (0, 3))
+        cs, ck = self.sample("cs_n", edges)
+        edges = edges[(cs == 0) & ck]
+        if not len(edges): return []
+        # frame id = number of cs_n falling edges seen so far
+        frame = np.searchsorted(self.edges("cs_n", rising=False), edges, side="right")
+        new_frame = np.ones(len(edges), dtype=bool); new_frame[1:] = frame[1:] != frame[:-1]
+        frame_start = np.maximum.accumulate(np.where(new_frame, np.arange(len(edges)), 0))
+        pos = np.arange(len(edges)) - frame_start
+        # only whole bytes: group every 8 bits inside a frame
+        grp = frame_start + (pos // 8) * 8
+        starts = np.flatnonzero(np.r_[True, grp[1:] != grp[:-1]])
+        sizes = np.diff(np.r_[starts, len(edges)])
+        full = starts[sizes == 8]
+        weights = np.left_shift(1, 7 - (pos % 8))
+        rows = []
+        for role in ("mosi", "miso"):
+            if not self.has(role): continue
+            bits, bk = self.sample(role, edges)
+            byte = np.add.reduceat(np.where(bk, bits, 0) * weights, starts)[sizes == 8]
+            ok = np.logical_and.reduceat(bk, starts)[sizes == 8]
+            rows.append([self.hexs(v, k) for v, k in zip(byte, ok)])
+        mosi = rows[0]; miso = rows[1] if len(rows) > 1 else [""] * len(full)
+        return [(int(edges[s]), int(edges[s + 7]), "—", "", mosi[i], f"miso {miso[i]}" if miso[i] else "")
+                for i, s in enumerate(full)]
+
+
+class UARTDecoder(ProtocolDecoder):
+    NAME = "UART"
+    ROLES = ["rx"]
+    PARAMS = {"bit_period": 8680, "data_bits": 8}   # 115200 baud in a 1ns timescale
+
+    def decode(self):
+        period = float(self.params["bit_period"]); nbits = int(self.params["data_bits"])
+        falls = self.edges("rx", rising=False)
+        rows = []; busy_until = -1
+        i = 0
+        while i < len(falls):
+            t0 = int(falls[i])
+            if t0 < busy_until:
+                i = int(np.searchsorted(falls, busy_until, side="left")); continue
+            # mid-bit sample points: start, data bits (LSB first), stop
+            at = (t0 + period * (np.arange(nbits + 2) + 0.5)).astype(np.int64) + 1
+            bits, bk = self.sample("rx", at)
+            frame_end = int(t0 + period * (nbits + 2))
+            if bits[0] == 0 and bk.all():
+                val = int(np.sum(bits[1:nbits + 1] << np.arange(nbits)))
+                info = "" if bits[-1] == 1 else "framing error"
+                ch = chr(val) if 32 <= val < 127 else ""
+                rows.append((t0, frame_end, "RX", "", self.hexs(val), f"'{ch}' {info}".strip() if ch else info))
+            busy_until = frame_end - int(period / 2)
+            i += 1
+        return rows
+
+
+PROTOCOL_DECODERS = {d.NAME: d for d in (APBDecoder, AXILiteDecoder, SPIDecoder, UARTDecoder)}
+
+
+class DecoderWorker(QThread):
+    """Runs one decoder off the GUI thread, with results cached per VCD on disk."""
+    finished = pyqtSignal(str, object)   # lane name, rows
+    failed = pyqtSignal(str)
+
+    def __init__(self, data, vcd_path, proto, mapping, params):
+        super().__init__()
+        self.data = data; self.vcd_path = vcd_path
+        self.proto = proto; self.mapping = mapping; self.params = params
+
+    def run(self):
+        try:
+            key = cache_key("decode", file_fingerprint(self.vcd_path), self.proto, self.mapping, self.params)
+            cache_file = os.path.join(silis_cache_dir(os.path.dirname(os.path.abspath(self.vcd_path)), "decode"), f"{key}.json")
+            if os.path.exists(cache_file):
+                with open(cache_file) as f: rows = [tuple(r) for r in json.load(f)]
+            else:
+                rows = PROTOCOL_DECODERS[self.proto](self.data, self.mapping, self.params).decode()
+                with open(cache_file, "w") as f: json.dump(rows, f)
+            self.finished.emit(self.proto, rows)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class DecoderDialog(QDialog):
+    """Pick a protocol, map its roles onto dump signals and set its parameters."""
+    def __init__(self, data, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Protocol Decoder"); self.resize(460, 560)
+        self.data = data
+        self.names = sorted(n for sid, n in data.names.items() if sid not in data.derived and sid not in data.lanes)
+        self.layout = QFormLayout(self)
+        self.cb_proto = QComboBox(); self.cb_proto.addItems(list(PROTOCOL_DECODERS))
+        self.cb_proto.currentTextChanged.connect(self.rebuild)
+        self.layout.addRow("<b>Protocol:</b>", self.cb_proto)
+        self.fields = QWidget(); self.f_lay = QFormLayout(self.fields); self.f_lay.setContentsMargins(0, 0, 0, 0)
+        self.layout.addRow(self.fields)
+        btn = QPushButton("Decode"); btn.clicked.connect(self.accept)
+        self.layout.addRow(btn)
+        self.role_boxes = {}; self.param_edits = {}
+        self.rebuild(self.cb_proto.currentText())
+
+    def rebuild(self, proto):
+        while self.f_lay.rowCount(): self.f_lay.removeRow(0)
+        self.role_boxes = {}; self.param_edits = {}
+        dec = PROTOCOL_DECODERS[proto]
+        for role in dec.ROLES:
+            key = role.lstrip("?")
+            cb = QComboBox(); cb.addItem("")
+            cb.addItems(self.names)
+            guess = next((n for n in self.names if n.lower() == key), None) or next((n for n in self.names if n.lower().endswith(key)), None)
+            if guess: cb.setCurrentText(guess)
+            self.role_boxes[role] = cb
+            self.f_lay.addRow(f"{key}{' (opt)' if role.startswith('?') else ''}:", cb)
+        for name, val in dec.PARAMS.items():
+            e = QLineEdit(str(val)); self.param_edits[name] = e
+            self.f_lay.addRow(f"{name}:", e)
+
+    def get_data(self):
+        mapping = {r: cb.currentText() for r, cb in self.role_boxes.items()}
+        params = {}
+        for name, e in self.param_edits.items():
+            try: params[name] = float(e.text()) if "." in e.text() else int(e.text(), 0)
+            except ValueError: params[name] = PROTOCOL_DECODERS[self.cb_proto.currentText()].PARAMS[name]
+        return self.cb_proto.currentText(), mapping, params
 
-                # 2. READ DATA
-                for line in f:
-                    line = line.strip()
-                    if not line: continue
-                    
-                    if line.startswith("#"):
-                        try: 
-                            curr_t = int(line[1:])
-                            self.end_time = max(self.end_time, curr_t)
-                        except: pass
-                    
-                    elif line.startswith("$dumpvars") or line.startswith("$end"):
-                        continue
-                        
-                    else:
-                        if line.startswith('b'):
-                            # Vector: b1010 ID
-                            parts = line.split()
-                            if len(parts) < 2: continue # Skip malformed lines
-                            
-                            val_bin = parts[0][1:] 
-                            sid = parts[1]
-                            
-                            if sid in self.signals:
-                                try: 
-                                    val_hex = hex(int(val_bin, 2))[2:].upper()
-                                    if len(val_hex) > 1 and len(val_hex) % 2 != 0: val_hex = "0" + val_hex
-                                except: 
-                                    val_hex = "X" if 'x' in val_bin else "Z"
-                                
-                                sig = self.signals[sid]
-                                if not sig or sig[-1][1] != val_hex:
-                                    sig.append((curr_t, val_hex))
-                        else:
-                            # Scalar: 1# or 1 #
-                            # Sometimes no space: '1!', '0!'
-                            if len(line) < 2: continue
-                            
-                            val = line[0]
-                            sid = line[1:].strip()
-                            
-                            if sid in self.signals:
-                                sig = self.signals[sid]
-                                if not sig or sig[-1][1] != val:
-                                    sig.append((curr_t, val))
-                                    
-        except Exception as e: print(f"VCD Parse Error (Non-Fatal): {e}")
 
 class WaveformCanvas(QWidget):
     def __init__(self, controller):
@@ -3019,17 +3769,25 @@ class WaveformCanvas(QWidget):
         
         self.selected_row = 0
         self.visible_ids = []
+        self.search = WaveSearch()
+        self.active_hit = -1
+        self.diff = None   # WaveDiff against a golden run, when compare mode is on
         
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
     def set_data(self, parser): 
         self.data = parser
-        if self.data:
-            self.visible_ids = list(self.data.signals.keys())
-            total_h = (len(self.visible_ids) * 40) + 60
-            self.setMinimumHeight(total_h)
-            self.resize(self.width(), total_h)
+        self.search.clear(); self.active_hit = -1; self.diff = None
+        if self.data: self.set_rows(list(self.data.signals.keys()))
+        self.update()
+
+    def set_rows(self, ids):
+        self.visible_ids = ids
+        self.selected_row = min(self.selected_row, max(0, len(ids) - 1))
+        total_h = (len(self.visible_ids) * 40) + 60
+        self.setMinimumHeight(total_h)
+        self.resize(self.width(), total_h)
         self.update()
 
     def format_time(self, t):
@@ -3059,28 +3817,58 @@ class WaveformCanvas(QWidget):
         for x in range(self.sidebar_width, self.width(), 100):
             painter.drawLine(x, 0, x, self.height())
 
+        # 3b. Search hit bands (only the ones on screen)
+        if len(self.search):
+            lo, hi = self.search.visible(self.offset_x / self.zoom, (self.offset_x + self.width() - self.sidebar_width) / self.zoom)
+            for i in range(lo, min(hi, lo + 2000)):
+                x0 = max(self.sidebar_width, self.sidebar_width + self.search.starts[i] * self.zoom - self.offset_x)
+                x1 = self.sidebar_width + self.search.ends[i] * self.zoom - self.offset_x
+                c = QColor(255, 215, 0, 60) if i == self.active_hit else QColor(255, 215, 0, 22)
+                painter.fillRect(QRectF(x0, 0, max(2.0, x1 - x0), self.height()), c)
+
         # 4. Draw Signals
         y = 40
         font_main = QFont("Consolas", 10); painter.setFont(font_main)
+        view_t0 = self.offset_x / self.zoom
+        view_t1 = (self.offset_x + self.width() - self.sidebar_width) / self.zoom
         
         for i, sid in enumerate(self.visible_ids):
             name = self.data.names[sid]
             width = self.data.widths[sid]
-            trans = self.data.signals[sid]
+            trans = self.data.visible_transitions(sid, view_t0, view_t1)
+            is_derived = sid in self.data.derived
+            is_lane = sid in self.data.lanes
+            is_ref = sid in self.data.refs
+            bands = self.diff.bands(sid) if self.diff else None
             
             # Sidebar Text
             if i == self.selected_row: painter.setPen(QColor("#00bcd4"))
+            elif bands is not None and not is_ref: painter.setPen(QColor("#f44747"))
+            elif is_derived: painter.setPen(QColor("#c586c0"))
+            elif is_lane: painter.setPen(QColor("#d7ba7d"))
+            elif is_ref: painter.setPen(QColor("#ce9178"))
             else: painter.setPen(QColor("#aaaaaa"))
             
             label = f"{name} [{width}]" if width > 1 else name
+            if is_derived: label = f"ƒ {label}"
+            elif is_ref: label = f"≡ {label}"
             elided = self.fontMetrics().elidedText(label, Qt.TextElideMode.ElideMiddle, self.sidebar_width - 10)
             painter.drawText(10, y + 5, elided)
+
+            # Mismatch bands against the golden run (this row only)
+            if bands is not None:
+                starts, ends = bands
+                lo = int(np.searchsorted(ends, view_t0, side="left")); hi = int(np.searchsorted(starts, view_t1, side="right"))
+                for k in range(lo, min(hi, lo + 2000)):
+                    x0 = max(self.sidebar_width, self.sidebar_width + starts[k] * self.zoom - self.offset_x)
+                    x1 = self.sidebar_width + ends[k] * self.zoom - self.offset_x
+                    painter.fillRect(QRectF(x0, y - 16, max(2.0, x1 - x0), 32), QColor(244, 71, 71, 70))
             
             # --- WAVEFORM RENDER ---
-            prev_x = self.sidebar_width - self.offset_x
-            prev_val = 'x'
+            prev_x = self.sidebar_width
+            prev_val = '' if is_lane else 'x'
             if trans and trans[0][0] == 0: prev_val = trans[0][1]
-            elif trans: prev_val = 'x'
+            elif trans and not is_lane: prev_val = 'x'
 
             draw_trans = trans + [(self.data.end_time, prev_val)]
             
@@ -3091,8 +3879,20 @@ class WaveformCanvas(QWidget):
                     prev_x = max(self.sidebar_width, x); prev_val = val; continue
                 if prev_x > self.width(): break
                 
+                # C. TRANSACTIONS LANE (decoded bus traffic; '' = idle)
+                if is_lane:
+                    if prev_val:
+                        c_tx = QColor("#d7ba7d")
+                        painter.setPen(QPen(c_tx, 1)); painter.setBrush(QColor(c_tx.red(), c_tx.green(), c_tx.blue(), 45))
+                        painter.drawRoundedRect(QRectF(prev_x, y - 9, max(2.0, x - prev_x), 18), 3, 3)
+                        if (x - prev_x) > 30:
+                            painter.setPen(QColor("#fff")); painter.setFont(QFont("Arial", 8))
+                            painter.drawText(QRectF(prev_x + 3, y - 9, x - prev_x - 6, 18), Qt.AlignmentFlag.AlignCenter, painter.fontMetrics().elidedText(prev_val, Qt.TextElideMode.ElideRight, int(x - prev_x - 6)))
+                            painter.setFont(font_main)
+                        painter.setBrush(Qt.BrushStyle.NoBrush)
+
                 # A. SINGLE BIT
-                if width == 1:
+                elif width == 1:
                     if prev_val == '1': c = QColor("#4EC9B0"); h_curr = y - 10
                     elif prev_val == '0': c = QColor("#2c5d52"); h_curr = y + 10
                     elif prev_val in ['z', 'Z']: c = QColor("#dcdcaa"); h_curr = y
@@ -3168,6 +3968,9 @@ class WaveformCanvas(QWidget):
             self.ensure_row_visible()
         elif key in [Qt.Key.Key_D, Qt.Key.Key_Right]: self.jump_edge(forward=True)
         elif key in [Qt.Key.Key_A, Qt.Key.Key_Left]: self.jump_edge(forward=False)
+        elif key == Qt.Key.Key_N: self.controller.step_hit(forward=True)
+        elif key == Qt.Key.Key_P: self.controller.step_hit(forward=False)
+        elif key == Qt.Key.Key_Delete and self.visible_ids: self.controller.remove_derived(self.visible_ids[self.selected_row])
         elif key == Qt.Key.Key_F: self.controller.fit_view()
         self.update()
 
@@ -3178,17 +3981,18 @@ class WaveformCanvas(QWidget):
     def jump_edge(self, forward=True):
         if not self.data or not self.visible_ids: return
         sid = self.visible_ids[self.selected_row]
-        trans = self.data.signals[sid]
-        target = self.cursor_time; found = False
+        times = self.data.column(sid)[0]
         if forward:
-            for t, v in trans:
-                if t > self.cursor_time: target = t; found = True; break
-            if not found: target = self.data.end_time 
+            i = np.searchsorted(times, self.cursor_time, side="right")
+            target = int(times[i]) if i < len(times) else self.data.end_time
         else:
-            for t, v in reversed(trans):
-                if t < self.cursor_time: target = t; found = True; break
-            if not found: target = 0 
-        self.cursor_time = target
+            i = np.searchsorted(times, self.cursor_time, side="left") - 1
+            target = int(times[i]) if i >= 0 else 0
+        self.goto_time(target)
+
+    def goto_time(self, t):
+        """Moves the cursor to t and scrolls so it stays on screen."""
+        self.cursor_time = t
         screen_x = self.sidebar_width + (self.cursor_time * self.zoom) - self.offset_x
         if screen_x > self.width(): self.offset_x += (screen_x - self.width()) + 100
         if screen_x < self.sidebar_width: self.offset_x = max(0, (self.cursor_time * self.zoom) - 100)
@@ -3207,6 +4011,53 @@ class SchematicTab(QWidget):
         tb.addWidget(self.btn_gen); tb.addWidget(btn_fit); tb.addStretch()
         self.view = SilisSchematic(); lay.addLayout(tb); lay.addWidget(self.view)
 
+# === DUMP PROFILES (the settings dialog) ===
+
+class DumpProfileDialog(QDialog):
+    """Choose what the next simulation dumps: whole scopes, single signals and time windows."""
+    def __init__(self, data, profile, visible_paths, window, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Dump Profile"); self.resize(520, 620)
+        self.data = data
+        profile = profile or {}
+        lay = QVBoxLayout(self)
+        self.chk_enabled = QCheckBox("Use this profile for the next simulation runs")
+        self.chk_enabled.setChecked(profile.get("enabled", True)); lay.addWidget(self.chk_enabled)
+        scopes = sorted({".".join(p.split(".")[:k]) for p in data.paths for k in range(1, p.count(".") + 1)})
+        lay.addWidget(QLabel("<b>Scopes</b> (everything below):"))
+        self.lst_scopes = self._checklist(scopes, set(profile.get("scopes", [])))
+        lay.addWidget(self.lst_scopes)
+        lay.addWidget(QLabel("<b>Signals</b> (pre-selected: rows on screen):"))
+        self.lst_signals = self._checklist(sorted(data.paths), set(profile.get("signals", visible_paths)))
+        lay.addWidget(self.lst_signals)
+        form = QFormLayout()
+        wins = profile.get("windows") or [window]
+        self.e_windows = QLineEdit(", ".join(f"{a}-{b}" for a, b in wins))
+        self.e_windows.setPlaceholderText(f"start-end, ... in {data.timescale} (empty = whole run)")
+        form.addRow(f"Windows ({data.timescale}):", self.e_windows)
+        lay.addLayout(form)
+        btn = QPushButton("Save Profile"); btn.clicked.connect(self.accept); lay.addWidget(btn)
+
+    @staticmethod
+    def _checklist(items, checked):
+        lst = QListWidget()
+        for name in items:
+            it = QListWidgetItem(name); it.setFlags(it.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            it.setCheckState(Qt.CheckState.Checked if name in checked else Qt.CheckState.Unchecked)
+            lst.addItem(it)
+        return lst
+
+    def get_data(self):
+        pick = lambda lst: [lst.item(i).text() for i in range(lst.count()) if lst.item(i).checkState() == Qt.CheckState.Checked]
+        windows = []
+        for part in self.e_windows.text().split(","):
+            m = re.match(r"\s*(\d+)\s*-\s*(\d+)\s*$", part)
+            if m and int(m.group(2)) > int(m.group(1)): windows.append([int(m.group(1)), int(m.group(2))])
+        return {"enabled": self.chk_enabled.isChecked(), "scopes": pick(self.lst_scopes), "signals": pick(self.lst_signals),
+                "windows": windows, "timescale": self.data.timescale}
+
+
+
 # === TAB 4: SYNTHESIS ===
 # === TAB 4: SYNTHESIS MISSION CONTROL ===
 
@@ -3217,7 +4068,6 @@ class SchematicTab(QWidget):
 # =============================================================================
 
 import re
-import datetime
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFrame, 
                              QLabel, QPushButton, QTabWidget, QTextEdit, 
                              QListWidget, QGridLayout, QFileDialog)
@@ -3231,218 +4081,385 @@ from PyQt6.QtCore import Qt
 #  TAB 4: SYNTHESIS & REPORTING ENGINE (Power & Timing Enhanced)
 # =============================================================================
 
-class ReportEngine:
-    """Parses generated report files for robust metric extraction."""
-    
-    FOOTER_ART = HeaderFactory.ASCII_ART
+
+# === TIMING PATH DATABASE ===
+
+class TimingPathDB:
+    """
+    Every path of an OpenSTA report_checks dump in SQLite (reports/timing_paths.db):
+    one row per path (ends, group, slack, arrival/required, byte span in the
+    report) and one per pin stage (cell, edge, fanout, cap, slew, delay, time,
+    net). Built in one streaming pass; rebuilt only when the report changes.
+    """
+    BATCH = 2000
+    ORDERS = ("slack", "status", "grp", "startpoint", "endpoint", "stages", "arrival", "required", "id")
+    NUM_RE = re.compile(r"^-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?$")
+    PIN_RE = re.compile(r"^(\S+) \(([^)]+)\)$")
+    SLACK_RE = re.compile(r"(-?[\d.]+|INF)\s+slack\s+\((\w+)\)")
+
+    def __init__(self, report):
+        self.report = report
+        self.path = os.path.join(os.path.dirname(report), "timing_paths.db")
+        self.con = None
+
+    def up_to_date(self):
+        try:
+            with sqlite3.connect(self.path) as con: return con.execute("SELECT value FROM meta WHERE key='report'").fetchone()[0] == file_fingerprint(self.report)
+        except (sqlite3.Error, TypeError): return False
+
+    def open(self):
+        if self.con: self.con.close()
+        self.con = sqlite3.connect(self.path, check_same_thread=False)
+        return self
+
+    def build(self, progress=None):
+        """Parses the report into a fresh database file; returns the number of paths."""
+        tmp = self.path + ".tmp"
+        with suppress(OSError): os.remove(tmp)
+        con = sqlite3.connect(tmp)
+        con.executescript("""
+            PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE paths (id INTEGER PRIMARY KEY, grp TEXT, type TEXT, startpoint TEXT, endpoint TEXT, slack REAL, status TEXT,
+                                arrival REAL, required REAL, stages INTEGER, off_start INTEGER, off_end INTEGER);
+            CREATE TABLE stages (path_id INTEGER, idx INTEGER, pin TEXT, cell TEXT, edge TEXT, fanout INTEGER, cap REAL, slew REAL,
+                                 delay REAL, time REAL, net TEXT);""")
+        paths, stages, n = [], [], 0
+        size = max(os.path.getsize(self.report), 1)
+        colat, desc_at, cur, pos = [], 0, None, 0
+        fnum = lambda v: float(v) if v is not None else None
+        tok_re, num_re, pin_re = re.compile(r"\S+"), self.NUM_RE, self.PIN_RE
+
+        def flush():
+            con.executemany("INSERT INTO paths VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", paths)
+            con.executemany("INSERT INTO stages VALUES (?,?,?,?,?,?,?,?,?,?,?)", stages)
+            paths.clear(); stages.clear()
+            if progress: progress(pos / size)
+
+        with open(self.report, "rb") as f:
+            for raw in f:
+                start, pos = pos, pos + len(raw)
+                line = raw.decode(errors="replace").rstrip("\r\n")
+                s = line.strip()
+                if s.startswith("Startpoint:"):
+                    cur = {"grp": None, "type": None, "start": s.split()[1], "end": None, "arrival": None, "required": None,
+                           "off": start, "stages": [], "arriving": True}
+                    continue
+                if cur is None: continue
+                if colat and cur["arriving"] and line[:1] == " " and s.endswith(")") and "slack (" not in s:   # pin / net row
+                    head, tail = line[:desc_at - 2], line[desc_at - 2:].strip()
+                    vals = {colat[min(m.end(), len(colat) - 1)]: m.group(0) for m in tok_re.finditer(head) if num_re.match(m.group(0))}
+                    edge = None
+                    if tail[:2] in ("^ ", "v "): edge, tail = ("rise" if tail[0] == "^" else "fall"), tail[2:]
+                    pm = pin_re.match(tail)
+                    if not pm: continue
+                    fo = int(float(vals["fanout"])) if "fanout" in vals else None
+                    if pm.group(2) == "net":   # fanout/cap are reported on the net the previous pin drives
+                        if cur["stages"]:
+                            pin, cell, e, fo0, cap, slew, delay, t, _ = cur["stages"][-1]
+                            cur["stages"][-1] = (pin, cell, e, fo if fo is not None else fo0, fnum(vals.get("cap", cap)), slew, delay, t, pm.group(1))
+                        continue
+                    cur["stages"].append((pm.group(1), pm.group(2), edge, fo, fnum(vals.get("cap")), fnum(vals.get("slew")),
+                                          fnum(vals.get("delay")), fnum(vals.get("time")), None))
+                elif s.startswith("Endpoint:"): cur["end"] = s.split()[1]
+                elif s.startswith("Path Group:"): cur["grp"] = s.split(":", 1)[1].strip()
+                elif s.startswith("Path Type:"): cur["type"] = s.split(":", 1)[1].strip()
+                elif "Description" in s and "Time" in s:   # column layout: each position maps to the nearest column end
+                    desc_at = line.index("Description")
+                    ends = [(m.group(0).lower(), m.end()) for m in tok_re.finditer(line[:desc_at])]
+                    colat = [min(ends, key=lambda c: abs(c[1] - x))[0] for x in range(desc_at + 1)] if ends else []
+                elif s.endswith("data arrival time"):
+                    if cur["arriving"]: cur["arrival"] = fnum(s.split()[0]); cur["arriving"] = False
+                elif s.endswith("data required time"):
+                    if cur["required"] is None: cur["required"] = fnum(s.split()[0])
+                elif "slack (" in s:
+                    m = self.SLACK_RE.search(s)
+                    if not m: continue
+                    n += 1
+                    slack = None if m.group(1) == "INF" else float(m.group(1))
+                    paths.append((n, cur["grp"], cur["type"], cur["start"], cur["end"], slack, m.group(2), cur["arrival"], cur["required"],
+                                  len(cur["stages"]), cur["off"], pos))
+                    stages.extend((n, i) + st for i, st in enumerate(cur["stages"]))
+                    cur = None
+                    if len(paths) >= self.BATCH: flush()
+        flush()
+        con.executescript("""
+            CREATE INDEX paths_slack ON paths(slack); CREATE INDEX paths_end ON paths(endpoint); CREATE INDEX paths_start ON paths(startpoint);
+            CREATE INDEX stages_path ON stages(path_id); CREATE INDEX stages_pin ON stages(pin); CREATE INDEX stages_cell ON stages(cell);""")
+        con.execute("INSERT INTO meta VALUES ('report', ?)", (file_fingerprint(self.report),))
+        con.commit(); con.close()
+        if self.con: self.con.close(); self.con = None
+        os.replace(tmp, self.path)
+        return n
 
     @staticmethod
-    def parse_files(report_dir):
-        metrics = {
-            "area": "Unknown", "cells": "0", "wires": "Unknown", "bits": "Unknown",
-            "wns": "0.00", "status": "UNKNOWN", 
-            "critical_path_trace": "No path data found in timing.rpt",
-            "pwr_seq": ["0", "0", "0", "0", "0%"],
-            "pwr_comb": ["0", "0", "0", "0", "0%"],
-            "pwr_clk": ["0", "0", "0", "0", "0%"],
-            "pwr_mac": ["0", "0", "0", "0", "0%"],
-            "pwr_pad": ["0", "0", "0", "0", "0%"],
-            "pwr_tot": ["0", "0", "0", "0", "100%"],
-            "pwr_pct": ["0%", "0%", "0%"],
-            "errors": [], "timing_groups": [], "cell_list": []
-        }
+    def where(text="", violating=False, group=None):
+        """SQL filter: words match start/endpoint (globs allowed), through:<pin glob>, cell:<cell glob>."""
+        clauses, args = [], []
+        for tok in text.split():
+            key, _, pat = tok.partition(":") if tok.startswith(("through:", "cell:")) else ("", "", tok)
+            if not any(ch in pat for ch in "*?["): pat = f"*{pat}*"
+            if key == "through": clauses.append("id IN (SELECT path_id FROM stages WHERE pin GLOB ?)"); args.append(pat)
+            elif key == "cell": clauses.append("id IN (SELECT path_id FROM stages WHERE cell GLOB ?)"); args.append(pat)
+            else: clauses.append("(startpoint GLOB ? OR endpoint GLOB ?)"); args += [pat, pat]
+        if violating: clauses.append("slack < 0")
+        if group: clauses.append("grp = ?"); args.append(group)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def count(self, where="", args=()):
+        return self.con.execute(f"SELECT COUNT(*) FROM paths {where}", args).fetchone()[0]
+
+    def rows(self, where="", args=(), order="slack", desc=False, limit=256, offset=0):
+        order = order if order in self.ORDERS else "slack"
+        return self.con.execute(f"SELECT id, slack, status, grp, startpoint, endpoint, stages, arrival, required FROM paths {where} "
+                                f"ORDER BY {order} {'DESC' if desc else 'ASC'}, id LIMIT ? OFFSET ?", (*args, limit, offset)).fetchall()
+
+    def groups(self):
+        return [g for (g,) in self.con.execute("SELECT DISTINCT grp FROM paths WHERE grp IS NOT NULL ORDER BY grp")]
+
+    def stages(self, pid):
+        return self.con.execute("SELECT pin, cell, edge, fanout, cap, slew, delay, time, net FROM stages WHERE path_id=? ORDER BY idx", (pid,)).fetchall()
+
+    def path_text(self, pid):
+        a, b = self.con.execute("SELECT off_start, off_end FROM paths WHERE id=?", (pid,)).fetchone()
+        with open(self.report, "rb") as f: f.seek(a); return f.read(b - a).decode(errors="replace")
+
+
+class PathTableModel(QAbstractTableModel):
+    """Paths from a TimingPathDB, fetched a page at a time so huge reports stay responsive."""
+    COLS = [("Slack", "slack"), ("Status", "status"), ("Group", "grp"), ("Startpoint", "startpoint"), ("Endpoint", "endpoint"),
+            ("Stages", "stages"), ("Arrival", "arrival"), ("Required", "required")]
+    PAGE, MAX_PAGES = 256, 64
 
-        # 1. PARSE YOSYS LOG (For Cell List & Warnings)
-        yosys_log = os.path.join(report_dir, "synthesis.log")
-        if os.path.exists(yosys_log):
-            with open(yosys_log, 'r') as f:
-                log_content = f.read()
-                raw_cells = re.findall(r"(sky130_fd_sc_hd__\w+)\s+cells:\s+(\d+)", log_content)
-                if raw_cells:
-                    metrics["cell_list"] = sorted([(k, int(v)) for k, v in raw_cells], key=lambda x: x[1], reverse=True)
-                
-                for line in log_content.split('\n'):
-                    if "ERROR" in line or "Warning:" in line:
-                        if len(metrics["errors"]) < 10: metrics["errors"].append(line.strip())
-
-        # 2. PARSE AREA REPORT (Yosys JSON Format)
-        area_rpt = os.path.join(report_dir, "area.rpt")
-        if os.path.exists(area_rpt):
-            with open(area_rpt, 'r') as f:
-                content = f.read()
-                
-                # Parse JSON keys specifically
-                m_area = re.search(r'"area":\s+([\d\.]+)', content)
-                if m_area: metrics["area"] = m_area.group(1)
-                
-                m_cells = re.search(r'"num_cells":\s+(\d+)', content)
-                if m_cells: metrics["cells"] = m_cells.group(1)
-                
-                m_wires = re.search(r'"num_wires":\s+(\d+)', content)
-                if m_wires: metrics["wires"] = m_wires.group(1)
-                
-                m_bits = re.search(r'"num_pub_wire_bits":\s+(\d+)', content)
-                if m_bits: metrics["bits"] = m_bits.group(1)
-
-        # 3. PARSE TIMING REPORT (OpenSTA)
-        timing_rpt = os.path.join(report_dir, "timing.rpt")
-        if os.path.exists(timing_rpt):
-            with open(timing_rpt, 'r') as f:
-                content = f.read()
-                
-                trace_match = re.search(r"(Startpoint:.*?slack \([A-Z]+\))", content, re.DOTALL)
-                if trace_match:
-                    metrics["critical_path_trace"] = trace_match.group(1)
-
-                slacks = re.findall(r"([-+]?\d+\.\d+)\s+slack\s+\((VIOLATED|MET)\)", content)
-                if slacks:
-                    worst_slack = min(slacks, key=lambda x: float(x[0]))
-                    metrics["wns"] = worst_slack[0]
-                    metrics["status"] = worst_slack[1]
-                else:
-                    metrics["status"] = "MET" 
-
-                chunks = content.split("Path Group: ")
-                seen_groups = set()
-                for chunk in chunks[1:]: 
-                    lines = chunk.strip().split('\n')
-                    g_name = lines[0].strip()
-                    if g_name in seen_groups: continue
-                    seen_groups.add(g_name)
-                    
-                    m_slack = re.search(r"([-+]?\d+\.\d+)\s+slack\s+\((VIOLATED|MET)\)", chunk)
-                    m_end = re.search(r"Endpoint:\s+(\S+)", chunk)
-                    
-                    if m_slack:
-                        s_val = m_slack.group(1)
-                        s_stat = m_slack.group(2)
-                        end_p = m_end.group(1) if m_end else "Unknown"
-                        metrics["timing_groups"].append((g_name, s_val, s_stat, end_p))
-
-        # 4. PARSE POWER REPORT (OpenSTA)
-        power_rpt = os.path.join(report_dir, "power.rpt")
-        if os.path.exists(power_rpt):
-            with open(power_rpt, 'r') as f:
-                for line in f:
-                    parts = line.split()
-                    if not parts: continue
-                    if parts[0] == "Sequential" and len(parts)>=6: metrics["pwr_seq"] = parts[1:6]
-                    elif parts[0] == "Combinational" and len(parts)>=6: metrics["pwr_comb"] = parts[1:6]
-                    elif parts[0] == "Clock" and len(parts)>=6: metrics["pwr_clk"] = parts[1:6]
-                    elif parts[0] == "Macro" and len(parts)>=6: metrics["pwr_mac"] = parts[1:6]
-                    elif parts[0] == "Pad" and len(parts)>=6: metrics["pwr_pad"] = parts[1:6]
-                    elif parts[0] == "Total" and len(parts)>=6: metrics["pwr_tot"] = parts[1:6]
-                    elif "%" in parts[0] and len(parts)>=3 and "Total" not in line: metrics["pwr_pct"] = parts[0:3]
+    def __init__(self):
+        super().__init__()
+        self.db = None; self.where = ""; self.args = []; self.order = "slack"; self.desc = False; self.n = 0; self.pages = {}
+
+    def set_query(self, db, where="", args=()):
+        self.beginResetModel()
+        self.db, self.where, self.args = db, where, list(args)
+        self.n = db.count(where, self.args) if db else 0; self.pages = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else self.n
+    def columnCount(self, parent=QModelIndex()): return len(self.COLS)
+
+    def row(self, r):
+        p = r // self.PAGE
+        if p not in self.pages:
+            if len(self.pages) >= self.MAX_PAGES: self.pages.pop(next(iter(self.pages)))
+            self.pages[p] = self.db.rows(self.where, self.args, self.order, self.desc, self.PAGE, p * self.PAGE)
+        page = self.pages[p]
+        return page[r % self.PAGE] if r % self.PAGE < len(page) else None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        r = self.row(index.row()) if index.isValid() else None
+        if r is None: return None
+        v = r[index.column() + 1]
+        if role == Qt.ItemDataRole.DisplayRole: return "" if v is None else (f"{v:.4f}" if isinstance(v, float) else str(v))
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() in (0, 1) and r[1] is not None:
+            return QColor("#f44336" if r[1] < 0 else "#4caf50")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal: return self.COLS[section][0]
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.beginResetModel()
+        self.order, self.desc = self.COLS[column][1], order == Qt.SortOrder.DescendingOrder; self.pages = {}
+        self.endResetModel()
+
+
+class PathDBWorker(QThread):
+    progress = pyqtSignal(float)
+    finished_db = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db):
+        super().__init__(); self.db = db
 
-        return metrics
+    def run(self):
+        try: self.finished_db.emit(self.db.build(self.progress.emit))
+        except Exception as e: self.failed.emit(str(e))
+
+
+class PathBrowser(QWidget):
+    """Sortable, filterable view over every path in timing.rpt."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.db = None; self.worker = None
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0)
+        row = QHBoxLayout()
+        self.e_filter = QLineEdit(); self.e_filter.setPlaceholderText("start/end point (globs ok)   through:<pin>   cell:<cell>")
+        self.chk_viol = QCheckBox("Violating only")
+        self.cb_group = QComboBox(); self.cb_group.addItem("All groups")
+        self.lbl = QLabel("No timing report loaded."); self.lbl.setStyleSheet("color:#6a7090; font-size:10px;")
+        for w in (self.e_filter, self.chk_viol, self.cb_group, self.lbl): row.addWidget(w)
+        lay.addLayout(row)
+        self.model = PathTableModel()
+        self.view = QTableView(); self.view.setModel(self.model); self.view.setSortingEnabled(True)
+        self.view.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.verticalHeader().setVisible(False); self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.selectionModel().currentRowChanged.connect(lambda cur, _: self.show_path(cur.row()))
+        self.detail = QPlainTextEdit(); self.detail.setReadOnly(True); self.detail.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.detail.setStyleSheet("background:#0a0b0f; color:#c8cad8; font-family:JetBrains Mono,Consolas,monospace; font-size:11px; border:none;")
+        split = QSplitter(Qt.Orientation.Vertical); split.addWidget(self.view); split.addWidget(self.detail)
+        split.setStretchFactor(0, 3); split.setStretchFactor(1, 2)
+        lay.addWidget(split)
+        self.e_filter.returnPressed.connect(self.apply_filter); self.chk_viol.toggled.connect(self.apply_filter)
+        self.cb_group.currentIndexChanged.connect(self.apply_filter)
+
+    def load(self, report):
+        if not os.path.exists(report) or (self.worker and self.worker.isRunning()): return
+        db = TimingPathDB(report)
+        if db.up_to_date(): self.on_built(None, db); return
+        self.lbl.setText("Indexing timing paths...")
+        self.worker = PathDBWorker(db)
+        self.worker.progress.connect(lambda f: self.lbl.setText(f"Indexing timing paths... {f:.0%}"))
+        self.worker.finished_db.connect(lambda n: self.on_built(n, db))
+        self.worker.failed.connect(lambda e: self.lbl.setText(f"Path index failed: {e}"))
+        self.worker.start()
+
+    def on_built(self, n, db):
+        self.db = db.open()
+        self.cb_group.blockSignals(True); self.cb_group.clear(); self.cb_group.addItems(["All groups"] + db.groups()); self.cb_group.blockSignals(False)
+        self.apply_filter()
+
+    def apply_filter(self):
+        if not self.db: return
+        group = self.cb_group.currentText() if self.cb_group.currentIndex() > 0 else None
+        where, args = TimingPathDB.where(self.e_filter.text(), self.chk_viol.isChecked(), group)
+        try: self.model.set_query(self.db, where, args)
+        except sqlite3.Error as e: self.lbl.setText(f"Filter error: {e}"); return
+        self.lbl.setText(f"{self.model.n} of {self.db.count()} paths"); self.detail.clear()
+
+    def show_path(self, row):
+        r = self.model.row(row) if self.db and row >= 0 else None
+        if r: self.detail.setPlainText(self.db.path_text(r[0]))
+
+
+class TelemetryPanel(QWidget):
+    """Flow runs from reports/telemetry.jsonl and, for the selected run, where the time went per tool step."""
+    RUN_COLS = ["Started", "Flow", "Span s", "Tool s", "CPU s", "Peak RSS", "Steps", "Fails", "Δ span"]
+    STEP_COLS = ["Tool", "Step", "Wall s", "Share", "CPU s", "Peak RSS", "Exit", "Outputs", "Δ wall"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.runs = []
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0)
+        self.lbl = QLabel("No telemetry recorded yet."); self.lbl.setStyleSheet("color:#6a7090; font-size:10px;")
+        lay.addWidget(self.lbl)
+        self.t_runs, self.t_steps = QTableWidget(0, len(self.RUN_COLS)), QTableWidget(0, len(self.STEP_COLS))
+        for t, cols in ((self.t_runs, self.RUN_COLS), (self.t_steps, self.STEP_COLS)):
+            t.setHorizontalHeaderLabels(cols); t.verticalHeader().setVisible(False)
+            t.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            t.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+            t.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        split = QSplitter(Qt.Orientation.Vertical); split.addWidget(self.t_runs); split.addWidget(self.t_steps)
+        lay.addWidget(split)
+        self.t_runs.currentCellChanged.connect(lambda row, *_: self.show_run(row))
 
     @staticmethod
-    def _bar(pct_str):
-        try:
-            val = float(pct_str.strip('%'))
-            blocks = int(val / 10)
-            return f"|{'█'*blocks}{'-'*(10-blocks)}| {pct_str}"
-        except: return "|----------| 0.0%"
+    def fmt_bytes(n): return "-" if not n else f"{n / (1 << 30):.2f} GB" if n >= 1 << 30 else f"{n / (1 << 20):.0f} MB"
 
     @staticmethod
-    def generate_report(metrics, design_name="riscv_core"):
-        now = datetime.datetime.now().strftime("%Y-%m-%d")
-        def pr(name, d):
-            split_vis = ReportEngine._bar(d[4])
-            return f"| {name:<14} | {d[0]:<10} | {d[1]:<10} | {d[2]:<10} | {d[3]:<10} | {d[4]:<6} | {split_vis:<16} |"
-
-        t_table = ""
-        for g, s, st, end in metrics["timing_groups"]:
-            t_table += f"| {g:<13} | {s:<11} | {st:<10} | {end:<25} |\n"
-
-        c_table = ""
-        total_c = int(metrics["cells"]) if int(metrics["cells"]) > 0 else 1
-        for name, count in metrics["cell_list"][:15]: 
-            pct = (count / total_c) * 100
-            c_table += f"| {name:<30} | {str(count):<6} | {pct:<4.1f}% |\n"
-
-        rpt = f"""################################################################################
-#                                            POST SYNTHESIS REPORT
-# Design:       {design_name}
-# Date:         {now}
-# PDK:          Sky130 (High Density)
-# Generated by Silis — Silicon Scaffold
-# © 2026 The Silis Foundation
-################################################################################
-
-================================================================================
-  SECTION 1: DESIGN STATISTICS
-================================================================================
-+---------------------------+-------------------+
-| Metric                    | Value             |
-+---------------------------+-------------------+
-| Total Cells               | {metrics['cells']:<17} |
-| Total Area                | {metrics['area'] + ' um^2':<17} |
-| Total Wires               | {metrics['wires']:<17} |
-| Public Wire Bits          | {metrics['bits']:<17} |
-+---------------------------+-------------------+
-
-================================================================================
-  SECTION 2: TIMING SUMMARY
-================================================================================
-+---------------+-------------+------------+---------------------------+
-| Path Group    | Slack       | Status     | Critical Endpoint         |
-+---------------+-------------+------------+---------------------------+
-{t_table}+---------------+-------------+------------+---------------------------+
-
-[ DETAILED TIMING REPORT ]
-  Worst Negative Slack (WNS): {metrics['wns']} ns ({metrics['status']})
-  
-  CRITICAL PATH TRACE:
-  {metrics['critical_path_trace'].replace(chr(10), chr(10)+'  ')}
-
-================================================================================
-  SECTION 3: POWER ANALYSIS
-================================================================================
-+----------------+------------+------------+------------+------------+--------+------------------+
-| Group          | Internal   | Switching  | Leakage    | Total      | %      | Split            |
-|                | Power (W)  | Power (W)  | Power (W)  | Power (W)  |        |                  |
-+----------------+------------+------------+------------+------------+--------+------------------+
-{pr("Sequential", metrics['pwr_seq'])}
-{pr("Combinational", metrics['pwr_comb'])}
-{pr("Clock", metrics['pwr_clk'])}
-{pr("Macro", metrics['pwr_mac'])}
-{pr("Pad", metrics['pwr_pad'])}
-+----------------+------------+------------+------------+------------+--------+------------------+
-| TOTAL          | {metrics['pwr_tot'][0]:<10} | {metrics['pwr_tot'][1]:<10} | {metrics['pwr_tot'][2]:<10} | {metrics['pwr_tot'][3]:<10} | 100%   | |██████████| 100% |
-|                | {metrics['pwr_pct'][0]:<10} | {metrics['pwr_pct'][1]:<10} | {metrics['pwr_pct'][2]:<10} |            |        |                  |
-+----------------+------------+------------+------------+------------+--------+------------------+
-
-  Split: {metrics['pwr_pct'][0]} Internal / {metrics['pwr_pct'][1]} Switching
-
-[ WARNINGS ]
-{chr(10).join(['  ! '+e for e in metrics['errors']]) if metrics['errors'] else "  (None)"}
-
-================================================================================
-  SECTION 4: CELL UTILIZATION (Top 15)
-================================================================================
-+--------------------------------+--------+-------+
-| Cell Name                      | Count  | %     |
-+--------------------------------+--------+-------+
-{c_table}+--------------------------------+--------+-------+
-
-{ReportEngine.FOOTER_ART}
-https://github.com/The-Silis-Foundation/silis
-________________________________________________________________________________
-Generated by Silis — Silicon Scaffold
-© 2026 The Silis Foundation
-Licensed under AGPL-3.0
-________________________________________________________________________________
-=== BACKEND ENGINE CREDITS ===
-+-----------------------+----------------------------------------------+
-| Component             | Version / Source                             |
-+-----------------------+----------------------------------------------+
-| Synthesis             | Yosys 0.33+ (git sha1 2584903)               |
-| Timing Analysis       | OpenSTA 2.4.0                                |
-| PDK Manager           | Silis SSA Forge (PDK Mapping & Alias)        |
-+-----------------------+----------------------------------------------+
-"""
-        return rpt
+    def fmt_s(v): return "-" if v is None else f"{v:.2f}"
+
+    def previous(self, i):
+        return next((r for r in self.runs[i + 1:] if r["flow"] == self.runs[i]["flow"]), None)
+
+    def load(self, root):
+        self.runs = telemetry_runs(load_telemetry(root))[:200]
+        self.t_runs.setRowCount(len(self.runs))
+        for i, r in enumerate(self.runs):
+            prev = self.previous(i)
+            vals = [time.strftime("%m-%d %H:%M:%S", time.localtime(r["t0"])), r["flow"], self.fmt_s(r["span"]), self.fmt_s(r["wall"]),
+                    self.fmt_s(r["cpu"]), self.fmt_bytes(r["rss"]), str(len(r["entries"])), str(r["fails"]),
+                    f"{r['span'] - prev['span']:+.2f}" if prev else ""]
+            for c, v in enumerate(vals): self.t_runs.setItem(i, c, QTableWidgetItem(v))
+            if r["fails"]: self.t_runs.item(i, 7).setForeground(QColor("#f44336"))
+        self.lbl.setText(f"{len(self.runs)} runs in {TELEMETRY_LOG}" if self.runs else "No telemetry recorded yet.")
+        if self.runs: self.t_runs.setCurrentCell(0, 0); self.show_run(0)
+        else: self.t_steps.setRowCount(0)
+
+    def show_run(self, i):
+        if not 0 <= i < len(self.runs): return
+        run, prev = self.runs[i], self.previous(i)
+        before = {}
+        for e in prev["entries"] if prev else []: before[(e["tool"], e["step"])] = before.get((e["tool"], e["step"]), 0) + e["wall"]
+        steps = sorted(run["entries"], key=lambda e: e["wall"], reverse=True)
+        total = sum(e["wall"] for e in steps) or 1
+        self.t_steps.setRowCount(len(steps))
+        for row, e in enumerate(steps):
+            share = e["wall"] / total
+            old = before.get((e["tool"], e["step"]))
+            vals = [e["tool"], e["step"], self.fmt_s(e["wall"]), f"{'█' * round(share * 20):<20} {share:.0%}", self.fmt_s(e.get("cpu")),
+                    self.fmt_bytes(e.get("rss")), "-" if e.get("rc") is None else str(e["rc"]), self.fmt_bytes(sum(e.get("outputs", {}).values())),
+                    f"{e['wall'] - old:+.2f}" if old is not None else ""]
+            for c, v in enumerate(vals):
+                it = QTableWidgetItem(v); it.setToolTip(e.get("cmd", "")); self.t_steps.setItem(row, c, it)
+            if e.get("rc") not in (0, None): self.t_steps.item(row, 6).setForeground(QColor("#f44336"))
+
+
+class JobsDialog(QDialog):
+    """Scheduler jobs, active first: state, queue wait, run time, CPU and peak RSS of their tools; cancel or open a job's log."""
+    COLS = ["#", "Job", "Group", "Prio", "State", "Waited s", "Ran s", "CPU s", "Peak RSS", "Tools", "Note"]
+    STATE_COLORS = {"running": "#00bcd4", "queued": "#d4b44a", "done": "#4caf50", "failed": "#f44336", "cancelled": "#9098b0"}
+
+    def __init__(self, scheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler; self.jobs = []
+        self.setWindowTitle("Jobs"); self.resize(860, 380)
+        lay = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.COLS)); self.table.setHorizontalHeaderLabels(self.COLS)
+        self.table.verticalHeader().setVisible(False); self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        lay.addWidget(self.table)
+        row = QHBoxLayout()
+        self.lbl = QLabel(); self.lbl.setStyleSheet("color:#6a7090; font-size:10px;")
+        btn_cancel = QPushButton("■ Cancel"); btn_cancel.clicked.connect(self.cancel)
+        btn_group = QPushButton("■ Cancel group"); btn_group.clicked.connect(lambda: self.cancel(group=True))
+        btn_log = QPushButton("Open log"); btn_log.clicked.connect(self.open_log)
+        row.addWidget(self.lbl, 1); row.addWidget(btn_cancel); row.addWidget(btn_group); row.addWidget(btn_log)
+        lay.addLayout(row)
+        self.timer = QTimer(self); self.timer.timeout.connect(self.refresh)   # ticks the run times only while shown
+
+    def showEvent(self, e):
+        self.refresh(); self.timer.start(1000); super().showEvent(e)
+
+    def hideEvent(self, e):
+        self.timer.stop(); super().hideEvent(e)
+
+    def selected(self):
+        r = self.table.currentRow()
+        return self.jobs[r] if 0 <= r < len(self.jobs) else None
+
+    def refresh(self):
+        if not self.isVisible(): return
+        sel = self.selected(); self.jobs = self.scheduler.jobs()
+        self.table.setRowCount(len(self.jobs))
+        for i, j in enumerate(self.jobs):
+            m = j.summary()
+            vals = [str(m["id"]), m["name"], m["group"], str(m["priority"]), m["state"], f"{m['waited']:.1f}", f"{m['ran']:.1f}",
+                    f"{m['cpu']:.1f}", TelemetryPanel.fmt_bytes(m["rss"]), str(m["tools"]), m["error"] or ""]
+            for c, v in enumerate(vals):
+                it = QTableWidgetItem(v); it.setToolTip(m["log"] or ""); self.table.setItem(i, c, it)
+            self.table.item(i, 4).setForeground(QColor(self.STATE_COLORS.get(m["state"], "#c8cad8")))
+            if j is sel: self.table.selectRow(i)
+        n = sum(1 for j in self.jobs if j.state in JOB_ACTIVE)
+        self.lbl.setText(f"{n} active  ·  {self.scheduler.cpus} cores")
+
+    def cancel(self, group=False):
+        j = self.selected()
+        if j: self.scheduler.cancel(j.group if group else j); self.refresh()
+
+    def open_log(self):
+        j = self.selected()
+        if j: open_full_log(j.log_path)
 
 
 class SynthesisTab(QWidget):
@@ -3468,13 +4485,21 @@ class SynthesisTab(QWidget):
         self.btn_run = QPushButton("Run Flow"); self.btn_run.setStyleSheet(run_style)
         self.btn_run.clicked.connect(self.ide.run_synthesis_flow)
         
-        cl.addWidget(self.lbl_pdk); cl.addStretch(); cl.addWidget(btn_sel); cl.addWidget(self.btn_run)
+        btn_sweep = QPushButton("⚗ Sweep"); btn_sweep.setStyleSheet(btn_style)
+        btn_sweep.clicked.connect(self.open_sweep)
+        
+        self.chk_inc = QCheckBox("Incremental"); self.chk_inc.setToolTip("Synthesise modules separately and reuse unchanged ones")
+        self.chk_inc.toggled.connect(self.set_incremental)
+        btn_fmax = QPushButton("⏱ Fmax"); btn_fmax.setStyleSheet(btn_style)
+        btn_fmax.clicked.connect(self.ide.run_fmax_search)
+        
+        cl.addWidget(self.lbl_pdk); cl.addStretch(); cl.addWidget(self.chk_inc); cl.addWidget(btn_sel); cl.addWidget(btn_sweep); cl.addWidget(btn_fmax); cl.addWidget(self.btn_run)
         l_lay.addWidget(ctrl)
         
         self.log_tabs = QTabWidget()
         self.log_tabs.setStyleSheet("QTabWidget::pane { border:none; } QTabBar::tab { background:transparent; padding:7px 16px; border:none; border-bottom:2px solid transparent; font-size:9px; font-weight:700; letter-spacing:0.8px; } QTabBar::tab:selected { color:#00bcd4; border-bottom-color:#00bcd4; } QTabBar::tab:hover:!selected { }")
         
-        self.log_main = QTextEdit(); self.log_main.setReadOnly(True)
+        self.log_main = LogViewer()   # follows the synth channel's full log (.silis_cache/logs/synth.log)
         self.log_main.setStyleSheet("background:#0a0b0f; color:#88cc88; font-family:JetBrains Mono,Consolas,monospace; font-size:11px; border:none; padding:6px 10px;")
         self.log_tabs.addTab(self.log_main, "Build Output")
         
@@ -3483,6 +4508,22 @@ class SynthesisTab(QWidget):
         self.list_err.setStyleSheet("background:#0a0b0f; color:#f44336; font-family:JetBrains Mono,Consolas,monospace; font-size:11px; border:none; padding:4px;")
         self.log_tabs.addTab(self.list_err, "Issues / Errors")
         
+        # --- STA CONSOLE: interactive queries on the resident OpenSTA session ---
+        sta_w = QWidget(); sta_l = QVBoxLayout(sta_w); sta_l.setContentsMargins(0,0,0,0)
+        self.sta_out = QPlainTextEdit(); self.sta_out.setReadOnly(True); self.sta_out.setMaximumBlockCount(LOG_TAIL_LINES)
+        self.sta_out.setStyleSheet("background:#0a0b0f; color:#c8cad8; font-family:JetBrains Mono,Consolas,monospace; font-size:11px; border:none; padding:6px 10px;")
+        self.sta_cmd = QLineEdit(); self.sta_cmd.setPlaceholderText("report_checks -to q_reg[3]/D    ·    report_power    ·    report_net clk")
+        self.sta_cmd.returnPressed.connect(self.run_sta_query)
+        sta_l.addWidget(self.sta_out); sta_l.addWidget(self.sta_cmd)
+        self.log_tabs.addTab(sta_w, "STA Console")
+        
+        self.paths = PathBrowser()
+        self.log_tabs.addTab(self.paths, "Timing Paths")
+
+        self.telemetry = TelemetryPanel()
+        self.log_tabs.addTab(self.telemetry, "Flow Profile")
+        self.log_tabs.currentChanged.connect(lambda i: self.log_tabs.widget(i) is self.telemetry and self.refresh_telemetry())
+        
         l_lay.addWidget(self.log_tabs)
         lay.addWidget(left_col, stretch=2) 
 
@@ -3518,14 +4559,27 @@ class SynthesisTab(QWidget):
         
         lay.addWidget(right_col, stretch=1)
 
-    def update_dashboard(self):
-        # NEW: Parse from FILES in the report directory
+    def show_live(self, m):
+        """Cards while the flow runs: values appear as Yosys/STA print them."""
+        if m["wns"] != "0.00" or m["status"] != "UNKNOWN": self.val_wns.setText(f"{m['wns']} ns")
+        if m["area"] != "Unknown": self.val_area.setText(f"{m['area']} um^2")
+        if m["cells"] != "0": self.val_gates.setText(m['cells'])
+
+    def refresh_telemetry(self):
+        _, base = self.ide.get_context()
+        if base: self.telemetry.load(self.ide.get_proj_root(base))
+
+    def update_dashboard(self, m=None):
+        # Metrics streamed by the flow, or parsed from FILES in the report directory
         _, base = self.ide.get_context()
         if not base: return
         root = self.ide.get_proj_root(base)
         report_dir = os.path.join(root, "reports")
+        self.chk_inc.blockSignals(True); self.chk_inc.setChecked(load_project_settings(root)["synth_incremental"]); self.chk_inc.blockSignals(False)
         
-        m = ReportEngine.parse_files(report_dir)
+        if m is None: m = ReportEngine.parse_files(report_dir)
+        self.paths.load(os.path.join(report_dir, "timing.rpt"))
+        self.telemetry.load(root)
         
         if m["status"] == "MET":
             self.card_status.setText("● TIMING MET")
@@ -3550,6 +4604,20 @@ class SynthesisTab(QWidget):
         print(rpt) 
         self.ide.log_system("Report generated in background.", "RPT")
 
+    def set_incremental(self, on):
+        _, base = self.ide.get_context()
+        if base: save_project_settings(self.ide.get_proj_root(base), synth_incremental=on)
+
+    def run_sta_query(self):
+        cmd = self.sta_cmd.text().strip()
+        if cmd: self.sta_cmd.clear(); self.ide.sta_query(cmd)
+
+    def open_sweep(self):
+        if not self.ide.active_pdk: QMessageBox.warning(self, "Err", "Select PDK!"); return
+        _, base = self.ide.get_context()
+        if not base: return
+        SweepDialog(self.ide, self.ide.prep_workspace(base), base, self.ide.active_pdk['lib']).exec()
+
     def save_report(self):
         if not hasattr(self, 'last_report'): return
         _, base = self.ide.get_context()
@@ -3559,6 +4627,472 @@ class SynthesisTab(QWidget):
             with open(path, 'w') as f: f.write(self.last_report)
             self.ide.log_system(f"Report saved: {os.path.basename(path)}")
 
+# === SYNTHESIS SWEEP (Recipe Exploration) ===
+
+def sweep_matrix(abcs, flatten=(False,), abc9=(False,), periods=(None,)):
+    """One recipe per abc script x flatten x -abc9 x clock period."""
+    return [{"abc": a, "flatten": fl, "abc9": a9, "period": p} for a in abcs for fl in flatten for a9 in abc9 for p in periods]
+
+def recipe_label(r):
+    r = dict(DEFAULT_RECIPE, **r)
+    abc = r["abc"].replace(" -liberty {lib}", "").replace("{period_ps}", "T")
+    return " ".join([abc] + (["flatten"] if r["flatten"] else ["hier"]) + (["abc9"] if r["abc9"] else []))
+
+def _num(text, default=None):
+    m = re.search(r"-?[\d.]+(?:e-?\d+)?", str(text))
+    try: return float(m.group(0)) if m else default
+    except ValueError: return default
+
+
+class SynthSweep:
+    """
+    Runs yosys + sta for every recipe in its own sweep/vNN work dir, at most
+    `workers` variants at a time, and ranks them: smallest area among those
+    that meet timing, otherwise the best slack. The tools are ToolRuns of the
+    Job that calls run(), which kills them when cancelled.
+    """
+    def __init__(self, root, top, lib, variants, workers=None, vcd=None, on_result=None):
+        self.root = root; self.top = top; self.lib = lib; self.variants = variants; self.vcd = vcd
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.on_result = on_result
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _tool(self, cmd, wd, log, step):
+        with open(log, "w") as f, ToolRun(self.root, "sweep", cmd[0], step, cmd, inputs=[os.path.join(wd, cmd[1])], outputs=[log]) as tr:
+            return tr.wait(tr.popen(cmd, cwd=wd, stdout=f, stderr=subprocess.STDOUT, start_new_session=True))
+
+    def run_variant(self, idx, recipe):
+        wd = os.path.join(self.root, "sweep", f"v{idx:02d}")
+        res = {"variant": f"v{idx:02d}", "recipe": recipe, "label": recipe_label(recipe), "period": recipe["period"],
+               "area": None, "cells": None, "wns": None, "power": None, "runtime": 0.0, "status": "CANCELLED", "workdir": wd}
+        if self.cancelled: return res
+        try: return self._run_variant(wd, res, recipe)
+        except JobCancelled: res["status"] = "CANCELLED"; return res
+
+    def _run_variant(self, wd, res, recipe):
+        shutil.rmtree(wd, ignore_errors=True)
+        for sub in ("netlist", "reports"): os.makedirs(os.path.join(wd, sub))
+        v_net = f"netlist/{self.top}_netlist.v"
+        with open(os.path.join(wd, "netlist", f"{self.top}.sdc"), "w") as f: f.write(sdc_with_period(self.root, self.top, recipe["period"]))
+        with open(os.path.join(wd, "synth.ys"), "w") as f: f.write(yosys_script(self.synth_lib, self.sources, self.top, v_net, recipe))
+        with open(os.path.join(wd, "reports", "activity.txt"), "w") as f: f.write(self.activity + "\n")
+        t0 = time.time()
+        rc = self._tool(["yosys", "synth.ys"], wd, os.path.join(wd, "reports", "synthesis.log"), res["variant"])
+        if rc == 0:   # STA reads only the cells this variant's netlist uses
+            with open(os.path.join(wd, "sta.tcl"), "w") as f: f.write(sta_script(netlist_liberty(self.lib, os.path.join(wd, v_net)), v_net, self.top, self.saif_cmd))
+        if rc != 0:
+            res["status"] = "CANCELLED" if self.cancelled else "SYNTH FAIL"
+        elif self._tool(["sta", "sta.tcl"], wd, os.path.join(wd, "reports", "sta.log"), res["variant"]) != 0:
+            res["status"] = "CANCELLED" if self.cancelled else "STA FAIL"
+        else:
+            m = ReportEngine.parse_files(os.path.join(wd, "reports"))
+            res.update(area=_num(m["area"]), cells=int(_num(m["cells"], 0)), wns=_num(m["wns"]), power=_num(m["pwr_tot"][3]),
+                       status=m["status"] if m["status"] != "UNKNOWN" else "NO TIMING")
+        res["runtime"] = round(time.time() - t0, 2)
+        return res
+
+    def run(self):
+        self.sources = synth_sources(self.root)
+        self.synth_lib, _ = synth_liberty(self.lib, load_project_settings(self.root)["dont_use"])
+        self.saif_cmd, self.activity, _ = saif_command(self.root, self.top, self.vcd)   # one SAIF shared by every variant
+        results = []; begin_flow_run(self.root, "sweep")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, initializer=bind_job, initargs=(current_job(),)) as ex:
+            futs = [ex.submit(self.run_variant, i, r) for i, r in enumerate(self.variants)]
+            for fut in concurrent.futures.as_completed(futs):
+                res = fut.result(); results.append(res)
+                if self.on_result: self.on_result(res)
+        results.sort(key=lambda r: r["variant"])
+        os.makedirs(os.path.join(self.root, "reports"), exist_ok=True)
+        with open(os.path.join(self.root, "reports", "sweep.json"), "w") as f: json.dump(results, f, indent=1)
+        return results
+
+def best_variant(results):
+    ok = [r for r in results if r["status"] in ("MET", "VIOLATED") and r["area"] is not None]
+    met = [r for r in ok if r["status"] == "MET"]
+    if met: return min(met, key=lambda r: (r["area"], -(r["wns"] or 0)))
+    return max(ok, key=lambda r: r["wns"] if r["wns"] is not None else float("-inf")) if ok else None
+
+def promote_variant(root, top, res):
+    """Makes a sweep variant the project's synthesis result and default recipe."""
+    wd = res["workdir"]
+    files = synth_outputs(top) + [f"netlist/{top}.sdc", "synth.ys", "sta.tcl"]
+    for f in files:
+        if os.path.exists(os.path.join(wd, f)): shutil.copyfile(os.path.join(wd, f), os.path.join(root, f))
+    save_project_settings(root, synth_recipe=res["recipe"])
+
+
+class SweepWorker(JobWorker):
+    result = pyqtSignal(object)
+    done = pyqtSignal(object)
+    NAME = "synthesis sweep"; GROUP = "sweep"; PRIORITY = JOB_BACKGROUND
+
+    def __init__(self, sweep):
+        super().__init__()
+        self.sweep = sweep; sweep.on_result = self.result.emit
+
+    def job_args(self):   # the sweep runs its own pool of `workers` yosys/sta processes
+        return {"cpus": self.sweep.workers, "root": self.sweep.root, "on_cancel": self.sweep.cancel}
+
+    def dropped(self): self.done.emit([])
+
+    def run(self):
+        self.done.emit(self.sweep.run())
+
+
+class SweepDialog(QDialog):
+    COLS = ["Variant", "Recipe", "Period (ns)", "Area (um^2)", "Cells", "WNS (ns)", "Power (W)", "Runtime (s)", "Status"]
+    STATUS_COLORS = {"MET": "#4caf50", "VIOLATED": "#d4b44a", "SYNTH FAIL": "#f44336", "STA FAIL": "#f44336", "CANCELLED": "#6a7090"}
+
+    def __init__(self, ide, root, top, lib):
+        super().__init__(ide)
+        self.setWindowTitle(f"Synthesis Sweep: {top}"); self.resize(980, 560)
+        self.ide = ide; self.root = root; self.top = top; self.lib = lib; self.worker = None; self.results = []
+        lay = QVBoxLayout(self)
+        form = QFormLayout()
+        self.chk_abc = []
+        row = QHBoxLayout()
+        for i, a in enumerate(ABC_PRESETS):
+            c = QCheckBox(a.replace(" -liberty {lib}", "").replace("{period_ps}", "T")); c.setChecked(i < 2); c.setProperty("abc", a)
+            self.chk_abc.append(c); row.addWidget(c)
+        form.addRow("ABC scripts:", row)
+        self.cb_flat = QComboBox(); self.cb_flat.addItems(["hierarchy + flatten", "hierarchy only", "flatten only"])
+        form.addRow("Flatten:", self.cb_flat)
+        self.chk_abc9 = QCheckBox("also try synth -abc9"); form.addRow("", self.chk_abc9)
+        period = sdc_period(root, top)
+        self.e_periods = QLineEdit(f"{period:g}" if period else ""); self.e_periods.setPlaceholderText("ns, comma separated (empty = project SDC)")
+        form.addRow("Clock periods:", self.e_periods)
+        self.e_jobs = QLineEdit(str(os.cpu_count() or 1)); self.e_jobs.setFixedWidth(40); form.addRow("Jobs:", self.e_jobs)
+        lay.addLayout(form)
+        self.lbl_summary = QLabel(""); lay.addWidget(self.lbl_summary)
+        self.table = QTableWidget(); self.table.setColumnCount(len(self.COLS)); self.table.setHorizontalHeaderLabels(self.COLS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False); self.table.setSortingEnabled(True)
+        lay.addWidget(self.table)
+        btns = QHBoxLayout()
+        self.btn_run = QPushButton("▶ Run Sweep"); self.btn_run.clicked.connect(self.run_sweep)
+        self.btn_stop = QPushButton("■ Stop"); self.btn_stop.setEnabled(False); self.btn_stop.clicked.connect(lambda: self.worker and self.worker.cancel())
+        self.btn_promote = QPushButton("★ Promote Selected"); self.btn_promote.setEnabled(False); self.btn_promote.clicked.connect(self.promote)
+        btns.addStretch()
+        for b in (self.btn_run, self.btn_stop, self.btn_promote): btns.addWidget(b)
+        lay.addLayout(btns)
+
+    def variants(self):
+        abcs = [c.property("abc") for c in self.chk_abc if c.isChecked()] or [DEFAULT_RECIPE["abc"]]
+        flatten = [(False, True), (False,), (True,)][self.cb_flat.currentIndex()]
+        periods = [p for p in (_num(x) for x in self.e_periods.text().split(",")) if p and p > 0] or [None]
+        return sweep_matrix(abcs, flatten, (False, True) if self.chk_abc9.isChecked() else (False,), periods)
+
+    def run_sweep(self):
+        if self.worker and self.worker.isRunning(): return
+        variants = self.variants()
+        try: workers = int(self.e_jobs.text())
+        except ValueError: workers = None
+        self.results = []
+        self.table.setSortingEnabled(False); self.table.setRowCount(0); self.table.setSortingEnabled(True)
+        self.worker = SweepWorker(SynthSweep(self.root, self.top, self.lib, variants, workers, latest_vcd(self.root, self.ide.cwd)))
+        self.worker.result.connect(self.add_result); self.worker.done.connect(self.on_done)
+        self.btn_run.setEnabled(False); self.btn_stop.setEnabled(True); self.btn_promote.setEnabled(False)
+        self.n_variants = len(variants); self.t_start = time.time()
+        self.lbl_summary.setText(f"0/{len(variants)} variants")
+        self.ide.log_system(f"Synthesis sweep: {len(variants)} variants on {self.worker.sweep.workers} workers")
+        self.worker.start()
+
+    def add_result(self, res):
+        self.results.append(res)
+        self.table.setSortingEnabled(False)
+        row = self.table.rowCount(); self.table.insertRow(row)
+        vals = [res["variant"], res["label"], res["period"], res["area"], res["cells"], res["wns"], res["power"], res["runtime"], res["status"]]
+        for c, v in enumerate(vals):
+            item = QTableWidgetItem(); item.setData(Qt.ItemDataRole.DisplayRole, "" if v is None else v)
+            if c == 0: item.setData(Qt.ItemDataRole.UserRole, len(self.results) - 1)
+            if c == 8: item.setForeground(QColor(self.STATUS_COLORS.get(v, "#c8cad8")))
+            self.table.setItem(row, c, item)
+        self.table.setSortingEnabled(True)
+        self.lbl_summary.setText(f"{len(self.results)}/{self.n_variants} variants  ·  {time.time() - self.t_start:.1f}s wall")
+
+    def on_done(self, results):
+        self.btn_run.setEnabled(True); self.btn_stop.setEnabled(False)
+        best = best_variant(results)
+        self.btn_promote.setEnabled(bool([r for r in results if r["status"] in ("MET", "VIOLATED")]))
+        if best:
+            for row in range(self.table.rowCount()):
+                if self.table.item(row, 0).text() == best["variant"]:
+                    self.table.selectRow(row)
+                    for c in range(self.table.columnCount()): self.table.item(row, c).setBackground(QColor(76, 175, 80, 40))
+            self.lbl_summary.setText(self.lbl_summary.text() + f"  ·  best: {best['variant']} ({best['label']})")
+        self.ide.log_system(f"Synthesis sweep finished: {len(results)} variants" + (f", best {best['variant']} {best['label']}" if best else ", none usable"),
+                            "SYS" if best else "ERR")
+
+    def promote(self):
+        item = self.table.item(self.table.currentRow(), 0)
+        if item is None: return
+        res = self.results[item.data(Qt.ItemDataRole.UserRole)]
+        if res["status"] not in ("MET", "VIOLATED"): self.ide.log_system("Only a completed variant can be promoted.", "ERR"); return
+        promote_variant(self.root, self.top, res)
+        self.ide.log_system(f"Promoted {res['variant']} ({res['label']}) to the main netlist and project recipe")
+        self.ide.tab_synth.update_dashboard()
+
+
+# === TAB 5: REGRESSION (Parallel Testbenches) ===
+
+class RegressionWorker(JobWorker):
+    result = pyqtSignal(object)
+    done = pyqtSignal(object)
+    NAME = "regression"; GROUP = "regression"; PRIORITY = JOB_BACKGROUND
+
+    def __init__(self, runner):
+        super().__init__()
+        self.runner = runner; runner.on_result = self.result.emit
+
+    def job_args(self):
+        return {"cpus": self.runner.workers, "root": self.runner.root, "on_cancel": self.runner.cancel}
+
+    def dropped(self): self.done.emit([])
+
+    def run(self):
+        self.done.emit(self.runner.run())
+
+
+class RegressionTab(QWidget):
+    COLS = ["Test", "Seed", "Plusargs", "Status", "Runtime (s)", "Log"]
+    STATUS_COLORS = {"PASS": "#4caf50", "FAIL": "#f44336", "BUILD FAIL": "#f44336", "TIMEOUT": "#d4b44a", "CANCELLED": "#6a7090"}
+
+    def __init__(self, ide):
+        super().__init__()
+        self.ide = ide; self.worker = None; self.results = []
+        lay = QVBoxLayout(self); lay.setContentsMargins(10, 10, 10, 10)
+        btn_style = "QPushButton { background:#1c1e26; color:#4a4e6a; border:1px solid #2c2f3e; padding:5px 15px; border-radius:5px; font-size:10px; font-weight:700; } QPushButton:hover { background:rgba(0,188,212,0.08); color:#00bcd4; border-color:#00bcd4; }"
+        run_style = "QPushButton { background:#0e2018; color:#4caf50; border:1px solid #2a5030; padding:5px 18px; border-radius:5px; font-size:10px; font-weight:700; letter-spacing:0.5px; } QPushButton:hover { background:#142a1e; color:#66c96a; border-color:#4caf50; }"
+        ctrl = QHBoxLayout()
+        self.e_seeds = QLineEdit(); self.e_seeds.setPlaceholderText("seeds: 1-8,42"); self.e_seeds.setFixedWidth(140)
+        self.e_args = QLineEdit(); self.e_args.setPlaceholderText("plusarg sets: +MODE=0 | +MODE=1 +FAST")
+        self.e_jobs = QLineEdit(str(os.cpu_count() or 1)); self.e_jobs.setFixedWidth(40); self.e_jobs.setToolTip("Parallel simulations")
+        self.e_timeout = QLineEdit("600"); self.e_timeout.setFixedWidth(50); self.e_timeout.setToolTip("Per-test timeout (s)")
+        self.btn_run = QPushButton("▶ Run Regression (F5)"); self.btn_run.setStyleSheet(run_style); self.btn_run.clicked.connect(self.run_regression)
+        self.btn_stop = QPushButton("■ Stop"); self.btn_stop.setStyleSheet(btn_style); self.btn_stop.setEnabled(False); self.btn_stop.clicked.connect(self.stop)
+        self.btn_waves = QPushButton("🌊 Open Waves"); self.btn_waves.setStyleSheet(btn_style); self.btn_waves.clicked.connect(self.open_waves)
+        for w in (QLabel("Seeds"), self.e_seeds, QLabel("Plusargs"), self.e_args, QLabel("Jobs"), self.e_jobs, QLabel("Timeout"), self.e_timeout,
+                  self.btn_run, self.btn_stop, self.btn_waves): ctrl.addWidget(w)
+        lay.addLayout(ctrl)
+        self.lbl_summary = QLabel("No regression run yet."); self.lbl_summary.setStyleSheet("color:#6a7090; font-size:10px; font-weight:700; padding:4px;")
+        lay.addWidget(self.lbl_summary)
+        split = QSplitter(Qt.Orientation.Vertical)
+        self.table = QTableWidget(); self.table.setColumnCount(len(self.COLS)); self.table.setHorizontalHeaderLabels(self.COLS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False); self.table.setSortingEnabled(True)
+        self.table.currentCellChanged.connect(lambda r, *_: self.show_log(r))
+        self.log_view = QPlainTextEdit(); self.log_view.setReadOnly(True)
+        self.log_view.setStyleSheet("background:#0a0b0f; color:#c8cad8; font-family:JetBrains Mono,Consolas,monospace; font-size:11px; border:none;")
+        split.addWidget(self.table); split.addWidget(self.log_view); split.setStretchFactor(0, 3); split.setStretchFactor(1, 2)
+        lay.addWidget(split)
+
+    def run_regression(self):
+        if self.worker and self.worker.isRunning(): return
+        _, base = self.ide.get_context()
+        if not base: self.ide.log_system("Open a design or testbench first.", "ERR"); return
+        root = self.ide.prep_workspace(base)
+        tbs, design = discover_testbenches(root)
+        if not tbs: self.ide.log_system("No tb_* / *_tb / test_* files in source/.", "ERR"); return
+        plusargs = [a.strip() for a in self.e_args.text().split("|") if a.strip()]
+        jobs = regression_matrix(tbs, parse_seeds(self.e_seeds.text()), plusargs)
+        try: workers, timeout = int(self.e_jobs.text()), float(self.e_timeout.text())
+        except ValueError: workers, timeout = os.cpu_count() or 1, 600
+        self.results = []
+        self.table.setSortingEnabled(False); self.table.setRowCount(0); self.table.setSortingEnabled(True)
+        self.log_view.clear()
+        self.ide.log_system(f"Regression: {len(jobs)} jobs from {len(tbs)} testbenches on {workers} workers")
+        self.worker = RegressionWorker(RegressionRunner(root, jobs, design, workers, timeout))
+        self.worker.result.connect(self.add_result); self.worker.done.connect(self.on_done)
+        self.btn_run.setEnabled(False); self.btn_stop.setEnabled(True)
+        self.t_start = time.time(); self.n_jobs = len(jobs); self.update_summary()
+        self.worker.start()
+
+    def stop(self):
+        if self.worker: self.worker.cancel()
+
+    def add_result(self, res):
+        self.results.append(res)
+        self.table.setSortingEnabled(False)
+        row = self.table.rowCount(); self.table.insertRow(row)
+        vals = [res["test"], res["seed"] if res["seed"] is not None else "", res["args"], res["status"], res["runtime"], os.path.relpath(res["log"], self.worker.runner.root) if res["log"] else ""]
+        for c, v in enumerate(vals):
+            item = QTableWidgetItem(); item.setData(Qt.ItemDataRole.DisplayRole, v)   # numbers sort numerically
+            if c == 0: item.setData(Qt.ItemDataRole.UserRole, len(self.results) - 1)
+            if c == 3: item.setForeground(QColor(self.STATUS_COLORS.get(v, "#c8cad8")))
+            self.table.setItem(row, c, item)
+        self.table.setSortingEnabled(True)
+        self.update_summary()
+
+    def update_summary(self):
+        counts = {}
+        for r in self.results: counts[r["status"]] = counts.get(r["status"], 0) + 1
+        parts = [f"{k} {v}" for k, v in sorted(counts.items())]
+        self.lbl_summary.setText(f"{len(self.results)}/{self.n_jobs} done  ·  {'  ·  '.join(parts) or '-'}  ·  {time.time() - self.t_start:.1f}s wall")
+
+    def on_done(self, results):
+        self.btn_run.setEnabled(True); self.btn_stop.setEnabled(False)
+        self.update_summary()
+        bad = [r for r in results if r["status"] != "PASS"]
+        self.ide.log_system(f"Regression finished: {len(results) - len(bad)}/{len(results)} passed", "ERR" if bad else "SYS")
+
+    def _result_at(self, row):
+        item = self.table.item(row, 0)
+        return self.results[item.data(Qt.ItemDataRole.UserRole)] if item is not None else None
+
+    def show_log(self, row):
+        res = self._result_at(row)
+        if not res or not res["log"] or not os.path.exists(res["log"]): self.log_view.clear(); return
+        with open(res["log"], errors="replace") as f: text = f.read(2_000_000)
+        self.log_view.setPlainText(text)
+
+    def open_waves(self):
+        res = self._result_at(self.table.currentRow())
+        vcds = glob.glob(os.path.join(res["workdir"], "*.vcd")) if res and res["workdir"] else []
+        if not vcds: self.ide.log_system("Selected test wrote no VCD.", "ERR"); return
+        self.ide.frontend_tabs.setCurrentWidget(self.ide.tab_waves)
+        self.ide.tab_waves.load_file(max(vcds, key=os.path.getmtime))
+
+
+# === TAB 6: FLOW (make-style stage graph) ===
+
+class FlowGraphView(QWidget):
+    """The FlowGraph drawn left to right by depth: fill by stamp state (or the running job), dashed outline on what a build would run."""
+    picked = pyqtSignal(str); opened = pyqtSignal(str)
+    COLORS = {"fresh": "#4caf50", "stale": "#d4b44a", "never": "#4a4e6a", "running": "#00bcd4", "queued": "#8a7a3a",
+              "failed": "#f44336", "cancelled": "#9098b0"}
+    NODE_W, NODE_H, GAP_X, GAP_Y = 110, 44, 36, 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.graph = None; self.states = {}; self.plan = []; self.target = None; self.boxes = {}
+        self.setMinimumHeight(3 * (self.NODE_H + self.GAP_Y) + 20); self.setMouseTracking(True)
+
+    def show_graph(self, graph, states, plan, target):
+        self.graph, self.states, self.plan, self.target = graph, states, plan, target
+        cols = {}
+        for n in graph.stages: cols.setdefault(graph.depth(n), []).append(n)
+        self.boxes = {n: QRectF(10 + d * (self.NODE_W + self.GAP_X), 10 + i * (self.NODE_H + self.GAP_Y), self.NODE_W, self.NODE_H)
+                      for d, names in cols.items() for i, n in enumerate(names)}
+        self.setMinimumWidth(int(20 + len(cols) * (self.NODE_W + self.GAP_X)))
+        self.update()
+
+    def paintEvent(self, e):
+        if not self.graph: return
+        p = QPainter(self); p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.setPen(QPen(QColor("#3a3e52"), 1.5))
+        for n, st in self.graph.stages.items():
+            for d in st.deps:
+                a, b = self.boxes[d], self.boxes[n]
+                p.drawLine(QPointF(a.right(), a.center().y()), QPointF(b.left(), b.center().y()))
+        f = p.font(); f.setPointSize(8)
+        for n, r in self.boxes.items():
+            state, why = self.states.get(n, ("never", ""))
+            col = QColor(self.COLORS.get(state, "#4a4e6a"))
+            fill = QColor(col); fill.setAlpha(40)
+            pen = QPen(col, 3 if n == self.target else 1.5)
+            if n in self.plan: pen.setStyle(Qt.PenStyle.DashLine)
+            p.setPen(pen); p.setBrush(fill); p.drawRoundedRect(r, 6, 6)
+            f.setBold(True); p.setFont(f); p.setPen(self.palette().color(QPalette.ColorRole.WindowText))
+            p.drawText(r.adjusted(0, 4, 0, -r.height() / 2), Qt.AlignmentFlag.AlignCenter, n)
+            f.setBold(False); p.setFont(f); p.setPen(col)
+            p.drawText(r.adjusted(4, r.height() / 2, -4, -2), Qt.AlignmentFlag.AlignCenter, state)
+        p.end()
+
+    def stage_at(self, pos):
+        return next((n for n, r in self.boxes.items() if r.contains(QPointF(pos))), None)
+
+    def mouseMoveEvent(self, e):
+        n = self.stage_at(e.position())
+        self.setToolTip(f"{n}: {self.states.get(n, ('', ''))[1]}" if n else "")
+
+    def mousePressEvent(self, e):
+        n = self.stage_at(e.position())
+        if n: self.picked.emit(n)
+
+    def mouseDoubleClickEvent(self, e):
+        n = self.stage_at(e.position())
+        if n: self.opened.emit(n)
+
+
+class FlowTab(QWidget):
+    """Build to a stage: only stale stages run, independent ones in parallel, through the job scheduler."""
+    def __init__(self, ide):
+        super().__init__()
+        self.ide = ide; self.graph = None; self.jobs = {}
+        lay = QVBoxLayout(self); lay.setContentsMargins(10, 10, 10, 10)
+        btn_style = "QPushButton { background:#1c1e26; color:#4a4e6a; border:1px solid #2c2f3e; padding:5px 15px; border-radius:5px; font-size:10px; font-weight:700; } QPushButton:hover { background:rgba(0,188,212,0.08); color:#00bcd4; border-color:#00bcd4; }"
+        run_style = "QPushButton { background:#0e2018; color:#4caf50; border:1px solid #2a5030; padding:5px 18px; border-radius:5px; font-size:10px; font-weight:700; letter-spacing:0.5px; } QPushButton:hover { background:#142a1e; color:#66c96a; border-color:#4caf50; }"
+        ctrl = QHBoxLayout()
+        self.cb_target = QComboBox(); self.cb_target.currentTextChanged.connect(lambda _: self.refresh())
+        self.btn_build = QPushButton("▶ Build"); self.btn_build.setStyleSheet(run_style); self.btn_build.clicked.connect(self.build)
+        self.btn_stop = QPushButton("■ Stop"); self.btn_stop.setStyleSheet(btn_style); self.btn_stop.clicked.connect(lambda: self.ide.jobs.cancel("flow"))
+        self.btn_refresh = QPushButton("⟳ Refresh"); self.btn_refresh.setStyleSheet(btn_style); self.btn_refresh.clicked.connect(self.refresh)
+        for w in (QLabel("Build to"), self.cb_target, self.btn_build, self.btn_stop, self.btn_refresh): ctrl.addWidget(w)
+        ctrl.addStretch(1); lay.addLayout(ctrl)
+        self.lbl_plan = QLabel("Open a design to see its flow."); self.lbl_plan.setStyleSheet("color:#6a7090; font-size:10px; font-weight:700; padding:4px;")
+        lay.addWidget(self.lbl_plan)
+        split = QSplitter(Qt.Orientation.Vertical)
+        scroll = QScrollArea(); scroll.setWidgetResizable(True)
+        self.view = FlowGraphView(); scroll.setWidget(self.view); scroll.setMinimumHeight(self.view.minimumHeight() + 24)
+        self.view.picked.connect(self.cb_target.setCurrentText); self.view.opened.connect(self.open_stage_log)
+        self.log = LogViewer()
+        split.addWidget(scroll); split.addWidget(self.log); split.setStretchFactor(0, 2); split.setStretchFactor(1, 3)
+        lay.addWidget(split)
+
+    def make_graph(self, prep=False):
+        _, base = self.ide.get_context()
+        if not base: return None
+        pdk = self.ide.active_pdk or self.ide.backend_widget.active_pdk
+        sink = self.ide.bus
+        root = self.ide.prep_workspace(base) if prep else self.ide.get_proj_root(base)   # refresh only looks, build gathers sources
+        return FlowGraph(root, base, pdk, self.ide.pdk_path or None, self.ide.sta_service,
+                         on_metrics=lambda data, live=False: sink.metrics("synth", data, live), on_progress=lambda *a: sink.progress("synth", *a))
+
+    def showEvent(self, e):
+        self.refresh(); super().showEvent(e)
+
+    def refresh(self):
+        if not self.isVisible(): return
+        self.graph = self.make_graph()
+        if not self.graph: self.lbl_plan.setText("Open a design to see its flow."); return
+        if self.cb_target.count() != len(self.graph.stages):
+            self.cb_target.blockSignals(True); self.cb_target.clear(); self.cb_target.addItems(list(self.graph.stages))
+            self.cb_target.setCurrentText("route"); self.cb_target.blockSignals(False)
+        target = self.cb_target.currentText()
+        statuses = self.graph.statuses(); states = dict(statuses)
+        for n, j in self.jobs.items():
+            if j.state != "done": states[n] = (j.state, j.error or statuses[n][1])
+        plan = self.graph.plan(target, statuses)
+        self.view.show_graph(self.graph, states, plan, target)
+        need = self.graph.ancestors(target)
+        running = sum(1 for j in self.jobs.values() if j.state in JOB_ACTIVE)
+        self.lbl_plan.setText(f"{self.graph.base} → {target}:  " + (f"{' → '.join(plan)}  ({len(need) - len(plan)} of {len(need)} fresh)" if plan else "up to date")
+                              + (f"  ·  {running} jobs active" if running else ""))
+        self.btn_build.setEnabled(not running)
+
+    def build(self):
+        self.graph = self.make_graph(prep=True)
+        if not self.graph: self.ide.log_system("Open a design first.", "ERR"); return
+        if self.ide.current_file: self.ide.save_file()
+        self.ide.bus.logs.restart("flow", silis_cache_dir(self.graph.root, "logs")); self.log.clear()
+        busy = [j for j in self.ide.jobs.active(root=self.graph.root) if j.group in ("flow", "synth", "sim")]
+        self.jobs = self.graph.build(self.cb_target.currentText(), self.ide.jobs, sink=self.ide.bus.log, after=busy)
+        if not self.jobs: self.ide.bus.log("[FLOW]", f"{self.cb_target.currentText()}: everything up to date")
+        self.refresh()
+
+    def open_stage_log(self, name):
+        j = self.jobs.get(name)
+        if j and j.log_path: open_full_log(j.log_path)
+
+
 # =============================================================================
 #  MAIN APPLICATION: SILIS IDE
 # =============================================================================
@@ -3758,6 +5292,8 @@ class BackendWidget(QWidget):
         
         # --- 1. INITIALIZE WIDGETS ---
         self.peeker = SiliconPeeker()
+        self.peeker.inst_picked.connect(lambda name: self.ide.sta_query(
+            f"report_checks -path_delay max -through [get_cells {{{name}}}] -fields {{slew cap}}", "[BACKEND]"))
         self.gds_viewer = GDSViewerWidget()
         self.gds3d_port = GDS3DPort(self.ide) # [NEW] 3D Viewer Port
         
@@ -3799,7 +5335,7 @@ class BackendWidget(QWidget):
         self.btn_ref = QPushButton("Refresh View")
         self.btn_load = QPushButton("📂 Load Routed")
         
-        self.term_log = QTextEdit(); self.term_log.setReadOnly(True)
+        self.term_log = LogViewer()   # follows the backend channel's full log
         self.term_log.setStyleSheet("background:#0a0b0f; color:#88cc88; font-family:JetBrains Mono,Consolas,monospace; font-size:11px; border:none; padding:6px 10px;")
         self.term_in = QLineEdit(); self.term_in.setPlaceholderText("openroad> ")
         self.term_in.setStyleSheet("background:#0a0b0f; color:#00bcd4; border:none; border-top:1px solid #1e2030; font-family:JetBrains Mono,Consolas,monospace; font-size:11px; padding:7px 12px;")
@@ -3966,6 +5502,7 @@ class BackendWidget(QWidget):
         self.proc = None
         self.pending_init = None
         self.cmd_active = False
+        self.or_run = None; self.or_before = None; self.or_cidfile = None   # telemetry of the OpenROAD command in flight
         
         self.reset_backend() 
         self.viz_tabs.setCurrentIndex(0)
@@ -3973,26 +5510,26 @@ class BackendWidget(QWidget):
     def launch_magic_gui(self):
         """Launches Magic VLSI in GUI mode with the correct Tech file."""
         if not shutil.which("magic"):
-            self.term_log.append("[ERR] Magic not found.")
+            self.log("[ERR] Magic not found.")
             return
 
         if not self.active_pdk: 
-            self.term_log.append("[ERR] No PDK Active.")
+            self.log("[ERR] No PDK Active.")
             return
 
         proj_root = self.ide.get_proj_root(self.ide.get_context()[0] or "design")
         gds_path = os.path.join(proj_root, "results", "design.gds")
         
         if not os.path.exists(gds_path): 
-             self.term_log.append("[ERR] GDS not found. Run 'GDS' step first.")
+             self.log("[ERR] GDS not found. Run 'GDS' step first.")
              return
 
         pdk_tech = self.active_pdk.get('tech', '')
         if not os.path.exists(pdk_tech):
-             self.term_log.append("[ERR] Magic Tech file not found in PDK config.")
+             self.log("[ERR] Magic Tech file not found in PDK config.")
              return
 
-        self.term_log.append(f"[SYS] Launching Magic GUI for {os.path.basename(gds_path)}...")
+        self.log(f"[SYS] Launching Magic GUI for {os.path.basename(gds_path)}...")
         # -d XR uses the X11 Cairo renderer (faster/better looking than default)
         # -T loads the tech file
         subprocess.Popen(["magic", "-d", "XR", "-T", pdk_tech, gds_path], cwd=proj_root)
@@ -4091,10 +5628,16 @@ class BackendWidget(QWidget):
             "openroad/openroad",                       # Docker image name
             "openroad"
         ]
+        proj_root = self.ide.get_proj_root(self.ide.get_context()[0] or "design")
+        begin_flow_run(proj_root, "backend"); self.or_run = None
+        self.ide.bus.logs.restart("backend", silis_cache_dir(proj_root, "logs"))
+        self.or_cidfile = os.path.join(silis_cache_dir(proj_root, "openroad"), "session.cid")   # container id -> cgroup CPU / memory
+        with suppress(OSError): os.remove(self.or_cidfile)
+        docker_cmd[4:4] = ["--cidfile", self.or_cidfile]
         if shutil.which("docker"):
             self.proc.start(docker_cmd[0], docker_cmd[1:])
         else:
-            self.term_log.append("[ERR] Docker not found. Cannot launch OpenROAD container.")
+            self.log("[ERR] Docker not found. Cannot launch OpenROAD container.")
 
     def on_tab_changed(self, index):
         if index == 0:
@@ -4134,27 +5677,25 @@ class BackendWidget(QWidget):
         gds_path = os.path.join(proj_root, "results", "design.gds")
         if os.path.exists(gds_path):
             if self.gds_viewer.loaded_file != gds_path:
-                self.term_log.append(f"[SYS] Loading GDS: {gds_path}...")
+                self.log(f"[SYS] Loading GDS: {gds_path}...")
                 self.gds_viewer.load_gds(gds_path)
                 self.populate_gds_layers()
         else:
-            self.term_log.append(f"[ERR] GDS not found. Run 'GDS' step first.")
+            self.log(f"[ERR] GDS not found. Run 'GDS' step first.")
 
     def run_flow_step(self, step_name):
         proj_root = self.ide.get_proj_root(self.ide.get_context()[0] or "design")
         results_dir = os.path.join(proj_root, "results"); os.makedirs(results_dir, exist_ok=True)
         reports_dir = os.path.join(proj_root, "reports"); os.makedirs(reports_dir, exist_ok=True)
-        def_abs_path = os.path.join(results_dir, "temp.def").replace("\\", "/")
-        write_cmd = f"write_def \"{def_abs_path}\""
 
         if step_name == "Antenna":
-            self.term_log.append("\n[SIGNOFF] Running Antenna Check...")
+            self.log("\n[SIGNOFF] Running Antenna Check...")
             self.send_command_internal("check_antennas -report_file reports/antenna.rpt; puts \"Antenna Violations: [check_antennas]\"")
             return
 
         if step_name == "STA":
             if not self.active_pdk: QMessageBox.critical(self, "Error", "PDK not active."); return
-            self.term_log.append("\n[SIGNOFF] Running Signoff Timing Analysis...")
+            self.log("\n[SIGNOFF] Running Signoff Timing Analysis...")
             lib_cmd = f"read_liberty \"{self.active_pdk['lib']}\""
             cmd = f"{lib_cmd}\nreport_checks -path_delay max -format full_clock_expanded -fields {{slew cap input_pins fanout}} -digits 4\nreport_worst_slack -max\nreport_tns\nreport_wns"
             self.send_command_internal(cmd)
@@ -4163,7 +5704,7 @@ class BackendWidget(QWidget):
         if step_name == "DRC":
             if not self.active_pdk or 'gds' not in self.active_pdk: QMessageBox.critical(self, "Error", "PDK GDS Required."); return
             gds_file = os.path.join(results_dir, "design.gds")
-            if not os.path.exists(gds_file): self.term_log.append("[ERR] Generate GDS first!"); return
+            if not os.path.exists(gds_file): self.log("[ERR] Generate GDS first!"); return
             self.trigger_magic_drc(proj_root, gds_file)
             return
 
@@ -4178,111 +5719,68 @@ class BackendWidget(QWidget):
             ctx = self.ide.get_context()[0] or "top"
             netlist_path = os.path.join(proj_root, "netlist", f"{ctx}_netlist.v")
             if not os.path.exists(netlist_path): netlist_path = self.ide.current_file or "design.v"
-            sdc_path = os.path.join(proj_root, "netlist", f"{ctx}.sdc")
-            if not os.path.exists(sdc_path):
-               with open(sdc_path, 'w') as f: f.write("create_clock -name clk -period 10.0 [get_ports clk]\nset_input_delay 2.0 -clock clk [all_inputs]\nset_output_delay 2.0 -clock clk [all_outputs]\n")
-            tcl_content = f"""read_lef "{self.active_pdk['tlef']}"\nread_lef "{self.active_pdk['lef']}"\nread_liberty "{self.active_pdk['lib']}"\nread_verilog "{netlist_path}"\nlink_design {ctx}\nread_sdc "{sdc_path}" """
+            sdc_path = ensure_sdc(proj_root, ctx)
+            tcl_content = openroad_init_tcl(self.active_pdk, netlist_path, ctx, sdc_path)
             try:
                 with open(tcl_path, 'w') as f: f.write(tcl_content)
                 self.pending_init = f"source {tcl_path}"
-                self.term_log.append("[SYS] Rebooting OpenROAD...")
+                self.log("[SYS] Rebooting OpenROAD...")
                 self.reset_backend() 
-            except Exception as e: self.term_log.append(f"[ERR] File Error: {e}")
+            except Exception as e: self.log(f"[ERR] File Error: {e}")
             return
 
         if step_name == "GDS":
             if not self.active_pdk or 'gds' not in self.active_pdk: QMessageBox.critical(self, "Error", "No GDS defined."); return
-            self.term_log.append("[SYS] Starting GDS Generation Flow...")
+            self.log("[SYS] Starting GDS Generation Flow...")
             final_def = os.path.join(results_dir, "final_routed.def").replace("\\", "/")
             self.send_command_internal(f"write_def \"{final_def}\"")
             QTimer.singleShot(2000, lambda: self.trigger_magic_merge(proj_root, final_def))
             return
 
-        cmd = ""
-        if not SSAForge.ALIASES: SSAForge.load_aliases()
-        pdk_name = self.active_pdk.get('name', SSAForge.DEFAULT_PDK) if self.active_pdk else SSAForge.DEFAULT_PDK
-        lib_path = self.active_pdk.get('lib', None) if self.active_pdk else None
-
-        if step_name == "Floorplan": cmd = f"initialize_floorplan -die_area \"0 0 400 400\" -core_area \"10 10 390 390\" -site unithd; {write_cmd}"
-        elif step_name == "Tapcells": cmd = SSAForge.get_tap_cmd(pdk_name, lib_path) + f"; {write_cmd}"
-        elif step_name == "PDN": cmd = "add_global_connection -net {VDD} -pin_pattern {^VPWR$|^VDD$} -power; add_global_connection -net {VSS} -pin_pattern {^VGND$|^VSS$} -ground; set_voltage_domain -name {Core} -power {VDD} -ground {VSS}; define_pdn_grid -name {grid} -voltage_domains {Core}; add_pdn_stripe -grid {grid} -layer {met1} -width {0.48} -followpins; add_pdn_stripe -grid {grid} -layer {met4} -width {1.6} -pitch {27.2} -offset {13.6} -extend_to_core_ring; add_pdn_connect -grid {grid} -layers {met1 met4}; pdngen; " + write_cmd
-        elif step_name == "IO Pins": cmd = f"place_pins -hor_layers met3 -ver_layers met4; {write_cmd}"
-        elif step_name == "Place": cmd = f"global_placement -density 0.6; detailed_placement; {write_cmd}"
-        elif step_name == "CTS": cmd = SSAForge.get_cts_cmd(pdk_name, lib_path) + f"; {write_cmd}"
-        elif step_name == "Route":
-            guide_path = os.path.join(results_dir, "route.guide").replace("\\", "/")
-            drc_path = os.path.join(reports_dir, "drc.rpt").replace("\\", "/")
-            fix_script = os.path.join(proj_root, "fix.tcl").replace("\\", "/")
-            try: 
-                with open(fix_script, 'w') as f: f.write("set db [ord::get_db]; set chip [$db getChip]; set block [$chip getBlock]; set net_names {zero_ one_ logic0 logic1}; foreach name $net_names { set net [$block findNet $name]; if {$net != \"NULL\"} { $net setSigType \"SIGNAL\" } }")
-            except: pass
-            cmd = f"source \"{fix_script}\"; global_route -guide_file \"{guide_path}\" -congestion_iterations 50 -verbose; detailed_route -output_drc \"{drc_path}\"; {write_cmd}"
-
+        prepare_backend_dirs(proj_root)
+        cmd = openroad_step_cmd(step_name, self.active_pdk, proj_root)
         if cmd:
             text, ok = self.ask_command(f"Run {step_name}", "Confirm TCL Command:", cmd)
             if ok and text: self.send_command_internal(text)
 
     def trigger_magic_drc(self, root, gds_path):
-        if not shutil.which("magic"): self.ide.queue.put(("[BACKEND]", "[ERR] 'magic' not found.")); return
-        pdk_tech = self.active_pdk.get('tech', '')
-        if not os.path.exists(pdk_tech): self.ide.queue.put(("[BACKEND]", "[ERR] Missing Tech file.")); return
-        script_content = f"drc off\ngds read {gds_path}\ndrc style drc(fast)\ndrc on\ndrc check\ndrc catchup\nset count [drc list count]\nputs \"SILIS_DRC_VIOLATIONS: $count\"\nif {{$count > 0}} {{ drc list all }}\nquit"
-        script_path = os.path.join(root, "run_drc.tcl")
-        with open(script_path, 'w') as f: f.write(script_content)
-        self.term_log.append(f"\n[SIGNOFF] Running Magic DRC on {os.path.basename(gds_path)}...")
-        def run_drc():
-            try:
-                cmd = ["magic", "-noconsole", "-dnull", "-T", pdk_tech, script_path]
-                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-                import re
-                for line in iter(proc.stdout.readline, ''):
-                    line = line.strip()
-                    if "SILIS_DRC_VIOLATIONS" in line:
-                        m = re.search(r'(\d+)\s*\}?$', line); count = m.group(1) if m else "Unknown"
-                        if count == "0": self.ide.queue.put(("[BACKEND]", "🟢 DRC CLEAN (0 Violations)"))
-                        else: self.ide.queue.put(("[BACKEND]", f"🔴 DRC FAILED: {count} Violations Found"))
-                    elif "Error:" in line or "error" in line.lower(): self.ide.queue.put(("[BACKEND]", f"[DRC ERR] {line}"))
-                proc.wait()
-                self.ide.queue.put(("[BACKEND]", "DRC Run Complete."))
-            except Exception as e: self.ide.queue.put(("[BACKEND]", f"[ERR] DRC Execution Failed: {e}"))
-        threading.Thread(target=run_drc, daemon=True).start()
+        tech = self.active_pdk.get('tech', '')
+        self.ide.jobs.submit(f"magic DRC {os.path.basename(gds_path)}", lambda job: magic_drc(job, root, tech, gds_path), group="signoff", root=root,
+                             sink=self.ide.bus.log, deps=self.ide.jobs.active("signoff", root))   # after a GDS merge still in flight
 
     def trigger_magic_merge(self, root, def_path):
-        if not shutil.which("magic"): self.ide.queue.put(("[BACKEND]", "[ERR] 'magic' executable not found.")); return
-        pdk_gds = self.active_pdk.get('gds', ''); pdk_tech = self.active_pdk.get('tech', '')
-        pdk_tlef = self.active_pdk.get('tlef', ''); pdk_lef = self.active_pdk.get('lef', '')   
-        output_gds = os.path.join(root, "results", "design.gds").replace("\\", "/")
-        if not all(os.path.exists(p) for p in [pdk_gds, pdk_tech, pdk_tlef, pdk_lef]): self.ide.queue.put(("[BACKEND]", f"[ERR] Missing PDK files.")); return
-        script_content = f"drc off\nlocking off\ngds readonly true\ngds rescale false\nlef read {pdk_tlef}\nlef read {pdk_lef}\ngds read {pdk_gds}\ndef read {def_path}\ngds write {output_gds}\nquit"
-        script_path = os.path.join(root, "merge_magic.tcl")
-        with open(script_path, 'w') as f: f.write(script_content)
-        self.term_log.append(f"[SYS] Magic: Merging with LEF support...")
-        def run_magic():
-            try:
-                cmd = ["magic", "-noconsole", "-dnull", "-T", pdk_tech, script_path]
-                proc = subprocess.run(cmd, capture_output=True, text=True)
-                if proc.returncode == 0 and os.path.exists(output_gds): self.ide.queue.put(("[BACKEND]", f"Saved: {output_gds}"))
-                else: self.ide.queue.put(("[BACKEND]", f"[ERR] Magic Failed:\n{proc.stderr}\n{proc.stdout}"))
-            except Exception as e: self.ide.queue.put(("[BACKEND]", f"[ERR] Magic Execution Error: {e}"))
-        threading.Thread(target=run_magic, daemon=True).start()
+        pdk = dict(self.active_pdk)
+        self.ide.jobs.submit("magic GDS merge", lambda job: magic_merge(job, root, pdk, def_path), group="signoff", root=root, sink=self.ide.bus.log)
 
     def open_pdk_selector(self):
         dlg = PDKSelector(self.pdk_mgr, self)
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            self.active_pdk = dlg.selected_config; self.term_log.append(f"[SYS] Target PDK: {self.active_pdk['name']}"); return True
+            self.active_pdk = dlg.selected_config; self.log(f"[SYS] Target PDK: {self.active_pdk['name']}"); return True
         return False
 
     def read_stdout(self):
         data = self.proc.readAllStandardOutput().data().decode()
-        self.term_log.append(data.strip())
-        self.term_log.verticalScrollBar().setValue(self.term_log.verticalScrollBar().maximum())
+        self.ide.bus.log("[BACKEND]", data.strip())   # batched with the other backend output
         if self.pending_init and ("OpenROAD" in data or "openroad>" in data): self.send_command_internal(self.pending_init); self.pending_init = None
-        if self.cmd_active and "openroad>" in data: self.cmd_active = False; self.force_refresh_view()
+        if self.or_run and "[ERROR" in data: self.or_run.rc = 1
+        if self.cmd_active and "openroad>" in data: self.cmd_active = False; self.finish_or_run(); self.force_refresh_view()
+
+    def or_usage(self):
+        try:
+            with open(self.or_cidfile) as f: return cgroup_usage(f.read().strip())
+        except (OSError, TypeError): return None, None
+
+    def finish_or_run(self):
+        if not self.or_run: return
+        tr, self.or_run = self.or_run, None
+        tr.usage(*self.or_usage(), before=self.or_before); tr.finish(tr.rc or 0)
+
+    def log(self, msg): self.ide.bus.log("[BACKEND]", msg)
 
     def send_command(self): cmd = self.term_in.text(); self.term_in.clear(); self.send_command_internal(cmd)
         
     def send_command_internal(self, cmd):
-        self.term_log.append(f"> {cmd}")
+        self.ide.bus.log("[BACKEND]", f"> {cmd}")
         if "initialize_floorplan" in cmd:
             import re
             m = re.search(r'-die_area\s+"(\d+)\s+(\d+)\s+(\d+)\s+(\d+)"', cmd)
@@ -4290,8 +5788,15 @@ class BackendWidget(QWidget):
                 x1, y1, x2, y2 = map(float, m.groups())
                 try: self.peeker.set_die_area(x1, y1, x2, y2)
                 except: pass
-        if self.proc and self.proc.state() == QProcess.ProcessState.Running: self.cmd_active = True; self.proc.write(f"{cmd}\n".encode())
-        else: self.term_log.append(f"[ERR] Backend not running. Click Reset.")
+        if self.proc and self.proc.state() == QProcess.ProcessState.Running:
+            self.finish_or_run()
+            cwd = os.path.abspath(self.ide.cwd); paths = lambda rx: [os.path.join(cwd, p) for p in re.findall(rx, cmd)]
+            self.or_run = ToolRun(self.ide.get_proj_root(self.ide.get_context()[0] or "design"), "backend", "openroad", (cmd.split() or [""])[0], cmd,
+                                  inputs=paths(r'(?:read_db|read_def|read_verilog|read_sdc|source)\s+"?([^"\s;]+)'),
+                                  outputs=paths(r'(?:write_def|write_db|-report_file|-output_drc|-guide_file)\s+"?([^"\s;]+)')).start()
+            self.or_before = self.or_usage()
+            self.cmd_active = True; self.proc.write(f"{cmd}\n".encode())
+        else: self.log(f"[ERR] Backend not running. Click Reset.")
     
     def update_view(self):
         try:
@@ -4327,12 +5832,12 @@ class BackendWidget(QWidget):
         proj_root = self.ide.get_proj_root(self.ide.get_context()[0] or "design")
         def_path = os.path.join(proj_root, "results", "final_routed.def")
         if os.path.exists(def_path):
-            self.term_log.append(f"[SYS] Loading Routed Design from: {def_path}")
+            self.log(f"[SYS] Loading Routed Design from: {def_path}")
             self.peeker.load_def_file(def_path); self.chk_nets.setChecked(True)
             self.peeker.show_nets = True; self.peeker.redraw()
             self.viz_tabs.setCurrentIndex(0)
             self._update_design_stats()
-        else: self.term_log.append(f"[ERR] Routed file not found at: {def_path}")
+        else: self.log(f"[ERR] Routed file not found at: {def_path}")
 
     def launch_native_gui(self):
         if not self.active_pdk: return
@@ -4365,7 +5870,7 @@ class BackendWidget(QWidget):
         proj_root = self.ide.get_proj_root(self.ide.get_context()[0] or "design")
         db_path = os.path.join(proj_root, "results", "checkpoint.odb").replace("\\", "/")
         if os.path.exists(db_path):
-            self.term_log.append(f"[SYS] Loading Checkpoint from {db_path}...")
+            self.log(f"[SYS] Loading Checkpoint from {db_path}...")
             self.send_command_internal(f"read_db \"{db_path}\"")
             self.force_refresh_view(); return True
         return False
@@ -4374,21 +5879,23 @@ class BackendWidget(QWidget):
         if not self.proc: return
         proj_root = self.ide.get_proj_root(self.ide.get_context()[0] or "design")
         db_path = os.path.join(proj_root, "results", "checkpoint.odb").replace("\\", "/")
-        self.term_log.append(f"[SYS] Saving Checkpoint to {db_path}...")
+        self.log(f"[SYS] Saving Checkpoint to {db_path}...")
         self.send_command_internal(f"write_db \"{db_path}\"")
 
 
 
 # ================= 4. VOLARE PDK MANAGER (Full Implementation) =================
 
-class VolareWorker(QThread):
+class VolareWorker(JobWorker):
     finished = pyqtSignal(str, str) # cmd_type, output
     log = pyqtSignal(str)
+    GROUP = "volare"; PRIORITY = JOB_BACKGROUND
 
     def __init__(self, cmd_type, args=[]):
         super().__init__()
         self.cmd_type = cmd_type
         self.args = args
+        self.NAME = f"volare {cmd_type}"
 
     def run(self):
         cmd = ["volare"] + self.args
@@ -4396,7 +5903,7 @@ class VolareWorker(QThread):
             self.log.emit(f"[VOLARE] Running: {' '.join(cmd)}...")
             
             # Run Subprocess
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            proc = self.job.popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
             out, _ = proc.communicate()
             
             # === [FIX] Graceful Handling for "Not Found" ===
@@ -4950,7 +6457,12 @@ class SilisIDE(QMainWindow):
         self.resize(1600, 960)
         self.cwd = os.getcwd(); self.current_file = None; self.pdk_path = ""
         self.theme_mode = "dark"  # 'dark' | 'light'
-        self.schem_engine = "Auto"; self.term_mode = "SHELL"; self.queue = queue.Queue()
+        self.schem_engine = "Auto"; self.term_mode = "SHELL"
+        self.bus = EventBus(silis_cache_dir(os.path.expanduser("~"), "logs"))   # worker logs, progress, metrics, job state
+        self.jobs = job_scheduler()   # every external tool run goes through it
+        self.jobs.listeners.append(lambda j: self.bus.job(j.group, j.state, j.name))
+        self.jobs_dialog = None
+        self.sta_service = StaService()   # resident OpenSTA for the flow and interactive queries
         
         # === UX: Keybind State ===
         self.key_map = {
@@ -4974,11 +6486,15 @@ class SilisIDE(QMainWindow):
         self.tab_waves = SignalPeeker(self)
         self.tab_schem = SchematicTab(self)
         self.tab_synth = SynthesisTab(self) # NEW UNIFIED DASHBOARD
+        self.tab_regress = RegressionTab(self)
+        self.tab_flow = FlowTab(self)
         
         self.frontend_tabs.addTab(self.tab_compile, "Compile")
         self.frontend_tabs.addTab(self.tab_waves, "Waveform")
         self.frontend_tabs.addTab(self.tab_schem, "Schematic")
         self.frontend_tabs.addTab(self.tab_synth, "Synthesis")
+        self.frontend_tabs.addTab(self.tab_regress, "Regression")
+        self.frontend_tabs.addTab(self.tab_flow, "Flow")
         self.stack.addWidget(self.frontend_tabs)
         
         # World 2: Backend Layout
@@ -4989,8 +6505,8 @@ class SilisIDE(QMainWindow):
         # Global Input Filter
         QApplication.instance().installEventFilter(self)
         
-        # Background Timer
-        self.queue_timer = QTimer(); self.queue_timer.timeout.connect(self.process_queue); self.queue_timer.start(50)
+        # Worker events arrive as queued signals; nothing polls
+        self.bus.lines.connect(self.show_log_lines); self.bus.posted.connect(self.on_bus_event)
         
         self.log_system(f"Silis Initialized. CWD: {self.cwd}")
         self.check_dependencies()
@@ -5005,7 +6521,12 @@ class SilisIDE(QMainWindow):
         self._sb_mode.setStyleSheet("border: 1px solid; padding: 1px 8px; border-radius: 3px; font-size: 9px; font-weight: 700; letter-spacing: 0.8px; color: #00bcd4;")
         self._sb_info = QLabel("  🐳 Docker / OpenROAD  ")
         self._sb_info.setStyleSheet("font-size: 10px;")
+        self._sb_job = QPushButton("  ⚙ jobs  "); self._sb_job.setFlat(True); self._sb_job.setStyleSheet("font-size: 10px; border:none;")
+        self._sb_job.clicked.connect(self.show_jobs)
+        self._sb_prog = QProgressBar(); self._sb_prog.setFixedWidth(120); self._sb_prog.hide()
         sb.addWidget(self._sb_cwd)
+        sb.addPermanentWidget(self._sb_job)
+        sb.addPermanentWidget(self._sb_prog)
         sb.addPermanentWidget(self._sb_mode)
         sb.addPermanentWidget(self._sb_info)
 
@@ -5041,6 +6562,11 @@ class SilisIDE(QMainWindow):
                         else: self.run_synthesis_flow()
                     return True
 
+                elif key == Qt.Key.Key_F5:
+                    if self.frontend_tabs.currentWidget() is not self.tab_regress: self.frontend_tabs.setCurrentWidget(self.tab_regress)
+                    else: self.tab_regress.run_regression()
+                    return True
+
             # --- SUPER KEY LOGIC (` + Key) ---
             if key == Qt.Key.Key_QuoteLeft: # Backtick `
                 self.sk_active = True
@@ -5094,6 +6620,8 @@ class SilisIDE(QMainWindow):
                 # Give it a moment to write (simple block)
                 self.backend_widget.proc.waitForReadyRead(3000) 
         
+        self.jobs.shutdown()   # kills the process groups of anything still running
+        self.sta_service.close()
         event.accept()
 
     def reset_sk(self): self.sk_active = False; self.statusBar().clearMessage()
@@ -5116,10 +6644,7 @@ class SilisIDE(QMainWindow):
         root = self.prep_workspace(base)
         
         # [FIX] Grab all files, BUT filter out testbenches
-        all_src = glob.glob(os.path.join(root, "source", "*.v")) + glob.glob(os.path.join(root, "source", "*.sv"))
-        
-        # Filter: Exclude files containing 'tb_', '_tb', or 'test_'
-        src = [f for f in all_src if not any(x in os.path.basename(f).lower() for x in ["tb_", "_tb", "test_"])]
+        src = schematic_sources(root)
         
         if not src:
             self.log_system("No synthesis sources found (Check file naming).", "ERR")
@@ -5153,96 +6678,77 @@ class SilisIDE(QMainWindow):
         self.pdk_path = self.active_pdk['lib']
         self.run_synthesis_thread(root, base)
 
+    def sta_query(self, cmd, tag="[STA_Q]"):
+        """Runs one command on the resident STA session and routes its output to `tag`."""
+        if not self.active_pdk: self.log_system("Select a PDK first.", "ERR"); return
+        _, base = self.get_context()
+        if not base: return
+        root = self.get_proj_root(base); lib = self.active_pdk['lib']
+
+        def task(job):
+            job.on_cancel(lambda: self.sta_service.session and kill_group(self.sta_service.session.p, signal.SIGTERM))
+            with ToolRun(root, "sta", "sta", "query", cmd) as tr:
+                before = self.sta_service.usage()
+                try: ok, out = self.sta_service.query(root, base, lib, cmd)
+                except Exception as e: ok, out = False, str(e)
+                tr.usage(*self.sta_service.usage(), before=before); tr.rc = 0 if ok else 1
+            job.log(tag, f"sta> {cmd}\n{out.rstrip() or ('(no output)' if ok else 'error')}")
+            return ok
+
+        # a query waits for a synthesis run of the same project to write its netlist
+        self.jobs.submit(f"sta: {cmd[:40]}", task, group="sta", priority=JOB_INTERACTIVE, root=root, sink=self.bus.log,
+                         deps=self.jobs.active("synth", root))
+
+    def run_fmax_search(self):
+        if not self.active_pdk: 
+            QMessageBox.warning(self, "Err", "Select PDK!"); return
+        _, base = self.get_context()
+        if not base: return
+        root = self.prep_workspace(base)
+        search = FmaxSearch(root, base, self.active_pdk['lib'])
+
+        def task(job):
+            search.log = lambda msg: job.log("[STA]", msg)
+            job.log("[SYS]", f"Fmax search on {base}_netlist.v ({search.workers} STA sessions)...")
+            try: r = search.run()
+            except Exception as e:
+                job.log("[SYS]", f"[ERR] Fmax search failed: {e}"); return False
+            job.log("[STA]", f"Limiting path at {r['period']} ns:\n{r['path']}")
+            job.log("[SYS]", f"Fmax: {r['fmax_mhz']} MHz (period {r['period']} ns, {len(r['probes'])} STA runs) -> reports/fmax.rpt")
+
+        self.jobs.submit(f"fmax {base}", task, group="fmax", cpus=search.workers, root=root, sink=self.bus.log,
+                         on_cancel=search.cancel, deps=self.jobs.active("synth", root))
+
     def run_synthesis_thread(self, root, base):
-        # Clear the unified log before starting
-        self.tab_synth.log_main.clear()
+        # Clear the unified log before starting; the full log of this run goes to .silis_cache/logs/synth.log
+        self.tab_synth.log_main.clear(); self.bus.logs.restart("synth", silis_cache_dir(root, "logs"))
         self.tab_synth.card_status.setText("⟳ RUNNING")
         self.tab_synth.card_status.setStyleSheet("background:#1a1808; color:#d4b44a; font-size:11px; font-weight:700; padding:14px; border-radius:6px; border:1px solid #403010; font-family:JetBrains Mono,Consolas,monospace; letter-spacing:1.5px;")
 
-        v_net = f"netlist/{base}_netlist.v"
-        src_v = glob.glob(os.path.join(root, "source", "*.v"))
-        src_v = [s for s in src_v if "tb_" not in s]
-        read_cmd = f"read_verilog {' '.join(src_v)}" if src_v else ""
-        
-        # --- 1. YOSYS SCRIPT (With Explicit File Dumps) ---
-        # Note the 'tee -o reports/area.rpt' to save area stats to a file
-        ys = f"""
-        read_liberty -lib {self.pdk_path}
-        {read_cmd}
-        synth -top {base}
-        dfflibmap -liberty {self.pdk_path}
-        abc -liberty {self.pdk_path}
-        tee -o reports/area.rpt stat -liberty {self.pdk_path} -json
-        write_verilog -noattr {v_net}
-        """
-        with open(os.path.join(root, "synth.ys"), 'w') as f: f.write(ys)
-        
-        # --- 2. STA SCRIPT (With Explicit File Dumps) ---
-        # Redirects output (>) to timing.rpt and power.rpt
-        tcl = f"""
-        read_liberty {self.pdk_path}
-        read_verilog {v_net}
-        link_design {base}
-        read_sdc netlist/{base}.sdc
-        report_checks -path_delay max -fields {{slew cap input_pins nets fanout}} -format full_clock_expanded -group_count 100 > reports/timing.rpt
-        report_power > reports/power.rpt
-        exit
-        """
-        with open(os.path.join(root, "sta.tcl"), 'w') as f: f.write(tcl)
+        vcd = latest_vcd(root, self.cwd); lib = self.pdk_path
 
-        def task():
-            self.queue.put(("[SYS]", "Starting Synthesis Flow..."))
-            
-            # --- STEP 1: YOSYS ---
-            try:
-                # We pipe output to a file AND the GUI queue
-                log_path = os.path.join(root, "reports/synthesis.log")
-                with open(log_path, "w") as log_file:
-                    p1 = subprocess.Popen(f"yosys synth.ys", shell=True, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
-                    
-                    for line in iter(p1.stdout.readline, ''):
-                        line = line.strip()
-                        if line:
-                            self.queue.put(("[YOSYS]", line)) 
-                            log_file.write(line + "\n")
-                    p1.wait()
-                    if p1.returncode != 0: raise Exception("Yosys Failed")
-            except Exception as e:
-                self.queue.put(("[SYS]", f"[ERR] Yosys Crash: {e}")); return
+        def flow(job):
+            return synth_flow(job, root, base, lib, self.sta_service, vcd,
+                              on_metrics=lambda data, live=False: self.bus.metrics("synth", data, live),
+                              on_progress=lambda *p: self.bus.progress("synth", *p))
 
-            # --- STEP 2: OPENSTA ---
-            try:
-                p2 = subprocess.Popen(f"sta sta.tcl", shell=True, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
-                for line in iter(p2.stdout.readline, ''):
-                    line = line.strip()
-                    if line:
-                        self.queue.put(("[STA]", line)) 
-                p2.wait()
-            except Exception as e:
-                self.queue.put(("[SYS]", f"[ERR] STA Crash: {e}")); return
-
-            self.queue.put(("[SYS]", "Synthesis & Timing Complete."))
-            self.queue.put(("UPDATE_DASHBOARD", None)) # Trigger UI update
-        
-        threading.Thread(target=task, daemon=True).start()
+        prev = self.jobs.active("synth", root)
+        for j in prev: self.jobs.cancel(j)   # a new run supersedes the previous one, and starts once it has unwound
+        self.jobs.submit(f"synth {base}", flow, group="synth", root=root, sink=self.bus.log, after=prev)
 
     def run_simulation(self):
         if self.current_file: self.save_file()
         _, base = self.get_context()
         if not base: return
         root = self.prep_workspace(base)
-        src_v = glob.glob(os.path.join(root, "source", "*.v")) + glob.glob(os.path.join(root, "source", "*.sv"))
-        if not src_v: self.log_system("No source files!", "ERR"); return
-        cmd = ["iverilog", "-g2012", "-o", f"{base}.out"] + src_v
-        def task():
-            try:
-                self.queue.put("[SYS] Compiling...")
-                subprocess.run(cmd, cwd=root, capture_output=True)
-                self.queue.put("[SYS] Simulating...")
-                proc = subprocess.Popen(["vvp", f"{base}.out"], cwd=root, stdout=subprocess.PIPE, text=True, bufsize=1)
-                for line in iter(proc.stdout.readline, ''): self.queue.put(line.strip())
-            except Exception as e: self.queue.put(f"[ERR] {e}")
-        threading.Thread(target=task, daemon=True).start()
+        if not project_sources(root): self.log_system("No source files!", "ERR"); return
+        prefs = load_project_settings(root)
+        self.cb_sim.blockSignals(True); self.cb_sim.setCurrentText(prefs["sim_backend"]); self.cb_sim.blockSignals(False)
+        tbs = discover_testbenches(root)[0]
+        top = next((t for _, t in tbs if t == self.get_context()[0]), tbs[0][1] if tbs else base)
+        self.bus.logs.restart("sim", silis_cache_dir(root, "logs")); self.tab_compile.sim_log.clear()
+        self.tab_compile.bottom_tabs.setCurrentIndex(1)
+        self.jobs.submit(f"sim {top}", lambda job: sim_flow(job, root, base, top), group="sim", root=root, sink=self.bus.log)
 
     # --- HELPERS (Copied & Cleaned) ---
     # ── pill style helpers ────────────────────────────────────────────────────
@@ -5329,10 +6835,25 @@ class SilisIDE(QMainWindow):
         tb.addWidget(self.lbl_pdk_tb)
         tb.addWidget(_div())
 
+        # Simulator backend (stored per project)
+        self.cb_sim = QComboBox(); self.cb_sim.addItems(list(SIM_BACKENDS))
+        self.cb_sim.setToolTip("Simulator for F1 (saved in the project's silis_project.json)")
+        self.cb_sim.setStyleSheet("font-size: 10px; padding: 2px 8px;")
+        self.cb_sim.currentTextChanged.connect(self.set_sim_backend)
+        tb.addWidget(self.cb_sim)
+        tb.addWidget(_div())
+
         btn_set = _ghost("Settings")
         btn_set.clicked.connect(self.open_settings)
         tb.addWidget(btn_set)
 
+    def set_sim_backend(self, name):
+        _, base = self.get_context()
+        if not base: return
+        if not SIM_BACKENDS[name]().available(): self.log_system(f"{name} is not installed; F1 will fall back to icarus", "ERR")
+        save_project_settings(self.get_proj_root(base), sim_backend=name)
+        self.log_system(f"Simulator for {base}: {name}")
+
     def switch_world(self, index):
         self.stack.setCurrentIndex(index)
         self.btn_front.setChecked(index == 0)
@@ -5440,6 +6961,7 @@ class SilisIDE(QMainWindow):
         _cm = {"SYS":"#4a8fc0","ERR":"#f44336","WARN":"#d4b44a","TIP":"#4caf50","RPT":"#9070c0","DBG":"#3a3e52"}
         color = _cm.get(tag, "#4a8fc0") if "ERR" not in tag else "#f44336"
         self.tab_compile.term_log.append(f'<span style="color:{color};">[{tag}] {msg}</span>')
+        self.bus.logs.channel("terminal").record(f"[{tag}] {msg}")
         self.tab_compile.term_log.verticalScrollBar().setValue(self.tab_compile.term_log.verticalScrollBar().maximum())
 
     def change_directory(self, path):
@@ -5495,21 +7017,22 @@ class SilisIDE(QMainWindow):
             return
 
         # ── shell command — run async, stream output ───────────────────────
-        def _run():
+        def _run(job):
             try:
-                proc = subprocess.Popen(
+                proc = job.popen(
                     cmd, shell=True,
                     stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
                     text=True, cwd=self.cwd, bufsize=1
                 )
                 for line in iter(proc.stdout.readline, ''):
-                    self.queue.put(("TERM_OUT", line.rstrip()))
+                    job.log("TERM_OUT", line.rstrip())
                 proc.wait()
                 if proc.returncode != 0:
-                    self.queue.put(("TERM_OUT", f"[exit {proc.returncode}]"))
+                    job.log("TERM_OUT", f"[exit {proc.returncode}]")
+                return proc.returncode == 0
             except Exception as e:
-                self.queue.put(("TERM_OUT", f"[ERR] {e}"))
-        threading.Thread(target=_run, daemon=True).start()
+                job.log("TERM_OUT", f"[ERR] {e}"); return False
+        self.jobs.submit(f"$ {cmd[:40]}", _run, group="shell", priority=JOB_INTERACTIVE, sink=self.bus.log)
 
     def toggle_term_mode(self): 
         self.term_mode = "SIM" if self.term_mode == "SHELL" else "SHELL"
@@ -5545,30 +7068,9 @@ class SilisIDE(QMainWindow):
         if not m: return None, None
         return m.group(1), m.group(1).replace("tb_", "").replace("_tb", "")
 
-    def get_proj_root(self, base):
-        pname = f"{base}_project"; cwd = os.path.abspath(self.cwd)
-        if os.path.basename(cwd) == pname: return cwd
-        if os.path.basename(cwd) in ["source", "netlist"]: return os.path.dirname(cwd)
-        return os.path.join(cwd, pname)
-
-    def prep_workspace(self, base):
-        root = self.get_proj_root(base)
-        src_dir = os.path.join(root, "source")
-        for d in ["source", "netlist", "reports", "results"]: os.makedirs(os.path.join(root, d), exist_ok=True)
-        files = [f"{base}.v", f"tb_{base}.v", f"{base}_tb.v", f"test_{base}.v", f"{base}.sv"]
-        search_dirs = list(set([os.path.abspath(self.cwd), root]))
-        for fname in files:
-            if os.path.exists(os.path.join(src_dir, fname)): continue
-            found = None
-            for s_dir in search_dirs:
-                possible = os.path.join(s_dir, fname)
-                if os.path.exists(possible): found = possible; break
-            if found:
-                try: 
-                    shutil.move(found, os.path.join(src_dir, fname))
-                    self.log_system(f"Moved {fname} -> source/")
-                except: pass
-        return root
+    def get_proj_root(self, base): return project_root(self.cwd, base)
+
+    def prep_workspace(self, base): return prep_workspace(self.cwd, base, log=self.log_system)
 
     def open_waves(self):
         self.frontend_tabs.setCurrentIndex(1)
@@ -5577,40 +7079,37 @@ class SilisIDE(QMainWindow):
     def harvest_logs(self, root):
         p = os.path.join(root, "reports/synthesis.log")
         if os.path.exists(p):
-             with open(p) as f: self.tab_synth.log_main.setPlainText(f.read())
+             self.tab_synth.log_main.open(p)
     
     # --- FIXED QUEUE PROCESSOR ---
     # === REPLACE IN SilisIDE CLASS ===
-    def process_queue(self):
-        while not self.queue.empty():
-            item = self.queue.get()
-            
-            if isinstance(item, tuple): tag, content = item
-            else: tag, content = "SYS", str(item)
-
-            # [NEW] Route terminal command output to the VSCode terminal widget
-            if tag == "TERM_OUT":
-                self.tab_compile.terminal.append_output(content)
-
-            # [NEW] Route Backend-specific messages to Backend Terminal
-            elif tag == "[BACKEND]":
-                self.backend_widget.term_log.append(content)
-                self.backend_widget.term_log.verticalScrollBar().setValue(self.backend_widget.term_log.verticalScrollBar().maximum())
-
-            # Existing Routing...
-            elif tag == "UPDATE_DASHBOARD":
-                self.tab_synth.update_dashboard()
-                
-            elif tag in ["[YOSYS]", "[STA]", "SYNTH_LOG", "STA_LOG"]:
-                self.tab_synth.log_main.append(content)
-                sb = self.tab_synth.log_main.verticalScrollBar()
-                sb.setValue(sb.maximum())
-                
-            elif tag == "[SYS]" or tag == "SYS":
-                self.log_system(content)
-                
-            else:
-                self.log_system(str(item))
+    def show_log_lines(self, name, lines, skipped):
+        sinks = {"synth": self.tab_synth.log_main, "backend": self.backend_widget.term_log,
+                 "terminal": self.tab_compile.term_log, "sta_console": self.tab_synth.sta_out, "sim": self.tab_compile.sim_log, "flow": self.tab_flow.log}
+        if isinstance(sinks[name], LogViewer): sinks[name].open(self.bus.logs.full_log(name), follow=True); return
+        if name == "terminal":   # shell output: ANSI stripped, terminal colours
+            lines = [(VSCodeTerminalWidget.ANSI_ESCAPE.sub("", text), color or "#cccccc") for text, color in lines]
+        append_log(sinks[name], lines, skipped, self.bus.logs.full_log(name))
+
+    def on_bus_event(self, ev):
+        if ev.kind == "metrics" and ev.source == "synth":
+            if ev.live: self.tab_synth.show_live(ev.data)
+            else: self.tab_synth.update_dashboard(ev.data)
+        elif ev.kind == "progress":
+            done, total, text = ev.data
+            self._sb_prog.setRange(0, total); self._sb_prog.setValue(done); self._sb_prog.setVisible(done < total)
+            self._sb_job.setText(f"  {ev.source}: {text}  ")
+        elif ev.kind == "job":
+            state, detail = ev.data
+            n = len(self.jobs.active())
+            self._sb_job.setText(f"  ⚙ {detail or ev.source}: {state}{f'  ·  {n} active' if n else ''}  ")
+            if state != "running" and ev.source == "synth": self._sb_prog.hide()
+            if ev.source == "flow": self.tab_flow.refresh()
+            if self.jobs_dialog: self.jobs_dialog.refresh()
+
+    def show_jobs(self):
+        if not self.jobs_dialog: self.jobs_dialog = JobsDialog(self.jobs, self)
+        self.jobs_dialog.show(); self.jobs_dialog.raise_()
 
     def load_violation_log(self): 
         self.frontend_tabs.setCurrentIndex(3)
@@ -5622,8 +7121,10 @@ class SilisIDE(QMainWindow):
     def update_ui_labels(self): pass
 # ================= WORKER CLASS =================
 
-class SchematicWorker(QThread):
+
+class SchematicWorker(JobWorker):
     finished = pyqtSignal(str); log = pyqtSignal(str, str)
+    NAME = "schematic"; PRIORITY = JOB_INTERACTIVE
     
     def __init__(self, root, base, engine, src_files):
         super().__init__()
@@ -5631,58 +7132,11 @@ class SchematicWorker(QThread):
         self.base = base
         self.src_files = src_files
 
-    def run(self):
-        # 1. Check for Graphviz (The Painter)
-        if not shutil.which("dot"):
-            self.log.emit("Graphviz ('dot') not found!", "ERR")
-            self.log.emit("Run: sudo apt install graphviz", "TIP")
-            return
+    def job_args(self): return {"root": self.root}
 
-        # Prepare paths
-        read_cmd = "".join([f"read_verilog {s}; " for s in self.src_files])
-        dot_base = os.path.join(self.root, self.base) # Yosys adds .dot automatically
-        dot_file = dot_base + ".dot"
-        svg_file = dot_base + ".svg"
-        
-        if os.path.exists(dot_file): os.remove(dot_file)
-
-        # === STRATEGY 1: High-Level RTL (Best for reading) ===
-        # 'proc' converts processes to logic. 'memory' handles arrays.
-        # We explicitly use -prefix to control the output filename.
-        cmd_rtl = f"yosys -p '{read_cmd} hierarchy -check -top {self.base}; proc; opt; show -colors 2 -width -stretch -format dot -prefix {dot_base}'"
-        
-        # === STRATEGY 2: Structural (Fallback if logic is too complex) ===
-        # No optimization, just raw connectivity.
-        cmd_raw = f"yosys -p '{read_cmd} hierarchy -auto-top; proc; show -colors 2 -width -stretch -format dot -prefix {dot_base}'"
-
-        try:
-            self.log.emit("Generating logic graph...", "SYS")
-            
-            # Try elegant RTL view first
-            res = subprocess.run(cmd_rtl, shell=True, cwd=self.root, capture_output=True, text=True)
-            
-            # If RTL view failed (or produced empty dot), try raw view
-            if not os.path.exists(dot_file):
-                self.log.emit("Complex render failed. Trying structural view...", "WARN")
-                subprocess.run(cmd_raw, shell=True, cwd=self.root, capture_output=True, text=True)
-
-            # 3. Convert DOT to SVG (The Visualizer)
-            if os.path.exists(dot_file):
-                self.log.emit("Rendering SVG...", "SYS")
-                # -Grankdir=LR makes it flow Left-to-Right (Standard Schematic style)
-                subprocess.run(f"dot -Tsvg {dot_file} -o {svg_file} -Grankdir=LR", shell=True, cwd=self.root)
-                
-                if os.path.exists(svg_file):
-                    self.finished.emit(svg_file)
-                    self.log.emit("Schematic Ready.", "SYS")
-                else:
-                    self.log.emit("Graphviz failed to convert DOT to SVG.", "ERR")
-            else:
-                self.log.emit("Yosys failed to generate graph. Check syntax.", "ERR")
-                self.log.emit(f"Yosys Stderr: {res.stderr[:200]}...", "DBG")
-
-        except Exception as e:
-            self.log.emit(f"Schematic Engine Crash: {e}", "ERR")
+    def run(self):
+        svg = render_schematic(self.root, self.base, self.src_files, self.log.emit)
+        if svg: self.finished.emit(svg)
 
 
 
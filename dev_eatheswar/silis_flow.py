@@ -0,0 +1,3347 @@
+# =========================== SILIS FLOW CORE ===========================
+"""
+The Qt-free half of Silis: PDK aliases, content caches, tool telemetry, the
+job scheduler, simulation / synthesis / STA / OpenROAD / Magic steps, the
+VCD engine (parser, expressions, search, golden diff), report parsing and
+the make-style flow DAG. pocpnrv37.py builds the IDE on top of it; `silis
+run` (flow_cli below) drives the same stages with no GUI, `silis batch`
+(batch_cli) runs them for many projects at once and `silis wavediff` checks
+a dump against a golden one in CI.
+"""
+
+import sys
+import os
+import subprocess
+import threading
+import queue
+import glob
+import re
+import shutil
+import json
+import hashlib
+import fnmatch
+import concurrent.futures
+import collections
+import itertools
+import signal
+import atexit
+import time
+import datetime
+from contextlib import suppress
+import numpy as np
+
+class HeaderFactory:
+    """Central factory for the ASCII branding."""
+    ASCII_ART = """
+███████╗ ██╗ ██╗      ██╗ ███████╗
+██╔════╝ ██║ ██║      ██║ ██╔════╝
+███████╗ ██║ ██║      ██║ ███████╗
+╚════██║ ██║ ██║      ██║ ╚════██║
+███████║ ██║ ███████╗ ██║ ███████║
+╚══════╝ ╚═╝ ╚══════╝ ╚═╝ ╚══════╝
+    """
+    TAGLINE = "Silis — Silicon Scaffold"
+    COPYRIGHT = "TO BE COPYRIGHTED"
+    LICENSE = "TO BE LICENCED UNDER OPEN-SOURCE"
+
+    @staticmethod
+    def get_raw_header():
+        return f"{HeaderFactory.ASCII_ART}\n{HeaderFactory.TAGLINE}\n{HeaderFactory.COPYRIGHT}\n{HeaderFactory.LICENSE}\n"
+
+
+# ================= PDK MANAGEMENT SYSTEM =================
+
+class SSAForge:
+    """
+    Silis Standard Aliases (SSA) - The Forge
+    Decouples the IDE from specific PDK naming conventions.
+    """
+    # 1. HARDCODED DEFAULTS (Failsafe)
+    DEFAULT_PDK = "sky130_fd_sc_hd"
+    ALIASES = {
+        "sky130_fd_sc_hd": {
+            "desc": "SkyWater 130nm High Density",
+            "tap_cell": "sky130_fd_sc_hd__tapvpwrvgnd_1",
+            "tap_dist": 14,
+            "cts_root": "sky130_fd_sc_hd__clkbuf_16",
+            "cts_leaf": "sky130_fd_sc_hd__clkbuf_4",
+            "fill": "sky130_fd_sc_hd__fill_*",
+            "tie_hi": "sky130_fd_sc_hd__conb_1",
+            "tie_lo": "sky130_fd_sc_hd__conb_1",
+            "min_layer": "met1",
+            "max_layer": "met5",
+            "driver": "sky130_fd_sc_hd__buf_1"
+        }
+    }
+
+    @staticmethod
+    def load_aliases(json_filename="pdk_aliases.json"):
+        """
+        Loads aliases from disk. 
+        Checks CWD first, then the script's own directory.
+        """
+        # 1. Check Current Working Directory
+        paths_to_check = [os.path.abspath(json_filename)]
+        
+        # 2. Check Script Directory (Crucial for execution from other folders)
+        if hasattr(sys, 'argv') and sys.argv:
+            script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+            paths_to_check.append(os.path.join(script_dir, json_filename))
+
+        loaded = False
+        for path in paths_to_check:
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r') as f:
+                        data = json.load(f)
+                        # Update existing, don't overwrite blindly
+                        SSAForge.ALIASES.update(data) 
+                        print(f"[SSA] Loaded aliases from: {path}")
+                        loaded = True
+                        break
+                except Exception as e:
+                    print(f"[SSA] Error parsing {path}: {e}")
+        
+        if not loaded:
+            print("[SSA] No external JSON found. Using built-in defaults.")
+
+    @staticmethod
+    def resolve_pdk_key(pdk_name, lib_path=None):
+        """Matches a name or file path to a known PDK key."""
+        # 1. Clean inputs
+        pdk_name = str(pdk_name).lower() if pdk_name else ""
+        lib_path = str(lib_path).lower() if lib_path else ""
+
+        # 2. Search Keys
+        for key in SSAForge.ALIASES:
+            key_lower = key.lower()
+            # Strict check first
+            if key_lower == pdk_name: return key
+            
+            # Fuzzy name check
+            if key_lower in pdk_name: return key
+            
+            # File path check (e.g. "sky130_fd_sc_hd__tt.lib")
+            if lib_path and key_lower in os.path.basename(lib_path):
+                return key
+
+        # 3. Fallback: If "sky130" is anywhere, assume HD
+        if "sky130" in pdk_name or "sky130" in lib_path:
+            return "sky130_fd_sc_hd"
+
+        return SSAForge.DEFAULT_PDK
+
+    @staticmethod
+    def get(pdk_name, key, lib_path=None):
+        family = SSAForge.resolve_pdk_key(pdk_name, lib_path)
+        val = SSAForge.ALIASES.get(family, {}).get(key, "")
+        
+        # If specific key missing in found family, try default family
+        if not val and family != SSAForge.DEFAULT_PDK:
+             val = SSAForge.ALIASES.get(SSAForge.DEFAULT_PDK, {}).get(key, "")
+             
+        return val
+
+    @staticmethod
+    def get_tap_cmd(pdk_name, lib_path=None):
+        cell = SSAForge.get(pdk_name, "tap_cell", lib_path)
+        dist = SSAForge.get(pdk_name, "tap_dist", lib_path)
+        if not cell: return "# [SSA ERROR] No TAP cell defined in aliases"
+        return f"tapcell -distance {dist} -tapcell_master {cell}; make_tracks"
+
+    @staticmethod
+    def get_cts_cmd(pdk_name, lib_path=None):
+        root = SSAForge.get(pdk_name, "cts_root", lib_path)
+        leaf = SSAForge.get(pdk_name, "cts_leaf", lib_path)
+        if not root: return "clock_tree_synthesis; detailed_placement"
+        return f"clock_tree_synthesis -root_buf {root} -buf_list {leaf}; detailed_placement"
+
+
+
+class PDKManager:
+    def __init__(self):
+        self.cache_file = os.path.expanduser("~/.silis_pdk_cache.json")
+        self.configs = []
+        self.load_cache()
+
+    def load_cache(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r') as f: 
+                    self.configs = json.load(f)
+            except: 
+                self.configs = []
+
+    def save_cache(self):
+        with open(self.cache_file, 'w') as f: 
+            json.dump(self.configs, f, indent=2)
+    
+    def update_config(self, config_data):
+        # Remove existing if name matches (Edit Mode)
+        self.configs = [c for c in self.configs if c['name'] != config_data['name']]
+        # Insert new at top
+        self.configs.insert(0, config_data)
+        self.save_cache()
+    
+    def delete_config(self, name):
+        self.configs = [c for c in self.configs if c['name'] != name]
+        self.save_cache()
+    def add_manual_config(self, name, tlef, lef, lib, gds):
+        # Insert at top
+        entry = {
+            "name": name, 
+            "tlef": tlef, 
+            "lef": lef, 
+            "lib": lib, 
+            "gds": gds, # The missing link for GDS generation
+            "corner": "Manual"
+        }
+        # Remove duplicates based on name to avoid clutter
+        self.configs = [c for c in self.configs if c['name'] != name]
+        self.configs.insert(0, entry)
+        self.save_cache()
+
+
+# ================= CONTENT CACHE HELPERS =================
+
+def silis_cache_dir(root, *sub):
+    """Per-project cache folder (<root>/.silis_cache/...), created on demand."""
+    path = os.path.join(root, ".silis_cache", *sub)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def file_fingerprint(path):
+    """Cheap identity of a file: absolute path + size + mtime (no content read)."""
+    try: st = os.stat(path)
+    except OSError: return f"{os.path.abspath(path)}:missing"
+    return f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+def cache_key(*parts):
+    """Stable short hash of any JSON-able parts."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+_digests = {}
+
+def file_digest(path):
+    """sha1 of a file's contents, remembered per fingerprint so big liberty files are hashed once."""
+    fp = file_fingerprint(path)
+    if fp not in _digests:
+        h = hashlib.sha1()
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+            _digests[fp] = h.hexdigest()
+        except OSError: _digests[fp] = "missing"
+    return _digests[fp]
+
+
+# === TOOL TELEMETRY LEDGER ===
+
+TELEMETRY_LOG = os.path.join("reports", "telemetry.jsonl")
+TELEMETRY_KEEP = 5000            # ledger lines kept once the file is trimmed
+_telemetry_lock = threading.Lock()
+_flow_runs = {}
+
+def begin_flow_run(root, flow):
+    """Starts a new run of a project's flow; the ToolRuns that follow are grouped under its id."""
+    t = time.time()
+    _flow_runs[(os.path.abspath(root), flow)] = rid = f"{flow}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(t))}-{int(t * 1000) % 1000:03d}"
+    return rid
+
+def flow_run(root, flow):
+    return _flow_runs.get((os.path.abspath(root), flow)) or begin_flow_run(root, flow)
+
+def proc_usage(pid):
+    """(CPU seconds incl. reaped children, peak RSS bytes) of a live process from /proc; Nones where unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as f: fields = f.read().rsplit(")", 1)[1].split()
+        cpu = sum(int(v) for v in fields[11:15]) / os.sysconf("SC_CLK_TCK")
+        with open(f"/proc/{pid}/status") as f: hwm = next((int(l.split()[1]) * 1024 for l in f if l.startswith("VmHWM:")), None)
+        return cpu, hwm
+    except (OSError, ValueError, IndexError): return None, None
+
+def tree_peak_rss(pid):
+    """Largest VmHWM in a process tree, skipping processes still running our own executable (not yet exec'd)."""
+    own, peak, todo = os.path.realpath("/proc/self/exe"), None, [pid]
+    while todo:
+        p = todo.pop()
+        with suppress(OSError):
+            with open(f"/proc/{p}/task/{p}/children") as f: todo += f.read().split()
+        with suppress(OSError, ValueError):
+            if os.path.realpath(f"/proc/{p}/exe") == own: continue
+            hwm = proc_usage(p)[1]
+            if hwm: peak = max(peak or 0, hwm)
+    return peak
+
+def cgroup_usage(cid):
+    """(CPU seconds, peak memory bytes) of a docker container from its cgroup v2 files; Nones where unavailable."""
+    for d in (f"/sys/fs/cgroup/system.slice/docker-{cid}.scope", f"/sys/fs/cgroup/docker/{cid}"):
+        try:
+            with open(os.path.join(d, "cpu.stat")) as f: cpu = next(int(l.split()[1]) for l in f if l.startswith("usage_usec")) / 1e6
+        except (OSError, StopIteration, ValueError): continue
+        peak = None
+        with suppress(OSError, ValueError):
+            with open(os.path.join(d, "memory.peak")) as f: peak = int(f.read())
+        return cpu, peak
+    return None, None
+
+def record_tool_run(root, entry):
+    """Appends one entry to <root>/reports/telemetry.jsonl, trimming the oldest lines once it grows past a few MB."""
+    path = os.path.join(root, TELEMETRY_LOG)
+    with _telemetry_lock, suppress(OSError):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f: f.write(json.dumps(entry) + "\n")
+        if os.path.getsize(path) > 4 << 20:
+            with open(path) as f: lines = f.readlines()[-TELEMETRY_KEEP:]
+            with open(path + ".tmp", "w") as f: f.writelines(lines)
+            os.replace(path + ".tmp", path)
+
+def load_telemetry(root):
+    entries = []
+    with suppress(OSError):
+        with open(os.path.join(root, TELEMETRY_LOG)) as f:
+            for line in f:
+                with suppress(ValueError): entries.append(json.loads(line))
+    return entries
+
+def telemetry_runs(entries):
+    """Ledger entries grouped per run, newest first: dicts with span, summed CPU, peak RSS, failures and the entries."""
+    runs = {}
+    for e in entries: runs.setdefault(e.get("run"), []).append(e)
+    out = []
+    for rid, es in runs.items():
+        t0 = min(e["t0"] for e in es); t1 = max(e["t0"] + e["wall"] for e in es)
+        out.append({"run": rid, "flow": es[0].get("flow"), "t0": t0, "span": t1 - t0, "wall": sum(e["wall"] for e in es),
+                    "cpu": sum(e.get("cpu") or 0 for e in es), "rss": max((e.get("rss") or 0 for e in es), default=0),
+                    "fails": sum(1 for e in es if e.get("rc") not in (0, None)), "entries": es})
+    return sorted(out, key=lambda r: r["t0"], reverse=True)
+
+
+class ToolRun:
+    """
+    One ledger entry per tool invocation: wall and CPU time, peak RSS, exit
+    code, input hashes and output sizes. Start the process with popen()/run()
+    and reap it with wait(): CPU comes from wait4 for that process tree alone,
+    peak RSS from /proc samples taken while it runs (wait4's maxrss includes
+    the IDE's own size at fork). Long-lived sessions report deltas via usage().
+    """
+    def __init__(self, root, flow, tool, step="", cmd="", inputs=(), outputs=()):
+        self.root, self.flow, self.tool, self.step = root, flow, tool, step
+        self.cmd = cmd if isinstance(cmd, str) else " ".join(map(str, cmd))
+        self.inputs, self.outputs = list(inputs), list(outputs)
+        self.rc = self.cpu = self.rss = None; self.t0 = None; self.done = threading.Event()
+
+    def start(self):
+        self.t0 = time.time(); return self
+
+    def popen(self, cmd, **kw):
+        """subprocess.Popen that samples the peak RSS of the process tree until wait()."""
+        self.cmd = self.cmd or (cmd if isinstance(cmd, str) else " ".join(map(str, cmd)))
+        job = current_job()
+        if job: job.check(); kw.setdefault("start_new_session", True)   # one process group to cancel
+        p = subprocess.Popen(cmd, **kw)
+        if job: job.attach(p)
+        def sample():
+            while True:
+                self.usage(None, tree_peak_rss(p.pid))
+                if self.done.wait(0.05): return
+        threading.Thread(target=sample, daemon=True).start()
+        return p
+
+    def wait(self, p):
+        """Reaps a Popen with wait4 and returns its exit code."""
+        try:
+            _, status, ru = os.wait4(p.pid, 0)
+            p.returncode = os.waitstatus_to_exitcode(status)
+            self.usage(ru.ru_utime + ru.ru_stime, None)
+        except ChildProcessError: p.wait()
+        finally: self.done.set()
+        self.rc = p.returncode
+        return p.returncode
+
+    def run(self, cmd, **kw):
+        """subprocess.run(cmd, capture_output=True, text=True, **kw), measured."""
+        with self.popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **kw) as p:
+            err = []; th = threading.Thread(target=lambda: err.append(p.stderr.read()), daemon=True); th.start()
+            out = p.stdout.read(); th.join(); self.wait(p)
+        return subprocess.CompletedProcess(cmd, p.returncode, out, err[0] if err else "")
+
+    def usage(self, cpu, rss, before=None):
+        """Records CPU seconds and peak RSS; with before=(cpu, rss) the CPU is the difference (resident sessions)."""
+        if cpu is not None: self.cpu = cpu - (before[0] or 0) if before else cpu
+        if rss: self.rss = max(self.rss or 0, rss)
+
+    def finish(self, rc=None):
+        if rc is not None: self.rc = rc
+        path = lambda p: os.path.join(self.root, p)
+        rel = lambda p: os.path.relpath(path(p), self.root)
+        entry = {
+            "run": flow_run(self.root, self.flow), "flow": self.flow, "tool": self.tool, "step": self.step, "cmd": self.cmd[:300],
+            "t0": round(self.t0, 3), "wall": round(time.time() - self.t0, 3), "cpu": None if self.cpu is None else round(self.cpu, 3),
+            "rss": self.rss, "rc": self.rc,
+            "inputs": {rel(p): file_digest(path(p))[:16] for p in self.inputs if os.path.isfile(path(p))},
+            "outputs": {rel(p): os.path.getsize(path(p)) for p in self.outputs if os.path.isfile(path(p))}}
+        job = current_job()
+        if job: entry["job"] = job.name; job.runs.append(entry)
+        record_tool_run(self.root, entry)
+
+    def __enter__(self): return self.start()
+
+    def __exit__(self, et, e, tb):
+        if self.rc is None and et: self.rc = -1
+        self.done.set(); self.finish()
+        return False
+
+
+# === JOB SCHEDULER (bounded pool, priorities, dependencies, process-group cancel) ===
+
+JOB_INTERACTIVE, JOB_FLOW, JOB_BACKGROUND = 0, 10, 20   # lower starts first; interactive jobs skip the CPU budget
+JOB_KILL_GRACE = 2.0       # seconds between SIGTERM and SIGKILL of a cancelled job's process groups
+JOB_MEM_FLOOR = 256 << 20  # MemAvailable kept free; below it only one job runs
+JOB_HISTORY = 200          # finished jobs kept for the jobs panel
+JOB_ACTIVE = ("queued", "running")
+_job_local = threading.local()
+
+def current_job():
+    """The Job whose fn is running on this thread, if any; tool launches attach their processes to it."""
+    return getattr(_job_local, "job", None)
+
+def bind_job(job):
+    """Makes job the current_job() of this thread, so a pool thread working for it launches tools under it."""
+    _job_local.job = job
+
+def mem_available():
+    try:
+        with open("/proc/meminfo") as f: return next(int(l.split()[1]) * 1024 for l in f if l.startswith("MemAvailable:"))
+    except (OSError, StopIteration, ValueError): return None
+
+def kill_group(p, sig):
+    with suppress(OSError): os.killpg(p.pid, sig)
+
+
+class JobCancelled(Exception): pass
+
+
+class Job:
+    """
+    fn(job) run by a JobScheduler. Processes started with job.popen() or a
+    ToolRun on the job's thread get a session of their own, so cancel() can
+    signal each whole process group; on_cancel() hooks stop anything else
+    (resident sessions, internal pools). log() lines go to the job's log file
+    under .silis_cache/jobs and on to `sink`; ToolRun ledger entries made while
+    it runs are tagged with the job and kept in job.runs.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, name, fn, group=None, priority=JOB_FLOW, deps=(), after=(), cpus=1, mem=0, root=None, sink=None, on_cancel=None):
+        self.id = next(Job._ids); self.name = name; self.fn = fn; self.group = group or name
+        self.priority = priority; self.deps = list(deps); self.after = list(after); self.cpus = max(1, cpus); self.mem = mem
+        self.root = root; self.sink = sink
+        self.state = "queued"; self.result = self.error = None; self.cancelled = False
+        self.procs = []; self.hooks = [on_cancel] if on_cancel else []; self.runs = []; self.lock = threading.Lock(); self.finished = threading.Event()
+        self.t_submit = time.time(); self.t_start = self.t_end = None
+        self.log_path = os.path.join(silis_cache_dir(root, "jobs"), re.sub(r"[^\w.-]+", "_", name)[:60] + ".log") if root else None
+        self._log = None
+
+    def log(self, tag, text):
+        """One line for the job log; also passed to the sink unless tag is None."""
+        with self.lock:
+            if self.log_path and not self._log:
+                with suppress(OSError): self._log = open(self.log_path, "w", encoding="utf-8", errors="replace")
+            if self._log: self._log.write(f"{text}\n")
+        if self.sink and tag: self.sink(tag, text)
+
+    def check(self):
+        if self.cancelled: raise JobCancelled(self.name)
+
+    def attach(self, p):
+        """Puts a started process under the job; a cancelled job kills it straight away."""
+        with self.lock: self.procs.append(p); dead = self.cancelled
+        if dead: kill_group(p, signal.SIGKILL)
+        return p
+
+    def popen(self, cmd, **kw):
+        self.check(); kw.setdefault("start_new_session", True)
+        return self.attach(subprocess.Popen(cmd, **kw))
+
+    def on_cancel(self, fn):
+        self.hooks.append(fn); return fn
+
+    def cancel(self):
+        """SIGTERM to every process group of the job (SIGKILL after JOB_KILL_GRACE) and runs the cancel hooks."""
+        with self.lock:
+            if self.cancelled or self.state not in JOB_ACTIVE: return False
+            self.cancelled = True; procs = list(self.procs)
+        for p in procs: kill_group(p, signal.SIGTERM)
+        for fn in self.hooks:
+            with suppress(Exception): fn()
+        if procs: threading.Timer(JOB_KILL_GRACE, lambda: [kill_group(p, signal.SIGKILL) for p in procs]).start()
+        return True
+
+    def wait(self, timeout=None):
+        self.finished.wait(timeout); return self.state
+
+    def summary(self):
+        """Queue wait, run time and the summed CPU / peak RSS of the tools it ran."""
+        now = time.time()
+        return {"id": self.id, "name": self.name, "group": self.group, "priority": self.priority, "state": self.state,
+                "waited": (self.t_start or now) - self.t_submit, "ran": ((self.t_end or now) - self.t_start) if self.t_start else 0.0,
+                "cpu": sum(r.get("cpu") or 0 for r in self.runs), "rss": max((r.get("rss") or 0 for r in self.runs), default=0),
+                "tools": len(self.runs), "error": self.error, "log": self.log_path}
+
+
+class JobScheduler:
+    """
+    Every external tool the IDE launches runs as a Job here. A queued job
+    starts once its deps are done and its `after` jobs have ended (in any
+    state), and its cpus fit the core count left by the
+    running jobs (interactive jobs skip that check) and its mem fits
+    MemAvailable; when nothing runs, the best job starts whatever it asks for.
+    Among ready jobs the lowest priority value goes first, then the oldest. A
+    failed or cancelled dependency cancels its dependents. Listeners get
+    every job on each state change, from the thread that changed it.
+    """
+    def __init__(self, cpus=None):
+        self.cpus = cpus or os.cpu_count() or 2
+        self.cond = threading.Condition(); self.queued = []; self.running = []
+        self.history = collections.deque(maxlen=JOB_HISTORY); self.listeners = []; self.closed = False
+
+    def submit(self, name, fn, **kw):
+        job = Job(name, fn, **kw)
+        with self.cond:
+            if self.closed: raise RuntimeError("scheduler is shut down")
+            self.queued.append(job); started = self._dispatch()
+        self._notify([job] + started)
+        return job
+
+    def active(self, group=None, root=None):
+        """Queued and running jobs, optionally of one group / project (use as deps)."""
+        with self.cond:
+            return [j for j in self.running + self.queued
+                    if (group is None or j.group == group) and (root is None or j.root == root)]
+
+    def jobs(self):
+        with self.cond: return self.running + self.queued + list(self.history)[::-1]
+
+    def cancel(self, what):
+        """Cancels a Job, or every active job of a group name; returns how many were cancelled."""
+        with self.cond:
+            jobs = [what] if isinstance(what, Job) else [j for j in self.running + self.queued if j.group == what]
+            dropped = [j for j in jobs if j in self.queued]
+            for j in dropped: self._end(j, "cancelled", "cancelled before it started")
+            started = self._dispatch()
+        n = len(dropped) + sum(1 for j in jobs if j not in dropped and j.cancel())
+        self._notify(dropped + started)
+        return n
+
+    def shutdown(self, timeout=3.0):
+        """Cancels everything (the IDE is closing) and waits briefly for running jobs to unwind."""
+        with self.cond: self.closed = True; queued = list(self.queued); running = list(self.running)
+        for j in queued + running: self.cancel(j)
+        deadline = time.time() + timeout
+        for j in running: j.finished.wait(max(0.0, deadline - time.time()))
+
+    def _fits(self, job):
+        if not self.running: return True
+        if job.priority > JOB_INTERACTIVE and job.cpus + sum(j.cpus for j in self.running if j.priority > JOB_INTERACTIVE) > self.cpus: return False
+        free = mem_available()
+        return free is None or free - sum(j.mem for j in self.running) - job.mem >= JOB_MEM_FLOOR
+
+    def _dispatch(self):
+        """Holding cond: drops jobs whose deps failed, then starts every ready job that fits. Returns what changed."""
+        changed = []
+        for j in [j for j in self.queued if any(d.state in ("failed", "cancelled") for d in j.deps)]:
+            bad = next(d for d in j.deps if d.state in ("failed", "cancelled"))
+            self._end(j, "cancelled", f"dependency {bad.name} {bad.state}"); changed.append(j)
+        if changed: changed += self._dispatch()
+        ready = sorted((j for j in self.queued if all(d.state == "done" for d in j.deps) and not any(a.state in JOB_ACTIVE for a in j.after)),
+                       key=lambda j: (j.priority, j.id))
+        for j in ready:
+            if not self._fits(j): continue
+            self.queued.remove(j); self.running.append(j)
+            j.state = "running"; j.t_start = time.time(); changed.append(j)
+            threading.Thread(target=self._run, args=(j,), daemon=True, name=f"job-{j.id}").start()
+        return changed
+
+    def _end(self, job, state, error=None):
+        """Holding cond: moves a job to history in its final state."""
+        if job in self.queued: self.queued.remove(job)
+        if job in self.running: self.running.remove(job)
+        job.state = state; job.error = job.error or error; job.t_end = time.time()
+        self.history.append(job)
+        with job.lock:
+            if job._log: job._log.close(); job._log = None
+        job.finished.set()
+
+    def _run(self, job):
+        _job_local.job = job
+        state = "done"
+        try:
+            job.result = job.fn(job)
+            if job.result is False: state = "failed"
+        except JobCancelled: state = "cancelled"
+        except Exception as e:
+            state = "failed"; job.error = str(e)
+            job.log("[SYS]", f"[ERR] {job.name}: {e}")
+        finally: _job_local.job = None
+        if job.cancelled: state = "cancelled"
+        s = job.summary()
+        job.log(None, f"[JOB] {job.name}: {state} after {s['ran']:.1f}s (queued {s['waited']:.1f}s, {s['tools']} tool runs, "
+                         f"{s['cpu']:.1f}s CPU, peak {s['rss'] >> 20} MB)")
+        with self.cond:
+            self._end(job, state); started = self._dispatch()
+        self._notify([job] + started)
+
+    def _notify(self, jobs):
+        for j in jobs:
+            for fn in list(self.listeners):
+                with suppress(Exception): fn(j)
+
+
+_scheduler = None
+
+def job_scheduler():
+    """The process-wide JobScheduler; its jobs are cancelled when the interpreter exits."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler(); atexit.register(_scheduler.shutdown)
+    return _scheduler
+
+
+# === DUMP PROFILES (Targeted $dumpvars for the next simulation) ===
+
+DUMP_PROFILE = "dump_profile.json"
+DUMP_CALL_RE = re.compile(r"\$dump(?:file|vars|all|on|off|limit|flush)\b[^;]*;")
+
+def load_dump_profile(root):
+    """The project's saved dump profile, or None when absent or switched off."""
+    try:
+        with open(os.path.join(root, DUMP_PROFILE)) as f: prof = json.load(f)
+    except (OSError, ValueError): return None
+    return prof if prof.get("enabled", True) else None
+
+def save_dump_profile(root, profile):
+    with open(os.path.join(root, DUMP_PROFILE), "w") as f: json.dump(profile, f, indent=2)
+
+def tb_dumpfile(src_files):
+    """First $dumpfile name found in the sources (None if the testbench never names one)."""
+    for src in src_files:
+        try:
+            with open(src, errors="replace") as f: m = re.search(r'\$dumpfile\s*\(\s*"([^"]+)"', f.read())
+        except OSError: continue
+        if m: return m.group(1)
+    return None
+
+def instrument_dump_profile(root, src_files, profile, dumpfile, bind_top=None):
+    """
+    Copies every source that issues its own $dump* calls with those calls
+    neutralised and adds a silis_dump root module that dumps only the
+    profile's scopes/signals inside its time windows. Hierarchical names are
+    unchanged because silis_dump is a separate root, not a wrapper. Verilator
+    elaborates only --top-module, so with bind_top silis_dump is bound into
+    that module instead and names the targets from $root.
+    Returns the file list to hand to the simulator.
+    """
+    out_dir = silis_cache_dir(root, "dump_profile")
+    files = []
+    for src in src_files:
+        with open(src, errors="replace") as f: text = f.read()
+        if "$dump" not in text: files.append(src); continue
+        dst = os.path.join(out_dir, os.path.basename(src))
+        with open(dst, "w") as f: f.write(f"// silis dump profile: instrumented copy of {src}\n" + DUMP_CALL_RE.sub(";", text))
+        files.append(dst)
+    ts = profile.get("timescale", "1ns")
+    body = [f'    $dumpfile("{dumpfile}");']
+    targets = [(0, s) for s in profile.get("scopes", [])] + [(1, s) for s in profile.get("signals", [])]
+    path = (lambda name: f"$root.{name}") if bind_top else (lambda name: name)
+    body += [f"    $dumpvars({d}, {path(name)});" for d, name in targets] or ["    $dumpvars;"]
+    windows = []
+    for a, b in sorted((int(a), int(b)) for a, b in profile.get("windows", []) if int(b) > int(a)):
+        if windows and a <= windows[-1][1]: windows[-1][1] = max(windows[-1][1], b)   # merge overlaps
+        else: windows.append([a, b])
+    if windows and windows[0][0] > 0: body.append("    $dumpoff;")
+    t = 0
+    for a, b in windows:
+        if a > t: body.append(f"    #{a - t} $dumpon;")
+        body.append(f"    #{b - a} $dumpoff;"); t = b
+    top = os.path.join(out_dir, "silis_dump.v")
+    with open(top, "w") as f:
+        f.write("// Generated by silis from dump_profile.json -- do not edit\n"
+                f"`timescale {ts}/{ts}\nmodule silis_dump;\n  initial begin\n" + "\n".join(body) + "\n  end\nendmodule\n"
+                + (f"bind {bind_top} silis_dump silis_dump_i();\n" if bind_top else ""))
+    return files + [top]
+
+def record_sim_run(root, vcd_path, seconds, profiled, backend="icarus", digest=None):
+    """Appends this run to reports/sim_runs.json and describes it against earlier runs."""
+    size = os.path.getsize(vcd_path) if vcd_path and os.path.exists(vcd_path) else 0
+    log = os.path.join(root, "reports", "sim_runs.json"); os.makedirs(os.path.dirname(log), exist_ok=True)
+    try:
+        with open(log) as f: runs = json.load(f)
+    except (OSError, ValueError): runs = []
+    full = next((r for r in reversed(runs) if not r["profiled"] and r["vcd_bytes"] and r.get("backend", "icarus") == backend), None)
+    other = next((r for r in reversed(runs) if digest and r.get("digest") == digest and r.get("backend", "icarus") != backend and r["profiled"] == profiled), None)
+    runs = (runs + [{"time": datetime.datetime.now().isoformat(timespec="seconds"), "backend": backend, "digest": digest,
+                     "profiled": profiled, "vcd_bytes": size, "sim_s": round(seconds, 3)}])[-50:]
+    with open(log, "w") as f: json.dump(runs, f, indent=1)
+    mb = lambda n: f"{n / 1e6:.2f} MB" if abs(n) >= 1e6 else f"{n / 1e3:.1f} KB"
+    vs = ""
+    if other:   # same sources and dump settings, other simulator: side-by-side runtime
+        fast = other["sim_s"] / seconds if seconds else 0
+        vs = f" | {backend} {seconds:.2f}s vs {other['backend']} {other['sim_s']:.2f}s ({fast:.1f}x)"
+    if not size: return f"Simulation {seconds:.2f}s (no VCD written){vs}"
+    msg = f"VCD {mb(size)}, sim {seconds:.2f}s{vs}"
+    if profiled and full:
+        saved = full["vcd_bytes"] - size
+        msg += f" | vs full dump {mb(full['vcd_bytes'])} / {full['sim_s']:.2f}s: saved {mb(saved)} ({100 * saved / full['vcd_bytes']:.0f}%) and {full['sim_s'] - seconds:.2f}s"
+    elif profiled: msg += " | no full-dump run on record to compare against"
+    return msg
+
+
+# === IVERILOG BUILD CACHE (Content-Hashed .vvp Images) ===
+
+IVERILOG_KEEP = 4        # recent builds kept per testbench
+INCLUDE_RE = re.compile(r'`include\s+"([^"]+)"')
+_tool_versions = {}
+
+def tool_version(cmd):
+    """First line of a tool's version banner, looked up once per session."""
+    key = tuple(cmd)
+    if key not in _tool_versions:
+        try: out = subprocess.run(cmd, capture_output=True, text=True, timeout=10, stdin=subprocess.DEVNULL)
+        except (OSError, subprocess.SubprocessError): out = None
+        _tool_versions[key] = ((out.stdout or out.stderr).strip().splitlines() or ["?"])[0] if out else "missing"
+    return _tool_versions[key]
+
+def source_closure(files, inc_dirs=(), cwd=None):
+    """The sources plus every file they `include, resolved against the including file's dir, cwd and -I dirs."""
+    seen, todo = [], list(files)
+    while todo:
+        path = os.path.abspath(todo.pop())
+        if path in seen or not os.path.isfile(path): continue
+        seen.append(path)
+        with open(path, errors="replace") as f: incs = INCLUDE_RE.findall(f.read())
+        for inc in incs:
+            for d in [os.path.dirname(path), cwd or os.getcwd(), *inc_dirs]:
+                cand = os.path.join(d, inc)
+                if os.path.isfile(cand): todo.append(cand)
+    return sorted(seen)
+
+def sources_digest(sources, inc_dirs=(), cwd=None):
+    """Content hash of the sources and everything they `include."""
+    h = hashlib.sha1()
+    for path in source_closure(sources, inc_dirs, cwd):
+        h.update(path.encode())
+        with open(path, "rb") as f: h.update(f.read())
+    return h.hexdigest()
+
+def compile_iverilog(root, sources, out_name, flags=("-g2012",), inc_dirs=()):
+    """
+    iverilog with a build cache keyed by source/include contents, flags and
+    compiler version. Returns (out path or None on failure, cache hit, compiler messages).
+    """
+    key = cache_key("iverilog", tool_version(["iverilog", "-V"]), list(flags), list(inc_dirs), sources_digest(sources, inc_dirs, root))
+    store = silis_cache_dir(root, "iverilog", os.path.splitext(out_name)[0])
+    built, target = os.path.join(store, f"{key}.vvp"), os.path.join(root, out_name)
+    if os.path.exists(built):
+        os.utime(built)   # most recently used builds survive pruning
+        shutil.copyfile(built, target)
+        return target, True, ""
+    tmp = built + ".tmp"
+    with ToolRun(root, "sim", "iverilog", out_name, inputs=sources, outputs=[tmp]) as tr:
+        r = tr.run(["iverilog", *flags, *[f"-I{d}" for d in inc_dirs], "-o", tmp, *sources], cwd=root)
+    if r.returncode != 0 or not os.path.exists(tmp):
+        with suppress(OSError): os.remove(tmp)
+        return None, False, r.stderr or r.stdout
+    os.replace(tmp, built); shutil.copyfile(built, target)
+    for old in sorted(glob.glob(os.path.join(store, "*.vvp")), key=os.path.getmtime, reverse=True)[IVERILOG_KEEP:]:
+        with suppress(OSError): os.remove(old)
+    return target, False, r.stderr
+
+
+# === SIMULATOR BACKENDS (Icarus / Verilator) ===
+
+PROJECT_SETTINGS = "silis_project.json"
+
+def load_project_settings(root):
+    """Per-project knobs (simulator backend, threads, trace format, dont_use cells) with defaults filled in."""
+    prefs = {"sim_backend": "icarus", "sim_threads": 0, "sim_trace": "vcd", "dont_use": [], "synth_incremental": False}
+    try:
+        with open(os.path.join(root, PROJECT_SETTINGS)) as f: prefs.update(json.load(f))
+    except (OSError, ValueError): pass
+    return prefs
+
+def save_project_settings(root, **changes):
+    prefs = load_project_settings(root); prefs.update(changes)
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, PROJECT_SETTINGS), "w") as f: json.dump(prefs, f, indent=2)
+    return prefs
+
+
+class SimBackend:
+    """A simulator: build(...) -> (command to run or None, cache hit, messages)."""
+    NAME = "base"
+    TOOL = ""
+
+    def available(self): return bool(shutil.which(self.TOOL))
+    def version(self): return tool_version([self.TOOL, "-V"])
+    def build(self, root, sources, top, out_name, inc_dirs=(), threads=0, trace="vcd"): raise NotImplementedError
+
+
+class IcarusBackend(SimBackend):
+    NAME = "icarus"; TOOL = "iverilog"
+
+    def build(self, root, sources, top, out_name, inc_dirs=(), threads=0, trace="vcd"):
+        out, hit, msgs = compile_iverilog(root, sources, out_name, inc_dirs=inc_dirs)
+        return (["vvp", out] if out else None), hit, msgs
+
+
+class VerilatorBackend(SimBackend):
+    """
+    verilator --binary into a persistent per-top obj_dir, so make (and ccache
+    when installed) only rebuilds the objects whose generated C++ changed; an
+    unchanged source digest skips Verilator entirely.
+    """
+    NAME = "verilator"; TOOL = "verilator"
+
+    def version(self): return tool_version(["verilator", "--version"])
+
+    def build(self, root, sources, top, out_name, inc_dirs=(), threads=0, trace="vcd"):
+        threads = threads or min(4, os.cpu_count() or 1)
+        flags = ["--binary", "--timing", "-j", "0", "-Wno-fatal", "--top-module", top,
+                 "--trace-fst" if trace == "fst" else "--trace"] + (["--threads", str(threads)] if threads > 1 else [])
+        key = cache_key("verilator", self.version(), flags, list(inc_dirs), sources_digest(sources, inc_dirs, root))
+        mdir = silis_cache_dir(root, "verilator", top)
+        exe, stamp = os.path.join(mdir, f"V{top}"), os.path.join(mdir, "silis.key")
+        with suppress(OSError):
+            with open(stamp) as f:
+                if f.read() == key and os.path.exists(exe): return [exe], True, ""
+        env = dict(os.environ)
+        if shutil.which("ccache"): env.setdefault("OBJCACHE", "ccache")
+        with ToolRun(root, "sim", "verilator", top, inputs=sources, outputs=[exe]) as tr:
+            r = tr.run(["verilator", *flags, "-Mdir", mdir, *[f"-I{d}" for d in inc_dirs], *sources], cwd=root, env=env)
+        if r.returncode != 0 or not os.path.exists(exe): return None, False, r.stderr or r.stdout
+        with open(stamp, "w") as f: f.write(key)
+        return [exe], False, r.stderr
+
+SIM_BACKENDS = {b.NAME: b for b in (IcarusBackend, VerilatorBackend)}
+
+def ensure_vcd(path, root=None):
+    """
+    Verilator's FST goes wherever the testbench's $dumpfile points, often a
+    .vcd name. Move such files to .fst and convert for the viewer when
+    fst2vcd is around (a ToolRun, so it is ledgered and dies with the job).
+    Returns the path the waveform viewer should load: the .vcd, or the .fst
+    when there is no converter or it failed.
+    """
+    if not path or not os.path.exists(path): return path
+    with open(path, "rb") as f: head = f.read(1)
+    if head in (b"$", b" ", b"\n", b"\t", b"\r", b""): return path   # already text VCD
+    fst = os.path.splitext(path)[0] + ".fst"; os.replace(path, fst)
+    if not shutil.which("fst2vcd"): return fst
+    vcd = os.path.splitext(path)[0] + ".vcd"
+    with ToolRun(root or os.path.dirname(fst), "sim", "fst2vcd", os.path.basename(fst), inputs=[fst], outputs=[vcd]) as tr:
+        r = tr.run(["fst2vcd", "-f", fst, "-o", vcd])
+    if r.returncode == 0 and os.path.exists(vcd): return vcd
+    with suppress(OSError): os.remove(vcd)   # a half-written conversion
+    return fst
+
+
+def project_sources(root):
+    return glob.glob(os.path.join(root, "source", "*.v")) + glob.glob(os.path.join(root, "source", "*.sv"))
+
+def sim_flow(job, root, base, top=None):
+    """
+    Builds and runs a testbench with the project's simulator (icarus when that
+    one is missing). top defaults to the first discovered testbench. Output goes
+    to job.log("[SIM]", ...); False on a failed build or run.
+    """
+    sim = lambda line: job.log("[SIM]", line)
+    src_v = project_sources(root)
+    if not src_v: sim("[ERR] No source files"); return False
+    dumpfile = tb_dumpfile(src_v) or f"{base}.vcd"
+    prefs = load_project_settings(root)
+    backend = SIM_BACKENDS.get(prefs["sim_backend"], IcarusBackend)()
+    if not backend.available() and backend.NAME != "icarus":
+        sim(f"[ERR] {backend.NAME} not found, falling back to icarus"); backend = IcarusBackend()
+    if top is None:
+        tbs = discover_testbenches(root)[0]; top = tbs[0][1] if tbs else base
+    profile = load_dump_profile(root)
+    if profile:
+        src_v = instrument_dump_profile(root, src_v, profile, dumpfile, bind_top=top if backend.NAME == "verilator" else None)
+        sim(f"[SYS] Dump profile: {len(profile.get('scopes', []))} scopes, {len(profile.get('signals', []))} signals, {len(profile.get('windows', []))} windows")
+    begin_flow_run(root, "sim")
+    try:
+        sim(f"[SYS] Compiling ({backend.NAME})...")
+        inc = [os.path.join(root, "source")]
+        t_build = time.time()
+        cmd, hit, msgs = backend.build(root, src_v, top, f"{base}.out", inc, prefs["sim_threads"], prefs["sim_trace"])
+        for line in msgs.splitlines()[:50]: sim(line)
+        if not cmd: sim(f"[ERR] {backend.NAME} build failed, simulation skipped"); return False
+        sim("[SYS] Sources unchanged, reusing cached build" if hit else f"[SYS] Built in {time.time() - t_build:.1f}s")
+        sim("[SYS] Simulating...")
+        t0 = time.time()
+        with ToolRun(root, "sim", os.path.basename(cmd[0]), top, cmd, inputs=cmd[1:], outputs=[dumpfile]) as tr:
+            proc = tr.popen(cmd, cwd=root, stdout=subprocess.PIPE, text=True, bufsize=1)
+            for line in iter(proc.stdout.readline, ''): sim(line.rstrip())
+            rc = tr.wait(proc)
+        elapsed = time.time() - t0
+        wave = ensure_vcd(os.path.join(root, dumpfile), root)
+        sim(f"[SYS] {record_sim_run(root, wave, elapsed, bool(profile), backend.NAME, sources_digest(src_v, inc, root))}")
+        return rc == 0
+    except Exception as e: sim(f"[ERR] {e}"); return False
+
+
+# === WAVEFORM DATA (VCD parser, columnar values) ===
+
+WAVE_UNKNOWN = {"x", "X", "z", "Z"}
+
+def format_wave_value(v, known, width):
+    """Formats a value the way VCDParser stores it ('0'/'1'/'x' or even-length hex)."""
+    if width == 1: return ("1" if v else "0") if known else "x"
+    if not known: return "X"
+    h = f"{v:X}"
+    return "0" + h if len(h) > 1 and len(h) % 2 else h
+
+def merge_change_times(arrays):
+    """Sorted, de-duplicated union of several already-sorted change-time arrays."""
+    t = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+    if not len(t): return t
+    t = np.sort(t, kind="stable")   # timsort: linear-ish on concatenated sorted runs
+    keep = np.empty(len(t), dtype=bool); keep[0] = True
+    np.not_equal(t[1:], t[:-1], out=keep[1:])
+    return t[keep]
+
+class VCDParser:
+    def __init__(self, path):
+        self.signals = {}     
+        self.names = {}       
+        self.widths = {}      
+        self.id_map = {}      
+        self.end_time = 0
+        self.timescale = "1ns"
+        self._columns = {}    # sid -> (times, vals, known) numpy view, built lazily
+        self.derived = {}     # sid -> WaveExpr for virtual signals
+        self._windowed = {}   # derived sid -> ((t0, t1), transitions) when too big to materialize
+        self.lanes = {}       # sid -> decoded transaction rows (drawn as a transactions lane)
+        self.paths = {}       # hierarchical name (tb.dut.state) -> sid
+        self.refs = {}        # sid -> hierarchical name of a golden-run overlay row
+        if os.path.exists(path): self.parse(path)
+
+    DERIVED_FULL_LIMIT = 2_000_000   # input transitions above which derived signals are computed per window
+
+    def add_derived(self, text):
+        """Registers a virtual signal computed from an expression and returns its id."""
+        text = text.strip()
+        sid = f"ƒ{text}"
+        if sid in self.derived: return sid
+        expr = WaveExpr(text)
+        cost = sum(len(self.signals[expr._sid(self, n)]) for n in expr.signals)
+        if cost <= self.DERIVED_FULL_LIMIT:
+            trans, width = expr.transitions(self)
+        else:
+            trans, width = [], expr.evaluate(self, 0, 0)[3]
+            self._windowed[sid] = None
+        self.derived[sid] = expr
+        self.names[sid] = text; self.widths[sid] = width; self.signals[sid] = trans
+        return sid
+
+    def remove_derived(self, sid):
+        if sid not in self.derived and sid not in self.lanes and sid not in self.refs: return
+        for table in (self.derived, self.lanes, self.refs, self.names, self.widths, self.signals, self._columns, self._windowed):
+            table.pop(sid, None)
+
+    def add_reference(self, path, other):
+        """Copies one signal of another dump (the golden run) in as an overlay row."""
+        osid = other.paths[path]
+        sid = f"≡{path}"
+        self.refs[sid] = path
+        self.names[sid] = path; self.widths[sid] = other.widths[osid]; self.signals[sid] = other.signals[osid]
+        self._columns.pop(sid, None)
+        return sid
+
+    def add_lane(self, name, rows):
+        """Registers decoded transactions as a label-valued row; '' marks idle time."""
+        sid = f"⇄{name}"
+        trans = []
+        for i, r in enumerate(rows):
+            start, end = r[0], r[1]
+            if trans and trans[-1][0] == start: trans.pop()
+            trans.append((start, " ".join(x for x in (r[2], r[3], r[4]) if x)))
+            nxt = rows[i + 1][0] if i + 1 < len(rows) else None
+            if nxt is None or end < nxt: trans.append((end, ""))
+        self.lanes[sid] = rows
+        self.names[sid] = f"{name} transactions"; self.widths[sid] = 0; self.signals[sid] = trans
+        self._columns.pop(sid, None)
+        return sid
+
+    def visible_transitions(self, sid, t0, t1):
+        """Transitions needed to draw [t0, t1], including the one already active at t0."""
+        if sid in self._windowed:
+            key = (int(t0), int(t1))
+            cached = self._windowed[sid]
+            if cached and cached[0] == key: return cached[1]
+            trans, _ = self.derived[sid].transitions(self, *key)
+            self._windowed[sid] = (key, trans)
+            return trans
+        trans = self.signals[sid]
+        if len(trans) < 256: return trans
+        times = self.column(sid)[0]
+        lo = max(0, int(np.searchsorted(times, t0, side="right")) - 1)
+        hi = int(np.searchsorted(times, t1, side="right")) + 1
+        return trans[lo:hi]
+
+    def resolve(self, name):
+        """Maps a user-typed signal name to its VCD id (None if unknown)."""
+        if name in self.id_map: return self.id_map[name]
+        if name in self.paths: return self.paths[name]
+        if name in self.names: return name
+        return None
+
+    def column(self, sid):
+        """Columnar (times, values, known) arrays for one signal. Cached after first use."""
+        col = self._columns.get(sid)
+        if col is not None: return col
+        trans = self.signals.get(sid, [])
+        n = len(trans)
+        times = np.fromiter((t for t, _ in trans), dtype=np.int64, count=n)
+        if sid in self.lanes:
+            col = (times, np.array([1 if v else 0 for _, v in trans], dtype=np.int64), np.ones(n, dtype=bool))
+            self._columns[sid] = col
+            return col
+        known = np.fromiter((v not in WAVE_UNKNOWN for _, v in trans), dtype=bool, count=n)
+        raw = [int(v, 16) if k else 0 for (_, v), k in zip(trans, known)]
+        # Anything wider than 62 bits stays as Python ints so nothing silently wraps
+        if self.widths.get(sid, 1) > 62: vals = np.array(raw, dtype=object)
+        else: vals = np.array(raw, dtype=np.int64)
+        col = (times, vals, known)
+        self._columns[sid] = col
+        return col
+
+    def parse(self, path):
+        curr_t = 0
+        scope = []
+        try:
+            with open(path, 'r') as f:
+                # 1. READ HEADER
+                for line in f:
+                    line = line.strip()
+                    if not line: continue
+                    
+                    if line.startswith("$var"):
+                        parts = line.split()
+                        # Strict check: Needs type, width, id, name (at least 5 parts)
+                        if len(parts) >= 5:
+                            width = int(parts[2])
+                            sid = parts[3]
+                            name = parts[4]
+                            
+                            self.names[sid] = name
+                            self.widths[sid] = width
+                            self.signals[sid] = []
+                            self.id_map[name] = sid
+                            self.paths.setdefault(".".join(scope + [name]), sid)
+
+                    elif line.startswith("$scope"):
+                        parts = line.split()
+                        if len(parts) >= 3: scope.append(parts[2])
+                    elif line.startswith("$upscope"):
+                        if scope: scope.pop()
+                            
+                    elif line.startswith("$timescale"):
+                        if len(line.split()) > 1: self.timescale = line.split()[1]
+                    
+                    elif line.startswith("$enddefinitions"):
+                        break
+
+                # 2. READ DATA
+                for line in f:
+                    line = line.strip()
+                    if not line: continue
+                    
+                    if line.startswith("#"):
+                        try: 
+                            curr_t = int(line[1:])
+                            self.end_time = max(self.end_time, curr_t)
+                        except: pass
+                    
+                    elif line.startswith("$dumpvars") or line.startswith("$end"):
+                        continue
+                        
+                    else:
+                        if line.startswith('b'):
+                            # Vector: b1010 ID
+                            parts = line.split()
+                            if len(parts) < 2: continue # Skip malformed lines
+                            
+                            val_bin = parts[0][1:] 
+                            sid = parts[1]
+                            
+                            if sid in self.signals:
+                                try: 
+                                    val_hex = hex(int(val_bin, 2))[2:].upper()
+                                    if len(val_hex) > 1 and len(val_hex) % 2 != 0: val_hex = "0" + val_hex
+                                except: 
+                                    val_hex = "X" if 'x' in val_bin else "Z"
+                                
+                                sig = self.signals[sid]
+                                if not sig or sig[-1][1] != val_hex:
+                                    sig.append((curr_t, val_hex))
+                        else:
+                            # Scalar: 1# or 1 #
+                            # Sometimes no space: '1!', '0!'
+                            if len(line) < 2: continue
+                            
+                            val = line[0]
+                            sid = line[1:].strip()
+                            
+                            if sid in self.signals:
+                                sig = self.signals[sid]
+                                if not sig or sig[-1][1] != val:
+                                    sig.append((curr_t, val))
+                                    
+        except Exception as e: print(f"VCD Parse Error (Non-Fatal): {e}")
+
+
+# === WAVEFORM QUERY ENGINE (Columnar Search) ===
+
+class WaveExpr:
+    """
+    Expressions over VCD signals, e.g. "state == 3'h5 && valid", "bus[7:4]",
+    "{hi, lo}" or "count - prev(count)". Every signal is piecewise constant, so
+    the expression is evaluated once per segment of the merged change-time array
+    instead of once per timestep.
+    """
+    TOKEN_RE = re.compile(r"\s*(?:(\d*'[sS]?[bBoOdDhH][0-9a-fA-F_xXzZ?]+)|(0[xX][0-9a-fA-F_]+|\d+)|([A-Za-z_\\][\w\.\$]*)|(==|!=|<=|>=|&&|\|\||<<|>>|[<>!~&|^()+\-*\[\]{}:,]))")
+
+    # Verilog precedence, loosest first
+    BIN_LEVELS = [["||"], ["&&"], ["|"], ["^"], ["&"], ["==", "!="], ["<", "<=", ">", ">="], ["<<", ">>"], ["+", "-"], ["*"]]
+    FUNCS = {"prev"}
+    WIDE = 62   # widths above this are evaluated as Python ints (object arrays)
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+        self.tree = self._parse_level(0)
+        if self.pos != len(self.tokens): raise ValueError(f"Unexpected '{self.tokens[self.pos][1]}'")
+        self.signals = sorted(self._collect(self.tree, set()))
+
+    # --- PARSING ---
+    def _tokenize(self, text):
+        toks = []; i = 0; text = text.rstrip()
+        while i < len(text):
+            m = self.TOKEN_RE.match(text, i)
+            if not m or m.end() == i: raise ValueError(f"Bad token near '{text[i:i+10]}'")
+            sized, num, ident, op = m.groups()
+            if sized: toks.append(("lit", self._parse_sized(sized)))
+            elif num: toks.append(("lit", (int(num.replace("_", ""), 0), True, 32)))
+            elif ident: toks.append(("sig", ident))
+            else: toks.append(("op", op))
+            i = m.end()
+        return toks
+
+    @staticmethod
+    def _parse_sized(tok):
+        """3'h5 / 'b1010 / 8'd12 -> (value, known, width)."""
+        size, rest = tok.split("'", 1)
+        rest = rest.lstrip("sS")
+        base = {"b": 2, "o": 8, "d": 10, "h": 16}[rest[0].lower()]
+        digits = rest[1:].replace("_", "")
+        width = int(size) if size else 32
+        if any(c in "xXzZ?" for c in digits): return (0, False, width)
+        return (int(digits, base), True, width)
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _expect(self, op):
+        if self._peek() != ("op", op): raise ValueError(f"Missing '{op}'")
+        self.pos += 1
+
+    def _parse_level(self, lvl):
+        if lvl == len(self.BIN_LEVELS): return self._parse_unary()
+        node = self._parse_level(lvl + 1)
+        while True:
+            kind, val = self._peek()
+            if kind != "op" or val not in self.BIN_LEVELS[lvl]: return node
+            self.pos += 1
+            node = ("bin", val, node, self._parse_level(lvl + 1))
+
+    def _parse_unary(self):
+        kind, val = self._peek()
+        if kind == "op" and val in ("!", "~", "-"):
+            self.pos += 1
+            return ("un", val, self._parse_unary())
+        return self._parse_postfix(self._parse_atom())
+
+    def _parse_postfix(self, node):
+        # bus[3] / bus[7:4]
+        while self._peek() == ("op", "["):
+            self.pos += 1
+            hi = self._parse_const()
+            lo = hi
+            if self._peek() == ("op", ":"):
+                self.pos += 1; lo = self._parse_const()
+            self._expect("]")
+            if lo > hi: hi, lo = lo, hi
+            node = ("slice", hi, lo, node)
+        return node
+
+    def _parse_const(self):
+        kind, val = self._peek()
+        if kind != "lit" or not val[1]: raise ValueError("Bit index must be a constant")
+        self.pos += 1
+        return val[0]
+
+    def _parse_atom(self):
+        kind, val = self._peek()
+        if kind is None: raise ValueError("Unexpected end of expression")
+        self.pos += 1
+        if kind == "lit": return ("lit", val[0], val[1], val[2])
+        if kind == "sig":
+            if self._peek() == ("op", "("):
+                if val not in self.FUNCS: raise ValueError(f"Unknown function '{val}'")
+                self.pos += 1
+                arg = self._parse_level(0)
+                self._expect(")")
+                return ("call", val, arg)
+            return ("sig", val)
+        if val == "(":
+            node = self._parse_level(0)
+            self._expect(")")
+            return node
+        if val == "{":
+            parts = [self._parse_level(0)]
+            while self._peek() == ("op", ","):
+                self.pos += 1; parts.append(self._parse_level(0))
+            self._expect("}")
+            return ("concat", tuple(parts))
+        raise ValueError(f"Unexpected '{val}'")
+
+    def _collect(self, node, acc):
+        if node[0] == "sig": acc.add(node[1])
+        elif node[0] == "concat":
+            for part in node[1]: self._collect(part, acc)
+        else:
+            for child in node[1:]:
+                if isinstance(child, tuple): self._collect(child, acc)
+        return acc
+
+    # --- EVALUATION ---
+    def breakpoints(self, data, t0=None, t1=None):
+        """Sorted union of change times of every referenced signal (always starts at 0).
+        With a window, only changes inside [t0, t1] plus one change of history are kept."""
+        cols = []
+        for n in self.signals:
+            times = data.column(self._sid(data, n))[0]
+            if t0 is not None:
+                lo = max(0, np.searchsorted(times, t0, side="right") - 2)
+                hi = np.searchsorted(times, t1, side="right")
+                times = times[lo:hi]
+            cols.append(times)
+        return merge_change_times(cols + [np.array([0 if t0 is None else t0], dtype=np.int64)])
+
+    def _sid(self, data, name):
+        sid = data.resolve(name)
+        if sid is None: raise KeyError(f"Unknown signal '{name}'")
+        return sid
+
+    def evaluate(self, data, t0=None, t1=None):
+        """Returns (bp, vals, known, width): the expression value on each segment [bp[i], bp[i+1])."""
+        bp = self.breakpoints(data, t0, t1)
+        return (bp,) + self._eval(self.tree, data, bp)
+
+    def _sample(self, data, name, bp):
+        sid = self._sid(data, name)
+        times, vals, known = data.column(sid)
+        width = data.widths.get(sid, 1)
+        if not len(times): return np.zeros(len(bp), dtype=np.int64), np.zeros(len(bp), dtype=bool), width
+        idx = np.searchsorted(times, bp, side="right") - 1
+        valid = idx >= 0
+        idx = np.maximum(idx, 0)
+        return vals[idx], known[idx] & valid, width
+
+    @classmethod
+    def _fit(cls, v, width):
+        """Promotes to Python ints when the result no longer fits int64."""
+        if width > cls.WIDE and v.dtype != object: return v.astype(object)
+        return v
+
+    @staticmethod
+    def _mask(v, width):
+        return v & ((1 << width) - 1)
+
+    def _eval(self, node, data, bp):
+        kind = node[0]
+        if kind == "lit":
+            _, val, known, width = node
+            return np.full(len(bp), val, dtype=np.int64 if width <= self.WIDE else object), np.full(len(bp), known), width
+        if kind == "sig":
+            return self._sample(data, node[1], bp)
+        if kind == "slice":
+            _, hi, lo, sub = node
+            v, k, w = self._eval(sub, data, bp)
+            if hi >= w: raise ValueError(f"Bit {hi} out of range (width {w})")
+            width = hi - lo + 1
+            return self._mask(v >> lo, width), k, width
+        if kind == "concat":
+            parts = [self._eval(p, data, bp) for p in node[1]]
+            width = sum(w for _, _, w in parts)
+            v, k = self._fit(parts[0][0], width), parts[0][1]
+            for pv, pk, pw in parts[1:]:
+                v = (v << pw) | self._fit(pv, width); k = k & pk
+            return v, k, width
+        if kind == "call":
+            # prev(x): value of x on the previous segment
+            v, k, w = self._eval(node[2], data, bp)
+            pv = np.empty_like(v); pk = np.empty_like(k)
+            pv[1:] = v[:-1]; pk[1:] = k[:-1]
+            if len(v): pv[0] = 0; pk[0] = False
+            return pv, pk, w
+        if kind == "un":
+            v, k, w = self._eval(node[2], data, bp)
+            if node[1] == "!": return (v == 0).astype(np.int64), k, 1
+            if node[1] == "~": return self._mask(~v, w), k, w
+            return self._mask(-v, w), k, w
+        op = node[1]
+        lv, lk, lw = self._eval(node[2], data, bp)
+        rv, rk, rw = self._eval(node[3], data, bp)
+        if op in ("&&", "||"):
+            lt, rt = (lv != 0), (rv != 0)
+            if op == "&&":
+                # a known-false side decides the result even if the other side is X
+                return (lt & rt).astype(np.int64), (lk & rk) | (lk & ~lt) | (rk & ~rt), 1
+            return (lt | rt).astype(np.int64), (lk & rk) | (lk & lt) | (rk & rt), 1
+        known = lk & rk
+        if op == "==": return (lv == rv).astype(np.int64), known, 1
+        if op == "!=": return (lv != rv).astype(np.int64), known, 1
+        if op == "<": return (lv < rv).astype(np.int64), known, 1
+        if op == "<=": return (lv <= rv).astype(np.int64), known, 1
+        if op == ">": return (lv > rv).astype(np.int64), known, 1
+        if op == ">=": return (lv >= rv).astype(np.int64), known, 1
+        width = max(lw, rw)
+        if op == "&": return lv & rv, known, width
+        if op == "|": return lv | rv, known, width
+        if op == "^": return lv ^ rv, known, width
+        if op == ">>": return lv >> rv, known, lw
+        if op == "<<": return self._mask(self._fit(lv, lw) << rv, lw), known, lw
+        if op == "+": return self._mask(self._fit(lv, width) + rv, width), known, width
+        if op == "-": return self._mask(self._fit(lv, width) - rv, width), known, width
+        if op == "*": return self._mask(self._fit(lv, width) * rv, width), known, width
+        raise ValueError(f"Unsupported operator '{op}'")
+
+    def match_ranges(self, data):
+        """All [start, end) time ranges where the expression is known and non-zero."""
+        bp, vals, known, _ = self.evaluate(data)
+        hit = known & (vals != 0)
+        edges = np.diff(np.concatenate(([0], hit.astype(np.int8), [0])))
+        first = np.flatnonzero(edges == 1)
+        last = np.flatnonzero(edges == -1) - 1
+        seg_end = np.append(bp[1:], max(data.end_time, int(bp[-1])))
+        return bp[first], seg_end[last]
+
+    def transitions(self, data, t0=None, t1=None):
+        """Evaluates into the same [(t, value_str)] form VCDParser stores, dropping repeats."""
+        bp, vals, known, width = self.evaluate(data, t0, t1)
+        if not len(bp): return [], width
+        # keep a segment only when its (value, known) differs from the previous one
+        change = np.ones(len(bp), dtype=bool)
+        vals = np.where(known, vals, 0)
+        change[1:] = (vals[1:] != vals[:-1]) | (known[1:] != known[:-1])
+        idx = np.flatnonzero(change)
+        out = []
+        for t, v, k in zip(bp[idx].tolist(), vals[idx].tolist(), known[idx].tolist()):
+            out.append((t, format_wave_value(v, k, width)))
+        return out, width
+
+
+class WaveSearch:
+    """Holds the current query hits and steps through them."""
+    def __init__(self):
+        self.expr = None
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+
+    def __len__(self): return len(self.starts)
+
+    def run(self, data, text):
+        self.expr = WaveExpr(text)
+        self.starts, self.ends = self.expr.match_ranges(data)
+        return len(self.starts)
+
+    def clear(self):
+        self.expr = None
+        self.starts = np.zeros(0, dtype=np.int64); self.ends = np.zeros(0, dtype=np.int64)
+
+    def next_hit(self, t):
+        i = np.searchsorted(self.starts, t, side="right")
+        return int(i) if i < len(self.starts) else None
+
+    def prev_hit(self, t):
+        i = np.searchsorted(self.starts, t, side="left") - 1
+        return int(i) if i >= 0 else None
+
+    def visible(self, t0, t1):
+        """Index range of hits overlapping [t0, t1]."""
+        lo = np.searchsorted(self.ends, t0, side="left")
+        hi = np.searchsorted(self.starts, t1, side="right")
+        return int(lo), int(hi)
+
+
+# === WAVEFORM REGRESSION DIFF (Golden vs Run) ===
+
+class WaveDiff:
+    """
+    Compares a run against a golden dump, signal by signal, matched on
+    hierarchical name. X and Z compare equal to each other but never to 0/1.
+    """
+    RANGES_CAP = 100   # mismatch intervals written per signal in the JSON report
+
+    def __init__(self, golden, run):
+        if golden.timescale != run.timescale:
+            raise ValueError(f"timescale differs: golden {golden.timescale}, run {run.timescale}")
+        self.golden = golden; self.run = run
+        self.end_time = max(golden.end_time, run.end_time)
+        self.mismatches = {}    # path -> (starts, ends) int64 arrays
+        self.run_sids = {}      # run sid -> path, for drawing bands on the run's own rows
+        self.only_golden = []; self.only_run = []; self.width_changed = []
+        self.compared = 0
+
+    @staticmethod
+    def _sample(col, t):
+        """Value/known of a signal just after each time in t (unknown before its first change)."""
+        times, vals, known = col
+        if not len(times): return np.zeros(len(t), dtype=np.int64), np.zeros(len(t), dtype=bool)
+        idx = np.searchsorted(times, t, side="right") - 1
+        valid = idx >= 0; idx[~valid] = 0
+        return vals[idx], known[idx] & valid
+
+    def intervals(self, gcol, rcol):
+        """(starts, ends) of every interval where the two columns disagree."""
+        t = merge_change_times([gcol[0], rcol[0]])
+        if not len(t): return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        gv, gk = self._sample(gcol, t)
+        rv, rk = self._sample(rcol, t)
+        both = gk & rk
+        diff = (gk != rk) | (both & np.asarray(gv != rv, dtype=bool))
+        edges = np.diff(np.concatenate(([0], diff.astype(np.int8), [0])))
+        s = np.flatnonzero(edges == 1); e = np.flatnonzero(edges == -1)
+        bounds = np.append(t, max(self.end_time, int(t[-1]) + 1))
+        return t[s], bounds[e]
+
+    def compare(self, ignore=()):
+        g_paths, r_paths = self.golden.paths, self.run.paths
+        skip = lambda p: any(fnmatch.fnmatchcase(p, pat) for pat in ignore)
+        self.only_golden = sorted(p for p in g_paths if p not in r_paths and not skip(p))
+        self.only_run = sorted(p for p in r_paths if p not in g_paths and not skip(p))
+        seen = set()
+        for path, gsid in g_paths.items():
+            rsid = r_paths.get(path)
+            if rsid is None or skip(path) or (gsid, rsid) in seen: continue   # aliased ports share one id
+            seen.add((gsid, rsid)); self.compared += 1
+            if self.golden.widths[gsid] != self.run.widths[rsid]: self.width_changed.append(path)
+            starts, ends = self.intervals(self.golden.column(gsid), self.run.column(rsid))
+            if len(starts):
+                self.mismatches[path] = (starts, ends)
+                self.run_sids[rsid] = path
+        return self
+
+    def bands(self, sid):
+        """Mismatch intervals to shade on a run row or a golden overlay row (None if clean)."""
+        path = self.run.refs.get(sid) or self.run_sids.get(sid)
+        return self.mismatches.get(path) if path else None
+
+    @property
+    def first_divergence(self):
+        return min((int(s[0]) for s, _ in self.mismatches.values()), default=None)
+
+    def summary(self):
+        """Rows of (path, first divergence, interval count, total mismatch time), earliest first."""
+        rows = [(p, int(s[0]), len(s), int((e - s).sum())) for p, (s, e) in self.mismatches.items()]
+        return sorted(rows, key=lambda r: (r[1], r[0]))
+
+    def to_json(self):
+        return {
+            "timescale": self.run.timescale, "end_time": self.end_time,
+            "compared": self.compared, "first_divergence": self.first_divergence,
+            "signals": [{"path": p, "first": f, "intervals": n, "mismatch_time": m,
+                         "ranges": [[int(a), int(b)] for a, b in zip(*[x[:self.RANGES_CAP] for x in self.mismatches[p]])]}
+                        for p, f, n, m in self.summary()],
+            "only_golden": self.only_golden, "only_run": self.only_run, "width_changed": self.width_changed,
+        }
+
+
+def wave_diff_cli(argv):
+    """Headless golden-vs-run comparison for CI. Exit code 1 when the dumps diverge."""
+    import argparse
+    ap = argparse.ArgumentParser(prog="silis --wavediff", description="Compare a simulation dump against a golden VCD.")
+    ap.add_argument("golden"); ap.add_argument("run")
+    ap.add_argument("--ignore", action="append", default=[], help="glob of hierarchical names to skip (repeatable)")
+    ap.add_argument("--json", help="write the full report here")
+    ap.add_argument("--strict", action="store_true", help="also fail on signals present in only one dump")
+    args = ap.parse_args(argv)
+    for p in (args.golden, args.run):
+        if not os.path.exists(p): print(f"wavediff: no such file: {p}"); return 2
+    try:
+        diff = WaveDiff(VCDParser(args.golden), VCDParser(args.run)).compare(args.ignore)
+    except ValueError as e:
+        print(f"wavediff: {e}"); return 2
+    rows = diff.summary()
+    print(f"compared {diff.compared} signals, {len(rows)} differ")
+    if rows: print(f"first divergence @ {diff.first_divergence} {diff.run.timescale}")
+    for p, f, n, m in rows[:50]:
+        print(f"  {p:<48} first {f:>10}  intervals {n:>6}  time {m}")
+    if len(rows) > 50: print(f"  ... {len(rows) - 50} more")
+    for tag, lst in (("only in golden", diff.only_golden), ("only in run", diff.only_run), ("width changed", diff.width_changed)):
+        if lst: print(f"{tag}: {', '.join(lst[:20])}{' ...' if len(lst) > 20 else ''}")
+    if args.json:
+        with open(args.json, "w") as f: json.dump(diff.to_json(), f, indent=2)
+    failed = bool(rows) or (args.strict and (diff.only_golden or diff.only_run))
+    return 1 if failed else 0
+
+
+# === SWITCHING ACTIVITY (VCD -> SAIF for report_power) ===
+
+SAIF_KEEP = 3            # recent SAIFs kept per dump path
+
+class ToggleCounter:
+    """
+    One streaming pass over a VCD that accumulates SAIF activity per net bit:
+    time spent at 0/1/X (T0/T1/TX) and 0<->1 toggles (TC). Value changes are
+    buffered and folded in with NumPy every CHUNK bit-events, so memory stays
+    flat however long the dump is.
+    """
+    CHUNK = 2_000_000
+    LEVELS = str.maketrans("01xzXZuUwW-", "01222222222")   # 0, 1, anything else counts as X
+
+    def __init__(self):
+        self.base = {}          # vcd id -> first bit slot (MSB first)
+        self.decls = []         # (scope tuple, name, msb, lsb, id); aliases share one id
+        self.scopes = set()
+        self.nbits = 0
+        self.timescale = "1ns"; self.end_time = 0
+        self._t, self._n, self._b, self._c = [], [], [], []
+        self._pending = 0
+
+    def scan(self, path):
+        scope = []
+        with open(path, "r", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("$var"):
+                    parts = line.split()
+                    if len(parts) < 5: continue
+                    width, sid = int(parts[2]), parts[3]
+                    name = " ".join(parts[4:-1]) if parts[-1] == "$end" else " ".join(parts[4:])
+                    m = re.match(r"(.*?)\s*\[(\d+)(?::(\d+))?\]$", name)
+                    if m: name = m.group(1)
+                    msb, lsb = (int(m.group(2)), int(m.group(3) or m.group(2))) if m else ((width - 1, 0) if width > 1 else (None, None))
+                    if sid not in self.base: self.base[sid] = self.nbits; self.nbits += width
+                    self.decls.append((tuple(scope), name, msb, lsb, sid))
+                elif line.startswith("$scope"):
+                    parts = line.split()
+                    if len(parts) >= 3: scope.append(parts[2]); self.scopes.add(tuple(scope))
+                elif line.startswith("$upscope"):
+                    if scope: scope.pop()
+                elif line.startswith("$timescale"):
+                    text = line
+                    while "$end" not in text: text += " " + next(f, "$end").strip()
+                    self.timescale = text.replace("$timescale", "").replace("$end", "").replace(" ", "") or "1ns"
+                elif line.startswith("$enddefinitions"): break
+            self._carry_t = np.zeros(self.nbits, dtype=np.int64)
+            self._carry_c = np.full(self.nbits, 2, dtype=np.uint8)   # everything is X until dumped
+            self._tc = np.zeros(self.nbits, dtype=np.int64)
+            self._lvl = np.zeros(self.nbits * 3, dtype=np.float64)
+            widths = {sid: 0 for sid in self.base}
+            for _, _, msb, lsb, sid in self.decls: widths[sid] = 1 if msb is None else abs(msb - lsb) + 1
+            t = 0
+            for line in f:
+                c0 = line[:1]
+                if not c0 or c0 == "$": continue
+                if c0 == "#":
+                    try: nt = int(line[1:])
+                    except ValueError: continue
+                    if self._pending >= self.CHUNK: self._fold(nt)
+                    t = nt
+                elif c0 in "bB":
+                    parts = line.split()
+                    if len(parts) < 2 or parts[1] not in self.base: continue
+                    sid = parts[1]; w = widths[sid]; v = parts[0][1:]
+                    if len(v) < w: v = (v[0] if v[0] in "xXzZ" else "0") * (w - len(v)) + v   # VCD left-extension
+                    elif len(v) > w: v = v[-w:]
+                    self._t.append(t); self._n.append(w); self._b.append(self.base[sid]); self._c.append(v)
+                    self._pending += w
+                elif c0 in "01xXzZ":
+                    sid = line[1:].strip()
+                    if sid not in self.base: continue
+                    self._t.append(t); self._n.append(1); self._b.append(self.base[sid]); self._c.append(c0)
+                    self._pending += 1
+            self.end_time = t
+        self._fold(self.end_time)
+        return self
+
+    def _fold(self, t_end):
+        """Adds the buffered changes (all before t_end) to the running totals."""
+        n = np.array(self._n, dtype=np.int64)
+        t = np.repeat(np.array(self._t, dtype=np.int64), n)
+        first = np.repeat(np.array(self._b, dtype=np.int64), n)
+        offs = np.arange(len(t), dtype=np.int64) - np.repeat(np.cumsum(n) - n, n)
+        c = np.frombuffer("".join(self._c).translate(self.LEVELS).encode(), dtype=np.uint8) - 48
+        self._t, self._n, self._b, self._c = [], [], [], []; self._pending = 0
+        # The carried-over level of every bit leads its run, then its changes in time order
+        B = np.concatenate((np.arange(self.nbits, dtype=np.int64), first + offs))
+        T = np.concatenate((self._carry_t, t)); C = np.concatenate((self._carry_c, c))
+        order = np.argsort(B, kind="stable"); B = B[order]; T = T[order]; C = C[order]
+        same = B[1:] == B[:-1]
+        nxt = np.append(np.where(same, T[1:], t_end), t_end)
+        self._lvl += np.bincount(B * 3 + C, weights=nxt - T, minlength=self.nbits * 3)
+        toggled = same & (C[1:] != C[:-1]) & (C[1:] < 2) & (C[:-1] < 2)
+        self._tc += np.bincount(B[1:][toggled], minlength=self.nbits)
+        last = np.flatnonzero(np.append(~same, True))
+        self._carry_c = C[last]; self._carry_t = np.full(self.nbits, t_end, dtype=np.int64)
+
+    def write_saif(self, path):
+        tree = {}
+        for scope, name, msb, lsb, sid in self.decls:
+            node = tree
+            for s in scope: node = node.setdefault(s, {})
+            node.setdefault(None, []).append((name, msb, lsb, sid))
+        lvl = self._lvl.reshape(-1, 3).astype(np.int64)
+        esc = lambda s: re.sub(r"([\[\]/\\.])", r"\\\1", s)
+        m = re.match(r"(\d+)\s*(\w+)", self.timescale)
+        out = ["(SAIFILE", '(SAIFVERSION "2.0")', '(DIRECTION "backward")', '(DESIGN )',
+               f'(DATE "{datetime.datetime.now():%a %b %d %H:%M:%S %Y}")', '(VENDOR "Silis")', '(PROGRAM_NAME "silis")',
+               '(VERSION "1.0")', "(DIVIDER / )", f"(TIMESCALE {m.group(1)} {m.group(2)})" if m else "(TIMESCALE 1 ns)",
+               f"(DURATION {self.end_time})"]
+        def emit(node, depth):
+            pad = "  " * depth
+            nets = node.get(None, [])
+            if nets:
+                out.append(f"{pad}(NET")
+                for name, msb, lsb, sid in nets:
+                    bits = [(esc(name), self.base[sid])] if msb is None else \
+                           [(f"{esc(name)}\\[{b}\\]", self.base[sid] + k) for k, b in enumerate(range(msb, lsb - 1, -1) if msb >= lsb else range(msb, lsb + 1))]
+                    for label, slot in bits:
+                        t0, t1, tx = lvl[slot]
+                        out.append(f"{pad}  ({label} (T0 {t0}) (T1 {t1}) (TX {tx}) (TC {self._tc[slot]}) (IG 0))")
+                out.append(f"{pad})")
+            for child, sub in node.items():
+                if child is None: continue
+                out.append(f"{pad}(INSTANCE {esc(child)}"); emit(sub, depth + 1); out.append(f"{pad})")
+        emit(tree, 0)
+        out.append(")")
+        with open(path, "w") as f: f.write("\n".join(out) + "\n")
+
+
+def vcd_activity(vcd_path, root):
+    """
+    SAIF for a dump plus its scope list, cached under .silis_cache/saif/<dump>.
+    The key is the dump's fingerprint (path, size, mtime), not a content hash:
+    a rewritten dump of the same size and mtime would reuse the old SAIF.
+    """
+    key = cache_key("saif", file_fingerprint(vcd_path))
+    cache = silis_cache_dir(root, "saif", cache_key(os.path.abspath(vcd_path)))
+    saif, meta = os.path.join(cache, f"{key}.saif"), os.path.join(cache, f"{key}.json")
+    if os.path.exists(saif) and os.path.exists(meta):
+        os.utime(saif)   # most recently used SAIFs survive pruning
+        with open(meta) as f: return saif, json.load(f), True
+    tc = ToggleCounter().scan(vcd_path)
+    tc.write_saif(saif)
+    info = {"vcd": vcd_path, "scopes": sorted("/".join(s) for s in tc.scopes), "duration": tc.end_time, "timescale": tc.timescale}
+    with open(meta, "w") as f: json.dump(info, f)
+    for old in sorted(glob.glob(os.path.join(cache, "*.saif")), key=os.path.getmtime, reverse=True)[SAIF_KEEP:]:
+        for p in (old, os.path.splitext(old)[0] + ".json"):
+            with suppress(OSError): os.remove(p)
+    return saif, info, False
+
+def latest_vcd(*dirs):
+    """Newest simulation dump in any of the given folders (None if there is none)."""
+    vcds = [p for d in dirs for p in glob.glob(os.path.join(d, "*.vcd"))]
+    return max(vcds, key=os.path.getmtime) if vcds else None
+
+def saif_command(root, top, vcd):
+    """(read_saif line or '', activity note for the report, log message) for one dump."""
+    if not vcd: return "", "default (no simulation dump found)", ""
+    try:
+        saif, info, cached = vcd_activity(vcd, root)
+    except Exception as e:
+        return "", "default (SAIF extraction failed)", f"[WARN] SAIF extraction failed, using default activity: {e}"
+    scope = guess_dut_scope(info["scopes"], top)
+    activity = f"SAIF from {os.path.basename(vcd)}" + (f" (scope {scope})" if scope else "")
+    return f"read_saif {'-scope ' + scope + ' ' if scope else ''}{{{saif}}}", activity, f"Power activity: {activity}{' [cached]' if cached else ''}"
+
+def guess_dut_scope(scopes, top):
+    """Testbench instance path of the synthesized top (tb/dut), or None when ambiguous."""
+    kids = [s for s in scopes if s.count("/") == 1]
+    for pick in (lambda s: s.split("/")[1] == top,
+                 lambda s: s.split("/")[1].lower() in ("dut", "uut", "u_dut", "i_dut", "inst", f"u_{top}".lower(), f"i_{top}".lower())):
+        hits = [s for s in kids if pick(s)]
+        if len(hits) == 1: return hits[0]
+    return kids[0] if len(kids) == 1 else None
+
+
+# === LIBERTY INDEX & TRIMMED LIBRARIES ===
+
+LIB_TOKEN_RE = re.compile(rb'/\*.*?\*/|"(?:\\.|[^"\\])*"|[{}]|\bcell\s*\(\s*"?([\w$]+)"?\s*\)', re.S)
+LIB_PIN_RE = re.compile(rb'\bpin\s*\(\s*"?([\w$]+)"?\s*\)\s*\{')
+LIB_SEQ_RE = re.compile(rb'\b(ff|latch|ff_bank|latch_bank|statetable)\s*\(')
+NETLIST_INST_RE = re.compile(r"^\s*([\w$]+)\s+(?:\\\S+|[\w$]+)\s*\(", re.M)
+_lib_indexes = {}; _lib_lock = threading.Lock()
+
+def _lib_attr(body, name, default=None):
+    m = re.search(rb"\b" + name + rb'\s*:\s*"?([^";\n]*)"?\s*;', body)
+    return m.group(1).decode(errors="replace").strip() if m else default
+
+def _lib_float(body, name):
+    try: return float(_lib_attr(body, name, 0.0))
+    except ValueError: return 0.0
+
+
+class LibertyIndex:
+    """
+    Cell-level index of one liberty file (byte span, area, leakage, sequential
+    flag, dont_use, pin direction/capacitance/function). Stored by content hash
+    under ~/.silis_cache/liberty, so each PDK library is parsed once, and used
+    to write trimmed copies holding only the cells a tool needs.
+    """
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.dir = silis_cache_dir(os.path.expanduser("~"), "liberty", file_digest(path)[:16])
+        idx = os.path.join(self.dir, "index.json")
+        t0 = time.time()
+        try:
+            with open(idx) as f: data = json.load(f)
+            if data.get("version") != self.VERSION: raise ValueError("stale index")
+            self.cells, self.size, self.cached = data["cells"], data["size"], True
+        except (OSError, ValueError, KeyError):
+            self.cells, self.size, self.cached = self._parse(), os.path.getsize(path), False
+            with open(idx + ".tmp", "w") as f: json.dump({"version": self.VERSION, "size": self.size, "cells": self.cells}, f)
+            os.replace(idx + ".tmp", idx)
+        self.load_time = time.time() - t0
+
+    def _parse(self):
+        with open(self.path, "rb") as f: text = f.read()
+        cells, depth, cur = {}, 0, None
+        for m in LIB_TOKEN_RE.finditer(text):
+            tok = m.group(0)
+            if tok == b"{": depth += 1
+            elif tok == b"}":
+                depth -= 1
+                if cur and depth == 1: cells[cur[0]] = self._cell(text[cur[1]:m.end()], cur[1], m.end()); cur = None
+            elif m.group(1) is not None and depth == 1: cur = (m.group(1).decode(), m.start())
+        return cells
+
+    @staticmethod
+    def _cell(body, start, end):
+        pins, starts = {}, list(LIB_PIN_RE.finditer(body))
+        for i, pm in enumerate(starts):
+            pb = body[pm.end(): starts[i + 1].start() if i + 1 < len(starts) else len(body)]
+            pins[pm.group(1).decode()] = {"dir": _lib_attr(pb, b"direction"), "cap": _lib_float(pb, b"capacitance"), "func": _lib_attr(pb, b"function")}
+        return {"span": [start, end], "area": _lib_float(body, b"area"), "leakage": _lib_float(body, b"cell_leakage_power"),
+                "dont_use": _lib_attr(body, b"dont_use", "false").lower() == "true", "seq": bool(LIB_SEQ_RE.search(body)), "pins": pins}
+
+    def usable(self, name):
+        """Logic a mapper can use: not dont_use, and sequential or driving a function (no fill/tap/decap/diode)."""
+        c = self.cells[name]
+        return not c["dont_use"] and (c["seq"] or any(p["dir"] == "output" and p["func"] for p in c["pins"].values()))
+
+    def subset(self, names):
+        """Path of a liberty with the header and only these cells (the full file when that is all of them)."""
+        keep = sorted(n for n in set(names) if n in self.cells)
+        if len(keep) == len(self.cells): return self.path
+        out = os.path.join(self.dir, cache_key(*keep) + ".lib")
+        if not os.path.exists(out):
+            with open(self.path, "rb") as f: text = f.read()
+            spans = sorted(tuple(c["span"]) for c in self.cells.values()); want = {tuple(self.cells[n]["span"]) for n in keep}
+            parts, pos = [], 0
+            for s, e in spans:
+                parts.append(text[pos:s])
+                if (s, e) in want: parts.append(text[s:e])
+                pos = e
+            parts.append(text[pos:])
+            with open(out + f".{os.getpid()}.{threading.get_ident()}", "wb") as f: f.write(b"".join(parts))
+            os.replace(out + f".{os.getpid()}.{threading.get_ident()}", out)
+        return out
+
+def liberty_index(path):
+    with _lib_lock:
+        key = (path, file_fingerprint(path))
+        if key not in _lib_indexes: _lib_indexes[key] = LibertyIndex(path)
+        return _lib_indexes[key]
+
+def synth_liberty(path, dont_use=()):
+    """(trimmed liberty for mapping, log note): usable cells minus the project's dont_use globs."""
+    try:
+        idx = liberty_index(path)
+        keep = [c for c in idx.cells if idx.usable(c) and not any(fnmatch.fnmatch(c, p) for p in dont_use)]
+        out = idx.subset(keep)
+    except Exception as e:
+        return path, f"[WARN] Liberty index failed, using the full library: {e}"
+    return out, (f"Liberty: {len(keep)}/{len(idx.cells)} cells for mapping, {idx.size / 1e6:.1f} MB -> {os.path.getsize(out) / 1e6:.1f} MB"
+                 f" (index {'cached' if idx.cached else 'built'} in {idx.load_time:.2f}s)")
+
+def netlist_cells(path, netlist):
+    """Cells of the liberty at path instantiated in a mapped netlist (None when unsure)."""
+    try:
+        idx = liberty_index(path)
+        with open(netlist, errors="replace") as f: return ({m.group(1) for m in NETLIST_INST_RE.finditer(f.read())} & idx.cells.keys()) or None
+    except Exception: return None
+
+def liberty_subset(path, cells):
+    """Trimmed liberty with just these cells (the full library when cells is None or trimming fails)."""
+    try: return liberty_index(path).subset(cells) if cells else path
+    except Exception: return path
+
+def netlist_liberty(path, netlist):
+    """Trimmed liberty with just the cells instantiated in a mapped netlist (the full library when unsure)."""
+    return liberty_subset(path, netlist_cells(path, netlist))
+
+def liberty_cli(argv):
+    """Index a liberty and report what trimming saves; optional netlist for the STA subset."""
+    import argparse
+    ap = argparse.ArgumentParser(prog="silis --liberty", description="Index a liberty file and write trimmed copies.")
+    ap.add_argument("lib"); ap.add_argument("netlist", nargs="?")
+    ap.add_argument("--dont-use", action="append", default=[], help="glob of cells to exclude from mapping (repeatable)")
+    args = ap.parse_args(argv)
+    if not os.path.exists(args.lib): print(f"liberty: no such file: {args.lib}"); return 2
+    t0 = time.time(); idx = liberty_index(args.lib)
+    print(f"{args.lib}: {len(idx.cells)} cells, {idx.size / 1e6:.2f} MB, index {'cached' if idx.cached else 'built'} in {time.time() - t0:.2f}s")
+    out, note = synth_liberty(args.lib, args.dont_use); print(f"synth: {out}\n  {note}")
+    if args.netlist:
+        out = netlist_liberty(args.lib, args.netlist)
+        print(f"sta:   {out} ({os.path.getsize(out) / 1e6:.2f} MB)")
+    # Tool-side cost of the library, full vs trimmed, when the tools are installed
+    bench = [(["sta", "-no_splash", "-exit"], "read_liberty {{{}}}\nexit\n", ".tcl"), (["yosys", "-q", "-s"], "read_liberty -lib {}\n", ".ys")]
+    for cmd, script, ext in bench:
+        if not shutil.which(cmd[0]): continue
+        for label, p in (("full", args.lib), ("trimmed", out)):
+            s = os.path.join(idx.dir, "bench" + ext)
+            with open(s, "w") as f: f.write(script.format(p))
+            t0 = time.time()
+            with ToolRun(idx.dir, "liberty", cmd[0], f"read_liberty {label}", cmd + [s], inputs=[s]) as tr: tr.run(cmd + [s])
+            print(f"  {cmd[0]:<5} read_liberty {label:<7} {time.time() - t0:.2f}s")
+    return 0
+
+
+# === SYNTHESIS SCRIPTS & RECIPES ===
+
+DEFAULT_RECIPE = {"flatten": False, "abc9": False, "abc": "abc -liberty {lib}", "period": None}
+ABC_PRESETS = ["abc -liberty {lib}", "abc -fast -liberty {lib}", "abc -D {period_ps} -liberty {lib}"]
+
+def synth_sources(root):
+    return [s for s in glob.glob(os.path.join(root, "source", "*.v")) if "tb_" not in s]
+
+def yosys_script(lib, sources, top, netlist, recipe=None):
+    """synth.ys for one recipe; the default recipe is the flow's classic script."""
+    r = dict(DEFAULT_RECIPE, **(recipe or {}))
+    read_cmd = f"read_verilog {' '.join(sources)}" if sources else ""
+    synth = f"synth -top {top}" + (" -flatten" if r["flatten"] else "") + (" -abc9" if r["abc9"] else "")
+    abc = r["abc"].format(lib=lib, period_ps=int(float(r["period"] or 10) * 1000))
+    # Note the 'tee -o reports/area.rpt' to save area stats to a file
+    return f"""
+        read_liberty -lib {lib}
+        {read_cmd}
+        {synth}
+        dfflibmap -liberty {lib}
+        {abc}
+        tee -o reports/area.rpt stat -liberty {lib} -json
+        write_verilog -noattr {netlist}
+        """
+
+STA_REPORTS = [("report_checks -path_delay max -fields {slew cap input_pins nets fanout} -format full_clock_expanded -group_count 100", "reports/timing.rpt"),
+               ("report_power", "reports/power.rpt")]
+
+def sta_script(lib, netlist, top, saif_cmd=""):
+    """sta.tcl: timing to reports/timing.rpt, power (SAIF-annotated when given) to reports/power.rpt."""
+    return f"""
+        read_liberty {lib}
+        read_verilog {netlist}
+        link_design {top}
+        read_sdc netlist/{top}.sdc
+        {' > '.join(STA_REPORTS[0])}
+        {saif_cmd}
+        {' > '.join(STA_REPORTS[1])}
+        exit
+        """
+
+def sdc_with_period(root, top, period):
+    """The project's SDC with its clock period replaced (or a minimal one when there is no SDC yet)."""
+    try:
+        with open(os.path.join(root, "netlist", f"{top}.sdc")) as f: sdc = f.read()
+    except OSError: sdc = ""
+    if period is None: return sdc
+    if re.search(r"create_clock\b[^\n]*-period", sdc):
+        return re.sub(r"(create_clock\b[^\n]*-period\s+)[\d.]+", lambda m: f"{m.group(1)}{period}", sdc)
+    clk = "clk"
+    for src in synth_sources(root):
+        with open(src, errors="replace") as f: m = re.search(r"input\s+(?:wire\s+|logic\s+)?(\w*cl(?:oc)?k\w*)", f.read())
+        if m: clk = m.group(1); break
+    return sdc + f"\ncreate_clock -name {clk} -period {period} [get_ports {clk}]\n"
+
+def sdc_period(root, top):
+    try:
+        with open(os.path.join(root, "netlist", f"{top}.sdc")) as f: m = re.search(r"create_clock\b[^\n]*-period\s+([\d.]+)", f.read())
+    except OSError: return None
+    return float(m.group(1)) if m else None
+
+
+# === INCREMENTAL SYNTHESIS (Per-Module Netlists) ===
+
+SYNTH_UNIT_KEEP = 4   # cached netlists kept per module
+MODULE_RE = re.compile(r"\bmodule\s+(\w+).*?\bendmodule\b", re.S)
+INST_LINE_RE = re.compile(r"^\s*(\w+)\s*(#)?", re.M)
+
+def module_graph(sources):
+    """({module: {"text", "children": {child: has parameter overrides}}}, digest of the text outside modules)."""
+    mods, glue = {}, []
+    for path in sources:
+        with open(path, errors="replace") as f: text = re.sub(r"//[^\n]*|/\*.*?\*/", "", f.read(), flags=re.S)
+        pos = 0
+        for m in MODULE_RE.finditer(text):
+            glue.append(" ".join(text[pos:m.start()].split())); pos = m.end()
+            mods[m.group(1)] = {"text": m.group(0), "children": {}}
+        glue.append(" ".join(text[pos:].split()))
+    for name, mod in mods.items():
+        for m in INST_LINE_RE.finditer(mod["text"]):
+            c = m.group(1)
+            if c in mods and c != name: mod["children"][c] = mod["children"].get(c, False) or bool(m.group(2))
+    return mods, cache_key("glue", *glue)
+
+
+class IncrementalSynth:
+    """
+    Synthesises each module on its own into .silis_cache/synth_units/<module>/<key>.v
+    (children as blackboxes) and stitches the top from those netlists. A unit's
+    key covers its own text, the children it inlines, its children's keys, the
+    liberty, the recipe and the yosys version, so an edit rebuilds only that
+    module and its ancestors; independent units build in parallel. Modules
+    instantiated with parameter overrides are inlined into each parent rather
+    than cached, since one netlist cannot serve every parameterisation.
+    """
+    def __init__(self, root, top, lib, sources, recipe=None, workers=None, log=None):
+        self.root = root; self.top = top; self.lib = lib; self.sources = sources
+        self.recipe = dict(DEFAULT_RECIPE, **(recipe or {}))
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.log = log or (lambda msg: None)
+
+    def plan(self):
+        mods, glue = module_graph(self.sources)
+        if self.top not in mods: raise ValueError(f"top module {self.top} not found in sources")
+        inlined = {c for m in mods.values() for c, o in m["children"].items() if o}
+        abc = self.recipe["abc"].format(lib=self.lib, period_ps=int(float(self.recipe["period"] or 10) * 1000))
+        base = (glue, self.lib, file_digest(self.lib), abc, self.recipe["abc9"], tool_version(["yosys", "-V"]))
+        self.units, self.order = {}, []
+
+        def visit(name):
+            if name in self.units: return
+            self.units[name] = None   # cycle guard
+            texts, deps, stack, seen = [mods[name]["text"]], [], list(mods[name]["children"]), set()
+            while stack:   # inlined children become part of this unit, the rest are dependencies
+                c = stack.pop()
+                if c in seen: continue
+                seen.add(c)
+                if c in inlined: texts.append(mods[c]["text"]); stack += list(mods[c]["children"])
+                else: visit(c); deps.append(c)
+            deps.sort()
+            key = cache_key("unit", name, *(" ".join(t.split()) for t in texts), *base, *(self.units[d]["key"] for d in deps if self.units[d]))
+            self.units[name] = {"deps": deps, "key": key, "out": os.path.join(self.root, ".silis_cache", "synth_units", name, key + ".v")}
+            self.order.append(name)
+
+        visit(self.top)
+        return self.units
+
+    def unit_script(self, name):
+        u = self.units[name]
+        abc = self.recipe["abc"].format(lib=self.lib, period_ps=int(float(self.recipe["period"] or 10) * 1000))
+        return f"""
+        read_liberty -lib {self.lib}
+        read_verilog {' '.join(self.sources)}
+        hierarchy -top {name}
+        {'blackbox ' + ' '.join(u['deps']) if u['deps'] else ''}
+        synth -top {name} -flatten{' -abc9' if self.recipe['abc9'] else ''}
+        dfflibmap -liberty {self.lib}
+        {abc}
+        opt_clean
+        write_verilog -noattr {u['out']}.tmp
+        """
+
+    def stitch_script(self, netlist):
+        """synth.ys for the top: read every unit netlist, link, report and write the design netlist."""
+        return f"""
+        read_liberty -lib {self.lib}
+        read_verilog {' '.join(self.units[n]['out'] for n in self.order)}
+        hierarchy -top {self.top}
+        {'flatten' if self.recipe['flatten'] else ''}
+        tee -o reports/area.rpt stat -liberty {self.lib} -json
+        write_verilog -noattr {netlist}
+        """
+
+    def _build(self, name, futs):
+        for d in self.units[name]["deps"]: futs[d].result()   # children were submitted first
+        u = self.units[name]
+        if os.path.exists(u["out"]): os.utime(u["out"]); return False
+        os.makedirs(os.path.dirname(u["out"]), exist_ok=True); os.makedirs(os.path.join(self.root, "reports", "units"), exist_ok=True)
+        script = u["out"][:-2] + ".ys"
+        with open(script, "w") as f: f.write(self.unit_script(name))
+        t0 = time.time()
+        with open(os.path.join(self.root, "reports", "units", f"{name}.log"), "w") as log:
+            with ToolRun(self.root, "synth", "yosys", f"unit {name}", ["yosys", script], inputs=[script, *self.sources, self.lib],
+                         outputs=[u["out"] + ".tmp"]) as tr:
+                rc = tr.wait(tr.popen(["yosys", script], cwd=self.root, stdout=log, stderr=subprocess.STDOUT))
+        if rc != 0 or not os.path.exists(u["out"] + ".tmp"): raise RuntimeError(f"module {name} failed, see reports/units/{name}.log")
+        os.replace(u["out"] + ".tmp", u["out"])
+        self.log(f"  built {name} in {time.time() - t0:.1f}s")
+        entries = sorted(glob.glob(os.path.join(os.path.dirname(u["out"]), "*.v")), key=os.path.getmtime, reverse=True)
+        for old in entries[SYNTH_UNIT_KEEP:]:
+            for p in (old, old[:-2] + ".ys"):
+                with suppress(OSError): os.remove(p)
+        return True
+
+    def build(self):
+        """(modules rebuilt, modules reused) after bringing every unit netlist up to date."""
+        futs = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as ex:
+            for name in self.order: futs[name] = ex.submit(self._build, name, futs)
+            built = [n for n in self.order if futs[n].result()]
+        return built, [n for n in self.order if n not in built]
+
+
+# === SYNTHESIS RESULT CACHE ===
+
+SYNTH_KEEP = 8   # cached synthesis results kept per project
+
+def synth_outputs(base):
+    return [f"netlist/{base}_netlist.v", "reports/area.rpt", "reports/timing.rpt", "reports/power.rpt",
+            "reports/synthesis.log", "reports/activity.txt"]
+
+def synth_restore(root, key, base):
+    """Copies a cached result back into the project. False when there is none."""
+    store = os.path.join(root, ".silis_cache", "synth", key)
+    files = synth_outputs(base)
+    if not all(os.path.exists(os.path.join(store, os.path.basename(f))) for f in files): return False
+    for f in files: shutil.copyfile(os.path.join(store, os.path.basename(f)), os.path.join(root, f))
+    os.utime(store)
+    return True
+
+def synth_store(root, key, base):
+    store = silis_cache_dir(root, "synth", key)
+    for f in synth_outputs(base):
+        if os.path.exists(os.path.join(root, f)): shutil.copyfile(os.path.join(root, f), os.path.join(store, os.path.basename(f)))
+    entries = sorted(glob.glob(os.path.join(root, ".silis_cache", "synth", "*")), key=os.path.getmtime, reverse=True)
+    for old in entries[SYNTH_KEEP:]: shutil.rmtree(old, ignore_errors=True)
+
+def synth_flow(job, root, base, lib, sta_service, vcd=None, on_metrics=None, on_progress=None):
+    """
+    Yosys (per-module incremental when the project enables it) and the STA
+    reports, behind the synthesis result cache. Logs through job.log;
+    on_metrics(data, live) gets the streamed dashboard metrics and
+    on_progress(done, total, text) the step. False when a tool failed.
+    """
+    on_metrics = on_metrics or (lambda data, live=False: None); on_progress = on_progress or (lambda *a: None)
+    v_net = f"netlist/{base}_netlist.v"
+    src_v = synth_sources(root)
+    settings = load_project_settings(root)
+    for d in ("netlist", "reports"): os.makedirs(os.path.join(root, d), exist_ok=True)
+
+    job.on_cancel(lambda: sta_service.session and kill_group(sta_service.session.p, signal.SIGTERM))
+    job.log("[SYS]", "Starting Synthesis Flow...")
+    t_flow = time.time(); begin_flow_run(root, "synth")
+    sdc = os.path.join("netlist", f"{base}.sdc")
+    stream = MetricStream()   # dashboard metrics straight from the tool output
+
+    def feed(kind, line):
+        if stream.feed(kind, line):
+            on_metrics({k: stream.m[k] for k in ("cells", "area", "wns", "status")}, live=True)
+
+    # --- 1. YOSYS SCRIPT (project recipe, mapped against the trimmed liberty) ---
+    synth_lib, note = synth_liberty(lib, settings["dont_use"])
+    job.log("[SYS]", note)
+    inc = None
+    if settings["synth_incremental"]:   # per-module netlists; synth.ys only stitches them
+        inc = IncrementalSynth(root, base, synth_lib, src_v, settings.get("synth_recipe"), log=lambda msg: job.log("[YOSYS]", msg))
+        try: inc.plan(); ys = inc.stitch_script(v_net)
+        except Exception as e:
+            job.log("[SYS]", f"[WARN] Incremental synthesis unavailable ({e}), running the full script"); inc = None
+    if not inc: ys = yosys_script(synth_lib, src_v, base, v_net, settings.get("synth_recipe"))
+    with open(os.path.join(root, "synth.ys"), 'w') as f: f.write(ys)
+
+    # --- STEP 0: SWITCHING ACTIVITY (latest sim dump -> SAIF) ---
+    saif_cmd, activity, note = saif_command(root, base, vcd)
+    if note: job.log("[SYS]", note)
+    sta_tcl = sta_script(lib, v_net, base, saif_cmd)
+    with open(os.path.join(root, "sta.tcl"), 'w') as f: f.write(sta_tcl)
+    with open(os.path.join(root, "reports", "activity.txt"), 'w') as f: f.write(activity + "\n")
+
+    # --- RESULT CACHE: same RTL, liberty, SDC, scripts and tools -> restore ---
+    key = cache_key("synth", sources_digest(src_v, [], root), lib, file_digest(lib), base, ys, sta_tcl,
+                    file_digest(os.path.join(root, "netlist", f"{base}.sdc")), tool_version(["yosys", "-V"]), tool_version(["sta", "-version"]))
+    if synth_restore(root, key, base):
+        job.log("[YOSYS]", f"Inputs unchanged since a previous run, results restored from cache ({key})")
+        job.log("[SYS]", "Synthesis & Timing Complete (cached).")
+        on_metrics(None); return True
+
+    # --- STEP 1: YOSYS (incremental: changed modules first, in parallel) ---
+    on_progress(0, 2, "Yosys")
+    if inc:
+        try:
+            built, reused = inc.build()
+            job.log("[YOSYS]", f"Modules: {len(built)} rebuilt ({', '.join(built) or '-'}), {len(reused)} reused")
+        except Exception as e:
+            job.log("[SYS]", f"[ERR] Yosys Crash: {e}"); return False
+    try:
+        # We pipe output to a file AND the GUI queue
+        log_path = os.path.join(root, "reports/synthesis.log")
+        with open(log_path, "w") as log_file, ToolRun(root, "synth", "yosys", "synth.ys", "yosys synth.ys",
+                                                      inputs=["synth.ys", *src_v, synth_lib], outputs=[v_net, log_path]) as tr:
+            p1 = tr.popen("yosys synth.ys", shell=True, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+            
+            for line in iter(p1.stdout.readline, ''):
+                line = line.strip()
+                if line:
+                    job.log("[YOSYS]", line) 
+                    log_file.write(line + "\n")
+                    feed("yosys", line)
+            if tr.wait(p1) != 0: raise Exception("Yosys Failed")
+    except Exception as e:
+        job.log("[SYS]", f"[ERR] Yosys Crash: {e}"); return False
+
+    # sta.tcl on disk reads only the cells the netlist instantiates
+    with open(os.path.join(root, "sta.tcl"), 'w') as f:
+        f.write(sta_script(netlist_liberty(lib, os.path.join(root, v_net)), v_net, base, saif_cmd))
+
+    # --- STEP 2: OPENSTA (resident session; one-shot `sta sta.tcl` if it is unavailable) ---
+    on_progress(1, 2, "OpenSTA")
+    sta_ok = False
+    try:
+        reloaded = sta_service.ensure(root, base, lib, saif_cmd)
+        job.log("[STA]", f"Resident STA session: {'design loaded' if reloaded else 'netlist and SDC unchanged'}")
+        for cmd, rpt in STA_REPORTS:
+            kind = os.path.basename(rpt).split(".")[0]; tail = []
+            with open(os.path.join(root, rpt), "w") as f, ToolRun(root, "synth", "sta", kind, cmd, inputs=[v_net, sdc], outputs=[rpt]) as tr:
+                def sink(line, f=f, kind=kind, tail=tail):
+                    f.write(line); feed(kind, line); tail[:] = (tail + [line])[-5:]
+                before = sta_service.usage()
+                ok, _ = sta_service.query(root, base, lib, cmd, sink)
+                tr.usage(*sta_service.usage(), before=before); tr.rc = 0 if ok else 1
+            if not ok: raise RuntimeError("".join(tail).strip()[-300:] or cmd)
+        sta_ok = True
+    except Exception as e:
+        job.log("[STA]", f"Resident STA session unavailable ({e}), running sta sta.tcl")
+        sta_service.close()
+    if not sta_ok:
+        try:
+            with ToolRun(root, "synth", "sta", "sta.tcl", "sta sta.tcl", inputs=["sta.tcl", v_net, sdc], outputs=[r for _, r in STA_REPORTS]) as tr:
+                p2 = tr.popen("sta sta.tcl", shell=True, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+                for line in iter(p2.stdout.readline, ''):
+                    line = line.strip()
+                    if line:
+                        job.log("[STA]", line) 
+                sta_ok = tr.wait(p2) == 0
+        except Exception as e:
+            job.log("[SYS]", f"[ERR] STA Crash: {e}"); return False
+
+    if sta_ok: synth_store(root, key, base)
+    job.log("[SYS]", f"Synthesis & Timing Complete in {time.time() - t_flow:.1f}s.")
+    on_metrics(stream.finish(os.path.join(root, "reports"))) # streamed metrics; files only fill gaps
+    on_progress(2, 2, "complete")
+    return sta_ok
+
+
+# === SYNTHESIS REPORTS (report files and streamed tool output -> metrics) ===
+
+class ReportEngine:
+    """Parses generated report files for robust metric extraction."""
+    
+    FOOTER_ART = HeaderFactory.ASCII_ART
+
+    @staticmethod
+    def empty_metrics():
+        return {
+            "area": "Unknown", "cells": "0", "wires": "Unknown", "bits": "Unknown",
+            "wns": "0.00", "status": "UNKNOWN", 
+            "critical_path_trace": "No path data found in timing.rpt",
+            "pwr_seq": ["0", "0", "0", "0", "0%"],
+            "pwr_comb": ["0", "0", "0", "0", "0%"],
+            "pwr_clk": ["0", "0", "0", "0", "0%"],
+            "pwr_mac": ["0", "0", "0", "0", "0%"],
+            "pwr_pad": ["0", "0", "0", "0", "0%"],
+            "pwr_tot": ["0", "0", "0", "0", "100%"],
+            "pwr_pct": ["0%", "0%", "0%"],
+            "activity": "default",
+            "errors": [], "timing_groups": [], "cell_list": []
+        }
+
+    @staticmethod
+    def parse_files(report_dir):
+        # Line by line through the same extractor the live flow feeds
+        return MetricStream().finish(report_dir)
+
+    @staticmethod
+    def _bar(pct_str):
+        try:
+            val = float(pct_str.strip('%'))
+            blocks = int(val / 10)
+            return f"|{'█'*blocks}{'-'*(10-blocks)}| {pct_str}"
+        except: return "|----------| 0.0%"
+
+    @staticmethod
+    def generate_report(metrics, design_name="riscv_core"):
+        now = datetime.datetime.now().strftime("%Y-%m-%d")
+        def pr(name, d):
+            split_vis = ReportEngine._bar(d[4])
+            return f"| {name:<14} | {d[0]:<10} | {d[1]:<10} | {d[2]:<10} | {d[3]:<10} | {d[4]:<6} | {split_vis:<16} |"
+
+        t_table = ""
+        for g, s, st, end in metrics["timing_groups"]:
+            t_table += f"| {g:<13} | {s:<11} | {st:<10} | {end:<25} |\n"
+
+        c_table = ""
+        total_c = int(metrics["cells"]) if int(metrics["cells"]) > 0 else 1
+        for name, count in metrics["cell_list"][:15]: 
+            pct = (count / total_c) * 100
+            c_table += f"| {name:<30} | {str(count):<6} | {pct:<4.1f}% |\n"
+
+        rpt = f"""################################################################################
+#                                            POST SYNTHESIS REPORT
+# Design:       {design_name}
+# Date:         {now}
+# PDK:          Sky130 (High Density)
+# Generated by Silis — Silicon Scaffold
+# © 2026 The Silis Foundation
+################################################################################
+
+================================================================================
+  SECTION 1: DESIGN STATISTICS
+================================================================================
++---------------------------+-------------------+
+| Metric                    | Value             |
++---------------------------+-------------------+
+| Total Cells               | {metrics['cells']:<17} |
+| Total Area                | {metrics['area'] + ' um^2':<17} |
+| Total Wires               | {metrics['wires']:<17} |
+| Public Wire Bits          | {metrics['bits']:<17} |
++---------------------------+-------------------+
+
+================================================================================
+  SECTION 2: TIMING SUMMARY
+================================================================================
++---------------+-------------+------------+---------------------------+
+| Path Group    | Slack       | Status     | Critical Endpoint         |
++---------------+-------------+------------+---------------------------+
+{t_table}+---------------+-------------+------------+---------------------------+
+
+[ DETAILED TIMING REPORT ]
+  Worst Negative Slack (WNS): {metrics['wns']} ns ({metrics['status']})
+  
+  CRITICAL PATH TRACE:
+  {metrics['critical_path_trace'].replace(chr(10), chr(10)+'  ')}
+
+================================================================================
+  SECTION 3: POWER ANALYSIS
+================================================================================
++----------------+------------+------------+------------+------------+--------+------------------+
+| Group          | Internal   | Switching  | Leakage    | Total      | %      | Split            |
+|                | Power (W)  | Power (W)  | Power (W)  | Power (W)  |        |                  |
++----------------+------------+------------+------------+------------+--------+------------------+
+{pr("Sequential", metrics['pwr_seq'])}
+{pr("Combinational", metrics['pwr_comb'])}
+{pr("Clock", metrics['pwr_clk'])}
+{pr("Macro", metrics['pwr_mac'])}
+{pr("Pad", metrics['pwr_pad'])}
++----------------+------------+------------+------------+------------+--------+------------------+
+| TOTAL          | {metrics['pwr_tot'][0]:<10} | {metrics['pwr_tot'][1]:<10} | {metrics['pwr_tot'][2]:<10} | {metrics['pwr_tot'][3]:<10} | 100%   | |██████████| 100% |
+|                | {metrics['pwr_pct'][0]:<10} | {metrics['pwr_pct'][1]:<10} | {metrics['pwr_pct'][2]:<10} |            |        |                  |
++----------------+------------+------------+------------+------------+--------+------------------+
+
+  Split: {metrics['pwr_pct'][0]} Internal / {metrics['pwr_pct'][1]} Switching
+  Activity: {metrics['activity']}
+
+[ WARNINGS ]
+{chr(10).join(['  ! '+e for e in metrics['errors']]) if metrics['errors'] else "  (None)"}
+
+================================================================================
+  SECTION 4: CELL UTILIZATION (Top 15)
+================================================================================
++--------------------------------+--------+-------+
+| Cell Name                      | Count  | %     |
++--------------------------------+--------+-------+
+{c_table}+--------------------------------+--------+-------+
+
+{ReportEngine.FOOTER_ART}
+https://github.com/The-Silis-Foundation/silis
+________________________________________________________________________________
+Generated by Silis — Silicon Scaffold
+© 2026 The Silis Foundation
+Licensed under AGPL-3.0
+________________________________________________________________________________
+=== BACKEND ENGINE CREDITS ===
++-----------------------+----------------------------------------------+
+| Component             | Version / Source                             |
++-----------------------+----------------------------------------------+
+| Synthesis             | Yosys 0.33+ (git sha1 2584903)               |
+| Timing Analysis       | OpenSTA 2.4.0                                |
+| PDK Manager           | Silis SSA Forge (PDK Mapping & Alias)        |
++-----------------------+----------------------------------------------+
+"""
+        return rpt
+
+class MetricStream:
+    """
+    Incremental ReportEngine: fed Yosys and STA output one line at a time, as
+    the flow produces it, and builds the same metrics dict parse_files returns.
+    Report files are only read for the sections the stream never saw.
+    """
+    CELL_RE = re.compile(r"(sky130_fd_sc_hd__\w+)\s+cells:\s+(\d+)")
+    AREA_RES = [("area", re.compile(r'"area":\s+([\d\.]+)')), ("cells", re.compile(r'"num_cells":\s+(\d+)')),
+                ("wires", re.compile(r'"num_wires":\s+(\d+)')), ("bits", re.compile(r'"num_pub_wire_bits":\s+(\d+)'))]
+    SLACK_RE = re.compile(r"([-+]?\d+\.\d+)\s+slack\s+\((VIOLATED|MET)\)")
+    TRACE_END_RE = re.compile(r"slack \([A-Z]+\)")
+    PWR_ROWS = {"Sequential": "pwr_seq", "Combinational": "pwr_comb", "Clock": "pwr_clk", "Macro": "pwr_mac", "Pad": "pwr_pad", "Total": "pwr_tot"}
+    FILES = [("log", "synthesis.log"), ("area", "area.rpt"), ("timing", "timing.rpt"), ("power", "power.rpt")]
+
+    def __init__(self):
+        self.m = ReportEngine.empty_metrics()
+        self.seen = set(); self.found = set()
+        self.raw_cells = []; self.worst = None; self.trace = None; self.trace_done = False
+        self.group = None; self.groups_seen = set()
+
+    def feed(self, kind, line):
+        """kind: 'yosys' (log + echoed stat), 'log', 'area', 'timing' or 'power'. True when cells, area or WNS changed."""
+        m = self.m; before = (m["cells"], m["area"], m["wns"])
+        if kind in ("yosys", "log"):
+            self.seen.add("log")
+            c = self.CELL_RE.search(line)
+            if c: self.raw_cells.append((c.group(1), int(c.group(2))))
+            if ("ERROR" in line or "Warning:" in line) and len(m["errors"]) < 10: m["errors"].append(line.strip())
+        if kind in ("yosys", "area"):
+            if kind == "area": self.seen.add("area")
+            for key, rx in self.AREA_RES:
+                if key in self.found: continue
+                r = rx.search(line)
+                if r: m[key] = r.group(1); self.found.add(key); self.seen.add("area")
+        elif kind == "timing":
+            self._timing(line)
+        elif kind == "power":
+            self.seen.add("power")
+            parts = line.split()
+            if parts and parts[0] in self.PWR_ROWS and len(parts) >= 6: m[self.PWR_ROWS[parts[0]]] = parts[1:6]; self.found.add(self.PWR_ROWS[parts[0]])
+            elif parts and "%" in parts[0] and len(parts) >= 3 and "Total" not in line: m["pwr_pct"] = parts[0:3]
+        return (m["cells"], m["area"], m["wns"]) != before
+
+    def _timing(self, line):
+        self.seen.add("timing")
+        if not self.trace_done:
+            if self.trace is None and "Startpoint:" in line: self.trace = [line[line.index("Startpoint:"):]]
+            elif self.trace is not None: self.trace.append(line)
+            if self.trace is not None:
+                e = self.TRACE_END_RE.search(self.trace[-1])
+                if e:
+                    self.trace[-1] = self.trace[-1][:e.end()]
+                    self.m["critical_path_trace"] = "".join(self.trace).rstrip("\n") if len(self.trace) > 1 else self.trace[0]
+                    self.trace_done = True
+        if "Path Group: " in line:
+            self._close_group()
+            name = line.split("Path Group: ", 1)[1].strip()
+            self.group = {"name": name, "slack": None, "end": None, "skip": name in self.groups_seen}
+            self.groups_seen.add(name)
+        s = self.SLACK_RE.search(line)
+        if s:
+            if self.worst is None or float(s.group(1)) < float(self.worst[0]): self.worst = (s.group(1), s.group(2))
+            self.m["wns"], self.m["status"] = self.worst
+            if self.group and self.group["slack"] is None: self.group["slack"] = (s.group(1), s.group(2))
+        e = re.search(r"Endpoint:\s+(\S+)", line)
+        if e and self.group and self.group["end"] is None: self.group["end"] = e.group(1)
+
+    def _close_group(self):
+        g, self.group = self.group, None
+        if g and not g["skip"] and g["slack"]: self.m["timing_groups"].append((g["name"], g["slack"][0], g["slack"][1], g["end"] or "Unknown"))
+
+    def finish(self, report_dir=None):
+        """Final metrics; sections the stream missed are read from report_dir."""
+        for kind, name in self.FILES:
+            path = os.path.join(report_dir, name) if report_dir else None
+            if kind in self.seen or not path or not os.path.exists(path): continue
+            with open(path, 'r', errors="replace") as f:
+                for line in f: self.feed(kind, line)
+        if report_dir and os.path.exists(os.path.join(report_dir, "activity.txt")):
+            with open(os.path.join(report_dir, "activity.txt"), 'r') as f: self.m["activity"] = f.read().strip() or "default"
+        self._close_group()
+        if "timing" in self.seen and self.worst is None: self.m["status"] = "MET"
+        if self.raw_cells: self.m["cell_list"] = sorted(self.raw_cells, key=lambda x: x[1], reverse=True)
+        return self.m
+
+
+# === STATIC TIMING: PERSISTENT STA SESSIONS & FMAX SEARCH ===
+
+class StaSession:
+    """
+    One long-lived `sta` process. Each command is sent over stdin wrapped in a
+    numbered begin/end frame, so its output and Tcl status come back as a unit;
+    the liberty is read once for the life of the process.
+    """
+    BEGIN, END = "#SILIS<", "#SILIS>"
+
+    def __init__(self, lib, cwd):
+        self.cwd = cwd; self.seq = 0; self.lock = threading.Lock()
+        self.p = subprocess.Popen(["sta", "-no_splash", "-no_init"], cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, text=True, bufsize=1, start_new_session=True)
+        if current_job(): current_job().attach(self.p)
+        ok, out = self.run(f"read_liberty {{{lib}}}")
+        if not ok: self.close(); raise RuntimeError(f"read_liberty failed: {out.strip()[-300:]}")
+
+    def run(self, cmd, on_line=None):
+        """(ok, output) of one Tcl command; with on_line each output line goes there instead, as it arrives."""
+        with self.lock:
+            self.seq += 1; n = self.seq
+            try:
+                self.p.stdin.write(f'puts "{self.BEGIN} {n}"; set _rc [catch {{{cmd}}} _msg]; if {{$_rc}} {{puts $_msg}}; puts "{self.END} {n} $_rc"; flush stdout\n')
+                self.p.stdin.flush()
+            except (BrokenPipeError, ValueError): raise RuntimeError("sta session is not running")
+            out, inside = [], False
+            for line in iter(self.p.stdout.readline, ''):
+                if line.startswith(f"{self.BEGIN} {n}"): inside = True
+                elif line.startswith(f"{self.END} {n} "): return line.split()[2] == "0", "".join(out)
+                elif inside and on_line: on_line(line)
+                elif inside: out.append(line)
+            raise RuntimeError("sta exited: " + "".join(out).strip()[-300:])
+
+    def load_design(self, netlist, top, sdc):
+        for cmd in (f"read_verilog {{{netlist}}}", f"link_design {top}", f"read_sdc {{{sdc}}}"):
+            ok, out = self.run(cmd)
+            if not ok: raise RuntimeError(f"{cmd.split()[0]} failed: {out.strip()[-300:]}")
+
+    def worst_slack(self):
+        ok, out = self.run("report_worst_slack -max -digits 4")
+        m = re.search(r"worst slack\s+(-?[\d.]+)", out)
+        if not ok or not m: raise RuntimeError(f"no worst slack reported: {out.strip()[-300:]}")
+        return float(m.group(1))
+
+    def close(self):
+        with suppress(Exception): self.p.stdin.write("exit\n"); self.p.stdin.flush()
+        try: self.p.wait(timeout=2)
+        except Exception:
+            with suppress(Exception): os.killpg(self.p.pid, 9)
+
+
+class FmaxSearch:
+    """
+    Max clock frequency of the current netlist: STA at several candidate periods
+    at once (one persistent session per worker), then a k-ary bisection between
+    the longest failing and the shortest passing period until they are within
+    `tol` ns. The netlist is not resynthesised; only the SDC period changes.
+    """
+    MAX_ROUNDS = 40
+
+    def __init__(self, root, top, lib, workers=None, tol=0.01, log=None):
+        self.root = root; self.top = top; self.lib = lib; self.tol = tol
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self.log = log or (lambda msg: None)
+        self.work = os.path.join(root, "reports", "fmax")
+        self.probes = {}; self.sessions = []; self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        for s in self.sessions:
+            with suppress(Exception): os.killpg(s.p.pid, 9)
+
+    def _open(self, _):
+        s = StaSession(self.lib, self.root); self.sessions.append(s)
+        s.load_design(self.netlist, self.top, os.path.join(self.root, "netlist", f"{self.top}.sdc"))
+        return s
+
+    def _probe(self, period):
+        if self.cancelled: raise RuntimeError("cancelled")
+        s = self.pool.get()
+        try:
+            sdc = os.path.join(self.work, f"p{period:.4f}.sdc")
+            with open(sdc, "w") as f: f.write(sdc_with_period(self.root, self.top, round(period, 4)))
+            ok, out = s.run(f"read_sdc {{{sdc}}}")
+            if not ok: raise RuntimeError(f"read_sdc failed: {out.strip()[-300:]}")
+            wns = self.probes[period] = s.worst_slack()
+            self.log(f"  period {period:.4f} ns -> WNS {wns:+.4f} ns")
+            return period, wns
+        finally: self.pool.put(s)
+
+    def run(self):
+        self.netlist = os.path.join(self.root, "netlist", f"{self.top}_netlist.v")
+        if not os.path.exists(self.netlist): raise FileNotFoundError("no netlist yet, run synthesis first")
+        self.lib = netlist_liberty(self.lib, self.netlist)
+        p0 = sdc_period(self.root, self.top) or 10.0
+        os.makedirs(self.work, exist_ok=True)
+        self.pool = queue.Queue()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as ex:
+                for s in ex.map(self._open, range(self.workers)): self.pool.put(s)
+                probe = lambda periods: dict(ex.map(self._probe, periods))
+                # Seed: slack at the constrained period predicts the critical delay; spread the workers around it
+                est = max(p0 - probe([p0])[p0], self.tol)
+                k = self.workers
+                probe([est * (0.9 + 0.2 * i / max(k - 1, 1)) for i in range(k)] if k > 1 else [est])
+                for _ in range(self.MAX_ROUNDS):
+                    fail = [p for p, w in self.probes.items() if w < 0]; ok = [p for p, w in self.probes.items() if w >= 0]
+                    lo, hi = (max(fail) if fail else None), (min(ok) if ok else None)
+                    if lo is not None and hi is not None and hi - lo <= self.tol: break
+                    if hi is None: probe([lo * 2 ** (i + 1) for i in range(k)])        # nothing passes: widen up
+                    elif lo is None: probe([hi / 2 ** (i + 1) for i in range(k)])      # nothing fails: widen down
+                    else: probe([lo + (hi - lo) * (i + 1) / (k + 1) for i in range(k)])
+                else: raise RuntimeError("no convergence")
+                s = self.pool.get()
+                with open(os.path.join(self.work, "fmax.sdc"), "w") as f: f.write(sdc_with_period(self.root, self.top, round(hi, 4)))
+                s.run(f"read_sdc {{{os.path.join(self.work, 'fmax.sdc')}}}")
+                s.run(f"report_checks -path_delay max -fields {{slew cap input_pins nets fanout}} -format full_clock_expanded > {{{os.path.join(self.work, 'timing.rpt')}}}")
+                self.pool.put(s)
+        finally:
+            for s in self.sessions: s.close()
+        m = ReportEngine.parse_files(self.work)
+        result = {"fmax_mhz": round(1000.0 / hi, 3), "period": round(hi, 4), "wns": self.probes[hi], "tol": self.tol,
+                  "probes": sorted(self.probes.items()), "path": m["critical_path_trace"]}
+        with open(os.path.join(self.root, "reports", "fmax.rpt"), "w") as f:
+            f.write(f"Fmax: {result['fmax_mhz']} MHz (period {result['period']} ns, WNS {result['wns']:+.4f} ns, tol {self.tol} ns)\n")
+            f.write(f"Probes: {len(self.probes)} STA runs on {self.workers} sessions\n\nLimiting path:\n{result['path']}\n")
+        return result
+
+
+class StaService:
+    """
+    The IDE's resident OpenSTA: one StaSession kept across flow runs and
+    interactive queries, keyed on the project and its PDK liberty. The session
+    reads a trimmed liberty holding the cells loaded so far; it is restarted
+    only when a netlist uses a cell outside that set, and then loads the union,
+    so resynthesis rarely costs a liberty read. The design is re-read only
+    when the netlist or SDC content hash, or the activity annotation, changes.
+    """
+    def __init__(self):
+        self.session = None; self.key = None; self.cells = None; self.stamp = None; self.lock = threading.Lock()
+
+    def _ensure(self, root, top, lib, saif_cmd):
+        netlist = os.path.join(root, "netlist", f"{top}_netlist.v"); sdc = os.path.join(root, "netlist", f"{top}.sdc")
+        if not os.path.exists(netlist): raise FileNotFoundError("no netlist yet, run synthesis first")
+        used = netlist_cells(lib, netlist)
+        alive = self.session is not None and self.session.p.poll() is None and self.key == (root, lib)
+        if not alive or (self.cells is not None and not (used and used <= self.cells)):   # cells None: the full library is loaded
+            cells = (used | self.cells) if alive and used else used
+            self.close(); self.session = StaSession(liberty_subset(lib, cells), root); self.key = (root, lib); self.cells = cells; self.stamp = None
+        saif_cmd = self.stamp[3] if saif_cmd is None and self.stamp else (saif_cmd or "")
+        stamp = (top, file_digest(netlist), file_digest(sdc), saif_cmd)
+        if stamp == self.stamp: return False
+        self.stamp = None
+        self.session.load_design(netlist, top, sdc)
+        if saif_cmd:
+            ok, out = self.session.run(saif_cmd)
+            if not ok: raise RuntimeError(f"read_saif failed: {out.strip()[-300:]}")
+        self.stamp = stamp
+        return True
+
+    def ensure(self, root, top, lib, saif_cmd=None):
+        """Brings the session up to date; True when the design had to be (re)loaded. saif_cmd None keeps the current activity."""
+        with self.lock: return self._ensure(root, top, lib, saif_cmd)
+
+    def query(self, root, top, lib, cmd, on_line=None):
+        """(ok, output) of one command against the current netlist (see StaSession.run for on_line)."""
+        with self.lock:
+            self._ensure(root, top, lib, None)
+            return self.session.run(cmd, on_line)
+
+    def usage(self):
+        """(CPU seconds, peak RSS) of the resident sta process so far."""
+        return proc_usage(self.session.p.pid) if self.session else (None, None)
+
+    def close(self):
+        if self.session: self.session.close()
+        self.session = None; self.stamp = None
+
+
+# === BACKEND BATCH (OpenROAD stage scripts, Magic GDS merge & DRC) ===
+
+DEFAULT_SDC = "create_clock -name clk -period 10.0 [get_ports clk]\nset_input_delay 2.0 -clock clk [all_inputs]\nset_output_delay 2.0 -clock clk [all_outputs]\n"
+ROUTE_FIX_TCL = "set db [ord::get_db]; set chip [$db getChip]; set block [$chip getBlock]; set net_names {zero_ one_ logic0 logic1}; foreach name $net_names { set net [$block findNet $name]; if {$net != \"NULL\"} { $net setSigType \"SIGNAL\" } }"
+OR_STAGES = {"floorplan": ("Floorplan", "Tapcells", "PDN", "IO Pins"), "place": ("Place",), "cts": ("CTS",), "route": ("Route",)}
+
+def ensure_sdc(root, top):
+    """netlist/<top>.sdc, written with a 10 ns clk when the project has none yet."""
+    path = os.path.join(root, "netlist", f"{top}.sdc")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f: f.write(DEFAULT_SDC)
+    return path
+
+def openroad_init_tcl(pdk, netlist, top, sdc):
+    return f"""read_lef "{pdk['tlef']}"\nread_lef "{pdk['lef']}"\nread_liberty "{pdk['lib']}"\nread_verilog "{netlist}"\nlink_design {top}\nread_sdc "{sdc}" """
+
+def prepare_backend_dirs(root):
+    """results/, reports/ and the fix.tcl the Route step sources."""
+    for d in ("results", "reports"): os.makedirs(os.path.join(root, d), exist_ok=True)
+    with suppress(OSError), open(os.path.join(root, "fix.tcl"), 'w') as f: f.write(ROUTE_FIX_TCL)
+
+def openroad_step_cmd(step, pdk, root):
+    """Default TCL of one backend ribbon step (run prepare_backend_dirs first); each ends by writing results/temp.def for the live floorplan view."""
+    results_dir = os.path.join(root, "results"); reports_dir = os.path.join(root, "reports")
+    def_abs_path = os.path.join(results_dir, "temp.def").replace("\\", "/")
+    write_cmd = f"write_def \"{def_abs_path}\""
+    if not SSAForge.ALIASES: SSAForge.load_aliases()
+    pdk_name = pdk.get('name', SSAForge.DEFAULT_PDK) if pdk else SSAForge.DEFAULT_PDK
+    lib_path = pdk.get('lib', None) if pdk else None
+
+    if step == "Floorplan": return f"initialize_floorplan -die_area \"0 0 400 400\" -core_area \"10 10 390 390\" -site unithd; {write_cmd}"
+    if step == "Tapcells": return SSAForge.get_tap_cmd(pdk_name, lib_path) + f"; {write_cmd}"
+    if step == "PDN": return "add_global_connection -net {VDD} -pin_pattern {^VPWR$|^VDD$} -power; add_global_connection -net {VSS} -pin_pattern {^VGND$|^VSS$} -ground; set_voltage_domain -name {Core} -power {VDD} -ground {VSS}; define_pdn_grid -name {grid} -voltage_domains {Core}; add_pdn_stripe -grid {grid} -layer {met1} -width {0.48} -followpins; add_pdn_stripe -grid {grid} -layer {met4} -width {1.6} -pitch {27.2} -offset {13.6} -extend_to_core_ring; add_pdn_connect -grid {grid} -layers {met1 met4}; pdngen; " + write_cmd
+    if step == "IO Pins": return f"place_pins -hor_layers met3 -ver_layers met4; {write_cmd}"
+    if step == "Place": return f"global_placement -density 0.6; detailed_placement; {write_cmd}"
+    if step == "CTS": return SSAForge.get_cts_cmd(pdk_name, lib_path) + f"; {write_cmd}"
+    if step == "Route":
+        guide_path = os.path.join(results_dir, "route.guide").replace("\\", "/")
+        drc_path = os.path.join(reports_dir, "drc.rpt").replace("\\", "/")
+        fix_script = os.path.join(root, "fix.tcl").replace("\\", "/")
+        return f"source \"{fix_script}\"; global_route -guide_file \"{guide_path}\" -congestion_iterations 50 -verbose; detailed_route -output_drc \"{drc_path}\"; {write_cmd}"
+    return ""
+
+def openroad_stage_tcl(stage, pdk, root, top):
+    """
+    Batch script of one OR_STAGES stage. It starts from the previous stage's
+    results/<stage>.odb (floorplan from the netlist) and saves its own, so
+    any stage can be re-run alone.
+    """
+    names = list(OR_STAGES); i = names.index(stage)
+    odb = lambda s: os.path.join(root, "results", f"{s}.odb").replace("\\", "/")
+    sdc = os.path.join(root, "netlist", f"{top}.sdc")
+    if i == 0: head = openroad_init_tcl(pdk, os.path.join(root, "netlist", f"{top}_netlist.v"), top, sdc)
+    else: head = f"read_liberty \"{pdk['lib']}\"\nread_db \"{odb(names[i - 1])}\"\nread_sdc \"{sdc}\""
+    body = [openroad_step_cmd(s, pdk, root) for s in OR_STAGES[stage]]
+    if stage == "route": body.append(f"write_def \"{os.path.join(root, 'results', 'final_routed.def')}\"")
+    return "\n".join([head, *body, f"write_db \"{odb(stage)}\""]) + "\n"
+
+def docker_kill(root, cidfile):
+    """
+    Cancel hook of a containerised run: `docker kill` as a ToolRun on a thread
+    of its own, outside every job (the cancelled one would refuse to start it)
+    and without holding up whoever is cancelling.
+    """
+    def kill():
+        try:
+            with open(cidfile) as f: cid = f.read().strip()
+        except OSError: return
+        if not cid: return
+        with ToolRun(root, "backend", "docker", "kill", ["docker", "kill", cid]) as tr: tr.run(["docker", "kill", cid])
+    threading.Thread(target=kill, daemon=True).start()
+
+def openroad_batch(job, root, name, tcl, paths=(), outputs=()):
+    """
+    Runs a TCL script through OpenROAD without the interactive session: the
+    local binary when installed, else the openroad/openroad container the
+    backend tab uses (home, the project and the folders of `paths` mounted).
+    Output goes to job.log("[BACKEND]", ...); cancelling the job also stops
+    the container. False on a non-zero exit or an [ERROR line.
+    """
+    work = silis_cache_dir(root, "openroad"); script = os.path.join(work, f"{name}.tcl"); cid = None
+    with open(script, "w") as f: f.write(tcl)
+    if shutil.which("openroad"): cmd = ["openroad", "-no_init", "-exit", script]
+    elif shutil.which("docker"):
+        cid = os.path.join(work, f"{name}.cid")
+        with suppress(OSError): os.remove(cid)
+        mounts = []
+        for d in [os.path.expanduser("~"), os.path.abspath(root), *(os.path.dirname(os.path.abspath(p)) for p in paths if p)]:
+            if not any(d == m or d.startswith(m + os.sep) for m in mounts): mounts.append(d)
+        cmd = ["docker", "run", "--rm", "--cidfile", cid, "--network", "none", *[a for m in mounts for a in ("-v", f"{m}:{m}")],
+               "-w", os.path.abspath(root), "openroad/openroad", "openroad", "-no_init", "-exit", script]
+        job.on_cancel(lambda: docker_kill(root, cid))
+    else: job.log("[BACKEND]", "[ERR] Neither openroad nor docker found."); return False
+    job.log("[BACKEND]", f"> openroad {os.path.relpath(script, root)}")
+    errors = 0
+    with ToolRun(root, "backend", "openroad", name, cmd, inputs=[script, *paths], outputs=outputs) as tr:
+        p = tr.popen(cmd, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        for line in iter(p.stdout.readline, ''):
+            line = line.rstrip()
+            if line: job.log("[BACKEND]", line)
+            errors += "[ERROR" in line
+        rc = tr.wait(p)
+    return rc == 0 and not errors
+
+def magic_merge(job, root, pdk, def_path):
+    """Streams a routed DEF into results/design.gds with the PDK's LEF and cell GDS through batch Magic."""
+    if not shutil.which("magic"): job.log("[BACKEND]", "[ERR] 'magic' executable not found."); return False
+    pdk_gds = pdk.get('gds', ''); pdk_tech = pdk.get('tech', '')
+    pdk_tlef = pdk.get('tlef', ''); pdk_lef = pdk.get('lef', '')
+    output_gds = os.path.join(root, "results", "design.gds").replace("\\", "/")
+    if not all(os.path.exists(p) for p in [pdk_gds, pdk_tech, pdk_tlef, pdk_lef]): job.log("[BACKEND]", "[ERR] Missing PDK files."); return False
+    script_content = f"drc off\nlocking off\ngds readonly true\ngds rescale false\nlef read {pdk_tlef}\nlef read {pdk_lef}\ngds read {pdk_gds}\ndef read {def_path}\ngds write {output_gds}\nquit"
+    script_path = os.path.join(root, "merge_magic.tcl")
+    with open(script_path, 'w') as f: f.write(script_content)
+    job.log("[BACKEND]", "[SYS] Magic: Merging with LEF support...")
+    try:
+        cmd = ["magic", "-noconsole", "-dnull", "-T", pdk_tech, script_path]
+        with ToolRun(root, "backend", "magic", "GDS merge", cmd, inputs=[script_path, def_path], outputs=[output_gds]) as tr:
+            proc = tr.run(cmd)
+        if proc.returncode == 0 and os.path.exists(output_gds): job.log("[BACKEND]", f"Saved: {output_gds}"); return True
+        job.log("[BACKEND]", f"[ERR] Magic Failed:\n{proc.stderr}\n{proc.stdout}"); return False
+    except Exception as e: job.log("[BACKEND]", f"[ERR] Magic Execution Error: {e}"); return False
+
+def magic_drc(job, root, tech, gds_path):
+    """
+    Batch Magic DRC of a GDS; the violation list goes to reports/magic_drc.rpt.
+    False when Magic failed, not when it found violations (those are results).
+    """
+    if not shutil.which("magic"): job.log("[BACKEND]", "[ERR] 'magic' not found."); return False
+    if not tech or not os.path.exists(tech): job.log("[BACKEND]", "[ERR] Missing Tech file."); return False
+    script_content = f"drc off\ngds read {gds_path}\ndrc style drc(fast)\ndrc on\ndrc check\ndrc catchup\nset count [drc list count]\nputs \"SILIS_DRC_VIOLATIONS: $count\"\nif {{$count > 0}} {{ drc list all }}\nquit"
+    script_path = os.path.join(root, "run_drc.tcl")
+    with open(script_path, 'w') as f: f.write(script_content)
+    job.log("[BACKEND]", f"\n[SIGNOFF] Running Magic DRC on {os.path.basename(gds_path)}...")
+    rpt = os.path.join(root, "reports", "magic_drc.rpt"); os.makedirs(os.path.dirname(rpt), exist_ok=True)
+    try:
+        cmd = ["magic", "-noconsole", "-dnull", "-T", tech, script_path]
+        with ToolRun(root, "backend", "magic", "DRC", cmd, inputs=[script_path, gds_path], outputs=[rpt]) as tr, open(rpt, "w") as out:
+            proc = tr.popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            for line in iter(proc.stdout.readline, ''):
+                out.write(line); line = line.strip()
+                if "SILIS_DRC_VIOLATIONS" in line:
+                    m = re.search(r'(\d+)\s*\}?$', line); count = m.group(1) if m else "Unknown"
+                    if count == "0": job.log("[BACKEND]", "🟢 DRC CLEAN (0 Violations)")
+                    else: job.log("[BACKEND]", f"🔴 DRC FAILED: {count} Violations Found")
+                elif "Error:" in line or "error" in line.lower(): job.log("[BACKEND]", f"[DRC ERR] {line}")
+            rc = tr.wait(proc)
+        job.log("[BACKEND]", "DRC Run Complete.")
+        return rc == 0
+    except Exception as e: job.log("[BACKEND]", f"[ERR] DRC Execution Failed: {e}"); return False
+
+
+# === FLOW DAG (make-style stages, content stamps, parallel builds) ===
+
+FLOW_STAMPS = "flow_stamps.json"
+FlowStage = collections.namedtuple("FlowStage", "name deps run inputs outputs params after", defaults=((),))   # after: ordering only, a failure does not cancel
+_flow_lock = threading.Lock()
+
+def load_flow_stamps(root):
+    try:
+        with open(os.path.join(root, ".silis_cache", FLOW_STAMPS)) as f: return json.load(f)
+    except (OSError, ValueError): return {}
+
+def input_stamp(root, path):
+    """Content hash for project files; size + mtime for anything outside it (PDK libraries and GDS are large and read-only)."""
+    path = os.path.abspath(path)
+    return file_digest(path) if path.startswith(os.path.abspath(root) + os.sep) else file_fingerprint(path)[len(path) + 1:]
+
+
+class FlowGraph:
+    """
+    The design flow as make sees it. Each stage declares its input files,
+    output files and parameters; it is fresh when its outputs exist and the
+    hash of its parameters and input contents matches the stamp recorded in
+    .silis_cache/flow_stamps.json when it last succeeded. A stage's inputs
+    include its deps' outputs, so an upstream rebuild that reproduces the
+    same netlist leaves everything below it fresh. build(target) runs only
+    what is stale, one scheduler job per stage with its upstream jobs as deps,
+    so independent stages run side by side. Synth reads the sim dump for
+    power, so it stamps that VCD and waits for a sim that is being rebuilt
+    (`after`: ordering only, a failed sim does not cancel synth).
+    """
+    def __init__(self, root, base, pdk=None, lib=None, sta_service=None, on_metrics=None, on_progress=None):
+        self.root, self.base, self.pdk = root, base, pdk or {}
+        self.lib = lib or self.pdk.get("lib"); self.sta_service = sta_service or StaService()
+        self.on_metrics, self.on_progress = on_metrics, on_progress
+        p = lambda *a: os.path.join(root, *a)
+        net, sdc = p("netlist", f"{base}_netlist.v"), p("netlist", f"{base}.sdc")
+        pdk_files = lambda *keys: [self.pdk[k] for k in keys if self.pdk.get(k)]
+        settings = lambda sim: {k: v for k, v in load_project_settings(root).items() if k.startswith("sim_") == sim}
+        odb = lambda s: p("results", f"{s}.odb")
+        S = FlowStage
+        stages = [
+            S("sim", (), lambda job: sim_flow(job, root, base), lambda: project_sources(root),
+              lambda: [p(tb_dumpfile(project_sources(root)) or f"{base}.vcd")], lambda: (settings(True), load_dump_profile(root))),
+            S("schematic", (), self.run_schematic, lambda: schematic_sources(root), lambda: [p(f"{base}.svg")], lambda: ()),
+            S("synth", (), self.run_synth, lambda: [*synth_sources(root), *([self.lib] if self.lib else []), sdc, *filter(None, [self.activity_vcd()])],
+              lambda: [net, *(p(r) for _, r in STA_REPORTS)], lambda: settings(False), after=("sim",)),
+        ]
+        prev = ("synth", [net, sdc])
+        for s in OR_STAGES:
+            outs = [odb(s)] + ([p("results", "final_routed.def")] if s == "route" else [])
+            stages.append(S(s, (prev[0],), lambda job, s=s: self.run_openroad(job, s), lambda prev=prev: [*prev[1], *pdk_files("tlef", "lef", "lib")],
+                            lambda outs=outs: outs, lambda s=s: self.pdk and openroad_stage_tcl(s, self.pdk, root, base)))
+            prev = (s, [odb(s)])
+        stages += [
+            S("gds", ("route",), lambda job: bool(self.need_pdk(job)) and magic_merge(job, root, self.pdk, p("results", "final_routed.def")),
+              lambda: [p("results", "final_routed.def"), *pdk_files("gds", "tech", "tlef", "lef")], lambda: [p("results", "design.gds")], lambda: ()),
+            S("drc", ("gds",), lambda job: bool(self.need_pdk(job)) and magic_drc(job, root, self.pdk.get("tech"), p("results", "design.gds")),
+              lambda: [p("results", "design.gds"), *pdk_files("tech")], lambda: [p("reports", "magic_drc.rpt")], lambda: ()),
+        ]
+        self.stages = {s.name: s for s in stages}
+
+    # --- stage bodies ---
+    def need_pdk(self, job):
+        if not self.pdk: job.log("[FLOW]", "[ERR] No PDK selected for the backend stages.")
+        return self.pdk
+
+    def run_schematic(self, job):
+        return render_schematic(self.root, self.base, schematic_sources(self.root), lambda msg, lvl: job.log("[SYS]", f"[{lvl}] {msg}")) is not None
+
+    def run_synth(self, job):
+        if not self.lib: job.log("[FLOW]", "[ERR] No liberty for synthesis (select a PDK)."); return False
+        ensure_sdc(self.root, self.base)
+        return synth_flow(job, self.root, self.base, self.lib, self.sta_service, self.activity_vcd(), self.on_metrics, self.on_progress)
+
+    def activity_vcd(self):
+        """The dump power analysis reads: the sim stage's output, else the newest VCD in the project."""
+        vcd = self.stages["sim"].outputs()[0]
+        return vcd if os.path.exists(vcd) else latest_vcd(self.root)
+
+    def run_openroad(self, job, stage):
+        if not self.need_pdk(job): return False
+        ensure_sdc(self.root, self.base); prepare_backend_dirs(self.root)
+        st = self.stages[stage]
+        return openroad_batch(job, self.root, stage, openroad_stage_tcl(stage, self.pdk, self.root, self.base), st.inputs(), st.outputs())
+
+    # --- stamps ---
+    def stamp(self, name):
+        """(key, {input: digest}) of a stage as its files stand now."""
+        st = self.stages[name]
+        rel = lambda f: os.path.relpath(f, self.root) if os.path.abspath(f).startswith(os.path.abspath(self.root) + os.sep) else f
+        digests = {rel(f): input_stamp(self.root, f) for f in sorted(set(st.inputs()))}
+        params = cache_key(st.params())
+        return cache_key(params, digests), params, digests
+
+    def record(self, name, stamp):
+        key, params, digests = stamp
+        with _flow_lock:
+            stamps = load_flow_stamps(self.root)
+            stamps[name] = {"key": key, "params": params, "inputs": digests, "t": round(time.time(), 3)}
+            path = os.path.join(silis_cache_dir(self.root), FLOW_STAMPS)
+            with open(path + ".tmp", "w") as f: json.dump(stamps, f, indent=1)
+            os.replace(path + ".tmp", path)
+
+    def status(self, name, stamps=None):
+        """("fresh" | "stale" | "never", reason) of one stage."""
+        rec = (load_flow_stamps(self.root) if stamps is None else stamps).get(name)
+        if not rec: return "never", "never built"
+        missing = [os.path.relpath(f, self.root) for f in self.stages[name].outputs() if not os.path.exists(f)]
+        if missing: return "stale", f"missing {', '.join(missing[:2])}" + (f" (+{len(missing) - 2})" if len(missing) > 2 else "")
+        key, params, digests = self.stamp(name)
+        if key == rec["key"]: return "fresh", f"built {time.strftime('%H:%M:%S', time.localtime(rec['t']))}"
+        changed = sorted(f for f in set(digests) | set(rec["inputs"]) if digests.get(f) != rec["inputs"].get(f))
+        if changed: return "stale", f"changed {', '.join(os.path.basename(f) for f in changed[:2])}" + (f" (+{len(changed) - 2})" if len(changed) > 2 else "")
+        return "stale", "settings changed"
+
+    def statuses(self):
+        stamps = load_flow_stamps(self.root)
+        return {n: self.status(n, stamps) for n in self.stages}
+
+    # --- planning ---
+    def ancestors(self, target=None):
+        """target and everything it depends on, in build order (None: every stage)."""
+        order = []
+        def walk(n):
+            for d in self.stages[n].deps: walk(d)
+            if n not in order: order.append(n)
+        for n in ([target] if target else self.stages): walk(n)
+        return order
+
+    def depth(self, name):
+        return 1 + max((self.depth(d) for d in self.stages[name].deps), default=-1)
+
+    def plan(self, target=None, statuses=None):
+        """Stages `build(target)` would run: the ones not fresh, and everything below them."""
+        statuses = statuses or self.statuses(); todo = []
+        for n in self.ancestors(target):
+            if statuses[n][0] != "fresh" or any(d in todo for d in (*self.stages[n].deps, *self.stages[n].after)): todo.append(n)
+        return todo
+
+    def build(self, target=None, scheduler=None, sink=None, after=()):
+        """Submits the plan as jobs (group "flow"); returns {stage: Job}."""
+        scheduler = scheduler or job_scheduler(); jobs = {}
+        for n in self.plan(target):
+            jobs[n] = scheduler.submit(f"{n} {self.base}", lambda job, n=n: self.run_stage(job, n), group="flow", root=self.root, sink=sink,
+                                       deps=[jobs[d] for d in self.stages[n].deps if d in jobs], after=[*after, *(jobs[d] for d in self.stages[n].after if d in jobs)])
+        return jobs
+
+    def run_stage(self, job, name):
+        """Re-checks the stage (an upstream rebuild may have changed nothing), runs it and records its stamp."""
+        state, why = self.status(name)
+        if state == "fresh": job.log("[FLOW]", f"{name}: up to date, upstream outputs unchanged"); return True
+        job.log("[FLOW]", f"{name}: building ({why})")
+        before = self.stamp(name); t0 = time.time()
+        ok = self.stages[name].run(job)
+        if ok is False or job.cancelled: job.log("[FLOW]", f"{name}: FAILED after {time.time() - t0:.1f}s"); return False
+        missing = [os.path.relpath(f, self.root) for f in self.stages[name].outputs() if not os.path.exists(f)]
+        if missing: job.log("[FLOW]", f"{name}: FAILED, no {', '.join(missing)}"); return False
+        after = self.stamp(name)
+        # inputs edited while it ran keep the stamp they were built from, so the next build picks them up
+        edited = [f for f, d in before[2].items() if d != "missing" and after[2].get(f) != d]
+        self.record(name, before if edited else after)
+        job.log("[FLOW]", f"{name}: done in {time.time() - t0:.1f}s")
+        return True
+
+
+# === REGRESSION RUNNER (Parallel Testbenches) ===
+
+TB_PATTERNS = ("tb_*", "*_tb", "test_*")     # same naming prep_workspace assumes
+REG_FAIL_RE = re.compile(r"\b(FAIL(ED|URE)?|ERROR|MISMATCH|FATAL)\b|Assertion failed", re.I)
+
+def discover_testbenches(root):
+    """([(testbench file, top module)], shared design files) from <root>/source."""
+    src = sorted(glob.glob(os.path.join(root, "source", "*.v")) + glob.glob(os.path.join(root, "source", "*.sv")))
+    is_tb = lambda p: any(fnmatch.fnmatch(os.path.splitext(os.path.basename(p))[0], pat) for pat in TB_PATTERNS)
+    tbs = []
+    for p in filter(is_tb, src):
+        with open(p, errors="replace") as f: m = re.search(r"^\s*module\s+(\w+)", f.read(), re.M)
+        if m: tbs.append((p, m.group(1)))
+    return tbs, [p for p in src if not is_tb(p)]
+
+def parse_seeds(text):
+    """'1,2,5-8' -> [1, 2, 5, 6, 7, 8]."""
+    seeds = []
+    for part in text.replace(" ", "").split(","):
+        m = re.match(r"^(\d+)(?:-(\d+))?$", part)
+        if m: seeds += list(range(int(m.group(1)), int(m.group(2) or m.group(1)) + 1))
+    return seeds
+
+def regression_matrix(tbs, seeds=(), plusargs=()):
+    """One job per testbench x seed x plusarg set."""
+    return [{"test": top, "tb": tb, "seed": seed, "args": args}
+            for tb, top in tbs for seed in (list(seeds) or [None]) for args in (list(plusargs) or [""])]
+
+
+class RegressionRunner:
+    """
+    Builds each testbench once (through the iverilog build cache) and runs the
+    job matrix with at most `workers` simulations alive at a time, each in its
+    own work dir. Verdict: non-zero exit, timeout or a failure pattern in the
+    output fails the job. The simulations are ToolRuns of the scheduler Job
+    that calls run(), so cancelling that job kills them; cancel() (its
+    on_cancel hook) only stops the rest of the matrix from starting.
+    """
+    def __init__(self, root, jobs, design, workers=None, timeout=600, on_result=None):
+        self.root = root; self.jobs = jobs; self.design = design
+        self.workers = max(1, workers or os.cpu_count() or 1); self.timeout = timeout
+        self.on_result = on_result
+        self.cancelled = False
+        self._builds = {}; self._build_locks = {t["test"]: threading.Lock() for t in jobs}
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _build(self, job):
+        with self._build_locks[job["test"]]:
+            if job["test"] not in self._builds:
+                out, _, msgs = compile_iverilog(self.root, [job["tb"]] + self.design, os.path.join("regress", f"{job['test']}.out"),
+                                                flags=("-g2012", "-s", job["test"]), inc_dirs=[os.path.join(self.root, "source")])
+                self._builds[job["test"]] = (out, msgs)
+            return self._builds[job["test"]]
+
+    def run_job(self, idx, job):
+        res = dict(job, status="CANCELLED", rc=None, runtime=0.0, log="", workdir="")
+        if self.cancelled: return res
+        try: return self._run_job(idx, job, res)
+        except JobCancelled: res["status"] = "CANCELLED"; return res
+
+    def _run_job(self, idx, job, res):
+        tag = job["test"] + (f"_s{job['seed']}" if job["seed"] is not None else "")
+        if job["args"]: tag += "_" + re.sub(r"[^\w.=-]+", "_", job["args"])[:40]
+        wd = os.path.join(self.root, "regress", f"{idx:04d}_{tag}"); os.makedirs(wd, exist_ok=True)
+        res["workdir"] = wd; res["log"] = os.path.join(wd, "sim.log")
+        build, msgs = self._build(job)
+        if not build:
+            with open(res["log"], "w") as f: f.write(msgs)
+            res["status"] = "BUILD FAIL"; return res
+        cmd = ["vvp", os.path.abspath(build)] + (["+seed=%d" % job["seed"]] if job["seed"] is not None else []) + job["args"].split()
+        t0 = time.time(); timed_out = []
+        with open(res["log"], "w") as log, ToolRun(self.root, "regression", "vvp", tag, cmd, inputs=[build], outputs=[res["log"]]) as tr:
+            p = tr.popen(cmd, cwd=wd, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            timer = threading.Timer(self.timeout, lambda: (timed_out.append(True), kill_group(p, signal.SIGKILL))); timer.start()
+            try: res["rc"] = tr.wait(p)
+            finally: timer.cancel()
+        res["runtime"] = round(time.time() - t0, 3)
+        if timed_out: res["status"] = "TIMEOUT"; return res
+        if self.cancelled: res["status"] = "CANCELLED"; return res
+        failed = res["rc"] != 0
+        with open(res["log"], errors="replace") as f:
+            for line in f:
+                if REG_FAIL_RE.search(line): failed = True; break
+        res["status"] = "FAIL" if failed else "PASS"
+        return res
+
+    def run(self):
+        results = []; begin_flow_run(self.root, "regression")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, initializer=bind_job, initargs=(current_job(),)) as ex:
+            futs = [ex.submit(self.run_job, i, job) for i, job in enumerate(self.jobs)]
+            for fut in concurrent.futures.as_completed(futs):
+                res = fut.result(); results.append(res)
+                if self.on_result: self.on_result(res)
+        os.makedirs(os.path.join(self.root, "reports"), exist_ok=True)
+        with open(os.path.join(self.root, "reports", "regression.json"), "w") as f: json.dump(results, f, indent=1)
+        return results
+
+
+# === SCHEMATIC RENDER (Yosys show -> Graphviz SVG) ===
+
+def schematic_sources(root):
+    """Design sources without the testbenches ('tb_', '_tb', 'test_' in the name)."""
+    return [f for f in project_sources(root) if not any(x in os.path.basename(f).lower() for x in ["tb_", "_tb", "test_"])]
+
+def render_schematic(root, base, src_files, log):
+    """
+    Yosys `show` -> DOT -> SVG for the top module, falling back to the raw
+    structural view when the RTL one fails. log(msg, level); returns the SVG
+    path, or None.
+    """
+    def tool(name, step, cmd):
+        with ToolRun(root, "schematic", name, step, cmd) as tr: return tr.run(cmd, shell=True, cwd=root)
+
+    # 1. Check for Graphviz (The Painter)
+    if not shutil.which("dot"):
+        log("Graphviz ('dot') not found!", "ERR")
+        log("Run: sudo apt install graphviz", "TIP")
+        return None
+
+    # Prepare paths
+    read_cmd = "".join([f"read_verilog {s}; " for s in src_files])
+    dot_base = os.path.join(root, base) # Yosys adds .dot automatically
+    dot_file = dot_base + ".dot"
+    svg_file = dot_base + ".svg"
+    
+    if os.path.exists(dot_file): os.remove(dot_file)
+
+    # === STRATEGY 1: High-Level RTL (Best for reading) ===
+    # 'proc' converts processes to logic. 'memory' handles arrays.
+    # We explicitly use -prefix to control the output filename.
+    cmd_rtl = f"yosys -p '{read_cmd} hierarchy -check -top {base}; proc; opt; show -colors 2 -width -stretch -format dot -prefix {dot_base}'"
+    
+    # === STRATEGY 2: Structural (Fallback if logic is too complex) ===
+    # No optimization, just raw connectivity.
+    cmd_raw = f"yosys -p '{read_cmd} hierarchy -auto-top; proc; show -colors 2 -width -stretch -format dot -prefix {dot_base}'"
+
+    try:
+        log("Generating logic graph...", "SYS")
+        
+        # Try elegant RTL view first
+        res = tool("yosys", "show rtl", cmd_rtl)
+        
+        # If RTL view failed (or produced empty dot), try raw view
+        if not os.path.exists(dot_file):
+            log("Complex render failed. Trying structural view...", "WARN")
+            tool("yosys", "show raw", cmd_raw)
+
+        # 3. Convert DOT to SVG (The Visualizer)
+        if os.path.exists(dot_file):
+            log("Rendering SVG...", "SYS")
+            # -Grankdir=LR makes it flow Left-to-Right (Standard Schematic style)
+            tool("dot", "svg", f"dot -Tsvg {dot_file} -o {svg_file} -Grankdir=LR")
+            
+            if os.path.exists(svg_file):
+                log("Schematic Ready.", "SYS"); return svg_file
+            log("Graphviz failed to convert DOT to SVG.", "ERR")
+        else:
+            log("Yosys failed to generate graph. Check syntax.", "ERR")
+            log(f"Yosys Stderr: {res.stderr[:200]}...", "DBG")
+
+    except Exception as e:
+        log(f"Schematic Engine Crash: {e}", "ERR")
+    return None
+
+
+# === PROJECT LAYOUT (<base>_project folders) ===
+
+def project_root(cwd, base):
+    """<cwd>/<base>_project, or cwd itself when it already is that project (or its source/ / netlist/ folder)."""
+    pname = f"{base}_project"; cwd = os.path.abspath(cwd)
+    if os.path.basename(cwd) == pname: return cwd
+    if os.path.basename(cwd) in ["source", "netlist"]: return os.path.dirname(cwd)
+    return os.path.join(cwd, pname)
+
+def prep_workspace(cwd, base, log=None):
+    """Creates the project folders and moves <base>.v and its testbench from cwd into source/."""
+    root = project_root(cwd, base)
+    src_dir = os.path.join(root, "source")
+    for d in ["source", "netlist", "reports", "results"]: os.makedirs(os.path.join(root, d), exist_ok=True)
+    files = [f"{base}.v", f"tb_{base}.v", f"{base}_tb.v", f"test_{base}.v", f"{base}.sv"]
+    search_dirs = list(set([os.path.abspath(cwd), root]))
+    for fname in files:
+        if os.path.exists(os.path.join(src_dir, fname)): continue
+        found = None
+        for s_dir in search_dirs:
+            possible = os.path.join(s_dir, fname)
+            if os.path.exists(possible): found = possible; break
+        if found:
+            try:
+                shutil.move(found, os.path.join(src_dir, fname))
+                if log: log(f"Moved {fname} -> source/")
+            except: pass
+    return root
+
+
+# === FLOW METRICS & HEADLESS CLI (silis run) ===
+
+DRC_COUNT_RE = re.compile(r"SILIS_DRC_VIOLATIONS:\s*(\d+)")
+
+def _metric(v, cast=float):
+    try: return cast(v)
+    except (TypeError, ValueError): return None
+
+def flow_metrics(root):
+    """Headline numbers of a project from its reports: area, cells, WNS, timing status, total power and DRC counts (None when not reported)."""
+    ms = MetricStream(); m = ms.finish(os.path.join(root, "reports"))
+    out = {"area": _metric(m["area"]) if "area" in ms.found else None, "cells": _metric(m["cells"], int) if "cells" in ms.found else None,
+           "wns": _metric(ms.worst[0]) if ms.worst else None, "timing": m["status"] if "timing" in ms.seen else None,
+           "power": _metric(m["pwr_tot"][3]) if "pwr_tot" in ms.found else None, "drc": None, "route_drc": None}
+    with suppress(OSError), open(os.path.join(root, "reports", "magic_drc.rpt"), errors="replace") as f:
+        d = DRC_COUNT_RE.search(f.read()); out["drc"] = int(d.group(1)) if d else None
+    with suppress(OSError), open(os.path.join(root, "reports", "drc.rpt"), errors="replace") as f:
+        out["route_drc"] = sum(1 for line in f if line.startswith("violation type"))
+    return out
+
+def resolve_pdk(spec):
+    """A PDK config from a name in the IDE's PDK cache, a JSON file holding one, or a bare liberty path."""
+    if not spec: return None
+    if spec.endswith(".json") and os.path.isfile(spec):
+        with open(spec) as f: return json.load(f)
+    cfg = next((c for c in PDKManager().configs if c.get("name") == spec), None)
+    if cfg: return cfg
+    if os.path.isfile(spec): return {"name": os.path.basename(spec), "lib": os.path.abspath(spec)}
+    raise ValueError(f"unknown PDK {spec!r} (known: {', '.join(c.get('name', '?') for c in PDKManager().configs) or 'none'})")
+
+def flow_report(graph, target, jobs, statuses, t0):
+    """The JSON `silis run` prints: per-stage job outcome and cost, and the project's metrics."""
+    stages = {}
+    for n in graph.ancestors(target):
+        j = jobs.get(n)
+        if j is None: stages[n] = {"state": "fresh", "reason": statuses[n][1]}; continue
+        s = j.summary()
+        stages[n] = {"state": s["state"], "reason": statuses[n][1], "ran": round(s["ran"], 3), "waited": round(s["waited"], 3),
+                     "cpu": round(s["cpu"], 3), "rss": s["rss"], "tools": s["tools"], "error": s["error"], "log": s["log"]}
+    return {"design": graph.base, "root": graph.root, "pdk": graph.pdk.get("name"), "target": target or "all",
+            "ok": all(v["state"] in ("done", "fresh") for v in stages.values()), "wall": round(time.time() - t0, 3),
+            "stages": stages, "metrics": flow_metrics(graph.root)}
+
+def flow_cli(argv):
+    """`silis run`: the FlowGraph up to one stage, headless, with the result as JSON on stdout."""
+    import argparse
+    ap = argparse.ArgumentParser(prog="silis run", description="Run the design flow without the GUI and print metrics JSON.")
+    ap.add_argument("--top", required=True, help="top module; the project is <cwd>/<top>_project unless --root is given")
+    ap.add_argument("--pdk", help="PDK name from the IDE's PDK list, a PDK config .json, or a liberty file")
+    ap.add_argument("--to", default="route", help="last stage: sim, schematic, synth, floorplan, place, cts, route, gds, drc or all (default: route)")
+    ap.add_argument("--root", help="project folder (default: prepared from the current directory like the IDE does)")
+    ap.add_argument("--jobs", type=int, default=None, help="CPU budget of the scheduler (default: all cores)")
+    ap.add_argument("--json", help="also write the result to this file")
+    ap.add_argument("--dry-run", action="store_true", help="print what would run and why, run nothing")
+    ap.add_argument("-v", "--verbose", action="store_true", help="tool output on stderr, not just stage progress")
+    args = ap.parse_args(argv)
+    try: pdk = resolve_pdk(args.pdk)
+    except ValueError as e: print(f"silis run: {e}", file=sys.stderr); return 2
+    if args.root: root = os.path.abspath(args.root)
+    elif args.dry_run: root = project_root(os.getcwd(), args.top)   # a dry run leaves the tree alone
+    else: root = prep_workspace(os.getcwd(), args.top, log=lambda m: print(m, file=sys.stderr))
+    graph = FlowGraph(root, args.top, pdk)
+    target = None if args.to == "all" else args.to
+    if target and target not in graph.stages: print(f"silis run: unknown stage {args.to!r}", file=sys.stderr); return 2
+    t0 = time.time(); statuses = graph.statuses()
+    if args.dry_run:
+        plan = graph.plan(target, statuses)
+        print(json.dumps({"design": args.top, "root": root, "target": args.to, "plan": plan,
+                          "stages": {n: {"state": statuses[n][0], "reason": statuses[n][1]} for n in graph.ancestors(target)}}, indent=2))
+        return 0
+    def sink(tag, text):
+        if args.verbose or tag == "[FLOW]": print(f"{tag} {text}", file=sys.stderr, flush=True)
+    sched = JobScheduler(args.jobs)
+    jobs = graph.build(target, sched, sink)
+    try:
+        for j in jobs.values(): j.wait()
+    except KeyboardInterrupt:
+        print("silis run: interrupted, cancelling", file=sys.stderr); sched.shutdown()
+    finally: graph.sta_service.close()
+    report = flow_report(graph, target, jobs, statuses, t0)
+    text = json.dumps(report, indent=2)
+    if args.json:
+        with open(args.json, "w") as f: f.write(text + "\n")
+    print(text)
+    return 0 if report["ok"] else 1
+
+
+# === BATCH RUNNER (silis batch: many projects, one CPU budget, resumable) ===
+
+BATCH_STATE = "batch_state.json"
+BATCH_COLUMNS = [("design", "Design"), ("state", "State"), ("runtime", "Runtime (s)"), ("area", "Area"), ("cells", "Cells"),
+                 ("wns", "WNS (ns)"), ("timing", "Timing"), ("power", "Power (W)"), ("drc", "DRC"), ("route_drc", "Route DRC"), ("error", "Error")]
+
+def batch_projects(specs, cwd, log=None):
+    """[(base, root)] from `<base>_project` folders, folders holding such projects, or design names laid out from cwd like the IDE does."""
+    found = []
+    for spec in specs:
+        path = os.path.abspath(os.path.join(cwd, spec))
+        if os.path.isdir(path) and os.path.basename(path).endswith("_project"): roots = [path]
+        elif os.path.isdir(path):
+            roots = sorted(p for p in glob.glob(os.path.join(path, "*_project")) if os.path.isdir(p))
+            if not roots: raise ValueError(f"no <design>_project folders in {spec}")
+        elif os.path.isdir(project_root(cwd, spec)) or os.path.exists(os.path.join(cwd, f"{spec}.v")): roots = [project_root(cwd, spec)]
+        else: raise ValueError(f"no project or source for {spec!r}")
+        for r in roots:
+            base = os.path.basename(r)[:-len("_project")]
+            if all(r != f[1] for f in found): found.append((base, prep_workspace(os.path.dirname(r), base, log)))
+    return found
+
+
+class BatchRunner:
+    """
+    The FlowGraph of many projects on one JobScheduler, so its CPU budget is
+    shared by every design. Per-design results go to `state_path` as each
+    design finishes; a rerun after an interruption rebuilds only what the
+    flow stamps say is stale, and keeps the recorded cost of the stages it
+    skips, so the dashboard still shows what each design took.
+    """
+    def __init__(self, projects, pdk, target, state_path, scheduler, sink=None):
+        self.projects = projects; self.pdk = pdk or {}; self.target = target
+        self.state_path = state_path; self.sched = scheduler; self.sink = sink
+        self.lock = threading.Lock(); self.graphs = {}; self.jobs = {}; self.done = {}; self.interrupted = False
+        self.state = self.load()
+        self.state.update(target=target or "all", pdk=self.pdk.get("name"))
+
+    def load(self):
+        try:
+            with open(self.state_path) as f: state = json.load(f)
+        except (OSError, ValueError): state = {}
+        state.setdefault("designs", {})
+        return state
+
+    def save(self):
+        """Holding lock: writes the state file (atomically, an interrupt must not leave half of it)."""
+        self.state["t"] = round(time.time(), 3)
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path + ".tmp", "w") as f: json.dump(self.state, f, indent=1)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def start(self):
+        """Submits every design's stale stages plus a report job that runs once they have all ended."""
+        for base, root in self.projects:
+            graph = FlowGraph(root, base, self.pdk); self.graphs[root] = graph
+            rec = self.state["designs"].setdefault(root, {"design": base, "root": root, "stages": {}})
+            sink = self.sink and (lambda tag, text, b=base: self.sink(tag, f"{b}: {text}" if tag == "[FLOW]" else text))
+            statuses = graph.statuses(); jobs = graph.build(self.target, self.sched, sink)
+            self.jobs[root] = jobs
+            with self.lock:
+                rec.update(state="running", error=None, plan=list(jobs)); self.save()
+            self.done[root] = self.sched.submit(f"report {base}", lambda job, r=root, s=statuses: self.finish(r, s),
+                                                group="batch", priority=JOB_INTERACTIVE, root=root, after=list(jobs.values()))
+        return self
+
+    def finish(self, root, statuses):
+        """Folds a design's jobs into its state record and refreshes the dashboard."""
+        graph = self.graphs[root]; jobs = self.jobs[root]
+        try:
+            with self.lock:
+                rec = self.state["designs"][root]
+                for n in graph.ancestors(self.target):
+                    j = jobs.get(n)
+                    if j is None: rec["stages"][n] = dict(rec["stages"].get(n) or {"ran": 0.0, "cpu": 0.0}, state="done", error=None); continue
+                    s = j.summary()
+                    rec["stages"][n] = {"state": s["state"], "ran": round(s["ran"], 3), "cpu": round(s["cpu"], 3), "error": s["error"], "log": s["log"]}
+                stages = [rec["stages"][n] for n in graph.ancestors(self.target)]
+                bad = next((n for n in graph.ancestors(self.target) if rec["stages"][n]["state"] != "done"), None)
+                cut = "interrupted" if self.interrupted else "cancelled"
+                rec.update(state="done" if bad is None else "failed" if rec["stages"][bad]["state"] == "failed" and not self.interrupted else cut,
+                           error=bad and f"{bad}: {rec['stages'][bad].get('error') or rec['stages'][bad]['state']}",
+                           runtime=round(sum(s["ran"] for s in stages), 3), cpu=round(sum(s["cpu"] for s in stages), 3),
+                           metrics=flow_metrics(root), t=round(time.time(), 3))
+                self.save(); rows = batch_rows(self.state, self.graphs)
+            write_dashboard(os.path.dirname(self.state_path), rows)
+            if self.sink: self.sink("[FLOW]", f"{graph.base}: {rec['state']}" + (f" ({rec['error']})" if rec["error"] else ""))
+        finally: graph.sta_service.close()
+
+    def wait(self):
+        for j in self.done.values(): j.wait()
+        return self.rows()
+
+    def interrupt(self):
+        """Cancels what is left; unfinished designs are marked so the next run resumes them."""
+        self.interrupted = True; self.sched.shutdown()
+        with self.lock:
+            for root, rec in self.state["designs"].items():
+                if rec.get("state") == "running": rec["state"] = "interrupted"
+            self.save()
+        for g in self.graphs.values(): g.sta_service.close()
+
+    def rows(self):
+        with self.lock: rows = batch_rows(self.state, self.graphs)
+        write_dashboard(os.path.dirname(self.state_path), rows)
+        return rows
+
+
+def batch_rows(state, roots=None):
+    """Dashboard rows (one per design, by name) from a batch state; roots limits them to this run's projects."""
+    rows = []
+    for root, rec in state.get("designs", {}).items():
+        if roots is not None and root not in roots: continue
+        m = rec.get("metrics") or {}
+        rows.append({"design": rec["design"], "root": root, "state": rec.get("state"), "runtime": rec.get("runtime"), "cpu": rec.get("cpu"),
+                     **{k: m.get(k) for k in ("area", "cells", "wns", "timing", "power", "drc", "route_drc")}, "error": rec.get("error")})
+    return sorted(rows, key=lambda r: (r["design"], r["root"]))
+
+def write_dashboard(out_dir, rows):
+    """dashboard.csv and dashboard.html next to the batch state (failed designs, negative WNS and DRC errors flagged)."""
+    import csv, html
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "dashboard.csv.tmp"), "w", newline="") as f:
+        w = csv.writer(f); w.writerow([k for k, _ in BATCH_COLUMNS] + ["root"])
+        for r in rows: w.writerow(["" if r[k] is None else r[k] for k, _ in BATCH_COLUMNS] + [r["root"]])
+    os.replace(os.path.join(out_dir, "dashboard.csv.tmp"), os.path.join(out_dir, "dashboard.csv"))
+    bad = lambda r, k: (k == "state" and r[k] != "done") or (k == "wns" and (r[k] or 0) < 0) or (k in ("drc", "route_drc") and (r[k] or 0) > 0)
+    cell = lambda r, k: f'<td{" class=bad" if bad(r, k) else ""}>{html.escape(str(r[k]) if r[k] is not None else "" if k == "error" else "-")}</td>'
+    body = "\n".join("<tr>" + "".join(cell(r, k) for k, _ in BATCH_COLUMNS) + "</tr>" for r in rows)
+    ok = sum(1 for r in rows if r["state"] == "done")
+    page = (f"<!doctype html><meta charset=utf-8><title>Silis batch</title>"
+            f"<style>body{{font-family:sans-serif}}table{{border-collapse:collapse}}td,th{{border:1px solid #999;padding:2px 8px;text-align:right}}"
+            f"td:first-child{{text-align:left}}.bad{{background:#f4c7c3}}</style>"
+            f"<h3>Silis batch: {ok}/{len(rows)} designs done, {datetime.datetime.now():%Y-%m-%d %H:%M}</h3>"
+            f"<table><tr>{''.join(f'<th>{html.escape(t)}</th>' for _, t in BATCH_COLUMNS)}</tr>\n{body}\n</table>\n")
+    with open(os.path.join(out_dir, "dashboard.html.tmp"), "w") as f: f.write(page)
+    os.replace(os.path.join(out_dir, "dashboard.html.tmp"), os.path.join(out_dir, "dashboard.html"))
+
+def batch_table(rows):
+    """The dashboard as fixed-width text."""
+    fmt = lambda v: "-" if v is None else f"{v:.4g}" if isinstance(v, float) else str(v)
+    cols = BATCH_COLUMNS[:-1]
+    cells = [[t for _, t in cols]] + [[fmt(r[k]) for k, _ in cols] for r in rows]
+    widths = [max(len(c[i]) for c in cells) for i in range(len(cols))]
+    return "\n".join("  ".join(c.ljust(w) for c, w in zip(line, widths)) for line in cells)
+
+def batch_cli(argv):
+    """`silis batch`: the flow of many projects in parallel under one CPU budget, with a dashboard; rerun to resume."""
+    import argparse
+    ap = argparse.ArgumentParser(prog="silis batch", fromfile_prefix_chars="@",
+                                 description="Run the design flow of many projects and collect their metrics. Rerunning resumes: fresh stages are skipped.")
+    ap.add_argument("projects", nargs="+", help="<design>_project folders, folders holding them, design names in the current directory, or @file listing them")
+    ap.add_argument("--pdk", help="PDK name from the IDE's PDK list, a PDK config .json, or a liberty file")
+    ap.add_argument("--to", default="route", help="last stage of every flow (default: route; 'all' for every stage)")
+    ap.add_argument("--jobs", type=int, default=None, help="CPU budget shared by all designs (default: all cores)")
+    ap.add_argument("--out", default="silis_batch", help=f"folder for {BATCH_STATE} and the dashboard (default: ./silis_batch)")
+    ap.add_argument("--fresh", action="store_true", help="forget earlier batch results (flow stamps still skip up-to-date stages)")
+    ap.add_argument("-v", "--verbose", action="store_true", help="tool output on stderr, not just stage progress")
+    args = ap.parse_args(argv)
+    log = lambda m: print(m, file=sys.stderr)
+    try: pdk = resolve_pdk(args.pdk); projects = batch_projects(args.projects, os.getcwd(), log)
+    except ValueError as e: print(f"silis batch: {e}", file=sys.stderr); return 2
+    target = None if args.to == "all" else args.to
+    if target and target not in FlowGraph(projects[0][1], projects[0][0]).stages: print(f"silis batch: unknown stage {args.to!r}", file=sys.stderr); return 2
+    state_path = os.path.join(os.path.abspath(args.out), BATCH_STATE)
+    if args.fresh:
+        with suppress(OSError): os.remove(state_path)
+    def sink(tag, text):
+        if args.verbose or tag == "[FLOW]": print(f"{tag} {text}", file=sys.stderr, flush=True)
+    def on_term(sig, frame): raise KeyboardInterrupt   # a nightly job's timeout stops it like ^C, so the state is saved
+    with suppress(ValueError): signal.signal(signal.SIGTERM, on_term)
+    runner = BatchRunner(projects, pdk, target, state_path, JobScheduler(args.jobs), sink)
+    t0 = time.time()
+    try: rows = runner.start().wait()
+    except KeyboardInterrupt:
+        print("silis batch: interrupted, cancelling; run the same command again to resume", file=sys.stderr)
+        runner.interrupt(); rows = runner.rows()
+    print(batch_table(rows))
+    ok = sum(1 for r in rows if r["state"] == "done")
+    log(f"silis batch: {ok}/{len(rows)} designs done in {time.time() - t0:.1f}s; dashboard in {os.path.dirname(state_path)}")
+    return 0 if ok == len(rows) else 1
+
+
+CLI_COMMANDS = {"run": flow_cli, "batch": batch_cli, "wavediff": wave_diff_cli, "liberty": liberty_cli,
+                "--wavediff": wave_diff_cli, "--liberty": liberty_cli}   # the flag spellings the IDE has always accepted
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if sys.argv[1:2] and sys.argv[1] in CLI_COMMANDS else None
+    sys.exit(CLI_COMMANDS[cmd](sys.argv[2:]) if cmd else flow_cli(sys.argv[1:]))
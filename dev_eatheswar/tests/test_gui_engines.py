@@ -0,0 +1,116 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pocpnrv37 as gui
+import silis_flow as sf
+from test_silis_flow import TIMING_RPT
+
+
+def scalar_vcd(tmp_path, waves, end):
+    """A dump of 1-bit wires under tb from {name: [(t, 0/1), ...]}."""
+    ids = {name: chr(33 + i) for i, name in enumerate(waves)}
+    lines = ["$timescale 1ns $end", "$scope module tb $end", *[f"$var wire 1 {c} {n} $end" for n, c in ids.items()], "$upscope $end", "$enddefinitions $end"]
+    at = {}
+    for name, changes in waves.items():
+        for t, v in changes: at.setdefault(t, []).append(f"{v}{ids[name]}")
+    for t in sorted(at): lines += [f"#{t}", *at[t]]
+    path = tmp_path / "bus.vcd"; path.write_text("\n".join(lines + [f"#{end}", ""]))
+    return sf.VCDParser(str(path))
+
+
+# --- timing path database ---
+
+def test_timing_path_db_indexes_paths_and_stages(tmp_path):
+    rpt = tmp_path / "timing.rpt"; rpt.write_text(TIMING_RPT)
+    db = gui.TimingPathDB(str(rpt))
+    assert not db.up_to_date() and db.build() == 3 and db.up_to_date()
+    db.open()
+    assert db.groups() == ["clk", "io"] and db.count() == 3
+    rows = db.rows()
+    assert [(r[4], r[5], r[1], r[2]) for r in rows] == [("b", "r2/D", -0.62, "VIOLATED"), ("c", "out", 7.7, "MET"), ("a", "r1/D", 8.78, "MET")]
+    worst = rows[0][0]
+    assert rows[0][6:] == (4, 10.5, 9.88)
+    assert db.stages(worst)[2] == ("u2/Y", "sky130_fd_sc_hd__nand2_1", "fall", 1, 0.01, 0.05, 9.5, 10.5, "n_u2_Y")
+    text = db.path_text(worst)
+    assert text.startswith("Startpoint: b") and text.rstrip().endswith("slack (VIOLATED)")
+    for query, expect in ((("",), 3), (("", True), 1), (("r1",), 1), (("through:u1/*",), 1), (("cell:*nand2*",), 1),
+                          (("cell:*dfxtp* a",), 1), (("", False, "io"), 1)):
+        assert db.count(*db.where(*query)) == expect, query
+
+
+# --- protocol decoders ---
+
+def uart_frames(t, period, *frames):
+    """rx changes for (byte, stop bit) frames sent back to back from t, LSB first."""
+    out = [(0, 1)]
+    for byte, stop in frames:
+        for bit in [0, *((byte >> i) & 1 for i in range(8)), stop]: out.append((t, bit)); t += period
+        out.append((t, 1)); t += 3 * period
+    return out
+
+def test_uart_decoder_reads_bytes_and_framing_errors(tmp_path):
+    data = scalar_vcd(tmp_path, {"rx": uart_frames(100, 10, (0x41, 1), (0x0A, 1), (0x7E, 0))}, 1000)
+    rows = gui.UARTDecoder(data, {"rx": "tb.rx"}, {"bit_period": 10}).decode()
+    assert [r[4:] for r in rows] == [("41", "'A'"), ("A", ""), ("7E", "'~' framing error")]
+    assert rows[0][:3] == (100, 200, "RX") and rows[1][0] == 230
+    with pytest.raises(ValueError, match="map rx"): gui.UARTDecoder(data, {})
+
+def test_spi_decoder_groups_whole_bytes_per_frame(tmp_path):
+    mosi_bytes, miso_bytes = [0xA5, 0x3C], [0x5A, 0xFF]
+    sclk, mosi, miso = [(0, 0)], [(0, 0)], [(0, 0)]
+    t = 20
+    for i in range(19):   # two bytes and three stray bits, changed on the falling edge
+        bit = lambda b: (b[i // 8] >> (7 - i % 8)) & 1 if i < 16 else 1
+        mosi.append((t, bit(mosi_bytes))); miso.append((t, bit(miso_bytes)))
+        sclk += [(t + 5, 1), (t + 10, 0)]; t += 10
+    data = scalar_vcd(tmp_path, {"sclk": sclk, "cs_n": [(0, 1), (15, 0), (t + 10, 1)], "mosi": mosi, "miso": miso}, t + 20)
+    rows = gui.SPIDecoder(data, {"sclk": "tb.sclk", "cs_n": "tb.cs_n", "mosi": "tb.mosi", "miso": "tb.miso"}).decode()
+    assert [(r[4], r[5]) for r in rows] == [("A5", "miso 5A"), ("3C", "miso FF")]
+    assert rows[0][:2] == (25, 95) and rows[1][:2] == (105, 175)
+    no_miso = gui.SPIDecoder(data, {"sclk": "tb.sclk", "cs_n": "tb.cs_n", "mosi": "tb.mosi"}).decode()
+    assert [(r[4], r[5]) for r in no_miso] == [("A5", ""), ("3C", "")]
+
+
+# --- log pipeline ---
+
+def test_log_pipeline_bounds_the_live_ring_and_spills_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(gui, "LOG_RING_LINES", 5)
+    logs = gui.LogPipeline(str(tmp_path))
+    logs.put(("[YOSYS]", "a\nb")); logs.put(("[STA]", "c")); logs.put(("[SYS]", "hello")); logs.put("bare")
+    for i in range(8): logs.put(("[BACKEND]", f"route {i}"))
+    frame = {name: (lines, skipped) for name, lines, skipped in logs.drain(limit=3)}
+    assert frame["synth"] == ([("a", None), ("b", None), ("c", None)], 0)
+    assert frame["terminal"] == ([("[SYS] hello", "#4a8fc0"), ("[SYS] bare", "#4a8fc0")], 0)
+    assert frame["backend"] == ([(f"route {i}", None) for i in (3, 4, 5)], 3) and logs.backlog()
+    assert [(n, [t for t, _ in l], k) for n, l, k in logs.drain()] == [("backend", ["route 6", "route 7"], 0)] and not logs.backlog()
+    with open(logs.full_log("backend")) as f: assert f.read().splitlines() == [f"route {i}" for i in range(8)]
+    logs.restart("backend"); logs.put(("[BACKEND]", "again"))
+    with open(logs.full_log("backend")) as f: assert f.read() == "again\n"
+
+
+# --- event bus ---
+
+@pytest.fixture(scope="module")
+def app():
+    from PyQt6.QtWidgets import QApplication
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"   # pocpnrv37 pins xcb on import
+    return QApplication.instance() or QApplication([])
+
+def test_event_bus_coalesces_live_events_and_holds_finals_behind_lines(tmp_path, app):
+    bus = gui.EventBus(str(tmp_path)); got, events = [], []
+    bus.lines.connect(lambda name, lines, skipped: got.append((name, len(lines))))
+    bus.posted.connect(events.append)
+    bus.log("[SIM]", "one"); app.processEvents()   # the queued wake delivers without a timer
+    assert got == [("sim", 1)] and not bus.armed
+    for i in range(gui.LOG_FRAME_LINES + 500): bus.log("[SIM]", f"line {i}")
+    bus.progress("sim", 1, 3); bus.progress("sim", 2, 3); bus.job("sim", "done")
+    bus.deliver()
+    assert got[-1] == ("sim", gui.LOG_FRAME_LINES)
+    assert [(e.kind, e.data) for e in events] == [("progress", (2, 3, ""))]   # the final job state waits for its lines
+    bus.deliver()
+    assert got[-1] == ("sim", 500) and [e.kind for e in events] == ["progress", "job"]
+    bus.frame.stop()
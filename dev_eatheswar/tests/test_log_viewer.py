@@ -0,0 +1,52 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pocpnrv37 as gui
+from PyQt6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="module")
+def app():
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"   # pocpnrv37 pins xcb on import
+    return QApplication.instance() or QApplication([])
+
+def write_log(path, n, start=0):
+    with open(path, "a") as f:
+        for i in range(start, start + n): f.write(f"line {i}" + (" Warning: w\n" if i % 7 == 0 else "\n"))
+
+def test_log_index_counts_lines_and_marks(tmp_path):
+    p = str(tmp_path / "a.log"); write_log(p, 100)
+    ix = gui.LogIndex(p); ix.update()
+    assert ix.lines == 100 and ix.line(43) == "line 43"
+    assert ix.warnings == list(range(0, 100, 7))
+    write_log(p, 5, 100); ix.update()
+    assert ix.lines == 105 and ix.find(b"line 103", 0) == 103
+
+def test_closing_during_an_index_pass_waits_for_the_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(gui.LogIndex, "CHUNK", 1 << 12)
+    p = str(tmp_path / "big.log"); write_log(p, 200_000)
+    ix = gui.LogIndex(p)
+    t = threading.Thread(target=ix.update); t.start(); time.sleep(0.02)
+    ix.close()   # used to raise BufferError: cannot close exported pointers exist
+    t.join(5)
+    assert not t.is_alive() and ix.mm is None and ix.lines == 0
+
+def test_viewer_shows_lines_written_during_an_index_pass(tmp_path, app, monkeypatch):
+    p = str(tmp_path / "run.log"); write_log(p, 10)
+    update = gui.LogIndex.update
+    def racing_update(self, progress=None):
+        changed = update(self, progress)
+        if self.lines == 10: write_log(p, 3, 10)   # the tool writes its last lines as the pass ends
+        return changed
+    monkeypatch.setattr(gui.LogIndex, "update", racing_update)
+    viewer = gui.LogViewer(); viewer.open(p, follow=True)
+    deadline = time.time() + 5
+    while (viewer.timer.isActive() or viewer.worker.is_alive()) and time.time() < deadline: app.processEvents(); time.sleep(0.01)
+    assert viewer.index.lines == 13 and viewer.index.line(12) == "line 12"
+    viewer.clear()
@@ -0,0 +1,403 @@
+import os
+import sys
+import re
+import json
+import shutil
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import silis_flow as sf
+
+
+COUNTER = """module cnt(input wire clk, input wire rst, output reg [3:0] q);
+  always @(posedge clk) q <= rst ? 4'd0 : q + 4'd1;
+endmodule
+"""
+COUNTER_TB = """`timescale 1ns/1ns
+module tb_cnt;
+  reg clk = 0, rst = 1; wire [3:0] q;
+  cnt dut(.clk(clk), .rst(rst), .q(q));
+  always #5 clk = ~clk;
+  initial begin
+    $dumpfile("wave.vcd"); $dumpvars(0, tb_cnt);
+    #20 rst = 0; #200 $finish;
+  end
+endmodule
+"""
+
+def make_project(tmp_path, files):
+    root = tmp_path / "cnt_project"
+    for d in ("source", "netlist", "reports", "results"): (root / d).mkdir(parents=True, exist_ok=True)
+    for name, text in files.items(): (root / "source" / name).write_text(text)
+    return str(root)
+
+def sink_job(name="test"):
+    lines = []
+    return sf.Job(name, lambda job: None, sink=lambda tag, text: lines.append(text)), lines
+
+
+# --- dump profiles ---
+
+def test_dump_profile_binds_into_verilator_top(tmp_path):
+    root = make_project(tmp_path, {"cnt.v": COUNTER, "tb_cnt.v": COUNTER_TB})
+    files = sf.instrument_dump_profile(root, sf.project_sources(root), {"scopes": ["tb_cnt.dut"]}, "wave.vcd", bind_top="tb_cnt")
+    with open(files[-1]) as f: text = f.read()
+    assert "bind tb_cnt silis_dump silis_dump_i();" in text
+    assert "$dumpvars(0, $root.tb_cnt.dut);" in text
+    tb = next(p for p in files if p.endswith("tb_cnt.v"))
+    with open(tb) as f: assert "$dump" not in f.read()
+
+@pytest.mark.skipif(not shutil.which("verilator"), reason="verilator not installed")
+def test_verilator_with_dump_profile_writes_a_dump(tmp_path):
+    root = make_project(tmp_path, {"cnt.v": COUNTER, "tb_cnt.v": COUNTER_TB})
+    sf.save_project_settings(root, sim_backend="verilator", sim_trace="vcd")
+    with open(os.path.join(root, sf.DUMP_PROFILE), "w") as f: json.dump({"scopes": ["tb_cnt.dut"], "windows": [[0, 100]]}, f)
+    job, lines = sink_job("sim cnt")
+    assert sf.sim_flow(job, root, "cnt"), "\n".join(lines)
+    wave = os.path.join(root, "wave.vcd")
+    assert os.path.exists(wave) or os.path.exists(os.path.join(root, "wave.fst")), "\n".join(lines)
+
+
+# --- regression runs go through the scheduler and the telemetry ledger ---
+
+FAKE_IVERILOG = """#!/usr/bin/env python3
+import sys
+out = sys.argv[sys.argv.index("-o") + 1]
+open(out, "w").write("#! fake vvp image\\n")
+"""
+FAKE_VVP = """#!/usr/bin/env python3
+import os, sys, time
+time.sleep(float(os.environ.get("FAKE_VVP_SLEEP", "0")))
+print("PASSED", *sys.argv[2:])
+"""
+
+@pytest.fixture
+def fake_icarus(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"; bin_dir.mkdir()
+    for name, text in (("iverilog", FAKE_IVERILOG), ("vvp", FAKE_VVP)):
+        (bin_dir / name).write_text(text); (bin_dir / name).chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+def regression(root, seeds):
+    tbs, design = sf.discover_testbenches(root)
+    return sf.RegressionRunner(root, sf.regression_matrix(tbs, seeds), design, workers=2)
+
+def test_regression_runs_are_ledgered_under_their_job(tmp_path, fake_icarus):
+    root = make_project(tmp_path, {"cnt.v": COUNTER, "tb_cnt.v": COUNTER_TB})
+    runner = regression(root, [1, 2, 3])
+    job = sf.JobScheduler(2).submit("regression", lambda job: runner.run(), root=root, on_cancel=runner.cancel)
+    assert job.wait(30) == "done"
+    assert [r["status"] for r in job.result] == ["PASS"] * 3
+    with open(os.path.join(root, sf.TELEMETRY_LOG)) as f: rows = [json.loads(line) for line in f]
+    sims = [r for r in rows if r["flow"] == "regression"]
+    assert len(sims) == 3 and all(r["tool"] == "vvp" and r["job"] == "regression" and r["rc"] == 0 for r in sims)
+    assert len(job.runs) >= 3
+
+def test_cancelling_the_regression_job_kills_its_simulations(tmp_path, fake_icarus, monkeypatch):
+    monkeypatch.setenv("FAKE_VVP_SLEEP", "30")
+    root = make_project(tmp_path, {"cnt.v": COUNTER, "tb_cnt.v": COUNTER_TB})
+    runner = regression(root, [1, 2])
+    sched = sf.JobScheduler(2)
+    job = sched.submit("regression", lambda job: runner.run(), root=root, on_cancel=runner.cancel)
+    for _ in range(100):
+        if len(job.procs) == 2: break
+        sf.time.sleep(0.05)
+    assert sched.cancel(job) == 1
+    assert job.wait(10) == "cancelled"
+    assert all(p.poll() is not None for p in job.procs)
+
+
+# --- resident STA keeps its liberty across resynthesis ---
+
+LIB = """library(t) {
+  cell(INV) { area : 1; pin(A) { direction : input; } }
+  cell(NAND) { area : 2; pin(A) { direction : input; } }
+  cell(NOR) { area : 2; pin(A) { direction : input; } }
+}
+"""
+
+class FakeSession:
+    started = []
+    def __init__(self, lib, root):
+        with open(lib) as f: self.cells = set(re.findall(r"cell\((\w+)\)", f.read()))
+        self.p = type("P", (), {"poll": lambda self: None})(); self.loads = 0
+        FakeSession.started.append(self)
+    def load_design(self, netlist, top, sdc): self.loads += 1
+    def run(self, cmd, on_line=None): return True, ""
+    def close(self): pass
+
+def test_sta_service_reloads_liberty_only_for_new_cells(tmp_path, monkeypatch):
+    monkeypatch.setattr(sf, "StaSession", FakeSession); FakeSession.started.clear()
+    root = make_project(tmp_path, {}); lib = str(tmp_path / "t.lib")
+    with open(lib, "w") as f: f.write(LIB)
+    sta = sf.StaService()
+    def synth(*cells):
+        with open(os.path.join(root, "netlist", "top_netlist.v"), "w") as f:
+            f.write("module top(input a, output y);\n" + "".join(f"  {c} u{i} (.A(a));\n" for i, c in enumerate(cells)) + "endmodule\n")
+        sta.ensure(root, "top", lib); return FakeSession.started[-1]
+    first = synth("INV")
+    assert first.cells == {"INV"}
+    assert synth("INV", "INV") is first and first.loads == 2
+    grown = synth("INV", "NAND")
+    assert grown is not first and grown.cells == {"INV", "NAND"}
+    assert synth("NAND") is grown and len(FakeSession.started) == 2
+
+
+# --- liberty trimming ---
+
+PDK_LIB = """library(pdk) {
+  /* cell(COMMENTED) { } */
+  time_unit : "1ns";
+  cell(INV) { area : 1; pin(A) { direction : input; capacitance : 0.002; } pin(Y) { direction : output; function : "!A"; } }
+  cell(DFF) { area : 5; ff(IQ, IQN) { next_state : "D"; clocked_on : "CLK"; } pin(D) { direction : input; } pin(Q) { direction : output; } }
+  cell(FILL) { area : 1; }
+  cell(BUF_SLOW) { area : 2; dont_use : true; pin(Y) { direction : output; function : "A"; } }
+  cell(NAND) { area : 2; pin(Y) { direction : output; function : "!(A&B)"; } }
+}
+"""
+
+def test_liberty_index_trims_to_usable_and_instantiated_cells(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    lib = tmp_path / "pdk.lib"; lib.write_text(PDK_LIB)
+    idx = sf.LibertyIndex(str(lib))
+    assert sorted(idx.cells) == ["BUF_SLOW", "DFF", "FILL", "INV", "NAND"] and not idx.cached
+    assert idx.cells["INV"]["pins"]["A"]["cap"] == 0.002 and idx.cells["DFF"]["seq"]
+    assert [c for c in idx.cells if idx.usable(c)] == ["INV", "DFF", "NAND"]
+    out, note = sf.synth_liberty(str(lib), ["NA*"])
+    with open(out) as f: text = f.read()
+    assert "2/5 cells" in note and text.startswith("library(pdk) {") and text.rstrip().endswith("}")
+    assert "cell(INV)" in text and "cell(DFF)" in text and "cell(NAND)" not in text and "cell(FILL)" not in text
+    netlist = tmp_path / "top.v"; netlist.write_text("module top(input a, output y);\n  NAND u0 (.A(a), .Y(y));\nendmodule\n")
+    with open(sf.netlist_liberty(str(lib), str(netlist))) as f: assert re.findall(r"cell\((\w+)\)", f.read()) == ["COMMENTED", "NAND"]
+    assert sf.liberty_subset(str(lib), None) == str(lib) and sf.LibertyIndex(str(lib)).cached
+
+
+# --- incremental synthesis ---
+
+FAKE_YOSYS = """#!/usr/bin/env python3
+import re, sys
+if sys.argv[1] == "-V": print("Yosys 0.0 (fake)"); sys.exit()
+out = re.search(r"write_verilog -noattr (\\S+)", open(sys.argv[1]).read()).group(1)
+open(out, "w").write("// netlist\\n")
+"""
+HIER = {
+    "leaf.v": "module leaf(input a, output y);\n  assign y = ~a;\nendmodule\n",
+    "cfg.v": "module cfg #(parameter W = 1)(input [W-1:0] a, output y);\n  assign y = ^a;\nendmodule\n",
+    "mid.v": "module mid(input a, output y);\n  wire t;\n  leaf l0(.a(a), .y(t));\n  cfg #(.W(1)) c0(.a(t), .y(y));\nendmodule\n",
+    "side.v": "module side(input a, output y);\n  assign y = a;\nendmodule\n",
+    "top.v": "module top(input a, output y, z);\n  mid m0(.a(a), .y(y));\n  side s0(.a(a), .y(z));\nendmodule\n",
+}
+
+def test_incremental_synth_rebuilds_the_edited_module_and_its_ancestors(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"; bin_dir.mkdir()
+    (bin_dir / "yosys").write_text(FAKE_YOSYS); (bin_dir / "yosys").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    root = make_project(tmp_path, HIER); lib = tmp_path / "t.lib"; lib.write_text(LIB)
+    def build():
+        inc = sf.IncrementalSynth(root, "top", str(lib), sf.project_sources(root), workers=2)
+        inc.plan(); return inc, inc.build()
+    inc, (built, reused) = build()
+    order = inc.order.index
+    assert sorted(inc.units) == ["leaf", "mid", "side", "top"] and order("leaf") < order("mid") < order("top") and order("side") < order("top")
+    assert inc.units["mid"]["deps"] == ["leaf"] and sorted(built) == sorted(inc.units) and reused == []
+    rebuilt = lambda: [sorted(names) for names in build()[1]]
+    assert rebuilt() == [[], ["leaf", "mid", "side", "top"]]
+    (tmp_path / "cnt_project" / "source" / "leaf.v").write_text(HIER["leaf.v"].replace("~a", "!a"))
+    assert rebuilt() == [["leaf", "mid", "top"], ["side"]]
+    (tmp_path / "cnt_project" / "source" / "cfg.v").write_text(HIER["cfg.v"].replace("^a", "&a"))
+    assert rebuilt() == [["mid", "top"], ["leaf", "side"]]   # cfg has overrides, so it is inlined into mid
+
+
+# --- report metrics ---
+
+def sta_row(desc, time="", delay="", slew="", cap="", fanout="", edge=" "):
+    return f"{fanout:>6}{cap:>7}{slew:>7}{delay:>8}{time:>8} {edge} {desc}"
+
+def sta_path(start, end, group, pins, required, slack):
+    """One report_checks -fields {slew cap input_pins nets fanout} path: pins are (pin, cell, edge, delay, net fanout)."""
+    rule = "-" * 77; t = 1.0
+    rows = [f"Startpoint: {start} (input port clocked by clk)", f"Endpoint: {end} (rising edge-triggered flip-flop clocked by clk)",
+            f"Path Group: {group}", "Path Type: max", "", f"{'Fanout':>6}{'Cap':>7}{'Slew':>7}{'Delay':>8}{'Time':>8}   Description", rule,
+            sta_row("clock clk (rise edge)", "0.00", "0.00", "0.00"), sta_row("input external delay", "1.00", "1.00", edge="^")]
+    for pin, cell, edge, delay, fanout in pins:
+        t += delay
+        rows.append(sta_row(f"{pin} ({cell})", f"{t:.2f}", f"{delay:.2f}", "0.05", edge=edge))
+        if fanout: rows.append(sta_row(f"n_{pin.replace('/', '_')} (net)", cap="0.01", fanout=str(fanout)))
+    rows += [sta_row("data arrival time", f"{t:.2f}"), "", sta_row("data required time", f"{required:.2f}"), rule,
+             sta_row("data required time", f"{required:.2f}"), sta_row("data arrival time", f"{-t:.2f}"), rule,
+             sta_row(f"slack ({'MET' if slack >= 0 else 'VIOLATED'})", f"{slack:.2f}"), "", ""]
+    return "\n".join(rows)
+
+TIMING_RPT = "".join([
+    sta_path("a", "r1/D", "clk", [("a", "in", "^", 0.0, 1), ("u1/A", "sky130_fd_sc_hd__inv_1", "^", 0.0, 0),
+                                  ("u1/Y", "sky130_fd_sc_hd__inv_1", "v", 0.1, 2), ("r1/D", "sky130_fd_sc_hd__dfxtp_1", "v", 0.0, 0)], 9.88, 8.78),
+    sta_path("b", "r2/D", "clk", [("b", "in", "^", 0.0, 1), ("u2/A", "sky130_fd_sc_hd__nand2_1", "^", 0.0, 0),
+                                  ("u2/Y", "sky130_fd_sc_hd__nand2_1", "v", 9.5, 1), ("r2/D", "sky130_fd_sc_hd__dfxtp_1", "v", 0.0, 0)], 9.88, -0.62),
+    sta_path("c", "out", "io", [("c", "in", "^", 0.0, 1), ("out", "out", "^", 0.3, 0)], 9.0, 7.7),
+])
+SYNTH_LOG = """Number of cells: 3
+     sky130_fd_sc_hd__dfxtp_1 cells: 2
+     sky130_fd_sc_hd__inv_1 cells: 1
+Warning: wire 'x' is assigned in a block
+"""
+AREA_RPT = """{
+   "design": {
+      "num_wires": 7,
+      "num_pub_wire_bits": 9,
+      "num_cells": 3,
+      "area": 48.796800
+   }
+}
+"""
+POWER_RPT = """Group                  Internal  Switching    Leakage      Total
+                          Power      Power      Power      Power (Watts)
+----------------------------------------------------------------
+Sequential             1.00e-05   2.00e-06   1.00e-10   1.20e-05  60.0%
+Combinational          5.00e-06   3.00e-06   1.00e-10   8.00e-06  40.0%
+Clock                  0.00e+00   0.00e+00   0.00e+00   0.00e+00   0.0%
+Macro                  0.00e+00   0.00e+00   0.00e+00   0.00e+00   0.0%
+Pad                    0.00e+00   0.00e+00   0.00e+00   0.00e+00   0.0%
+----------------------------------------------------------------
+Total                  1.50e-05   5.00e-06   2.00e-10   2.00e-05 100.0%
+                          75.0%      25.0%       0.0%
+"""
+
+def write_reports(root):
+    for name, text in (("synthesis.log", SYNTH_LOG), ("area.rpt", AREA_RPT), ("timing.rpt", TIMING_RPT), ("power.rpt", POWER_RPT)):
+        with open(os.path.join(root, "reports", name), "w") as f: f.write(text)
+    return os.path.join(root, "reports")
+
+def test_streamed_metrics_match_the_report_files(tmp_path):
+    reports = write_reports(make_project(tmp_path, {}))
+    parsed = sf.ReportEngine.parse_files(reports)
+    assert (parsed["cells"], parsed["area"], parsed["wires"], parsed["bits"]) == ("3", "48.796800", "7", "9")
+    assert (parsed["wns"], parsed["status"]) == ("-0.62", "VIOLATED") and parsed["pwr_pct"] == ["75.0%", "25.0%", "0.0%"]
+    assert [g[:3] for g in parsed["timing_groups"]] == [("clk", "8.78", "MET"), ("io", "7.70", "MET")]
+    assert parsed["cell_list"] == [("sky130_fd_sc_hd__dfxtp_1", 2), ("sky130_fd_sc_hd__inv_1", 1)] and len(parsed["errors"]) == 1
+    assert parsed["critical_path_trace"].startswith("Startpoint: a") and parsed["critical_path_trace"].endswith("slack (MET)")
+    stream = sf.MetricStream(); changed = []
+    for kind, text in (("yosys", SYNTH_LOG + AREA_RPT), ("timing", TIMING_RPT), ("power", POWER_RPT)):
+        for line in text.splitlines(True): changed.append(stream.feed(kind, line))
+    assert stream.m["wns"] == "-0.62" and any(changed)
+    assert stream.finish(reports) == parsed
+    partial = sf.MetricStream()   # the stream only saw Yosys; timing and power come from the files
+    for line in (SYNTH_LOG + AREA_RPT).splitlines(True): partial.feed("yosys", line)
+    assert partial.finish(reports) == parsed
+    assert sf.flow_metrics(os.path.dirname(reports))["wns"] == -0.62
+
+
+# --- silis run ---
+
+def test_dry_run_leaves_the_tree_alone(tmp_path, monkeypatch, capsys):
+    (tmp_path / "foo.v").write_text("module foo(input a); endmodule\n")
+    monkeypatch.chdir(tmp_path)
+    assert sf.flow_cli(["--top", "foo", "--to", "synth", "--dry-run"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["root"] == str(tmp_path / "foo_project") and "synth" in out["plan"]
+    assert sorted(os.listdir(tmp_path)) == ["foo.v"]
+
+
+# --- FST dumps ---
+
+@pytest.mark.parametrize("rc", [0, 1])
+def test_fst_dump_is_converted_or_kept(tmp_path, monkeypatch, rc):
+    bin_dir = tmp_path / "bin"; bin_dir.mkdir()
+    (bin_dir / "fst2vcd").write_text("#!/bin/sh\n" + ('printf "\\$date\\n" > "$4"\n' if rc == 0 else "echo broken >&2; exit 1\n"))
+    (bin_dir / "fst2vcd").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    root = make_project(tmp_path, {})
+    dump = os.path.join(root, "wave.vcd")
+    with open(dump, "wb") as f: f.write(b"\x00FST binary")
+    wave = sf.ensure_vcd(dump, root)
+    assert os.path.exists(os.path.join(root, "wave.fst"))
+    assert wave == (dump if rc == 0 else os.path.join(root, "wave.fst")) and os.path.exists(wave)
+    with open(os.path.join(root, sf.TELEMETRY_LOG)) as f: rows = [json.loads(line) for line in f]
+    assert [(r["tool"], r["rc"]) for r in rows] == [("fst2vcd", rc)]
+
+
+# --- waveform queries ---
+
+VCD = """$timescale 1ns $end
+$scope module tb $end
+$var wire 1 ! clk $end
+$var wire 2 " d [1:0] $end
+$upscope $end
+$enddefinitions $end
+#0
+0!
+b00 "
+#10
+1!
+b01 "
+#20
+0!
+b11 "
+#30
+1!
+#40
+"""
+
+def load_vcd(tmp_path, text=VCD, name="wave.vcd"):
+    path = tmp_path / name; path.write_text(text)
+    return sf.VCDParser(str(path))
+
+def test_wave_search_finds_condition_intervals(tmp_path):
+    data = load_vcd(tmp_path)
+    search = sf.WaveSearch()
+    assert search.run(data, "clk") == 2
+    assert search.starts.tolist() == [10, 30] and search.ends.tolist() == [20, 40]
+    assert search.next_hit(10) == 1 and search.prev_hit(30) == 0 and search.next_hit(30) is None
+    assert search.visible(15, 25) == (0, 1)
+    assert search.run(data, "clk && d == 2'b01") == 1 and search.starts.tolist() == [10]
+    assert search.run(data, "tb.d[1] && !clk") == 1 and (search.starts.tolist(), search.ends.tolist()) == ([20], [30])
+
+
+def test_derived_signals_evaluate_per_segment(tmp_path):
+    data = load_vcd(tmp_path)
+    sid = data.add_derived("d[1] | clk")
+    assert data.signals[sid] == [(0, "0"), (10, "1")] and data.widths[sid] == 1
+    sid = data.add_derived("{d, clk}")
+    assert data.signals[sid] == [(0, "0"), (10, "3"), (20, "6"), (30, "7")] and data.widths[sid] == 3
+    sid = data.add_derived("d - prev(d)")
+    assert data.signals[sid] == [(0, "X"), (10, "1"), (20, "2")]
+    assert data.add_derived(" d - prev(d) ") == sid
+    data.remove_derived(sid)
+    assert sid not in data.signals and data.resolve(sid) is None
+
+
+def test_wave_diff_reports_the_first_divergence(tmp_path, capsys):
+    golden = load_vcd(tmp_path)
+    run = load_vcd(tmp_path, VCD.replace('b11 "', 'b10 "').replace("$var wire 1 ! clk $end", "$var wire 1 ! clk $end\n$var wire 1 # extra $end"), "run.vcd")
+    diff = sf.WaveDiff(golden, run).compare()
+    assert diff.compared == 2 and diff.first_divergence == 20
+    assert diff.summary() == [("tb.d", 20, 1, 20)] and diff.only_run == ["tb.extra"]
+    assert sf.WaveDiff(golden, run).compare(ignore=["tb.d"]).first_divergence is None
+    assert sf.wave_diff_cli([str(tmp_path / "wave.vcd"), str(tmp_path / "run.vcd")]) == 1
+    assert "first divergence @ 20 1ns" in capsys.readouterr().out
+    assert sf.wave_diff_cli([str(tmp_path / "wave.vcd"), str(tmp_path / "wave.vcd")]) == 0
+
+
+# --- switching activity ---
+
+@pytest.mark.parametrize("chunk", [1, sf.ToggleCounter.CHUNK])
+def test_toggle_counter_writes_t0_t1_tc_per_bit(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(sf.ToggleCounter, "CHUNK", chunk)   # 1 folds after every timestep
+    path = tmp_path / "wave.vcd"; path.write_text(VCD)
+    tc = sf.ToggleCounter().scan(str(path)); tc.write_saif(str(tmp_path / "wave.saif"))
+    text = (tmp_path / "wave.saif").read_text()
+    assert "(DURATION 40)" in text and "(INSTANCE tb" in text
+    assert "(clk (T0 20) (T1 20) (TX 0) (TC 3) (IG 0))" in text
+    assert "(d\\[1\\] (T0 20) (T1 20) (TX 0) (TC 1) (IG 0))" in text
+    assert "(d\\[0\\] (T0 10) (T1 30) (TX 0) (TC 1) (IG 0))" in text
+
+def test_saif_cache_keeps_the_newest_per_dump(tmp_path):
+    root = make_project(tmp_path, {}); vcd = os.path.join(root, "wave.vcd")
+    for i in range(sf.SAIF_KEEP + 2):
+        with open(vcd, "w") as f: f.write(VCD + "#" + str(50 + i) + "\n")
+        os.utime(vcd, ns=(i * 10**9, i * 10**9))
+        saif, info, cached = sf.vcd_activity(vcd, root)
+        assert not cached and sf.vcd_activity(vcd, root)[2]
+    store = os.path.dirname(saif)
+    assert len(os.listdir(store)) == 2 * sf.SAIF_KEEP and os.path.exists(saif)
+    assert info["scopes"] == ["tb"]